@@ -1,3 +1,75 @@
-from django.contrib import admin
+# applications/admin.py
 
-# Register your models here.
+from django.contrib import admin, messages
+from django.utils import timezone
+from core import dashboard
+from core.admin import EstimatedCountPaginator, InputFilter, iter_pk_chunks
+from .models import Application
+
+
+class UserFilter(InputFilter):
+    """ Filter by username or user id, instead of a sidebar link per user. """
+    title = 'user'
+    parameter_name = 'user'
+
+    def queryset(self, request, queryset):
+        value = (self.value() or '').strip()
+        if not value:
+            return queryset
+        if value.isdigit():
+            return queryset.filter(user_id=int(value))
+        return queryset.filter(user__username=value)
+
+
+def set_status_action(status, label):
+    """
+    Admin action that moves the selected applications to `status`, in batches
+    of primary keys so "select all" on a large table never loads every row.
+    Queryset updates skip the post_save signal, so the affected users'
+    dashboard counts are refreshed here instead.
+    """
+    def action(modeladmin, request, queryset):
+        updated = 0
+        for pks in iter_pk_chunks(queryset):
+            batch = Application.objects.filter(pk__in=pks)
+            user_ids = set(batch.values_list('user_id', flat=True))
+            updated += batch.update(status=status, updated_at=timezone.now())
+            for user_id in user_ids:
+                dashboard.refresh_applications(user_id)
+        modeladmin.message_user(request, f'{updated} application(s) marked as {label}.', messages.SUCCESS)
+
+    action.__name__ = f'mark_{status.lower()}'
+    action.short_description = f'Mark selected applications as {label}'
+    return action
+
+
+@admin.register(Application)
+class ApplicationAdmin(admin.ModelAdmin):
+    list_display = ('job_title', 'company_name', 'user', 'status', 'date_applied', 'updated_at')
+    list_filter = ('status', UserFilter, 'date_applied', 'updated_at')
+    # One join instead of a user query per row (the user column, __str__ on save, log entries)
+    list_select_related = ('user',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False # Skips the second COUNT(*) behind "N total"
+    actions = [set_status_action(status, label) for status, label in (
+        ('APPLIED', 'Applied'), ('REJECTED', 'Rejected'), ('WITHDRAWN', 'Withdrawn'),
+    )]
+    search_fields = ('job_title', 'company_name', 'user__username', 'notes')
+    autocomplete_fields = ['user', 'job_posting'] # Make linking easier
+    list_editable = ('status',) # Allow quick status updates from list view
+    readonly_fields = ('created_at', 'updated_at')
+    fieldsets = (
+        (None, {
+            'fields': ('user', 'job_posting')
+        }),
+        ('Manual Job Details', {
+            'fields': ('company_name', 'job_title', 'location', 'application_url')
+        }),
+        ('Tracking Details', {
+            'fields': ('status', 'date_applied', 'notes')
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',) # Hide by default
+        }),
+    )
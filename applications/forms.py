@@ -0,0 +1,67 @@
+# applications/forms.py
+
+from django import forms
+from .models import Application
+from jobs.models import JobPosting # Needed for ModelChoiceField
+
+class ApplicationForm(forms.ModelForm):
+    """ Form for creating and editing Job Applications. """
+
+    # Optional: Allow selecting a job from the board to pre-fill details
+    # Use ModelChoiceField, make it not required
+    job_posting_select = forms.ModelChoiceField(
+        queryset=JobPosting.objects.order_by('-date_added_db'), # Show newest jobs first
+        required=False,
+        label="Link to Job Posting (Optional)",
+        help_text="Select a job from the board to pre-fill details.",
+        widget=forms.Select(attrs={
+            'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'
+            })
+    )
+
+    class Meta:
+        model = Application
+        # Exclude user (set in view), created_at, updated_at
+        fields = [
+            'job_posting_select', # Add the selection field
+            'company_name',
+            'job_title',
+            'location',
+            'status',
+            'date_applied',
+            'application_url',
+            'notes',
+        ]
+        widgets = {
+            # Apply consistent styling
+            'company_name': forms.TextInput(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}),
+            'job_title': forms.TextInput(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}),
+            'location': forms.TextInput(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}),
+            'status': forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}),
+            'date_applied': forms.DateInput(attrs={'type': 'date', 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}),
+            'application_url': forms.URLInput(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}),
+            'notes': forms.Textarea(attrs={'rows': 5, 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}),
+        }
+        labels = {
+            'company_name': 'Company Name',
+            'job_title': 'Job Title',
+            'date_applied': 'Date Applied (Optional)',
+            'application_url': 'Application/Job URL (Optional)',
+            'notes': 'Notes',
+        }
+
+    def clean(self):
+        """ Add custom validation if needed. """
+        cleaned_data = super().clean()
+        job_posting = cleaned_data.get('job_posting_select')
+        company_name = cleaned_data.get('company_name')
+        job_title = cleaned_data.get('job_title')
+
+        # Require company/title if no job posting is linked
+        if not job_posting:
+            if not company_name:
+                self.add_error('company_name', 'Company name is required if not linking to a job posting.')
+            if not job_title:
+                 self.add_error('job_title', 'Job title is required if not linking to a job posting.')
+
+        return cleaned_data
@@ -0,0 +1,71 @@
+# applications/gap.py
+
+"""
+Resume-versus-job keyword gap.
+
+Both sides are extracted ahead of time: a posting's key phrases when it is
+saved or ingested (JobPosting.key_phrases, jobs/keyphrases.py), a resume's
+terms when a section changes (ResumeTerms, profiles/terms.py). At request
+time the gap is a set difference, and a whole application list costs the
+same few queries as one application:
+  - the profile and its stored terms,
+  - the key phrases of every linked posting, joined in one SELECT.
+"""
+
+from dataclasses import dataclass
+from profiles import skills, terms
+from profiles.models import UserProfile
+
+
+@dataclass
+class KeywordGap:
+    matched: list # Display names, in the posting's order (skills first, then by importance)
+    missing: list
+
+    @property
+    def coverage(self):
+        """ Percentage of the posting's key phrases the resume contains; None when it has none. """
+        total = len(self.matched) + len(self.missing)
+        return round(len(self.matched) * 100 / total) if total else None
+
+
+def keyword_gap(key_phrases, resume_terms):
+    """ Splits a posting's key phrases into those the resume terms contain and those it lacks. """
+    matched, missing = [], []
+    for phrase in key_phrases:
+        (matched if phrase in resume_terms else missing).append(skills.display_name(phrase))
+    return KeywordGap(matched, missing)
+
+
+def resume_terms_for(user):
+    """ The user's resume terms as a set (extracted on first use); empty without a profile. """
+    try:
+        profile = (
+            UserProfile.objects.select_related('resume_terms')
+            .only('id', 'resume_terms', *terms.SUMMARY_FIELDS).get(user=user)
+        )
+    except UserProfile.DoesNotExist:
+        return set()
+    return set(terms.get_terms(profile).terms)
+
+
+def application_gaps(applications, resume_terms):
+    """
+    {application id: KeywordGap} for the applications (a queryset) linked to
+    a posting, in one query however many there are.
+    """
+    rows = (
+        applications.filter(job_posting__isnull=False).order_by()
+        .values_list('pk', 'job_posting__key_phrases')
+    )
+    return {pk: keyword_gap(phrases or [], resume_terms) for pk, phrases in rows}
+
+
+def common_missing(gaps, limit=10):
+    """ [(keyword, postings missing it)] over many gaps, most frequent first: what to add to the resume. """
+    counts = {}
+    for gap in gaps:
+        for keyword in gap.missing:
+            counts[keyword] = counts.get(keyword, 0) + 1
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
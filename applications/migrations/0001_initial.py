@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-19 17:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('jobs', '0003_trigram_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Application',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company_name', models.CharField(max_length=255)),
+                ('job_title', models.CharField(max_length=255)),
+                ('location', models.CharField(blank=True, max_length=150, null=True)),
+                ('status', models.CharField(choices=[('WISHLIST', 'Wishlist'), ('APPLIED', 'Applied'), ('SCREENING', 'Screening'), ('INTERVIEWING', 'Interviewing'), ('ASSESSMENT', 'Assessment'), ('OFFER', 'Offer Received'), ('REJECTED', 'Rejected'), ('DECLINED', 'Offer Declined'), ('WITHDRAWN', 'Withdrawn')], default='WISHLIST', max_length=20)),
+                ('date_applied', models.DateField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True, help_text='Your personal notes about this application.', null=True)),
+                ('application_url', models.URLField(blank=True, help_text='Link to the application portal or job description.', max_length=500, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_posting', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='jobs.jobposting')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+            },
+        ),
+    ]
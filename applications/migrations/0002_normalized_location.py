@@ -0,0 +1,63 @@
+# Generated by Django 5.2 on 2026-10-19 18:00
+
+from django.db import migrations, models
+
+from core.geo import LOCATION_FIELDS, location_fields
+
+
+def fill_normalized_location(apps, schema_editor):
+    """ Resolves the existing location strings against the gazetteer. """
+    db = schema_editor.connection.alias
+    for model_name in ['Application']:
+        Model = apps.get_model('applications', model_name)
+        batch = []
+        rows = Model.objects.using(db).exclude(location__isnull=True).exclude(location='')
+        for obj in rows.only('id', 'location').iterator(chunk_size=2000):
+            for field, value in location_fields(obj.location).items():
+                setattr(obj, field, value)
+            batch.append(obj)
+            if len(batch) >= 2000:
+                Model.objects.using(db).bulk_update(batch, LOCATION_FIELDS)
+                batch = []
+        Model.objects.using(db).bulk_update(batch, LOCATION_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='location_city',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='location_country',
+            field=models.CharField(blank=True, default='', editable=False, max_length=2),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='location_geohash',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='location_lat',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='location_lon',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='location_remote',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(fill_normalized_location, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,14 @@
+# applications/urls.py
+
+from django.urls import path
+from . import views
+
+app_name = 'applications'
+
+urlpatterns = [
+    path('', views.ApplicationListView.as_view(), name='application_list'),
+    path('add/', views.ApplicationCreateView.as_view(), name='application_add'),
+    path('<int:pk>/gap/', views.ApplicationGapView.as_view(), name='application_gap'),
+    path('<int:pk>/edit/', views.ApplicationUpdateView.as_view(), name='application_edit'),
+    path('<int:pk>/delete/', views.ApplicationDeleteView.as_view(), name='application_delete'),
+]
@@ -1,3 +1,142 @@
-from django.shortcuts import render
+# applications/views.py
 
-# Create your views here.
+import logging
+from django.shortcuts import render, redirect
+from django.urls import reverse_lazy
+from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib import messages
+from core.mixins import OwnerScopedMixin
+from . import gap
+from .models import Application
+from .forms import ApplicationForm
+
+logger = logging.getLogger(__name__)
+
+class ApplicationListView(LoginRequiredMixin, ListView):
+    """ Displays a list of the user's job applications. """
+    model = Application
+    template_name = 'applications/application_list.html'
+    context_object_name = 'application_list'
+    paginate_by = 10 # Show 10 applications per page
+
+    def get_queryset(self):
+        """ Only show applications belonging to the logged-in user. """
+        queryset = Application.objects.filter(user=self.request.user).order_by('-updated_at')
+        logger.info(f"Fetching applications for user {self.request.user.username}")
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        """ Keyword match of every listed application against the resume, scored in one pass. """
+        context = super().get_context_data(**kwargs)
+        gaps = gap.application_gaps(self.object_list, gap.resume_terms_for(self.request.user))
+        for app in context['application_list']:
+            app.keyword_gap = gaps.get(app.pk)
+        # Over the whole list, not just this page: the keywords most worth adding to the resume
+        context['common_missing_keywords'] = gap.common_missing(gaps.values())
+        return context
+
+class ApplicationCreateView(LoginRequiredMixin, CreateView):
+    """ Handles creating a new job application entry. """
+    model = Application
+    form_class = ApplicationForm
+    template_name = 'applications/application_form.html'
+    success_url = reverse_lazy('applications:application_list')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['form_title'] = 'Add New Application'
+        return context
+
+    def form_valid(self, form):
+        """ Assign user and handle potential job posting link before saving. """
+        form.instance.user = self.request.user
+        job_posting = form.cleaned_data.get('job_posting_select')
+        if job_posting:
+            form.instance.job_posting = job_posting
+            # Pre-fill fields if empty (optional, can also be done in JS)
+            if not form.instance.company_name:
+                form.instance.company_name = job_posting.company_name
+            if not form.instance.job_title:
+                form.instance.job_title = job_posting.title
+            if not form.instance.location:
+                 form.instance.location = job_posting.location
+            if not form.instance.application_url:
+                 form.instance.application_url = job_posting.job_url
+
+        logger.info(f"User {self.request.user.username} creating application for {form.instance.job_title} at {form.instance.company_name}")
+        messages.success(self.request, 'Application added successfully!')
+        if job_posting:
+            keyword_gap = gap.keyword_gap(job_posting.key_phrases, gap.resume_terms_for(self.request.user))
+            if keyword_gap.missing:
+                messages.info(self.request, f"Your resume doesn't mention: {', '.join(keyword_gap.missing[:8])}.")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"Invalid application form submission by user {self.request.user.username}: {form.errors}")
+        messages.error(self.request, 'Please correct the errors below.')
+        return super().form_invalid(form)
+
+class ApplicationGapView(LoginRequiredMixin, OwnerScopedMixin, DetailView):
+    """ Which key phrases of the linked job posting the user's resume has and lacks. """
+    model = Application
+    template_name = 'applications/application_gap.html'
+    context_object_name = 'application'
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('job_posting')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        posting = self.object.job_posting
+        if posting:
+            context['keyword_gap'] = gap.keyword_gap(posting.key_phrases, gap.resume_terms_for(self.request.user))
+        return context
+
+class ApplicationUpdateView(LoginRequiredMixin, OwnerScopedMixin, UpdateView):
+    """ Handles editing an existing job application entry (the user's own only; others are a 404). """
+    model = Application
+    form_class = ApplicationForm
+    template_name = 'applications/application_form.html'
+    success_url = reverse_lazy('applications:application_list')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['form_title'] = 'Edit Application'
+        return context
+
+    def get_initial(self):
+        """ Pre-select the job_posting_select field if the application is linked. """
+        initial = super().get_initial()
+        if self.object.job_posting_id: # The id is on the row; no need to load the posting
+            initial['job_posting_select'] = self.object.job_posting_id
+        return initial
+
+    def form_valid(self, form):
+        """ Handle potential job posting link update. """
+        job_posting = form.cleaned_data.get('job_posting_select')
+        form.instance.job_posting = job_posting # Update or clear the link
+        # Optionally re-fill fields if job_posting was changed, or leave as is
+        logger.info(f"User {self.request.user.username} updated application (ID: {self.object.pk})")
+        messages.success(self.request, 'Application updated successfully!')
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        logger.warning(f"Invalid application update form submission by user {self.request.user.username} (ID: {self.object.pk}): {form.errors}")
+        messages.error(self.request, 'Please correct the errors below.')
+        return super().form_invalid(form)
+
+class ApplicationDeleteView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
+    """ Handles deleting a job application entry (the user's own only; others are a 404). """
+    model = Application
+    template_name = 'applications/application_confirm_delete.html'
+    success_url = reverse_lazy('applications:application_list')
+    context_object_name = 'application'
+
+    def post(self, request, *args, **kwargs):
+        application = self.get_object() # Memoized by OwnerScopedMixin; the delete reuses it
+        app_id = application.pk
+        app_title = str(application)
+        logger.warning(f"User {request.user.username} deleting application '{app_title}' (ID: {app_id})")
+        messages.success(self.request, 'Application deleted successfully!')
+        return super().post(request, *args, **kwargs)
@@ -1,3 +1,126 @@
+# core/admin.py
+
+"""
+Admin building blocks for tables that are too big for Django's defaults.
+
+- InputFilter: a text box in the filter sidebar, for columns with too many
+  values to list (users, locations). The stock filters render one link per
+  distinct value.
+- EstimatedCountPaginator: unfiltered changelists take the row count from
+  the database statistics instead of running COUNT(*) over the whole table.
+  Use it with show_full_result_count = False, which drops the second count.
+- BoundedInlineFormSet: inlines that edit only the first few related rows
+  instead of every row the parent has.
+- iter_pk_chunks(): walks a queryset's primary keys in fixed-size batches,
+  for admin actions that may be applied to "all N selected" rows.
+"""
+
 from django.contrib import admin
+from django.contrib.admin.views.main import PAGE_VAR
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from django.forms.models import BaseInlineFormSet
+from django.http import QueryDict
+from django.utils.functional import cached_property
+
+ACTION_CHUNK_SIZE = 1000
+
+
+class InputFilter(admin.SimpleListFilter):
+    """ Free-text sidebar filter. Subclasses set title, parameter_name and `lookup` (or override queryset()). """
+    template = 'admin/input_filter.html'
+    lookup = None
+
+    def lookups(self, request, model_admin):
+        # Must be non-empty or the filter isn't shown at all; the template ignores it
+        return (('', ''),)
+
+    def queryset(self, request, queryset):
+        value = (self.value() or '').strip()
+        if not value:
+            return queryset
+        return queryset.filter(**{self.lookup: value})
+
+    def choices(self, changelist):
+        # Other active filters, the search and the ordering go into hidden inputs
+        query_string = changelist.get_query_string({PAGE_VAR: None}, [self.parameter_name])
+        yield {
+            'selected': self.value() is None,
+            'query_string': query_string,
+            'query_parts': [(k, v) for k, values in QueryDict(query_string[1:]).lists() for v in values],
+            'display': 'All',
+        }
+
+
+def estimated_row_count(model, using):
+    """
+    Row count from the planner statistics (PostgreSQL pg_class.reltuples,
+    SQLite sqlite_stat1 after ANALYZE). None when there is no estimate.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+            elif connection.vendor == 'sqlite':
+                cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table])
+            else:
+                return None
+            row = cursor.fetchone()
+    except DatabaseError: # e.g. sqlite_stat1 doesn't exist until the first ANALYZE
+        return None
+    if not row or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split()[0]) # sqlite_stat1.stat is "rows [rows-per-key ...]"
+    return estimate if estimate >= 0 else None # PostgreSQL reports -1 before the first ANALYZE
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the table estimate for unfiltered querysets over exact_threshold rows.
+    Below that, or once any filter/search applies, it counts exactly.
+    The last page can come up short or empty when the estimate is stale.
+    """
+    exact_threshold = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where and not queryset.query.distinct:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.exact_threshold:
+                return estimate
+        return super().count
+
+
+class BoundedInlineFormSet(BaseInlineFormSet):
+    """ Edits at most `max_shown` related rows (in the model's ordering); the rest stay untouched. """
+    max_shown = 10
+
+    def get_queryset(self):
+        if not hasattr(self, '_bounded_queryset'):
+            queryset = super().get_queryset()[:self.max_shown]
+            for obj in queryset: # Evaluates it once; str(obj) in the inline then doesn't fetch the parent per row
+                setattr(obj, self.fk.name, self.instance)
+            self._bounded_queryset = queryset
+        return self._bounded_queryset
+
 
-# Register your models here.
+def iter_pk_chunks(queryset, size=None):
+    """
+    Yields lists of primary keys from queryset, `size` at a time, in pk order.
+    Each batch is a fresh keyset query, so rows changed by the caller between
+    batches are neither skipped nor revisited.
+    """
+    size = size or ACTION_CHUNK_SIZE
+    queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(batch[:size])
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
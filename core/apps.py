@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from . import signals # noqa: F401 - connects dashboard signal handlers
+        from . import dbpool, events, metrics
+        metrics.register('db_pools', dbpool.database_pools)
+        metrics.register('events', events.stats)
@@ -0,0 +1,90 @@
+# core/backends/postgresql_pool/base.py
+
+"""
+PostgreSQL engine with connection pooling on psycopg2.
+
+ENGINE 'core.backends.postgresql_pool' with OPTIONS['pool'] set, e.g.
+    {'min_size': 2, 'max_size': 10, 'timeout': 10}
+hands out connections from a core.dbpool.ConnectionPool per alias and
+process. It takes the same OPTIONS['pool'] setting as Django's built-in
+psycopg 3 pool, and when psycopg 3 is installed it simply uses that one.
+CONN_MAX_AGE must be 0: the pool, not the request thread, keeps connections open.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from core.dbpool import ConnectionPool, PoolTimeout
+
+if not is_psycopg3:
+    import psycopg2
+    from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+    class PooledConnection(psycopg2.extensions.connection):
+        """ psycopg2 connections don't take new attributes; Django's _close() needs conn._pool. """
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+
+    @property
+    def pool(self):
+        if is_psycopg3:
+            return super().pool
+        pool_options = self.settings_dict['OPTIONS'].get('pool')
+        if not pool_options:
+            return None
+        if self.alias not in self._connection_pools:
+            if self.settings_dict.get('CONN_MAX_AGE', 0) != 0:
+                raise ImproperlyConfigured("Pooling doesn't support persistent connections.")
+            pool_options = {} if pool_options is True else dict(pool_options)
+            conn_params = self.get_connection_params()
+            conn_params['connection_factory'] = PooledConnection
+            pool = ConnectionPool(
+                connect=lambda: psycopg2.connect(**conn_params),
+                configure=self._configure_pooled_connection,
+                check=_check_connection if self.settings_dict['CONN_HEALTH_CHECKS'] else None,
+                reset=_reset_connection,
+                name=self.alias,
+                **pool_options,
+            )
+            # First thread to get here wins, as in Django's own pool property
+            self._connection_pools.setdefault(self.alias, pool)
+        return self._connection_pools[self.alias]
+
+    def get_connection_params(self):
+        if is_psycopg3 or 'pool' not in self.settings_dict['OPTIONS']:
+            return super().get_connection_params()
+        # Django rejects OPTIONS['pool'] on psycopg2; it's ours to handle, not a libpq parameter
+        settings_dict = self.settings_dict
+        options = {k: v for k, v in settings_dict['OPTIONS'].items() if k != 'pool'}
+        self.settings_dict = {**settings_dict, 'OPTIONS': options}
+        try:
+            return super().get_connection_params()
+        finally:
+            self.settings_dict = settings_dict
+
+    def get_new_connection(self, conn_params):
+        try:
+            connection = super().get_new_connection(conn_params)
+        except PoolTimeout as e:
+            # Surface as a normal database error so Django's error handling applies
+            raise self.Database.OperationalError(str(e)) from e
+        if self.pool is not None and not is_psycopg3:
+            connection._pool = self.pool
+        return connection
+
+    def _configure_pooled_connection(self, connection):
+        """ Time zone and role once per physical connection (init_connection_state skips them when pooled). """
+        connection.autocommit = True # Django sets the real autocommit mode on checkout
+        self._configure_connection(connection)
+
+
+def _check_connection(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+def _reset_connection(connection):
+    # Never hand the next request a connection that is mid-transaction
+    if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+        connection.rollback()
@@ -0,0 +1,149 @@
+# core/dashboard.py
+
+"""
+Maintenance of the per-user DashboardSummary row.
+
+Each refresh_* function recomputes one part of the summary for one user with
+a single small query and writes it with an UPDATE. Rows that don't exist yet
+are left alone: get_summary() builds the full row the first time a user opens
+the home page, and the handlers keep it current from then on.
+"""
+
+import logging
+from collections import Counter
+from django.db.models import Count, F
+from .models import DashboardSummary
+
+logger = logging.getLogger(__name__)
+
+RECENT_COVER_LETTERS = 3
+
+# Resume section -> related_name on UserProfile
+PROFILE_SECTION_RELATIONS = {
+    'education': 'education',
+    'experience': 'experience',
+    'skills': 'skills',
+    'projects': 'projects',
+    'awards': 'awards',
+    'certifications': 'certifications',
+}
+
+
+def _application_counts(user_id):
+    from applications.models import Application
+    rows = Application.objects.filter(user_id=user_id).order_by().values_list('status').annotate(n=Count('id'))
+    counts = dict(rows)
+    return counts, sum(counts.values())
+
+
+def _recent_cover_letters(user_id):
+    from documents.models import CoverLetter
+    return list(
+        CoverLetter.objects.filter(user_id=user_id)
+        .order_by('-updated_at')
+        .values('id', 'title', 'updated_at')[:RECENT_COVER_LETTERS]
+    )
+
+
+def _profile_sections(profile):
+    sections = {'summary': bool(profile.summary)}
+    for section, relation in PROFILE_SECTION_RELATIONS.items():
+        sections[section] = getattr(profile, relation).exists()
+    return sections
+
+
+def build_summary(user):
+    """ Computes the whole summary from scratch (first visit, or repair). """
+    counts, total = _application_counts(user.pk)
+    summary, _ = DashboardSummary.objects.update_or_create(
+        user=user,
+        defaults={
+            'application_counts': counts,
+            'application_total': total,
+            'recent_cover_letters': _recent_cover_letters(user.pk),
+            'profile_sections': _profile_sections(user.profile),
+        },
+    )
+    logger.info(f"Built dashboard summary for user {user.pk}")
+    return summary
+
+
+def get_summary(user):
+    """ One read in the common case; builds the row on the user's first visit. """
+    summary = DashboardSummary.objects.filter(user=user).first()
+    return summary or build_summary(user)
+
+
+def refresh_applications(user_id):
+    counts, total = _application_counts(user_id)
+    DashboardSummary.objects.filter(user_id=user_id).update(application_counts=counts, application_total=total)
+
+
+def refresh_cover_letters(user_id):
+    # Goes through a model instance so DjangoJSONEncoder handles the datetimes
+    summary = DashboardSummary.objects.filter(user_id=user_id).only('id').first()
+    if summary:
+        summary.recent_cover_letters = _recent_cover_letters(user_id)
+        summary.save(update_fields=['recent_cover_letters', 'updated_at'])
+
+
+def refresh_profile_section(profile, section):
+    """ Updates one section flag. `section` is a key of DashboardSummary.PROFILE_SECTIONS. """
+    summary = DashboardSummary.objects.filter(user_id=profile.user_id).only('id', 'profile_sections').first()
+    if not summary:
+        return
+    if section == 'summary':
+        filled = bool(profile.summary)
+    else:
+        filled = getattr(profile, PROFILE_SECTION_RELATIONS[section]).exists()
+    if summary.profile_sections.get(section) != filled:
+        summary.profile_sections[section] = filled
+        summary.save(update_fields=['profile_sections', 'updated_at'])
+
+
+def record_new_postings(postings):
+    """
+    Bumps new_matching_jobs for users with a skill named in a new posting's title.
+    Titles are resolved to canonical skills in memory; one index lookup then
+    finds the interested users for the whole batch, so the cost grows with
+    the postings, not with the number of users.
+    """
+    from profiles import skills
+    from profiles.models import Skill
+
+    title_skills = {posting.pk: skills.mentioned_skills(posting.title) for posting in postings}
+    all_skills = set().union(*title_skills.values()) if title_skills else set()
+    if not all_skills:
+        return
+
+    users_by_skill = {}
+    rows = Skill.objects.filter(canonical_id__in=all_skills).values_list('canonical_id', 'profile__user_id')
+    for skill_id, user_id in rows:
+        users_by_skill.setdefault(skill_id, set()).add(user_id)
+
+    matches = Counter()
+    for skill_ids in title_skills.values():
+        interested = set()
+        for skill_id in skill_ids & users_by_skill.keys():
+            interested |= users_by_skill[skill_id]
+        matches.update(interested)
+
+    # Group users by how many postings matched, one UPDATE per distinct count
+    by_count = {}
+    for user_id, n in matches.items():
+        by_count.setdefault(n, []).append(user_id)
+    for n, user_ids in by_count.items():
+        DashboardSummary.objects.filter(user_id__in=user_ids).update(new_matching_jobs=F('new_matching_jobs') + n)
+
+
+def has_unseen_jobs(user_id):
+    """
+    Whether the badge has anything to reset. Checked first (a read, so it may
+    go to a replica) because the UPDATE counts as a write even when it changes
+    no row, and a write pins the client to the primary (core/routers.py).
+    """
+    return DashboardSummary.objects.filter(user_id=user_id, new_matching_jobs__gt=0).exists()
+
+
+def mark_jobs_seen(user):
+    DashboardSummary.objects.filter(user=user, new_matching_jobs__gt=0).update(new_matching_jobs=0)
@@ -0,0 +1,306 @@
+# core/dbpool.py
+
+"""
+Connection pool for PostgreSQL through psycopg2.
+
+Django 5.1+ ships a pool for psycopg 3 (OPTIONS['pool'], backed by
+psycopg_pool), but this project installs psycopg2-binary, where Django opens
+a new connection for every request unless CONN_MAX_AGE keeps one per thread.
+Connection setup (TCP, TLS, auth, SET TIME ZONE) costs several round trips,
+which dominates short requests.
+
+ConnectionPool keeps up to max_size connections per process and shares them
+between request threads: Django checks one out when a request first touches
+the database and returns it when the request finishes (CONN_MAX_AGE=0).
+The core.backends.postgresql_pool engine plugs it into Django; see the
+DB_POOL_* settings in hire_synapse/settings/base.py.
+
+Live counts (in use, idle, wait time, timeouts) are available from
+ConnectionPool.metrics() and, for every pool in the process, from
+core.metrics.snapshot() / the staff metrics endpoint.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """ No connection became free within the pool's timeout. """
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections.
+
+    connect() opens a new connection. Optional hooks:
+      configure(conn) - runs once on every new connection
+      check(conn) - raises if a connection that sat idle is no longer usable
+      reset(conn) - runs when a connection comes back, e.g. to roll back an open transaction
+    """
+
+    def __init__(self, connect, min_size=0, max_size=10, timeout=30.0, max_idle=600.0, max_lifetime=3600.0,
+                 check_after=30.0, configure=None, check=None, reset=None, name='pool'):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError(f'Invalid pool size: min_size={min_size}, max_size={max_size}')
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle # Close connections idle this long (beyond min_size)
+        self.max_lifetime = max_lifetime # Replace connections this old when they come back
+        self.check_after = check_after # Only health-check connections idle at least this long
+        self._connect = connect
+        self._configure = configure
+        self._check = check
+        self._reset = reset
+        self._cond = threading.Condition()
+        self._idle = deque() # (conn, created_at, returned_at); most recently returned on the right
+        self._created_at = {} # id(conn) -> monotonic time it was opened
+        self._size = 0 # Open connections, idle or in use
+        self._in_use = 0
+        self._waiting = 0
+        self._opened = False
+        self._closed = False
+        self._pid = os.getpid()
+        self._inherited = [] # Connections copied from a parent process; see _check_fork()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.stats = {
+            'requests': 0, 'waits': 0, 'wait_ms_total': 0.0, 'wait_ms_max': 0.0,
+            'timeouts': 0, 'created': 0, 'discarded': 0,
+        }
+
+    def open(self):
+        """ Opens min_size connections up front (once). Safe to call repeatedly. """
+        self._check_fork()
+        with self._cond:
+            if self._opened:
+                return
+            self._opened = True
+            missing = max(self.min_size - self._size, 0)
+            self._size += missing
+        for _ in range(missing):
+            try:
+                conn = self._new_connection()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle.append((conn, self._created_at[id(conn)], time.monotonic()))
+                self._cond.notify()
+
+    def getconn(self, timeout=None):
+        """ Checks out a connection, waiting up to `timeout` seconds for one to free up. """
+        self._check_fork()
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            conn, returned_at = self._acquire(started, deadline)
+            if conn is None:
+                # A free slot: open a new connection outside the lock
+                try:
+                    return self._new_connection()
+                except Exception:
+                    self._release_slot()
+                    raise
+            if self._usable(conn, returned_at):
+                return conn
+            self._discard(conn)
+            self._release_slot()
+
+    def putconn(self, conn):
+        """ Returns a connection. Broken, expired or surplus connections are closed instead of kept. """
+        if os.getpid() != self._pid:
+            return # Checked out before a fork(); belongs to the parent's pool
+        now = time.monotonic()
+        keep = not self._closed and not getattr(conn, 'closed', False)
+        created_at = self._created_at.get(id(conn), now)
+        if keep and now - created_at > self.max_lifetime:
+            keep = False
+        if keep and self._reset is not None:
+            try:
+                self._reset(conn)
+            except Exception as e:
+                logger.warning(f"Pool '{self.name}': discarding connection that failed to reset: {e}")
+                keep = False
+        with self._cond:
+            self._in_use -= 1
+            if keep:
+                self._idle.append((conn, created_at, now))
+            else:
+                self._size -= 1
+            self._cond.notify()
+        if not keep:
+            self._discard(conn)
+        self._shrink(now)
+
+    def close(self):
+        """ Closes idle connections now; connections still in use are closed when they come back. """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def metrics(self):
+        """ Current pool state plus counters since the pool was created. """
+        with self._cond:
+            stats = dict(self.stats)
+            stats.update({
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+            })
+        stats['wait_ms_avg'] = stats['wait_ms_total'] / stats['waits'] if stats['waits'] else 0.0
+        return stats
+
+    def _acquire(self, started, deadline):
+        """ Returns (idle connection, returned_at), or (None, None) when the caller may open a new one. """
+        with self._cond:
+            if self._closed:
+                raise PoolTimeout(f"Pool '{self.name}' is closed.")
+            self.stats['requests'] += 1
+            waited = False
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['timeouts'] += 1
+                    self._record_wait(started)
+                    logger.warning(f"Pool '{self.name}' exhausted: no connection free after "
+                                   f"{(time.monotonic() - started):.1f}s ({self._size} in use).")
+                    raise PoolTimeout(f"Pool '{self.name}' exhausted (max_size={self.max_size}).")
+                waited = True
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            if waited:
+                self._record_wait(started)
+            self._in_use += 1
+            if self._idle:
+                conn, _, returned_at = self._idle.pop() # LIFO: the warmest connection
+                return conn, returned_at
+            self._size += 1
+            return None, None
+
+    def _record_wait(self, started):
+        waited_ms = (time.monotonic() - started) * 1000
+        self.stats['waits'] += 1
+        self.stats['wait_ms_total'] += waited_ms
+        self.stats['wait_ms_max'] = max(self.stats['wait_ms_max'], waited_ms)
+
+    def _release_slot(self):
+        with self._cond:
+            self._in_use -= 1
+            self._size -= 1
+            self._cond.notify()
+
+    def _new_connection(self):
+        conn = self._connect()
+        try:
+            if self._configure is not None:
+                self._configure(conn)
+        except Exception:
+            self._discard(conn)
+            raise
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+            self.stats['created'] += 1
+        return conn
+
+    def _usable(self, conn, returned_at):
+        if getattr(conn, 'closed', False):
+            return False
+        if self._check is None or time.monotonic() - returned_at < self.check_after:
+            return True
+        try:
+            self._check(conn)
+            return True
+        except Exception as e:
+            logger.info(f"Pool '{self.name}': dropping connection that failed its health check: {e}")
+            return False
+
+    def _shrink(self, now):
+        """ Closes connections that sat idle longer than max_idle, keeping min_size. """
+        stale = []
+        with self._cond:
+            # The oldest returns are on the left
+            while self._idle and self._size > self.min_size and now - self._idle[0][2] > self.max_idle:
+                stale.append(self._idle.popleft()[0])
+                self._size -= 1
+        for conn in stale:
+            self._discard(conn)
+
+    def _discard(self, conn):
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+            self.stats['discarded'] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _check_fork(self):
+        """
+        After fork() (e.g. gunicorn --preload) the child starts with an empty pool.
+        The inherited connections share sockets with the parent, so they are neither
+        used nor closed here; closing would end the parent's sessions.
+        """
+        if os.getpid() == self._pid:
+            return
+        with self._cond:
+            if os.getpid() == self._pid:
+                return
+            self._inherited.extend(conn for conn, _, _ in self._idle)
+            self._idle = deque()
+            self._created_at = {}
+            self._size = self._in_use = self._waiting = 0
+            self._opened = False
+            self._pid = os.getpid()
+            self._reset_stats()
+
+
+def pool_metrics(pool):
+    """ Metrics for one of our pools or a psycopg_pool pool (Django's native psycopg 3 pool). """
+    if hasattr(pool, 'metrics'):
+        return pool.metrics()
+    stats = pool.get_stats()
+    size, idle = stats.get('pool_size', 0), stats.get('pool_available', 0)
+    waits = stats.get('requests_queued', 0)
+    return {
+        'min_size': stats.get('pool_min', pool.min_size),
+        'max_size': stats.get('pool_max', pool.max_size),
+        'size': size,
+        'in_use': size - idle,
+        'idle': idle,
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': stats.get('requests_num', 0),
+        'waits': waits,
+        'wait_ms_total': stats.get('requests_wait_ms', 0),
+        'wait_ms_avg': stats.get('requests_wait_ms', 0) / waits if waits else 0.0,
+        'timeouts': stats.get('requests_errors', 0),
+        'created': stats.get('connections_num', 0),
+    }
+
+
+def database_pools():
+    """ Metrics for every PostgreSQL pool opened in this process, by database alias. """
+    try:
+        from django.db.backends.postgresql.base import DatabaseWrapper
+    except Exception: # No PostgreSQL driver installed
+        return {}
+    return {alias: pool_metrics(pool) for alias, pool in list(DatabaseWrapper._connection_pools.items())}
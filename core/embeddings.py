@@ -0,0 +1,300 @@
+# core/embeddings.py
+
+"""
+Dense text embeddings, for "similar jobs" and "jobs like my experience".
+
+The model is set in settings.EMBEDDINGS['BACKEND']:
+  - StubEmbeddingModel: deterministic and offline. Words and word pairs are
+    hashed into a fixed number of dimensions (the "hashing trick"), so texts
+    that share vocabulary get nearby vectors. For development, tests and
+    benchmarks; it knows nothing about synonyms.
+  - GeminiEmbeddingModel: Google's embedding API through the pinned
+    google-generativeai package. Needs GEMINI_API_KEY.
+Vectors are L2-normalized, so a dot product is the cosine similarity.
+
+EmbeddingStore is a content-addressed cache on disk: one vector per distinct
+text, keyed by a 64-bit hash of the text. embed() only sends the model texts
+the store hasn't seen, so saving a posting whose text didn't change costs no
+API call. The files are append-only and memory-mapped, so every worker
+shares them:
+
+  keys.bin      uint64 per row, the text hash
+  vectors.bin   dim float16 per row (half the size of float32; precision
+                far beyond what ranking needs)
+
+Each model (and dimension) gets its own directory, so switching models never
+mixes vectors from different spaces.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+try:
+    import fcntl # Serializes appends across processes; not available on Windows
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BACKEND': 'core.embeddings.StubEmbeddingModel',
+    'OPTIONS': {},
+    'DIRECTORY': None, # BASE_DIR / 'var' / 'embeddings'
+}
+MAX_TEXT_CHARS = 8000 # About the input limit of the Gemini embedding models
+STORE_DTYPE = np.float16
+SORTED_TAIL_RATIO = 0.1 # Re-sort the key lookup once this share of rows was appended since the last sort
+
+_token = re.compile(r'[\w+#]+')
+_spaces = re.compile(r'\s+')
+
+
+class EmbeddingError(Exception):
+    """ The model could not embed the texts (network, quota, bad response). """
+
+
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def clean_text(text):
+    return _spaces.sub(' ', text or '').strip()[:MAX_TEXT_CHARS]
+
+
+# --- Models ---
+
+class EmbeddingModel:
+    name = ''
+
+    def __init__(self, dim=256):
+        self.dim = dim
+
+    @property
+    def key(self):
+        """ Identifies the vector space: the store and indexes live under a directory of this name. """
+        return f'{self.name}-{self.dim}'
+
+    def embed(self, texts):
+        """ (len(texts), dim) float32 array of unit vectors. """
+        raise NotImplementedError
+
+
+@lru_cache(maxsize=200_000)
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class StubEmbeddingModel(EmbeddingModel):
+    """ Feature hashing of words and adjacent word pairs, log-scaled counts, random signs. """
+    name = 'stub'
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _token.findall(text.lower())
+            features = Counter(tokens)
+            features.update(f'{a} {b}' for a, b in zip(tokens, tokens[1:]))
+            for feature, count in features.items():
+                h = _feature_hash(feature)
+                vectors[row, (h >> 1) % self.dim] += (1.0 if h & 1 else -1.0) * (1.0 + math.log(count))
+        return normalize_rows(vectors)
+
+
+class GeminiEmbeddingModel(EmbeddingModel):
+    """ models/text-embedding-004 (or another Gemini embedding model), truncated to `dim` dimensions. """
+    name = 'gemini'
+    batch_size = 100 # Texts per request
+
+    def __init__(self, model='models/text-embedding-004', dim=256, api_key='', task_type='semantic_similarity'):
+        super().__init__(dim)
+        try:
+            import google.generativeai as genai
+        except ImportError as e:
+            raise ImproperlyConfigured('GeminiEmbeddingModel needs the google-generativeai package.') from e
+        api_key = api_key or os.environ.get('GEMINI_API_KEY', '')
+        if not api_key:
+            raise ImproperlyConfigured('Set GEMINI_API_KEY (or EMBEDDINGS OPTIONS api_key) to use Gemini embeddings.')
+        genai.configure(api_key=api_key)
+        self.genai = genai
+        self.model = model
+        self.task_type = task_type
+
+    @property
+    def key(self):
+        return f"gemini-{self.model.rsplit('/', 1)[-1]}-{self.dim}"
+
+    def embed(self, texts):
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            try:
+                result = self.genai.embed_content(model=self.model, content=batch, task_type=self.task_type,
+                                                  output_dimensionality=self.dim)
+            except Exception as e: # google.api_core and transport errors share no useful base class
+                raise EmbeddingError(f'Gemini embedding request failed: {e}') from e
+            vectors.extend(result['embedding'])
+        if len(vectors) != len(texts):
+            raise EmbeddingError(f'Gemini returned {len(vectors)} embeddings for {len(texts)} texts.')
+        return normalize_rows(vectors) if vectors else np.zeros((0, self.dim), dtype=np.float32)
+
+
+def get_config():
+    config = {**DEFAULTS, **getattr(settings, 'EMBEDDINGS', {})}
+    if config['DIRECTORY'] is None:
+        config['DIRECTORY'] = os.path.join(settings.BASE_DIR, 'var', 'embeddings')
+    return config
+
+
+_models = {}
+
+
+def get_model():
+    config = get_config()
+    cache_key = (config['BACKEND'], tuple(sorted(config['OPTIONS'].items())))
+    if cache_key not in _models:
+        try:
+            model_class = import_string(config['BACKEND'])
+        except ImportError as e:
+            raise ImproperlyConfigured(f"Could not import embedding model {config['BACKEND']!r}.") from e
+        _models[cache_key] = model_class(**config['OPTIONS'])
+    return _models[cache_key]
+
+
+# --- Content-addressed store ---
+
+def text_key(text):
+    """ 64-bit content hash of a (cleaned) text. """
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class EmbeddingStore:
+    """ Append-only, memory-mapped vectors keyed by text hash. Safe to share between processes. """
+
+    def __init__(self, directory, dim):
+        self.directory = Path(directory)
+        self.dim = dim
+        self.keys_path = self.directory / 'keys.bin'
+        self.vectors_path = self.directory / 'vectors.bin'
+        self._count = 0
+        self._keys = np.zeros(0, dtype=np.uint64)
+        self._vectors = np.zeros((0, dim), dtype=STORE_DTYPE)
+        # Lookup: rows [0, _sorted_count) through a sorted copy of their keys, later rows through a dict
+        self._sorted_keys = np.zeros(0, dtype=np.uint64)
+        self._sorted_rows = np.zeros(0, dtype=np.int64)
+        self._sorted_count = 0
+        self._tail = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        self._refresh()
+        return self._count
+
+    def _refresh(self):
+        """ Maps rows appended (by any process) since the last call. """
+        try:
+            # Keys are written after their vectors, so every key on disk has its vector
+            count = os.path.getsize(self.keys_path) // 8
+        except FileNotFoundError:
+            return
+        if count == self._count:
+            return
+        with self._lock:
+            if count == self._count:
+                return
+            keys = np.memmap(self.keys_path, dtype=np.uint64, mode='r', shape=(count,))
+            vectors = np.memmap(self.vectors_path, dtype=STORE_DTYPE, mode='r', shape=(count, self.dim))
+            if count < self._count or (count - self._sorted_count) > max(1024, SORTED_TAIL_RATIO * count):
+                order = np.argsort(keys, kind='stable')
+                self._sorted_keys, self._sorted_rows = np.asarray(keys[order]), order
+                self._sorted_count, self._tail = count, {}
+            else:
+                self._tail.update(zip(keys[self._count:count].tolist(), range(self._count, count)))
+            self._keys, self._vectors, self._count = keys, vectors, count
+
+    def lookup(self, keys):
+        """ Row of each key (an array of uint64), -1 where the store doesn't have it. """
+        self._refresh()
+        keys = np.asarray(keys, dtype=np.uint64)
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        if self._sorted_count:
+            positions = np.searchsorted(self._sorted_keys, keys)
+            positions = np.minimum(positions, self._sorted_count - 1)
+            found = self._sorted_keys[positions] == keys
+            rows[found] = self._sorted_rows[positions[found]]
+        if self._tail:
+            for i in np.flatnonzero(rows < 0):
+                rows[i] = self._tail.get(int(keys[i]), -1)
+        return rows
+
+    def vectors(self, rows):
+        """ float32 copies of the given rows. """
+        self._refresh()
+        return np.asarray(self._vectors[rows], dtype=np.float32)
+
+    def append(self, keys, vectors):
+        if not len(keys):
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        vectors = np.ascontiguousarray(vectors, dtype=STORE_DTYPE)
+        with open(self.directory / 'store.lock', 'w') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # Truncate a half-written tail a crashed writer may have left behind
+            count = os.path.getsize(self.keys_path) // 8 if self.keys_path.exists() else 0
+            with open(self.vectors_path, 'ab') as f:
+                f.truncate(count * self.dim * vectors.itemsize)
+                f.write(vectors.tobytes())
+            with open(self.keys_path, 'ab') as f:
+                f.truncate(count * 8)
+                f.write(np.asarray(keys, dtype=np.uint64).tobytes())
+
+
+_stores = {}
+
+
+def get_store(model=None):
+    model = model or get_model()
+    directory = Path(get_config()['DIRECTORY']) / model.key / 'store'
+    if directory not in _stores:
+        _stores[directory] = EmbeddingStore(directory, model.dim)
+    return _stores[directory]
+
+
+def embed(texts, model=None, store=None):
+    """
+    (len(texts), dim) float32 embeddings. Texts already in the store are read
+    from it; only the others (each distinct one once) go to the model.
+    """
+    model = model or get_model()
+    store = store if store is not None else get_store(model) # An empty store is falsy
+    texts = [clean_text(text) for text in texts]
+    keys = np.fromiter((text_key(text) for text in texts), dtype=np.uint64, count=len(texts))
+    rows = store.lookup(keys)
+    missing = {}
+    for i in np.flatnonzero(rows < 0):
+        missing.setdefault(int(keys[i]), texts[i])
+    if missing:
+        new_vectors = model.embed(list(missing.values()))
+        store.append(np.fromiter(missing, dtype=np.uint64, count=len(missing)), new_vectors)
+        logger.info(f"Embedded {len(missing)} new texts with {model.key} ({len(texts) - len(missing)} cached).")
+        rows = store.lookup(keys)
+    return store.vectors(rows) if len(rows) else np.zeros((0, model.dim), dtype=np.float32)
+
+
+def reset():
+    """ Forgets this process's models and open stores (tests, settings changes). """
+    _models.clear()
+    _stores.clear()
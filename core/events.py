@@ -0,0 +1,255 @@
+# core/events.py
+
+"""
+Buffered event tracking for high-volume, low-value-each events (outbound
+clicks, impressions).
+
+track(kind, *fields) appends one tuple to an in-process ring buffer and
+returns: no query, no I/O on the request path. A flusher thread drains the
+buffer every FLUSH_INTERVAL seconds (sooner once it is half full) and hands
+each kind's events to the handler registered for it, which aggregates them
+and writes the batch in one statement (see jobs/tracking.py). A thousand
+clicks a second cost one write every few seconds, not a thousand.
+
+What can be lost:
+  - Graceful shutdown loses nothing: stop() runs at interpreter exit
+    (atexit) and from gunicorn's worker_exit hook (gunicorn.conf.py), and
+    flushes whatever is buffered.
+  - A worker killed outright (SIGKILL, OOM) loses up to FLUSH_INTERVAL
+    seconds of its events.
+  - If the buffer fills faster than it drains (the database is down), the
+    oldest events are overwritten and counted in `dropped`. A handler that
+    fails has its batch put back for the next flush, up to MAX_RETRIES
+    flushes in a row; then the batch is logged and discarded (counted in
+    `discarded`), so a batch that can never be written doesn't block its
+    kind for good.
+
+Settings (EVENT_TRACKING):
+  BUFFER_SIZE     events held per process (default 100000)
+  FLUSH_INTERVAL  seconds between flushes; None starts no thread, so events
+                  are only written by flush() (tests, management commands)
+  MAX_RETRIES     failed flushes in a row before a kind's batch is discarded
+                  (default 5)
+
+Handlers are registered in AppConfig.ready(), like metrics sources. The
+buffer is per process; a forked child starts with an empty one so events
+buffered in the parent are not counted twice.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BUFFER_SIZE': 100_000,
+    'FLUSH_INTERVAL': 5.0,
+    'MAX_RETRIES': 5,
+}
+
+_handlers = {}
+
+
+def register(kind, handler):
+    """ handler(events) persists a list of (kind, timestamp, *fields) tuples of one kind. """
+    _handlers[kind] = handler
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'EVENT_TRACKING', {})}
+
+
+class EventBuffer:
+    """ Fixed-size ring buffer: pushing onto a full buffer overwrites the oldest event. """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._events = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.pushed = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    def push(self, event):
+        with self._lock:
+            if len(self._events) == self.capacity:
+                self.dropped += 1
+            self._events.append(event)
+            self.pushed += 1
+            return len(self._events)
+
+    def drain(self):
+        """ Removes and returns everything buffered, oldest first. """
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def requeue(self, events):
+        """ Puts back events a handler failed to write (they count as pushed already). """
+        with self._lock:
+            overflow = len(self._events) + len(events) - self.capacity
+            if overflow > 0:
+                self.dropped += overflow
+            self._events.extend(events)
+
+
+class EventTracker:
+    """ An EventBuffer and the thread that flushes it. """
+
+    def __init__(self, capacity=DEFAULTS['BUFFER_SIZE'], flush_interval=DEFAULTS['FLUSH_INTERVAL'],
+                 using=DEFAULT_DB_ALIAS, max_retries=DEFAULTS['MAX_RETRIES']):
+        self.buffer = EventBuffer(capacity)
+        self.flush_interval = flush_interval
+        self.using = using
+        self.max_retries = max_retries
+        self.flushed = 0
+        self.failed_flushes = 0
+        self.discarded = 0
+        self._failures = defaultdict(int) # kind -> failed flushes in a row
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock() # One flush at a time: the thread's, stop()'s or a caller's
+
+    def track(self, kind, *fields):
+        size = self.buffer.push((kind, time.time(), *fields))
+        if self.flush_interval is not None:
+            self._ensure_started()
+            if size * 2 >= self.buffer.capacity:
+                self._wake.set() # Half full: don't wait for the interval
+        return size
+
+    def flush(self):
+        """ Writes everything buffered so far, in the calling thread. Returns the number of events written. """
+        with self._flush_lock:
+            events = self.buffer.drain()
+            if not events:
+                return 0
+            by_kind = defaultdict(list)
+            for event in events:
+                by_kind[event[0]].append(event)
+            written = 0
+            for kind, batch in by_kind.items():
+                handler = _handlers.get(kind)
+                if handler is None:
+                    logger.error(f"No handler registered for {len(batch)} '{kind}' events; discarding them.")
+                    continue
+                try:
+                    handler(batch)
+                    written += len(batch)
+                    self._failures.pop(kind, None)
+                except Exception as e:
+                    self.failed_flushes += 1
+                    self._failures[kind] += 1
+                    if self._failures[kind] > self.max_retries:
+                        del self._failures[kind]
+                        self.discarded += len(batch)
+                        logger.error(f"Writing {len(batch)} '{kind}' events failed {self.max_retries + 1} times in a row, "
+                                     f"discarding them: {e}", exc_info=True)
+                        continue
+                    logger.error(f"Writing {len(batch)} '{kind}' events failed, keeping them for the next flush: {e}",
+                                 exc_info=True)
+                    self.buffer.requeue(batch)
+            self.flushed += written
+            return written
+
+    def stop(self, timeout=None):
+        """ Stops the flusher thread, then flushes what's left. Safe to call more than once. """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        if thread is not None:
+            self._wake.set()
+            thread.join(timeout)
+        self.flush()
+
+    def stats(self):
+        return {
+            'buffered': len(self.buffer),
+            'capacity': self.buffer.capacity,
+            'tracked': self.buffer.pushed,
+            'written': self.flushed,
+            'dropped': self.buffer.dropped,
+            'failed_flushes': self.failed_flushes,
+            'discarded': self.discarded,
+            'flusher_running': self._thread is not None,
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None or self._stopping:
+            return
+        with self._lock:
+            if self._thread is None and not self._stopping:
+                self._thread = threading.Thread(target=self._run, name='event-flusher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stopping:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                connections[self.using].close_if_unusable_or_obsolete()
+                try:
+                    self.flush()
+                except Exception as e: # Keep the thread alive whatever a flush does
+                    logger.error(f"Event flush failed: {e}", exc_info=True)
+        finally:
+            connections[self.using].close()
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_tracker():
+    """ The process-wide tracker, created on first use; flushed at exit. """
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                config = get_config()
+                _tracker = EventTracker(config['BUFFER_SIZE'], config['FLUSH_INTERVAL'],
+                                        max_retries=config['MAX_RETRIES'])
+                atexit.register(shutdown)
+    return _tracker
+
+
+def track(kind, *fields):
+    """ Records one event; written by the next flush. """
+    get_tracker().track(kind, *fields)
+
+
+def flush():
+    """ Writes buffered events now, in this thread. """
+    return get_tracker().flush() if _tracker is not None else 0
+
+
+def shutdown(timeout=10):
+    """ Flushes and stops this process's tracker (atexit, gunicorn worker_exit). """
+    if _tracker is not None:
+        _tracker.stop(timeout)
+
+
+def stats():
+    """ core.metrics source. """
+    return get_tracker().stats()
+
+
+def _reset_after_fork():
+    # The parent's thread doesn't exist in the child, and its buffered events are the parent's to write
+    global _tracker, _tracker_lock
+    _tracker, _tracker_lock = None, threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,46 @@
+# core/fragments.py
+
+"""
+Version keys for template fragment caching.
+
+Cached fragments (job cards, resume items) are keyed on the object's pk plus
+that object's version, kept in the cache. Saving or deleting a row drops its
+version key (see core/signals.py), so only that object's stale fragment is
+never read again and simply expires; editing one resume item or updating a
+few postings leaves every other cached fragment in place.
+
+A missing version key is seeded with time.time_ns(), not 1: after an
+invalidation or an eviction the new version can't equal one that old
+fragments were cached under. Templates fetch the versions of a whole list
+with one get_many through {% fragment_versions %} from the `fragments` tag
+library, which sets `fragment_version` on each object.
+"""
+
+import time
+from django.core.cache import cache
+
+FRAGMENT_TIMEOUT = 24 * 60 * 60
+
+
+def _version_key(model, pk):
+    return f'fragments:version:{model._meta.label_lower}:{pk}'
+
+
+def object_versions(model, pks):
+    """ {pk: version} for some objects of one model, seeding the missing ones. """
+    keys = {_version_key(model, pk): pk for pk in pks}
+    found = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys.keys() - found.keys()}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return {pk: found[key] for key, pk in keys.items()}
+
+
+def object_version(obj):
+    return object_versions(type(obj), [obj.pk])[obj.pk]
+
+
+def invalidate(model, pks):
+    """ Drops the versions of some objects: their cached fragments are not read again. """
+    cache.delete_many([_version_key(model, pk) for pk in pks])
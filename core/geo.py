@@ -0,0 +1,214 @@
+# core/geo.py
+
+"""
+Location normalization and geohash radius search.
+
+Free-text locations ("New Delhi, India", "Remote - US", "Bangalore") are
+resolved against a small gazetteer bundled with the app (core/data/*.csv:
+major cities with coordinates and aliases, and countries). The result goes
+into the NormalizedLocation columns (core/models.py) when a row is saved:
+city, ISO country code, lat/lon, a remote flag and a geohash.
+
+A geohash interleaves longitude and latitude bits into a base32 string, so
+every prefix is a rectangular cell and the points inside a cell share that
+prefix. Sorted geohashes therefore keep cells contiguous: "all rows in cell
+c" is the index range [c, c + '~'). A radius query picks a precision whose
+cells are about the radius' size, lists the cells that touch the circle and
+ORs one such range per cell. The database never computes a distance; results
+are approximate to the size of one cell at the chosen precision.
+
+No network access is needed. Anything missing from the gazetteer keeps its
+text but gets no coordinates (and so never shows up in radius searches).
+"""
+
+import csv
+import logging
+import math
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+GEOHASH_PRECISION = 9 # ~5 m cells; shorter prefixes of it are used for searching
+MAX_COVER_CELLS = 32 # Ranges ORed together by within_km()
+EARTH_RADIUS_KM = 6371.0
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_REMOTE = re.compile(r'\b(remote|anywhere|work from home|wfh|distributed|telecommute|fully remote)\b')
+_SEPARATORS = re.compile(r'[,/|;()\-–—]+|\bor\b')
+
+Place = namedtuple('Place', 'city country lat lon remote')
+LOCATION_FIELDS = ('location_city', 'location_country', 'location_lat', 'location_lon', 'location_remote', 'location_geohash')
+
+
+def normalize(text):
+    """ Lowercase, no accents or punctuation: "São Paulo, BR" -> "sao paulo br". """
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text.lower()).split())
+
+
+# --- Gazetteer ---
+
+@lru_cache(maxsize=1)
+def _gazetteer():
+    """ ({normalized city name or alias: [(city, country, lat, lon)]}, {normalized country or alias: code}, {code: name}). """
+    cities, countries, country_names = {}, {}, {}
+    with open(DATA_DIR / 'countries.csv', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            country_names[row['code']] = row['name']
+            for name in [row['name'], row['code'], *filter(None, row['aliases'].split('|'))]:
+                countries.setdefault(normalize(name), row['code'])
+    with open(DATA_DIR / 'gazetteer.csv', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            entry = (row['city'], row['country'], float(row['lat']), float(row['lon']))
+            for name in [row['city'], *filter(None, row['aliases'].split('|'))]:
+                cities.setdefault(normalize(name), []).append(entry)
+    logger.info(f"Loaded gazetteer: {len(cities)} city names, {len(countries)} country names.")
+    return cities, countries, country_names
+
+
+def country_name(code):
+    return _gazetteer()[2].get(code, '')
+
+
+@lru_cache(maxsize=4096)
+def resolve(text):
+    """ Place for a free-text location, or None when nothing in it is recognized. """
+    cities, countries, _ = _gazetteer()
+    normalized = normalize(text)
+    if not normalized:
+        return None
+    remote = bool(_REMOTE.search(normalized))
+    # The whole string first ("new york city", "cambridge ma"), then its parts
+    parts = [normalized] + [normalize(p) for p in _SEPARATORS.split(text or '')]
+    city_matches, country = [], ''
+    for part in parts:
+        if not part:
+            continue
+        if part in cities and not city_matches:
+            city_matches = cities[part]
+        elif part in countries and not country:
+            country = countries[part]
+    if city_matches:
+        # A named country picks between same-named cities, and overrules a city in another country
+        in_country = [c for c in city_matches if not country or c[1] == country]
+        if in_country:
+            city, code, lat, lon = in_country[0]
+            return Place(city, code, lat, lon, remote)
+    if country or remote:
+        return Place('', country, None, None, remote)
+    return None
+
+
+def location_fields(text):
+    """ Values for the NormalizedLocation columns from a location string. """
+    place = resolve(text or '')
+    if place is None:
+        return {'location_city': '', 'location_country': '', 'location_lat': None, 'location_lon': None,
+                'location_remote': False, 'location_geohash': ''}
+    has_point = place.lat is not None
+    return {
+        'location_city': place.city, 'location_country': place.country,
+        'location_lat': place.lat, 'location_lon': place.lon, 'location_remote': place.remote,
+        'location_geohash': encode(place.lat, place.lon) if has_point else '',
+    }
+
+
+# --- Geohash ---
+
+def encode(lat, lon, precision=GEOHASH_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, ch, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        ch <<= 1
+        if value >= mid:
+            ch |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[ch])
+            bits, ch = 0, 0
+    return ''.join(chars)
+
+
+def cell_bounds(geohash):
+    """ (south, west, north, east) of a geohash cell. """
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for c in geohash:
+        value = _BASE32.index(c)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def cell_size(precision):
+    """ (height, width) in degrees of cells at a precision. """
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _cell_distance_km(lat, lon, geohash):
+    """ Distance from a point to the nearest point of a cell (0 inside it). """
+    south, west, north, east = cell_bounds(geohash)
+    # Measure towards the cell the short way round, across the antimeridian if that's shorter
+    middle = (west + east) / 2
+    lon = min((lon - 360, lon, lon + 360), key=lambda candidate: abs(candidate - middle))
+    return haversine_km(lat, lon, min(max(lat, south), north), min(max(lon, west), east))
+
+
+def cover(lat, lon, km, max_cells=MAX_COVER_CELLS):
+    """ Sorted geohash cells, all of one precision, that together contain the circle of radius km. """
+    dlat = km / 111.32
+    dlon = km / (111.32 * max(math.cos(math.radians(lat)), 0.01))
+    south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    west, east = lon - dlon, lon + dlon
+    # Finest precision whose grid covers the bounding box in at most max_cells cells
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.ceil((north - south) / height) + 1
+        cols = min(math.ceil((east - west) / width) + 1, math.ceil(360 / width))
+        if rows * cols <= max_cells:
+            break
+    cells = set()
+    for i in range(rows):
+        cell_lat = min(south + i * height, north)
+        for j in range(cols):
+            cell_lon = min(west + j * width, east)
+            cell_lon = (cell_lon + 180.0) % 360.0 - 180.0 # Across the antimeridian
+            cells.add(encode(cell_lat, cell_lon, precision))
+    # Corners of the box are outside the circle; drop cells that only touch those
+    return sorted(c for c in cells if _cell_distance_km(lat, lon, c) <= km)
+
+
+def within_km(lat, lon, km, field='location_geohash'):
+    """ Q matching rows whose geohash lies in a cell touching the circle: one index range per cell. """
+    query = Q()
+    for cell in cover(lat, lon, km):
+        query |= Q(**{f'{field}__gte': cell, f'{field}__lt': cell + '~'})
+    return query if query else Q(pk__in=[])
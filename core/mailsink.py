@@ -0,0 +1,94 @@
+# core/mailsink.py
+
+"""
+A local SMTP stand-in for development: accepts every message and writes it
+to a directory as an .eml file instead of delivering it. Just enough SMTP
+(HELO/EHLO, MAIL, RCPT, DATA, RSET, NOOP, QUIT) for Django's SMTP backend.
+
+Run it with `python manage.py smtp_standin`; the EMAIL_* settings point at it
+by default.
+"""
+
+import logging
+import socketserver
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_BYTES = 10 * 1024 * 1024
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """ One client connection; may carry several messages (Django sends a digest batch over one). """
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.reply(f'220 {self.server.hostname} SMTP stand-in ready')
+        sender, recipients = None, []
+        while line := self.rfile.readline(8192):
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command[:4].upper()
+            if verb == 'EHLO':
+                self.reply(f'250-{self.server.hostname}')
+                self.reply(f'250 SIZE {MAX_MESSAGE_BYTES}')
+            elif verb == 'HELO':
+                self.reply(f'250 {self.server.hostname}')
+            elif verb == 'MAIL':
+                sender, recipients = command[10:].strip(), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command[8:].strip())
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                if not recipients:
+                    self.reply('503 RCPT first')
+                    continue
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                self.server.save(sender, recipients, self._read_data())
+                sender, recipients = None, []
+                self.reply('250 OK: saved')
+            elif verb == 'RSET':
+                sender, recipients = None, []
+                self.reply('250 OK')
+            elif verb == 'NOOP':
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+    def _read_data(self):
+        lines = []
+        while line := self.rfile.readline(MAX_MESSAGE_BYTES):
+            if line in (b'.\r\n', b'.\n'):
+                break
+            lines.append(line[1:] if line.startswith(b'..') else line) # Undo dot-stuffing
+        return b''.join(lines)
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """ Writes each received message to <directory>/<time>-<n>.eml. """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, directory, hostname='localhost'):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hostname = hostname
+        self.received = 0
+        self._lock = threading.Lock()
+        super().__init__(address, SMTPHandler)
+
+    def save(self, sender, recipients, data):
+        with self._lock:
+            self.received += 1
+            path = self.directory / f'{time.strftime("%Y%m%d-%H%M%S")}-{self.received:05d}.eml'
+        header = f'X-Stand-In-From: {sender}\r\nX-Stand-In-To: {", ".join(recipients)}\r\n'.encode()
+        path.write_bytes(header + data)
+        logger.info(f"Stand-in mail from {sender} to {', '.join(recipients)} saved to {path}")
+        return path
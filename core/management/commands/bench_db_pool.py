@@ -0,0 +1,124 @@
+import logging
+import os
+import statistics
+import threading
+import time
+import dj_database_url
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+from core.dbpool import pool_metrics
+
+logger = logging.getLogger(__name__)
+
+ALIAS = 'pool_bench'
+MODES = ('direct', 'persistent', 'pooled')
+
+
+def _configure(url, mode, pool_size):
+    """ Registers a connection alias for the benchmark database in the given mode. """
+    settings_dict = dj_database_url.parse(url, conn_max_age=None if mode == 'persistent' else 0)
+    if mode == 'pooled':
+        settings_dict['ENGINE'] = 'core.backends.postgresql_pool'
+        settings_dict.setdefault('OPTIONS', {})['pool'] = {'min_size': 0, 'max_size': pool_size, 'timeout': 30}
+    configured = connections.configure_settings({'default': connections['default'].settings_dict, ALIAS: settings_dict})
+    connections.settings[ALIAS] = configured[ALIAS]
+    if hasattr(connections._connections, ALIAS):
+        delattr(connections._connections, ALIAS)
+
+
+def _request():
+    """
+    What a small read-only request does with the database: one short query,
+    then request_finished closes the connection (or keeps it with CONN_MAX_AGE,
+    or hands it back to the pool).
+    """
+    connection = connections[ALIAS]
+    connection.close_if_unusable_or_obsolete() # request_started
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT %s', [1])
+        cursor.fetchone()
+    connection.close_if_unusable_or_obsolete() # request_finished
+
+
+class Command(BaseCommand):
+    help = ('Measures requests/sec for short single-query requests against PostgreSQL, comparing a new '
+            'connection per request, persistent per-thread connections (CONN_MAX_AGE) and the connection pool.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL', ''),
+                            help='postgres:// URL of a local database (default: DATABASE_URL).')
+        parser.add_argument('--threads', default='4,16,32', help='Comma separated request thread counts.')
+        parser.add_argument('--pool-size', type=int, default=8, help='max_size of the pool in pooled mode.')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per measurement.')
+        parser.add_argument('--modes', default=','.join(MODES), help=f'Comma separated, from: {", ".join(MODES)}.')
+
+    def handle(self, *args, **options):
+        url = options['database_url']
+        if not url.startswith(('postgres://', 'postgresql://')):
+            raise CommandError('Pass --database-url postgres://... (or set DATABASE_URL) for a local PostgreSQL.')
+        modes = [m.strip() for m in options['modes'].split(',') if m.strip()]
+        if unknown := set(modes) - set(MODES):
+            raise CommandError(f'Unknown modes: {", ".join(sorted(unknown))}')
+        thread_counts = [int(n) for n in options['threads'].split(',')]
+
+        _configure(url, 'direct', options['pool_size'])
+        try:
+            _request()
+        except DatabaseError as e:
+            raise CommandError(f'Could not reach PostgreSQL: {e}')
+        finally:
+            connections[ALIAS].close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'--- Connection pool benchmark: pool max_size={options["pool_size"]}, '
+            f'{options["duration"]:.0f}s per run ---'
+        ))
+        for mode in modes:
+            for threads in thread_counts:
+                _configure(url, mode, options['pool_size'])
+                try:
+                    requests, errors, latencies = self._run(threads, options['duration'])
+                    metrics = pool_metrics(connections[ALIAS].pool) if mode == 'pooled' else None
+                finally:
+                    connections[ALIAS].close_pool()
+                p50 = statistics.median(latencies) if latencies else 0
+                p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else p50
+                summary_msg = (f'{mode:<10} threads={threads:<3} req/s={requests / options["duration"]:>8.0f} '
+                               f'p50={p50:6.2f}ms p95={p95:6.2f}ms errors={errors}')
+                if metrics:
+                    summary_msg += (f' | pool size={metrics["size"]} waits={metrics["waits"]} '
+                                    f'avg wait={metrics["wait_ms_avg"]:.2f}ms max wait={metrics["wait_ms_max"]:.2f}ms '
+                                    f'timeouts={metrics["timeouts"]}')
+                logger.info(f"Connection pool benchmark {summary_msg}")
+                self.stdout.write(summary_msg)
+        self.stdout.write(self.style.SUCCESS('--- Finished connection pool benchmark ---'))
+
+    def _run(self, threads, duration):
+        deadline = time.perf_counter() + duration
+        lock = threading.Lock()
+        totals = {'requests': 0, 'errors': 0}
+        latencies = []
+
+        def request_thread():
+            local, local_errors, local_latencies = 0, 0, []
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    _request()
+                    local += 1
+                    local_latencies.append((time.perf_counter() - started) * 1000)
+                except DatabaseError:
+                    local_errors += 1
+                    connections[ALIAS].close()
+            connections[ALIAS].close() # Persistent mode: don't leave the connection behind
+            with lock:
+                totals['requests'] += local
+                totals['errors'] += local_errors
+                latencies.extend(local_latencies)
+
+        workers = [threading.Thread(target=request_thread) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return totals['requests'], totals['errors'], latencies
@@ -0,0 +1,66 @@
+import random
+import statistics
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.events import EventTracker, register
+from jobs import tracking
+
+BENCH_EVENT = 'bench_job_click'
+
+
+class Command(BaseCommand):
+    help = ('Compares writing one counter upsert per click with buffering clicks (core/events.py) and '
+            'flushing them in batches. Runs against the configured database and rolls everything back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=50_000)
+        parser.add_argument('--threads', type=int, default=4, help='Request threads tracking events at once.')
+        parser.add_argument('--postings', type=int, default=2000, help='Distinct posting ids clicked.')
+        parser.add_argument('--direct', type=int, default=2000, help='Events written one upsert each, for comparison.')
+
+    def handle(self, *args, **options):
+        n, threads = options['events'], options['threads']
+        self.stdout.write(self.style.SUCCESS(f'--- Event tracking benchmark: {n} clicks from {threads} threads ---'))
+        postings = [(pk, random.choice(['LinkedIn', 'Indeed', 'Company Website'])) for pk in range(1, options['postings'] + 1)]
+
+        with transaction.atomic():
+            # Baseline: what a write per request would cost
+            started = time.perf_counter()
+            for _ in range(options['direct']):
+                pk, source = random.choice(postings)
+                with transaction.atomic():
+                    tracking.save_counts([(tracking.CLICK_EVENT, time.time(), pk, source)])
+            direct_ms = (time.perf_counter() - started) * 1000 / max(options['direct'], 1)
+
+            register(BENCH_EVENT, lambda batch: tracking.save_counts([(tracking.CLICK_EVENT, *event[1:]) for event in batch]))
+            tracker = EventTracker(capacity=n, flush_interval=None)
+            latencies = []
+            lock = threading.Lock()
+
+            def request_thread(count):
+                local = []
+                for _ in range(count):
+                    pk, source = random.choice(postings)
+                    t = time.perf_counter()
+                    tracker.track(BENCH_EVENT, pk, source)
+                    local.append((time.perf_counter() - t) * 1_000_000)
+                with lock:
+                    latencies.extend(local)
+
+            workers = [threading.Thread(target=request_thread, args=(n // threads,)) for _ in range(threads)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            started = time.perf_counter()
+            written = tracker.flush()
+            flush_ms = (time.perf_counter() - started) * 1000
+            transaction.set_rollback(True)
+
+        p99 = statistics.quantiles(latencies, n=100)[-1] if len(latencies) > 1 else latencies[0]
+        self.stdout.write(f'Direct: {direct_ms:.3f}ms per click ({1000 / direct_ms:.0f} clicks/s on one connection)')
+        self.stdout.write(f'Buffered: track() p50={statistics.median(latencies):.1f}us p99={p99:.1f}us; '
+                          f'flushed {written} events in {flush_ms:.0f}ms ({written / max(flush_ms, 1e-9) * 1000:.0f} events/s)')
+        self.stdout.write(self.style.SUCCESS(f'--- {tracker.stats()} ---'))
@@ -0,0 +1,66 @@
+import logging
+import random
+import time
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve
+from core.middleware import RateLimitMiddleware
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = {
+    'local': ('core.ratelimit.LocalMemoryBackend', {}),
+    'cache': ('core.ratelimit.CacheBackend', {}),
+    'redis': ('core.ratelimit.RedisBackend', {}),
+}
+
+class Command(BaseCommand):
+    help = 'Measures the per-request overhead of RateLimitMiddleware for each counter backend.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000, help='Requests to time per backend.')
+        parser.add_argument('--clients', type=int, default=1000, help='Distinct client IPs to spread the requests over.')
+        parser.add_argument('--backend', choices=BACKENDS, action='append',
+                            help='Backend(s) to measure (default: local and cache).')
+        parser.add_argument('--redis-url', default='redis://localhost:6379/0', help='Server for the redis backend.')
+        parser.add_argument('--path', default='/jobs/', help='URL to simulate; it must have a rule in RATELIMIT.')
+
+    def handle(self, *args, **options):
+        names = options['backend'] or ['local', 'cache']
+        match = resolve(options['path'])
+        factory = RequestFactory()
+        requests = []
+        for i in range(options['requests']):
+            request = factory.get(options['path'], REMOTE_ADDR=f'10.0.{(i % options["clients"]) // 256}.{i % 256}')
+            request.user = AnonymousUser()
+            request.resolver_match = match
+            requests.append(request)
+        random.shuffle(requests)
+
+        self.stdout.write(self.style.SUCCESS(f'--- Benchmarking rate limiting on {match.view_name} ---'))
+        for name in names:
+            path, backend_options = BACKENDS[name]
+            if name == 'redis':
+                backend_options = {'url': options['redis_url']}
+            # A rule high enough that nothing is refused, so every request does the full check
+            config = {'BACKEND': path, 'OPTIONS': backend_options, 'RULES': {match.view_name: '1000000/m'}}
+            with override_settings(RATELIMIT=config):
+                try:
+                    middleware = RateLimitMiddleware(lambda request: HttpResponse())
+                except Exception as e:
+                    raise CommandError(f'Could not set up the {name} backend: {e}')
+            timings = []
+            for request in requests:
+                started = time.perf_counter()
+                middleware.process_view(request, match.func, match.args, match.kwargs)
+                timings.append((time.perf_counter() - started) * 1_000_000)
+            timings.sort()
+            p50 = timings[len(timings) // 2]
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            summary_msg = f'{name}: p50 {p50:.1f} us, p99 {p99:.1f} us, max {timings[-1]:.1f} us'
+            logger.info(f"Rate limit benchmark {summary_msg}")
+            self.stdout.write(f'{summary_msg}')
+        self.stdout.write(self.style.SUCCESS('--- Finished rate limit benchmark ---'))
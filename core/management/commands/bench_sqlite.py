@@ -0,0 +1,147 @@
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from core.writequeue import WriteQueue
+
+logger = logging.getLogger(__name__)
+
+ALIAS = 'sqlite_bench'
+ROWS = 10_000
+MODES = ('default', 'tuned', 'tuned+queue')
+
+
+def _configure(path, mode):
+    """ Registers a connection alias for the scratch database, with or without the tuning options. """
+    settings_dict = dict(connections['default'].settings_dict)
+    options = dict(settings_dict.get('OPTIONS', {}))
+    if mode == 'default':
+        options.pop('init_command', None)
+        options.pop('transaction_mode', None)
+    settings_dict.update(NAME=path, OPTIONS=options, CONN_MAX_AGE=None)
+    connections.settings[ALIAS] = settings_dict
+    if hasattr(connections._connections, ALIAS):
+        delattr(connections._connections, ALIAS)
+
+
+def _read():
+    start = random.randint(1, ROWS - 20)
+    with connections[ALIAS].cursor() as cursor:
+        cursor.execute('SELECT id, title, views FROM bench_job WHERE id BETWEEN %s AND %s', [start, start + 20])
+        cursor.fetchall()
+
+
+def _write():
+    with connections[ALIAS].cursor() as cursor:
+        cursor.execute('UPDATE bench_job SET views = views + 1 WHERE id = %s', [random.randint(1, ROWS)])
+
+
+def _direct_write():
+    with transaction.atomic(using=ALIAS):
+        _write()
+
+
+def _worker(path, mode, threads, write_ratio, duration, results):
+    """ One "gunicorn worker": a process running request threads against the shared file. """
+    _configure(path, mode)
+    write_queue = WriteQueue(using=ALIAS) if mode == 'tuned+queue' else None
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def request_thread():
+        local = {'reads': 0, 'writes': 0, 'errors': 0}
+        while time.perf_counter() < deadline:
+            try:
+                if random.random() < write_ratio:
+                    if write_queue:
+                        write_queue.run(_write)
+                    else:
+                        _direct_write()
+                    local['writes'] += 1
+                else:
+                    _read()
+                    local['reads'] += 1
+            except OperationalError: # "database is locked"
+                local['errors'] += 1
+        connections[ALIAS].close()
+        with lock:
+            for key, value in local.items():
+                counts[key] += value
+
+    workers = [threading.Thread(target=request_thread) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    if write_queue:
+        write_queue.stop()
+    results.put(counts)
+
+
+class Command(BaseCommand):
+    help = ('Measures mixed read/write throughput on a scratch SQLite file across worker process counts, '
+            'comparing default SQLite settings, the tuned pragmas, and tuned pragmas plus the write queue.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', default='1,2,4,8', help='Comma separated worker process counts.')
+        parser.add_argument('--threads', type=int, default=4, help='Request threads per worker.')
+        parser.add_argument('--write-ratio', type=float, default=0.2, help='Fraction of operations that write.')
+        parser.add_argument('--duration', type=float, default=3.0, help='Seconds per measurement.')
+        parser.add_argument('--modes', default=','.join(MODES), help=f'Comma separated, from: {", ".join(MODES)}.')
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('This benchmark compares SQLite configurations; the default database is not SQLite.')
+        modes = [m.strip() for m in options['modes'].split(',') if m.strip()]
+        if unknown := set(modes) - set(MODES):
+            raise CommandError(f'Unknown modes: {", ".join(sorted(unknown))}')
+        worker_counts = [int(n) for n in options['workers'].split(',')]
+        context = multiprocessing.get_context('fork')
+        tmpdir = tempfile.mkdtemp(prefix='hs-sqlite-bench-')
+        self.stdout.write(self.style.SUCCESS(
+            f'--- SQLite benchmark: {options["threads"]} threads/worker, '
+            f'{options["write_ratio"]:.0%} writes, {options["duration"]:.0f}s per run ---'
+        ))
+        try:
+            for mode in modes:
+                for workers in worker_counts:
+                    path = os.path.join(tmpdir, f'{mode}-{workers}.sqlite3')
+                    self._seed(path, mode)
+                    results = context.Queue()
+                    processes = [
+                        context.Process(target=_worker, args=(path, mode, options['threads'],
+                                                              options['write_ratio'], options['duration'], results))
+                        for _ in range(workers)
+                    ]
+                    for process in processes:
+                        process.start()
+                    totals = {'reads': 0, 'writes': 0, 'errors': 0}
+                    for _ in processes:
+                        for key, value in results.get().items():
+                            totals[key] += value
+                    for process in processes:
+                        process.join()
+                    seconds = options['duration']
+                    summary_msg = (f'{mode:<12} workers={workers:<3} reads/s={totals["reads"] / seconds:>9.0f} '
+                                   f'writes/s={totals["writes"] / seconds:>8.0f} locked errors={totals["errors"]}')
+                    logger.info(f"SQLite benchmark {summary_msg}")
+                    self.stdout.write(summary_msg)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        self.stdout.write(self.style.SUCCESS('--- Finished SQLite benchmark ---'))
+
+    def _seed(self, path, mode):
+        _configure(path, mode)
+        with transaction.atomic(using=ALIAS), connections[ALIAS].cursor() as cursor:
+            cursor.execute('CREATE TABLE bench_job (id INTEGER PRIMARY KEY, title TEXT, views INTEGER NOT NULL)')
+            cursor.executemany('INSERT INTO bench_job (id, title, views) VALUES (%s, %s, 0)',
+                               [(i, f'Job {i}') for i in range(1, ROWS + 1)])
+        # Children must open their own connections, never inherit this one across fork()
+        connections[ALIAS].close()
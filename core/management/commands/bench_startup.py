@@ -0,0 +1,83 @@
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Measures cold start: `manage.py check` and a gunicorn worker booting to its first response.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Repetitions per measurement.')
+        parser.add_argument('--settings-module', default='hire_synapse.settings.prod',
+                            help='Settings profile the gunicorn worker boots with.')
+        parser.add_argument('--skip-gunicorn', action='store_true', help='Only time `manage.py check`.')
+
+    def handle(self, *args, **options):
+        base_dir = Path(settings.BASE_DIR)
+        env = {
+            **os.environ,
+            'DJANGO_SECRET_KEY': os.environ.get('DJANGO_SECRET_KEY', 'bench-startup-not-secret'),
+            'DJANGO_ALLOWED_HOSTS': os.environ.get('DJANGO_ALLOWED_HOSTS', '127.0.0.1,localhost'),
+        }
+        self.stdout.write(self.style.SUCCESS('--- Benchmarking startup ---'))
+
+        check_env = {**env, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'hire_synapse.settings.dev')}
+        timings = []
+        for _ in range(options['runs']):
+            started = time.perf_counter()
+            result = subprocess.run([sys.executable, 'manage.py', 'check'], cwd=base_dir, env=check_env,
+                                    capture_output=True, text=True)
+            timings.append(time.perf_counter() - started)
+            if result.returncode:
+                raise CommandError(f'manage.py check failed:\n{result.stderr}')
+        self._report('manage.py check', timings)
+
+        if options['skip_gunicorn']:
+            return
+        gunicorn_env = {**env, 'DJANGO_SETTINGS_MODULE': options['settings_module']}
+        timings = [self._boot_gunicorn(base_dir, gunicorn_env) for _ in range(options['runs'])]
+        self._report('gunicorn worker boot to first response', timings)
+        self.stdout.write(self.style.SUCCESS('--- Finished startup benchmark ---'))
+
+    def _boot_gunicorn(self, base_dir, env):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', 'hire_synapse.wsgi', '--workers', '1', '--bind', f'127.0.0.1:{port}'],
+            cwd=base_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        try:
+            while time.perf_counter() - started < 30:
+                if process.poll() is not None:
+                    raise CommandError(f'gunicorn exited early:\n{process.stderr.read().decode()[-2000:]}')
+                try:
+                    # Any HTTP response (even a 404) means the worker has loaded the app
+                    urllib.request.urlopen(f'http://127.0.0.1:{port}/__startup_probe__', timeout=1)
+                except urllib.error.HTTPError:
+                    return time.perf_counter() - started
+                except OSError:
+                    time.sleep(0.01)
+                    continue
+                return time.perf_counter() - started
+            raise CommandError('gunicorn did not answer within 30s.')
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    def _report(self, label, timings):
+        timings = sorted(timings)
+        summary_msg = (f'{label}: median {timings[len(timings) // 2] * 1000:.0f} ms, '
+                       f'min {timings[0] * 1000:.0f} ms, max {timings[-1] * 1000:.0f} ms ({len(timings)} runs)')
+        logger.info(f"Startup benchmark {summary_msg}")
+        self.stdout.write(summary_msg)
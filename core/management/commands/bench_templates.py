@@ -0,0 +1,95 @@
+import logging
+import time
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template import Engine, RequestContext
+from django.template.backends.django import get_installed_libraries
+from django.test import RequestFactory
+from django.utils import timezone
+from jobs.models import JobPosting
+from profiles.models import Award, Certification, Education, Project, WorkExperience
+
+logger = logging.getLogger(__name__)
+
+# Minimal stand-in for the project's base.html so pages can be rendered on their own
+BASE_STUB = '{% block content %}{% endblock %}{% block extra_js %}{% endblock %}'
+DESCRIPTION = '<p>We are hiring a <strong>senior engineer</strong> to build data pipelines.</p>' * 40
+
+
+class Command(BaseCommand):
+    help = ('Times rendering of the job list and profile pages: plain loader with cold fragment '
+            'caches (before) versus the cached loader with warm fragment caches (after).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Renders per measurement.')
+        parser.add_argument('--items', type=int, default=20, help='Job cards / resume items per page.')
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/')
+        request.user = User(username='bench')
+        pages = {
+            'jobs/job_list.html': self._job_context(options['items']),
+            'profiles/profile_details.html': self._profile_context(options['items']),
+        }
+        self.stdout.write(self.style.SUCCESS('--- Benchmarking template rendering ---'))
+        for name, context in pages.items():
+            before = self._time(self._engine(cached=False), name, context, request, options['iterations'], warm=False)
+            after = self._time(self._engine(cached=True), name, context, request, options['iterations'], warm=True)
+            summary_msg = (f'{name}: {before:.3f} ms -> {after:.3f} ms per render '
+                           f'({(1 - after / before) * 100:.0f}% less)')
+            logger.info(f"Template benchmark {summary_msg}")
+            self.stdout.write(summary_msg)
+        self.stdout.write(self.style.SUCCESS('--- Finished template benchmark ---'))
+
+    def _engine(self, cached):
+        loaders = [
+            ('django.template.loaders.locmem.Loader', {'base.html': BASE_STUB}),
+            'django.template.loaders.app_directories.Loader',
+        ]
+        if cached:
+            loaders = [('django.template.loaders.cached.Loader', loaders)]
+        return Engine(loaders=loaders, libraries=get_installed_libraries(), context_processors=[
+            'django.template.context_processors.request',
+            'django.contrib.auth.context_processors.auth',
+        ])
+
+    def _time(self, engine, name, context, request, iterations, warm):
+        cache.clear()
+        if warm:
+            engine.get_template(name).render(RequestContext(request, context))
+        started = time.perf_counter()
+        for _ in range(iterations):
+            if not warm:
+                cache.clear()
+            engine.get_template(name).render(RequestContext(request, context))
+        return (time.perf_counter() - started) * 1000 / iterations
+
+    def _job_context(self, count):
+        now = timezone.now()
+        jobs = []
+        for i in range(count):
+            job = JobPosting(pk=i + 1, title=f'Engineer {i}', company_name='Acme', location='Remote',
+                             job_url=f'https://example.com/{i}', source='Bench', description=DESCRIPTION,
+                             salary_range='$100k - $120k', date_posted_source=now, date_added_db=now)
+            job.populate_derived_fields()
+            jobs.append(job)
+        return {'job_list': jobs, 'search_query': ''}
+
+    def _profile_context(self, count):
+        today = date.today()
+        per_type = max(1, count // 5)
+        rows = range(1, per_type + 1)
+        text = 'Led a team of five engineers.\nShipped the new ingestion pipeline.'
+        return {
+            'education_list': [Education(pk=i, institution_name='State University', degree='BSc', field_of_study='CS',
+                                         start_date=today - timedelta(days=1500), end_date=today, description=text) for i in rows],
+            'experience_list': [WorkExperience(pk=i, job_title='Engineer', company_name='Acme', location='Remote',
+                                               start_date=today - timedelta(days=700), description=text) for i in rows],
+            'project_list': [Project(pk=i, name=f'Project {i}', start_date=today, url='https://example.com',
+                                     description=text) for i in rows],
+            'award_list': [Award(pk=i, title=f'Award {i}', issuer='ACM', date_received=today, description=text) for i in rows],
+            'certification_list': [Certification(pk=i, name=f'Cert {i}', issuing_organization='AWS', issue_date=today,
+                                                 credential_id='ABC-123', credential_url='https://example.com') for i in rows],
+        }
@@ -0,0 +1,79 @@
+import statistics
+import tempfile
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+from core.embeddings import normalize_rows
+from core.vectorindex import DEFAULT_NPROBE, IVFIndex
+
+
+class Command(BaseCommand):
+    help = ('Measures top-k search latency and recall of the IVF vector index (core/vectorindex.py) '
+            'on synthetic clustered unit vectors; no database or embedding model involved.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vectors', type=int, default=1_000_000)
+        parser.add_argument('--dim', type=int, default=256)
+        parser.add_argument('--topics', type=int, default=5000, help='Clusters in the synthetic data.')
+        parser.add_argument('--noise', type=float, default=0.5, help='Spread of each cluster (norm of the noise added to its center).')
+        parser.add_argument('--queries', type=int, default=500)
+        parser.add_argument('--recall-queries', type=int, default=50, help='Queries also answered exactly, for recall@k.')
+        parser.add_argument('--k', type=int, default=10)
+        parser.add_argument('--nprobe', type=int, action='append', help=f'Cells probed (default {DEFAULT_NPROBE}); repeatable.')
+        parser.add_argument('--inserts', type=int, default=10_000, help='Vectors added through the delta before querying.')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        n, dim, k = options['vectors'], options['dim'], options['k']
+        rng = np.random.default_rng(options['seed'])
+        self.stdout.write(self.style.SUCCESS(f'--- Vector search benchmark: {n} x {dim} ---'))
+
+        topics = normalize_rows(rng.standard_normal((options['topics'], dim), dtype=np.float32))
+
+        def sample(count):
+            points = topics[rng.integers(len(topics), size=count)]
+            return normalize_rows(points + rng.standard_normal((count, dim), dtype=np.float32) * (options['noise'] / np.sqrt(dim)))
+
+        vectors = np.empty((n, dim), dtype=np.float32)
+        for start in range(0, n, 100_000):
+            vectors[start:start + 100_000] = sample(min(100_000, n - start))
+
+        with tempfile.TemporaryDirectory() as directory:
+            index = IVFIndex(directory, dim)
+            started = time.perf_counter()
+            index.build(np.arange(n, dtype=np.int64), vectors, seed=options['seed'])
+            self.stdout.write(f'Built in {time.perf_counter() - started:.1f}s: {index.stats()}')
+
+            inserted = sample(options['inserts']) if options['inserts'] else np.zeros((0, dim), dtype=np.float32)
+            if len(inserted):
+                started = time.perf_counter()
+                for start in range(0, len(inserted), 1000):
+                    batch = inserted[start:start + 1000]
+                    index.insert(np.arange(n + start, n + start + len(batch), dtype=np.int64), batch)
+                self.stdout.write(f'Inserted {len(inserted)} vectors in {time.perf_counter() - started:.2f}s: {index.stats()}')
+
+            queries = sample(options['queries'])
+            exact = self._exact(vectors, inserted, queries[:options['recall_queries']], k)
+            for nprobe in options['nprobe'] or [DEFAULT_NPROBE]:
+                latencies, found = [], 0
+                for i, query in enumerate(queries):
+                    t = time.perf_counter()
+                    results = index.search(query, k=k, nprobe=nprobe)
+                    latencies.append((time.perf_counter() - t) * 1000)
+                    if i < len(exact):
+                        found += len(exact[i] & {pk for pk, _ in results})
+                p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+                recall = found / (len(exact) * k) if exact else float('nan')
+                summary_msg = (f'nprobe={nprobe}: {len(latencies) / (sum(latencies) / 1000):.0f} queries/s, '
+                               f'p50={statistics.median(latencies):.2f}ms p95={p95:.2f}ms, recall@{k}={recall:.3f}')
+                self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
+
+    def _exact(self, vectors, inserted, queries, k):
+        """ True top-k ids per query by scanning everything. """
+        if not len(queries):
+            return []
+        scores = np.concatenate([
+            *(vectors[s:s + 100_000] @ queries.T for s in range(0, len(vectors), 100_000)),
+            inserted @ queries.T,
+        ])
+        return [set(np.argpartition(-scores[:, q], k - 1)[:k].tolist()) for q in range(len(queries))]
@@ -0,0 +1,28 @@
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.mailsink import SMTPStandIn
+
+class Command(BaseCommand):
+    help = ('Runs a local SMTP server that saves every message it receives as an .eml file '
+            'instead of delivering it (job alert digests during development).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=getattr(settings, 'EMAIL_PORT', 1025))
+        parser.add_argument('--directory', default=os.path.join(settings.BASE_DIR, 'var', 'mail'),
+                            help='Where the .eml files go.')
+
+    def handle(self, *args, **options):
+        server = SMTPStandIn((options['host'], options['port']), options['directory'])
+        self.stdout.write(self.style.SUCCESS(
+            f"--- SMTP stand-in listening on {options['host']}:{options['port']}, "
+            f"saving to {options['directory']} (Ctrl+C to stop) ---"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(self.style.SUCCESS(f'--- Received {server.received} messages ---'))
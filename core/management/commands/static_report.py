@@ -0,0 +1,74 @@
+import logging
+import os
+import re
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = ('Reports transfer sizes of collected static files (original vs purged/compressed) '
+            'and of the assets each main page loads. Run collectstatic first.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', nargs='+', default=['/', '/jobs/', '/interview-prep/'],
+                            help='Page paths to fetch and measure.')
+
+    def handle(self, *args, **options):
+        # Manifest storages load {name: hashed name} from staticfiles.json on startup
+        manifest = getattr(staticfiles_storage, 'hashed_files', None)
+        if not manifest:
+            raise CommandError('No static manifest found. Run `python manage.py collectstatic` first.')
+
+        self.stdout.write(self.style.SUCCESS(f'--- Static assets ({len(manifest)} files) ---'))
+        sizes = {} # hashed name -> (before, after)
+        total_before = total_after = 0
+        for name, hashed_name in sorted(manifest.items()):
+            before, after, encoding = self._sizes(name, hashed_name)
+            sizes[hashed_name] = (before, after)
+            total_before += before
+            total_after += after
+            if name.endswith(('.css', '.js', '.svg')):
+                self.stdout.write(f'{name}: {before:,} -> {after:,} bytes ({encoding})')
+        self.stdout.write(f'All assets: {total_before:,} -> {total_after:,} bytes')
+
+        self.stdout.write(self.style.SUCCESS('--- Page transfer sizes ---'))
+        client = Client()
+        static_url = re.escape(settings.STATIC_URL if settings.STATIC_URL.startswith('/') else f'/{settings.STATIC_URL}')
+        asset_re = re.compile(rf'(?:href|src)=["\']{static_url}([^"\'?#]+)')
+        for path in options['pages']:
+            try:
+                response = client.get(path)
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'{path}: could not render ({e.__class__.__name__}: {e})'))
+                continue
+            if response.status_code >= 400:
+                self.stdout.write(self.style.WARNING(f'{path}: HTTP {response.status_code}'))
+                continue
+            html = response.content.decode('utf-8', errors='ignore')
+            assets = set(asset_re.findall(html))
+            before = after = len(response.content)
+            for asset in assets:
+                asset_before, asset_after = sizes.get(asset, (0, 0))
+                before += asset_before
+                after += asset_after
+            summary_msg = f'{path}: {len(assets)} assets, {before:,} -> {after:,} bytes'
+            logger.info(f"Static report {summary_msg}")
+            self.stdout.write(summary_msg)
+        self.stdout.write(self.style.SUCCESS('--- Finished static report ---'))
+
+    def _sizes(self, name, hashed_name):
+        """ (original source size, smallest size actually served, encoding used). """
+        source = finders.find(name)
+        served_path = staticfiles_storage.path(hashed_name)
+        before = os.path.getsize(source) if source else os.path.getsize(served_path)
+        best, encoding = os.path.getsize(served_path), 'identity'
+        for suffix, label in (('.br', 'br'), ('.gz', 'gzip')):
+            if os.path.exists(served_path + suffix):
+                size = os.path.getsize(served_path + suffix)
+                if size < best:
+                    best, encoding = size, label
+        return before, best, encoding
@@ -0,0 +1,57 @@
+# core/metrics.py
+
+"""
+Process-level instrumentation.
+
+Components register a source: a name and a callable returning a dict of
+current values (gauges and counters). snapshot() collects every source, for
+the staff-only JSON endpoint (core:metrics) and for benchmark commands. Values
+are per process, so under gunicorn each worker reports its own.
+
+Built-in sources (registered in CoreConfig.ready):
+  db_pools - PostgreSQL connection pools by alias: size, in_use, idle, waiting,
+             waits, wait_ms_total/avg/max, timeouts (see core/dbpool.py)
+  events   - event buffer: buffered, tracked, written, dropped, failed
+             flushes, discarded after MAX_RETRIES, whether the flusher
+             thread runs (see core/events.py)
+
+Registered by other apps:
+  candidate_index - profiles in the candidate search bitmaps, values per
+                    criterion, index age (see profiles/candidates.py)
+  job_embeddings  - embedding model, texts in the embedding store, vectors
+                    and cells in the similar-jobs index (see jobs/semantic.py)
+"""
+
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_sources = {}
+_lock = threading.Lock()
+
+
+def register(name, source):
+    """ Adds (or replaces) a metrics source. """
+    with _lock:
+        _sources[name] = source
+
+
+def unregister(name):
+    with _lock:
+        _sources.pop(name, None)
+
+
+def snapshot():
+    """ Current values from every registered source; a failing source reports its error instead. """
+    with _lock:
+        sources = dict(_sources)
+    values = {'pid': os.getpid()}
+    for name, source in sources.items():
+        try:
+            values[name] = source()
+        except Exception as e:
+            logger.warning(f"Metrics source '{name}' failed: {e}")
+            values[name] = {'error': str(e)}
+    return values
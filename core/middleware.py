@@ -0,0 +1,105 @@
+# core/middleware.py
+
+import logging
+import math
+import time
+from django.http import HttpResponse
+from . import ratelimit, routers
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitMiddleware:
+    """
+    Throttles requests per client and per URL name (see core/ratelimit.py).
+    Must come after AuthenticationMiddleware so signed-in users are limited by account.
+
+    Only views with a rule in settings.RATELIMIT['RULES'] are counted; everything
+    else costs a single dict lookup. Over-limit requests get a 429 with Retry-After.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = ratelimit.get_config()
+        self.enabled = config['ENABLED']
+        self.exempt_staff = config['EXEMPT_STAFF']
+        self.ip_header = config['IP_HEADER']
+        self.trusted_proxies = config['TRUSTED_PROXIES']
+        # Parse rates once at startup, not per request
+        self.rules = {name: ratelimit.Rate.parse(rate) for name, rate in config['RULES'].items()}
+        self.backend = ratelimit.build_backend(config) if self.enabled and self.rules else None
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.backend is None:
+            return None
+        view_name = request.resolver_match.view_name if request.resolver_match else None
+        rate = self.rules.get(view_name)
+        if rate is None:
+            return None
+        user = getattr(request, 'user', None)
+        if self.exempt_staff and user is not None and user.is_staff:
+            return None
+
+        key = f'{view_name}:{ratelimit.client_key(request, self.ip_header, self.trusted_proxies)}'
+        try:
+            allowed, retry_after = self.backend.hit(key, rate)
+        except Exception as e:
+            # A broken counter store shouldn't take the site down with it
+            logger.warning(f"Rate limit backend error for {key}, allowing request: {e}")
+            return None
+        if allowed:
+            return None
+
+        logger.warning(f"Rate limit exceeded for {key} ({rate.limit}/{rate.period}s).")
+        response = HttpResponse('Too many requests. Please slow down and try again shortly.',
+                                status=429, content_type='text/plain')
+        response['Retry-After'] = ratelimit.retry_after_header(retry_after)
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    Lets the views listed in settings.REPLICA_ROUTER['VIEWS'] read from replicas
+    (see core/routers.py), unless the client wrote something within that view's
+    lag window. Writes are remembered in a cookie holding the time of the last
+    write, so no shared state is needed to keep users on the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = routers.get_config()
+        self.views = config['VIEWS']
+        self.cookie_name = config['COOKIE_NAME']
+        self.cookie_max_age = math.ceil(max(self.views.values(), default=0))
+        self.enabled = bool(config['REPLICAS'] and self.views)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+        tokens = routers.start_request()
+        try:
+            response = self.get_response(request)
+            wrote = routers.wrote_during_request()
+        finally:
+            routers.reset_request_state(tokens)
+        if wrote and self.cookie_max_age:
+            response.set_cookie(self.cookie_name, f'{time.time():.3f}', max_age=self.cookie_max_age,
+                                httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.enabled or request.resolver_match is None:
+            return None
+        window = self.views.get(request.resolver_match.view_name)
+        if window is None:
+            return None
+        try:
+            last_write = float(request.COOKIES[self.cookie_name])
+        except (KeyError, ValueError):
+            last_write = None
+        if not routers.should_pin(last_write, window):
+            routers.enable_replica_reads()
+        return None
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 17:18
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application_counts', models.JSONField(default=dict, help_text='Application count per status.')),
+                ('application_total', models.PositiveIntegerField(default=0)),
+                ('recent_cover_letters', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Latest few cover letters (id, title, updated_at).')),
+                ('new_matching_jobs', models.PositiveIntegerField(default=0, help_text="Postings matching the user's skills since they last opened the job board.")),
+                ('profile_sections', models.JSONField(default=dict, help_text='Which resume sections have content.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
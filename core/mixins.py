@@ -0,0 +1,47 @@
+# core/mixins.py
+
+"""
+View mixins shared by the apps.
+
+OwnerScopedMixin replaces the UserPassesTestMixin pattern of
+`test_func(): return request.user == self.get_object().profile.user` on
+edit/delete views. That pattern fetched the object once for the check and
+again in get()/post(), plus one query per relation it walked to reach the
+owner. Here the owner check is part of the single query that loads the
+object, and other users' objects are a 404, not a 403 (which would
+confirm the id exists).
+"""
+
+
+class OwnerScopedMixin:
+    """
+    For SingleObjectMixin views (UpdateView, DeleteView, ...): only objects
+    owned by request.user are reachable, loaded once per request.
+
+    owner_field is the lookup from the model to its User, e.g. 'user' or
+    'profile__user'. Relations along it are joined by the same query and the
+    request user is attached at the end, so obj.profile.user needs no query.
+    Use after LoginRequiredMixin.
+    """
+    owner_field = 'user'
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(**{self.owner_field: self.request.user})
+        relations = self.owner_field.split('__')[:-1]
+        if relations:
+            queryset = queryset.select_related('__'.join(relations))
+        return queryset
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if getattr(self, '_owned_object', None) is None:
+            obj = super().get_object()
+            # Walk the (already loaded) relations and put the request user at the end
+            *relations, owner = self.owner_field.split('__')
+            target = obj
+            for name in relations:
+                target = getattr(target, name)
+            setattr(target, owner, self.request.user)
+            self._owned_object = obj
+        return self._owned_object
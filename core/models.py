@@ -1,3 +1,63 @@
+# core/models.py
+
 from django.db import models
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from . import geo
+
+
+class NormalizedLocation(models.Model):
+    """
+    Abstract base for models with a free-text `location` field: adds the
+    gazetteer resolution of it (core/geo.py), refreshed on every save.
+    location_geohash is indexed for radius searches (geo.within_km()).
+    Bulk writes skip save(); call normalize_location() on each object first.
+    """
+    location_city = models.CharField(max_length=100, blank=True, default='', editable=False)
+    location_country = models.CharField(max_length=2, blank=True, default='', editable=False) # ISO 3166 alpha-2
+    location_lat = models.FloatField(blank=True, null=True, editable=False)
+    location_lon = models.FloatField(blank=True, null=True, editable=False)
+    location_remote = models.BooleanField(default=False, editable=False)
+    location_geohash = models.CharField(max_length=12, blank=True, default='', editable=False, db_index=True)
+
+    class Meta:
+        abstract = True
+
+    def normalize_location(self):
+        for field, value in geo.location_fields(self.location).items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        self.normalize_location()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'location' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *geo.LOCATION_FIELDS}
+        super().save(*args, **kwargs)
+
+
+class DashboardSummary(models.Model):
+    """
+    Per-user snapshot of everything the home page dashboard shows.
+    Kept up to date incrementally by the signal handlers in core/signals.py,
+    so the home page renders from this single row instead of querying
+    applications, documents, jobs and profiles on every hit.
+    """
+    # Profile sections counted towards completeness, in display order
+    PROFILE_SECTIONS = ['summary', 'education', 'experience', 'skills', 'projects', 'awards', 'certifications']
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='dashboard_summary')
+    application_counts = models.JSONField(default=dict, help_text="Application count per status.")
+    application_total = models.PositiveIntegerField(default=0)
+    recent_cover_letters = models.JSONField(default=list, encoder=DjangoJSONEncoder, help_text="Latest few cover letters (id, title, updated_at).")
+    new_matching_jobs = models.PositiveIntegerField(default=0, help_text="Postings matching the user's skills since they last opened the job board.")
+    profile_sections = models.JSONField(default=dict, help_text="Which resume sections have content.")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Dashboard summary for {self.user_id}"
 
-# Create your models here.
+    @property
+    def profile_completeness(self):
+        """ Percentage of resume sections that have content. """
+        filled = sum(1 for section in self.PROFILE_SECTIONS if self.profile_sections.get(section))
+        return round(100 * filled / len(self.PROFILE_SECTIONS))
@@ -0,0 +1,209 @@
+# core/ratelimit.py
+
+"""
+Rate limiting for expensive views, applied by core.middleware.RateLimitMiddleware.
+
+Limits are configured per URL name in settings.RATELIMIT['RULES'] as
+"<count>/<period>" strings, e.g. '30/m' or '200/5m'. Each client is
+identified by user id when signed in and by IP address otherwise, so every
+(client, URL name) pair gets its own counter.
+
+Counters live in a pluggable backend:
+  - LocalMemoryBackend: token buckets in process memory. Fastest, but each
+    worker process counts separately (the effective limit is limit * workers).
+  - CacheBackend: sliding-window counters in the Django cache, shared by all
+    workers that share the cache.
+  - RedisBackend: the same sliding window against any Redis-compatible server,
+    for when the Django cache isn't Redis. Needs the optional `redis` package.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+PERIOD_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+RATE_RE = re.compile(r'^\s*(\d+)\s*/\s*(\d*)\s*([smhd])\s*$')
+
+DEFAULTS = {
+    'ENABLED': True,
+    'BACKEND': 'core.ratelimit.LocalMemoryBackend',
+    'OPTIONS': {},
+    'RULES': {},
+    'EXEMPT_STAFF': True,
+    # Header holding the client IP when running behind a trusted proxy, e.g. 'HTTP_X_FORWARDED_FOR'
+    'IP_HEADER': None,
+    # Proxies in front of the app that append to IP_HEADER. The client address is the one that many
+    # hops from the right; anything further left was written by the client and can't be trusted.
+    'TRUSTED_PROXIES': 1,
+}
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    period: int # Seconds
+
+    @classmethod
+    def parse(cls, value):
+        match = RATE_RE.match(value)
+        if not match:
+            raise ImproperlyConfigured(f"Invalid rate limit {value!r}, expected e.g. '30/m' or '100/5m'.")
+        count, multiplier, unit = match.groups()
+        return cls(int(count), int(multiplier or 1) * PERIOD_SECONDS[unit])
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'RATELIMIT', {})}
+
+
+class LocalMemoryBackend:
+    """
+    Token bucket per key, in this process only. Each bucket refills at
+    limit/period tokens per second up to `limit`, so short bursts are allowed
+    but the long-run rate is capped.
+    """
+
+    def __init__(self, max_keys=50_000):
+        self.max_keys = max_keys
+        self._buckets = {} # key -> [tokens, last_refill]
+        self._lock = threading.Lock()
+
+    def hit(self, key, rate, now=None):
+        """ Consumes one token. Returns (allowed, retry_after_seconds). """
+        now = time.monotonic() if now is None else now
+        refill_per_sec = rate.limit / rate.period
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._evict(now, refill_per_sec, rate.limit)
+                bucket = self._buckets[key] = [float(rate.limit), now]
+            else:
+                bucket[0] = min(rate.limit, bucket[0] + (now - bucket[1]) * refill_per_sec)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0
+            return False, (1 - bucket[0]) / refill_per_sec
+
+    def _evict(self, now, refill_per_sec, limit):
+        """ Drops buckets that have refilled completely, they're equivalent to a fresh bucket. """
+        full = [k for k, (tokens, last) in self._buckets.items() if tokens + (now - last) * refill_per_sec >= limit]
+        for key in full or list(self._buckets)[:len(self._buckets) // 2]:
+            del self._buckets[key]
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SlidingWindowMixin:
+    """
+    Approximate sliding window from two fixed windows: the previous window's
+    count is weighted by how much of it still overlaps the sliding window.
+    Needs two counters per key, and no per-request timestamps.
+    """
+
+    def _window(self, rate, now):
+        index, offset = divmod(now, rate.period)
+        return int(index), offset / rate.period
+
+    def _decide(self, rate, previous, current, elapsed_fraction):
+        estimate = previous * (1 - elapsed_fraction) + current
+        if estimate < rate.limit:
+            return True, 0
+        # Wait until enough of the previous window has slid out (or the current one ends)
+        if previous:
+            needed = (estimate - rate.limit + 1) / previous
+            return False, min(needed, 1 - elapsed_fraction + 1e-9) * rate.period
+        return False, (1 - elapsed_fraction) * rate.period
+
+
+class CacheBackend(SlidingWindowMixin):
+    """ Sliding-window counters in a Django cache (settings.CACHES alias). """
+
+    def __init__(self, alias='default', prefix='rl'):
+        from django.core.cache import caches
+        self.cache = caches[alias]
+        self.prefix = prefix
+
+    def hit(self, key, rate, now=None):
+        now = time.time() if now is None else now
+        index, fraction = self._window(rate, now)
+        current_key = f'{self.prefix}:{key}:{index}'
+        previous_key = f'{self.prefix}:{key}:{index - 1}'
+        counts = self.cache.get_many([previous_key, current_key])
+        allowed, retry_after = self._decide(rate, counts.get(previous_key, 0), counts.get(current_key, 0), fraction)
+        if allowed:
+            # Counters outlive their window by one period so they can serve as "previous"
+            if not self.cache.add(current_key, 1, rate.period * 2):
+                try:
+                    self.cache.incr(current_key)
+                except ValueError: # Expired between add() and incr()
+                    self.cache.set(current_key, 1, rate.period * 2)
+        return allowed, retry_after
+
+
+class RedisBackend(SlidingWindowMixin):
+    """ Sliding-window counters on a Redis-compatible server, one round trip per request. """
+
+    def __init__(self, url='redis://localhost:6379/0', prefix='rl'):
+        try:
+            import redis # Optional dependency
+        except ImportError as e:
+            raise ImproperlyConfigured('RedisBackend requires the redis package (pip install redis).') from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def hit(self, key, rate, now=None):
+        now = time.time() if now is None else now
+        index, fraction = self._window(rate, now)
+        current_key = f'{self.prefix}:{key}:{index}'
+        # Count optimistically: a denied request still increments, which keeps
+        # hammering clients limited instead of letting them through at the edge
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(f'{self.prefix}:{key}:{index - 1}')
+        pipe.incr(current_key)
+        pipe.expire(current_key, rate.period * 2)
+        previous, current, _ = pipe.execute()
+        return self._decide(rate, int(previous or 0), current - 1, fraction)
+
+
+def build_backend(config=None):
+    config = config or get_config()
+    try:
+        backend_class = import_string(config['BACKEND'])
+    except ImportError as e:
+        raise ImproperlyConfigured(f"Could not import rate limit backend {config['BACKEND']!r}.") from e
+    return backend_class(**config['OPTIONS'])
+
+
+def client_key(request, ip_header=None, trusted_proxies=1):
+    """
+    'u<id>' for signed-in users, 'ip<address>' otherwise. Behind proxies, the
+    address is taken `trusted_proxies` hops from the right of ip_header: each
+    proxy appends the address it received the request from, while the hops
+    left of those are whatever the client sent (a fresh fake one per request
+    would otherwise get a fresh counter every time).
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'u{user.pk}'
+    address = None
+    if ip_header and trusted_proxies > 0:
+        hops = [hop.strip() for hop in request.META.get(ip_header, '').split(',') if hop.strip()]
+        if len(hops) >= trusted_proxies: # Fewer: the request didn't come through all the proxies
+            address = hops[-trusted_proxies]
+    return f"ip{address or request.META.get('REMOTE_ADDR', '')}"
+
+
+def retry_after_header(seconds):
+    return str(max(1, math.ceil(seconds)))
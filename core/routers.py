@@ -0,0 +1,106 @@
+# core/routers.py
+
+"""
+Read-replica routing.
+
+Replicas are extra DATABASES aliases listed in settings.REPLICA_ROUTER['REPLICAS']
+with a weight each. Reads go to a replica only while a view listed in
+REPLICA_ROUTER['VIEWS'] is handling the request; everything else (other
+views, management commands, the shell, background threads) reads from the
+primary, and all writes go to the primary.
+
+Read-your-writes: each view in VIEWS has a lag window in seconds. When a
+client has written within that window (tracked with a cookie set by
+ReplicaPinningMiddleware), or has already written earlier in the same
+request, the view reads from the primary instead, so users always see their
+own changes even if a replica is behind.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Whether the current request may read from replicas (set by the middleware per view)
+_replica_reads = ContextVar('replica_reads', default=False)
+# Set by db_for_write so the rest of the request reads from the primary
+_wrote = ContextVar('wrote', default=False)
+
+DEFAULTS = {
+    'REPLICAS': {}, # alias -> weight
+    'VIEWS': {}, # URL name -> read-after-write window in seconds
+    # Auth/session lookups happen on every request and must never be stale;
+    # 'django_cache' is DatabaseCache's table, whose version counters must not lag either
+    'PRIMARY_APPS': ['auth', 'sessions', 'contenttypes', 'admin', 'django_cache'],
+    'COOKIE_NAME': 'hs_last_write',
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'REPLICA_ROUTER', {})}
+
+
+def start_request():
+    """ Fresh per-request state; returns tokens for reset_request_state(). Used by ReplicaPinningMiddleware. """
+    return _replica_reads.set(False), _wrote.set(False)
+
+
+def enable_replica_reads():
+    _replica_reads.set(True)
+
+
+def reset_request_state(tokens):
+    replica_token, wrote_token = tokens
+    _replica_reads.reset(replica_token)
+    _wrote.reset(wrote_token)
+
+
+def wrote_during_request():
+    return _wrote.get()
+
+
+def should_pin(last_write, window, now=None):
+    """ True if a write at `last_write` (epoch seconds) is still inside the view's lag window. """
+    if last_write is None:
+        return False
+    return (now or time.time()) - last_write < window
+
+
+class ReplicaRouter:
+    """ Weighted replica selection for reads, primary for writes and migrations. """
+
+    def __init__(self):
+        config = get_config()
+        replicas = {alias: weight for alias, weight in config['REPLICAS'].items() if weight > 0}
+        self.replicas = list(replicas)
+        self.weights = list(replicas.values())
+        self.primary_apps = set(config['PRIMARY_APPS'])
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db # Follow relations on the database the object came from
+        if not self.replicas or not _replica_reads.get() or _wrote.get():
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label in self.primary_apps:
+            return DEFAULT_DB_ALIAS
+        return random.choices(self.replicas, weights=self.weights)[0]
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label != 'django_cache': # DatabaseCache sets aren't the user's writes
+            _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary, so cross-alias relations are fine
+        databases = {DEFAULT_DB_ALIAS, *self.replicas}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication, never from migrate
+        if db in self.replicas:
+            return False
+        return None
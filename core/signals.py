@@ -0,0 +1,97 @@
+# core/signals.py
+
+"""
+Signal handlers that keep DashboardSummary rows and cached template
+fragments current. Connected in CoreConfig.ready().
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from applications.models import Application
+from documents.models import CoverLetter
+from jobs.models import JobPosting
+from jobs.signals import postings_ingested
+from profiles.models import (
+    UserProfile, Education, WorkExperience, Skill,
+    Project, Award, Certification
+)
+from . import dashboard, fragments
+
+# Resume model -> dashboard section it affects
+PROFILE_SECTION_MODELS = {
+    Education: 'education',
+    WorkExperience: 'experience',
+    Skill: 'skills',
+    Project: 'projects',
+    Award: 'awards',
+    Certification: 'certifications',
+}
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def application_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        dashboard.refresh_applications(instance.user_id)
+
+
+@receiver(post_save, sender=CoverLetter)
+@receiver(post_delete, sender=CoverLetter)
+def cover_letter_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        dashboard.refresh_cover_letters(instance.user_id)
+
+
+@receiver(post_save, sender=JobPosting)
+def job_posting_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        dashboard.record_new_postings([instance])
+
+
+@receiver(postings_ingested, sender=JobPosting)
+def job_postings_ingested(sender, created, **kwargs):
+    dashboard.record_new_postings(created)
+
+
+@receiver(post_save, sender=UserProfile)
+def user_profile_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        dashboard.refresh_profile_section(instance, 'summary')
+
+
+def resume_section_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        profile = instance.profile
+    except UserProfile.DoesNotExist:
+        return # Profile is being deleted along with the user
+    dashboard.refresh_profile_section(profile, PROFILE_SECTION_MODELS[sender])
+
+
+for model in PROFILE_SECTION_MODELS:
+    post_save.connect(resume_section_changed, sender=model, dispatch_uid=f'dashboard_{model.__name__}_saved')
+    post_delete.connect(resume_section_changed, sender=model, dispatch_uid=f'dashboard_{model.__name__}_deleted')
+
+
+# --- Fragment cache versions (core/fragments.py), per object ---
+# Models rendered in cached fragments: job cards and resume section items
+FRAGMENT_MODELS = [JobPosting, *PROFILE_SECTION_MODELS]
+
+
+def fragment_model_changed(sender, instance, created=False, **kwargs):
+    # A new row has no cached fragment yet, so only updates and deletes invalidate
+    if not created:
+        fragments.invalidate(sender, [instance.pk])
+
+
+for model in FRAGMENT_MODELS:
+    post_save.connect(fragment_model_changed, sender=model, dispatch_uid=f'fragments_{model.__name__}_saved')
+    post_delete.connect(fragment_model_changed, sender=model, dispatch_uid=f'fragments_{model.__name__}_deleted')
+
+
+@receiver(postings_ingested, sender=JobPosting)
+def job_postings_ingested_fragments(sender, updated, **kwargs):
+    # New postings have no cached cards yet; only the updated postings' cards are stale
+    if updated:
+        fragments.invalidate(JobPosting, [posting.pk for posting in updated])
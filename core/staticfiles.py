@@ -0,0 +1,198 @@
+# core/staticfiles.py
+
+"""
+Production static file storage.
+
+PurgedManifestStaticFilesStorage is whitenoise's compressed manifest storage
+with one extra step at `collectstatic` time: before files are hashed, the
+Tailwind stylesheets listed in settings.STATIC_PURGE['CSS'] have every rule
+removed whose classes never appear in the project's templates (or in the
+static JS, for classes toggled at runtime). The purged file is then
+fingerprinted and pre-compressed to .gz and .br (Brotli when the `Brotli`
+package is installed) like every other asset.
+
+Hashed files are served by WhiteNoiseMiddleware with
+"Cache-Control: max-age=315360000, public, immutable".
+"""
+
+import fnmatch
+import logging
+import re
+from pathlib import Path
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PURGE = {
+    'CSS': ['css/tailwind*.css'], # Stylesheets to purge (static paths, glob patterns)
+    'CONTENT': ['*.html', '*.js'], # Files scanned for class names
+    'SAFELIST': ['dark'], # Classes added outside the scanned content (e.g. <html class="dark">)
+}
+
+# A class in a selector, including Tailwind's escaped characters (md\:flex, w-1\/2, \32xl\:...)
+SELECTOR_CLASS_RE = re.compile(r'\.((?:\\(?:[0-9a-fA-F]{1,6}\s?|.)|[\w-])+)')
+CSS_ESCAPE_RE = re.compile(r'\\([0-9a-fA-F]{1,6}\s?|.)')
+# Anything that could be a class name in markup: split on whitespace, quotes, tag brackets and
+# template tag delimiters ({% if x %}hidden{% endif %}); % stays inside arbitrary values (w-[50%])
+_TOKEN_CHAR = r'[^<>"\'`\s={}%]'
+CONTENT_TOKEN_RE = re.compile(rf'(?:{_TOKEN_CHAR}|(?<={_TOKEN_CHAR})%(?={_TOKEN_CHAR}))+')
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+# At-rules whose body holds ordinary style rules that can be purged
+NESTED_AT_RULES = ('@media', '@supports', '@layer', '@container')
+
+
+def get_purge_config():
+    return {**DEFAULT_PURGE, **getattr(settings, 'STATIC_PURGE', {})}
+
+
+def _unescape(name):
+    def replace(match):
+        value = match.group(1)
+        if re.fullmatch(r'[0-9a-fA-F]{1,6}\s?', value):
+            return chr(int(value.strip(), 16))
+        return value
+    return CSS_ESCAPE_RE.sub(replace, name)
+
+
+def content_dirs():
+    """ Template directories plus every app's templates/ and static/ directory. """
+    dirs = []
+    for engine in settings.TEMPLATES:
+        dirs.extend(Path(d) for d in engine.get('DIRS', []))
+    dirs.extend(Path(d) for d in getattr(settings, 'STATICFILES_DIRS', []))
+    for app_config in apps.get_app_configs():
+        # Django's own apps don't ship Tailwind markup
+        if app_config.name.startswith('django.'):
+            continue
+        for sub in ('templates', 'static'):
+            dirs.append(Path(app_config.path) / sub)
+    return [d for d in dirs if d.is_dir()]
+
+
+def used_class_names(patterns=None, dirs=None):
+    """ Every token in the scanned content that could be a class name. """
+    patterns = patterns or get_purge_config()['CONTENT']
+    tokens = set()
+    for directory in dirs if dirs is not None else content_dirs():
+        for path in directory.rglob('*'):
+            if path.is_file() and any(fnmatch.fnmatch(path.name, p) for p in patterns):
+                tokens.update(CONTENT_TOKEN_RE.findall(path.read_text(encoding='utf-8', errors='ignore')))
+    return tokens
+
+
+def _split_top_level(text, separator):
+    """ Splits on separator outside (), [] and quotes, e.g. selector lists with :is(a, b). """
+    parts, depth, quote, start = [], 0, None, 0
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote and text[i - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _blocks(css):
+    """
+    Yields (prelude, body) for each top-level rule; body is None for
+    statements like @import or @charset.
+    """
+    i, length = 0, len(css)
+    while i < length:
+        start, quote = i, None
+        while i < length:
+            char = css[i]
+            if quote:
+                if char == quote and css[i - 1] != '\\':
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char in '{;':
+                break
+            i += 1
+        prelude = css[start:i].strip()
+        if i >= length:
+            if prelude:
+                yield prelude, None
+            return
+        if css[i] == ';':
+            yield prelude, None
+            i += 1
+            continue
+        depth, body_start, quote = 1, i + 1, None
+        i += 1
+        while i < length and depth:
+            char = css[i]
+            if quote:
+                if char == quote and css[i - 1] != '\\':
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+            i += 1
+        yield prelude, css[body_start:i - 1]
+
+
+def purge_css(css, used):
+    """ Returns css without the rules whose selectors need a class that isn't in `used`. """
+    out = []
+    for prelude, body in _blocks(COMMENT_RE.sub('', css)):
+        if body is None:
+            out.append(f'{prelude};')
+        elif prelude.startswith(NESTED_AT_RULES):
+            inner = purge_css(body, used)
+            if inner.strip():
+                out.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            out.append(f'{prelude}{{{body}}}') # @font-face, @keyframes, @property...
+        else:
+            kept = [
+                selector for selector in _split_top_level(prelude, ',')
+                if all(_unescape(name) in used for name in SELECTOR_CLASS_RE.findall(selector))
+            ]
+            if kept:
+                out.append(f"{','.join(s.strip() for s in kept)}{{{body}}}")
+    return '\n'.join(out)
+
+
+class PurgedManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """ Compressed, fingerprinted storage that purges unused Tailwind classes first. """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            self.purge_stylesheets(paths)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def purge_stylesheets(self, paths):
+        """
+        Purges the collected copies of the matching stylesheets and points
+        their `paths` entries at them: hashing reads each file from the storage
+        it was collected from, which would fingerprint the unpurged original.
+        """
+        config = get_purge_config()
+        targets = [p for p in paths if any(fnmatch.fnmatch(p, pattern) for pattern in config['CSS'])]
+        if not targets:
+            return
+        used = used_class_names(config['CONTENT']) | set(config['SAFELIST'])
+        for path in targets:
+            with self.open(path) as f:
+                original = f.read().decode('utf-8')
+            purged = purge_css(original, used)
+            self.delete(path)
+            self._save(path, ContentFile(purged.encode('utf-8')))
+            paths[path] = (self, path)
+            logger.info(f"Purged {path}: {len(original)} -> {len(purged)} bytes.")
@@ -0,0 +1,20 @@
+from django import template
+from core.fragments import object_versions
+
+register = template.Library()
+
+
+@register.simple_tag
+def fragment_versions(objects):
+    """
+    Sets `fragment_version` on each object of a list or queryset, with one
+    cache round trip for the whole list. Renders nothing:
+        {% fragment_versions job_list %}
+        {% for job in job_list %}{% cache 86400 job_card job.pk job.fragment_version %}...
+    """
+    objects = list(objects or [])
+    if objects:
+        versions = object_versions(type(objects[0]), [obj.pk for obj in objects])
+        for obj in objects:
+            obj.fragment_version = versions[obj.pk]
+    return ''
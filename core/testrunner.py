@@ -0,0 +1,34 @@
+# core/testrunner.py
+
+"""
+Test runner used by the test settings profile (TEST_RUNNER).
+
+Postings created by tests feed the suggestion snapshot and the embedding
+store, which are files. The runner points both at a scratch directory for
+the run and removes it afterwards, instead of the settings module creating
+directories when it is imported.
+"""
+
+import os
+import shutil
+import tempfile
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class ScratchFilesRunner(DiscoverRunner):
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._scratch = tempfile.mkdtemp(prefix='hire-synapse-tests-')
+        self._override = override_settings(
+            JOB_SUGGEST_SNAPSHOT=os.path.join(self._scratch, 'job_suggestions.bin'),
+            EMBEDDINGS={**settings.EMBEDDINGS, 'DIRECTORY': os.path.join(self._scratch, 'embeddings')},
+        )
+        self._override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._override.disable()
+        shutil.rmtree(self._scratch, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
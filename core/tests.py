@@ -1,3 +1,536 @@
-from django.test import TestCase
+import json
+import math
+import random
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
 
-# Create your tests here.
+import numpy as np
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.mail import EmailMessage
+from django.core.mail.backends.smtp import EmailBackend
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import resolve, reverse
+
+from applications.models import Application
+from documents.models import CoverLetter
+from jobs.ingest import upsert_postings
+from jobs.models import JobPosting
+from jobs.views import JobListSearchView
+from profiles import skills
+from profiles.models import Skill, WorkExperience
+
+from . import dashboard, events, geo
+from .dbpool import ConnectionPool, PoolTimeout
+from .embeddings import EmbeddingStore, StubEmbeddingModel, embed, normalize_rows
+from .mailsink import SMTPStandIn
+from .models import DashboardSummary
+from .middleware import ReplicaPinningMiddleware
+from .ratelimit import CacheBackend, LocalMemoryBackend, Rate
+from .staticfiles import PurgedManifestStaticFilesStorage, purge_css, used_class_names
+from .vectorindex import IVFIndex
+from .views import HomePageView
+from .writequeue import WriteQueue
+
+
+class RateTests(SimpleTestCase):
+
+    def test_parse(self):
+        self.assertEqual(Rate.parse('30/m'), Rate(30, 60))
+        self.assertEqual(Rate.parse('100/5m'), Rate(100, 300))
+        with self.assertRaises(Exception):
+            Rate.parse('lots')
+
+
+class RateLimitBackendTests(SimpleTestCase):
+
+    def test_token_bucket_refills(self):
+        backend, rate = LocalMemoryBackend(), Rate(3, 60)
+        self.assertEqual([backend.hit('k', rate, now=0)[0] for _ in range(4)], [True, True, True, False])
+        allowed, retry_after = backend.hit('k', rate, now=0)
+        self.assertAlmostEqual(retry_after, 20) # One token every 20s
+        self.assertTrue(backend.hit('k', rate, now=20)[0])
+        self.assertTrue(backend.hit('other', rate, now=20)[0]) # Keys are independent
+
+    def test_sliding_window(self):
+        cache.clear()
+        backend, rate = CacheBackend(), Rate(4, 60)
+        results = [backend.hit('k', rate, now=30)[0] for _ in range(5)]
+        self.assertEqual(results, [True] * 4 + [False])
+        # Halfway through the next window, half of the previous window's hits still count
+        self.assertEqual([backend.hit('k', rate, now=90)[0] for _ in range(3)], [True, True, False])
+
+
+@override_settings(RATELIMIT={'RULES': {'jobs:job_suggest': '2/m'}})
+class RateLimitMiddlewareTests(TestCase):
+
+    def test_returns_429_with_retry_after(self):
+        url = reverse('jobs:job_suggest')
+        codes = [self.client.get(url, {'q': 'py'}).status_code for _ in range(2)]
+        self.assertEqual(codes, [200, 200])
+        response = self.client.get(url, {'q': 'py'})
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        # Clients are counted separately
+        self.assertEqual(self.client.get(url, {'q': 'py'}, REMOTE_ADDR='10.0.0.9').status_code, 200)
+
+    @override_settings(RATELIMIT={'RULES': {'jobs:job_suggest': '2/m'}, 'IP_HEADER': 'HTTP_X_FORWARDED_FOR',
+                                  'TRUSTED_PROXIES': 1})
+    def test_spoofed_forwarded_for_hops_do_not_reset_the_limit(self):
+        url = reverse('jobs:job_suggest')
+        # The client makes up the first hop each time; the proxy appends the real address
+        codes = [
+            self.client.get(url, {'q': 'py'}, HTTP_X_FORWARDED_FOR=f'198.51.100.{i}, 203.0.113.7').status_code
+            for i in range(3)
+        ]
+        self.assertEqual(codes, [200, 200, 429])
+        self.assertEqual(
+            self.client.get(url, {'q': 'py'}, HTTP_X_FORWARDED_FOR='198.51.100.1, 203.0.113.8').status_code, 200,
+        )
+
+
+class PurgeCSSTests(SimpleTestCase):
+
+    def test_drops_rules_for_unused_classes(self):
+        css = (
+            '/* build */ .flex{display:flex} .grid{display:grid}'
+            '@media (min-width:768px){.md\\:p-8{padding:2rem}.md\\:grid{display:grid}}'
+            '.hover\\:underline:hover,.flex:focus{outline:0}'
+            '@keyframes spin{to{transform:rotate(360deg)}}'
+        )
+        purged = purge_css(css, {'flex', 'md:p-8'})
+        self.assertIn('.flex{display:flex}', purged)
+        self.assertIn('@media (min-width:768px){.md\\:p-8{padding:2rem}}', purged)
+        self.assertIn('.flex:focus{outline:0}', purged)
+        self.assertIn('@keyframes spin', purged)
+        self.assertNotIn('grid', purged)
+        self.assertNotIn('underline', purged)
+
+    def test_classes_inside_template_tags_are_kept(self):
+        with tempfile.TemporaryDirectory() as content:
+            Path(content, 'card.html').write_text(
+                '<p class="{% if x %}hidden{% endif %} w-[50%] {{ extra }}">{%if y%}italic{%endif%}</p>'
+            )
+            used = used_class_names(['*.html'], [Path(content)])
+        self.assertTrue({'hidden', 'italic', 'w-[50%]'} <= used)
+        css = '.hidden{display:none}.italic{font-style:italic}.w-\\[50\\%\\]{width:50%}'
+        self.assertEqual(purge_css(css, used).split('\n'), css.replace('}.', '}\n.').split('\n'))
+
+    def test_hashed_stylesheet_is_purged(self):
+        css = '.flex{display:flex}.zz-never-used{color:red}'
+        with tempfile.TemporaryDirectory() as source_dir, tempfile.TemporaryDirectory() as root:
+            source = FileSystemStorage(location=source_dir)
+            source.save('css/tailwind.css', ContentFile(css.encode()))
+            storage = PurgedManifestStaticFilesStorage(location=root, base_url='/static/')
+            storage.save('css/tailwind.css', ContentFile(css.encode())) # What collectstatic copies
+            list(storage.post_process({'css/tailwind.css': (source, 'css/tailwind.css')}))
+
+            with storage.open(storage.manifest_name) as f:
+                hashed = json.load(f)['paths']['css/tailwind.css']
+            self.assertNotEqual(hashed, 'css/tailwind.css')
+            with storage.open(hashed) as f:
+                served = f.read().decode()
+        self.assertIn('.flex{display:flex}', served)
+        self.assertNotIn('zz-never-used', served)
+
+
+class WriteQueueTests(TransactionTestCase):
+
+    def test_failed_write_does_not_undo_its_batch(self):
+        def fail():
+            User.objects.create(username='first-batch-mate')
+            raise ValueError('boom')
+
+        write_queue = WriteQueue()
+        futures = [write_queue.submit(User.objects.create, username=f'user{i}') for i in range(5)]
+        failing = write_queue.submit(fail)
+        write_queue.stop()
+        self.assertEqual([f.result().username for f in futures], [f'user{i}' for i in range(5)])
+        self.assertIsInstance(failing.exception(), ValueError)
+        # The failing write's own changes are rolled back, the others are committed
+        self.assertEqual(User.objects.count(), 5)
+
+
+class DashboardTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('dash')
+        self.profile = self.user.profile
+
+    def tearDown(self):
+        skills.reset_alias_map()
+
+    def _home_context(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        view = HomePageView()
+        view.setup(request)
+        return view.get_context_data()
+
+    def test_summary_is_built_on_first_visit_then_read_as_one_row(self):
+        Application.objects.create(user=self.user, company_name='Acme', job_title='Engineer', status='APPLIED')
+        Application.objects.create(user=self.user, company_name='Initech', job_title='Engineer', status='APPLIED')
+        Application.objects.create(user=self.user, company_name='Hooli', job_title='Engineer', status='OFFER')
+        Skill.objects.create(profile=self.profile, name='Python')
+        self.assertFalse(DashboardSummary.objects.exists()) # Handlers leave users without a row alone
+
+        summary = self._home_context()['dashboard']
+        self.assertEqual((summary.application_counts, summary.application_total), ({'APPLIED': 2, 'OFFER': 1}, 3))
+        self.assertEqual({s for s, filled in summary.profile_sections.items() if filled}, {'skills'})
+        self.assertEqual(summary.profile_completeness, 14)
+
+        # From then on the home page is one query, however much the user has
+        with self.assertNumQueries(1):
+            self._home_context()
+        Application.objects.bulk_create([
+            Application(user=self.user, company_name=f'Company {i}', job_title='Engineer') for i in range(20)
+        ])
+        with self.assertNumQueries(1):
+            self._home_context()
+
+    def test_signals_keep_the_summary_current(self):
+        dashboard.get_summary(self.user)
+        application = Application.objects.create(user=self.user, company_name='Acme', job_title='Engineer')
+        letters = [CoverLetter.objects.create(user=self.user, title=f'Letter {i}', body='Dear team') for i in range(4)]
+        WorkExperience.objects.create(profile=self.profile, job_title='Engineer', company_name='Acme', start_date=date(2020, 1, 1))
+        self.profile.summary = 'Backend engineer'
+        self.profile.save()
+
+        summary = DashboardSummary.objects.get(user=self.user)
+        self.assertEqual((summary.application_counts, summary.application_total), ({'WISHLIST': 1}, 1))
+        self.assertEqual([c['title'] for c in summary.recent_cover_letters], ['Letter 3', 'Letter 2', 'Letter 1'])
+        self.assertTrue(summary.profile_sections['experience'] and summary.profile_sections['summary'])
+
+        application.delete()
+        letters[3].delete()
+        self.profile.experience.all().delete()
+        summary.refresh_from_db()
+        self.assertEqual((summary.application_counts, summary.application_total), ({}, 0))
+        self.assertEqual([c['title'] for c in summary.recent_cover_letters], ['Letter 2', 'Letter 1', 'Letter 0'])
+        self.assertFalse(summary.profile_sections['experience'])
+
+    def test_new_postings_matching_skills_bump_the_badge(self):
+        Skill.objects.create(profile=self.profile, name='Python')
+        other = User.objects.create_user('other')
+        dashboard.get_summary(self.user)
+        dashboard.get_summary(other)
+
+        JobPosting.objects.create(title='Senior Python Developer', job_url='https://example.com/1')
+        upsert_postings([
+            {'title': f'{title} Engineer', 'job_url': f'https://example.com/{title}', 'description': ''}
+            for title in ('Python', 'Java', 'Python Backend')
+        ])
+        counts = dict(DashboardSummary.objects.values_list('user__username', 'new_matching_jobs'))
+        self.assertEqual(counts, {'dash': 3, 'other': 0})
+
+        self.assertTrue(dashboard.has_unseen_jobs(self.user.pk))
+        dashboard.mark_jobs_seen(self.user)
+        self.assertFalse(dashboard.has_unseen_jobs(self.user.pk))
+
+
+@override_settings(
+    REPLICA_ROUTER={'REPLICAS': {'replica1': 1}, 'VIEWS': {'jobs:job_list_search': 5}},
+    DATABASE_ROUTERS=['core.routers.ReplicaRouter'],
+)
+class ReplicaRouterTests(TestCase):
+    databases = {'default', 'replica1'}
+
+    @classmethod
+    def setUpTestData(cls):
+        # Different rows on each side so the response shows which database answered
+        JobPosting(title='primary', job_url='https://example.com/p').save(using='default')
+        JobPosting(title='replica', job_url='https://example.com/r').save(using='replica1')
+
+    def _get(self, path='/jobs/', cookies=None, write=False):
+        def view(request):
+            middleware.process_view(request, view, (), {})
+            if write:
+                JobPosting.objects.create(title='new', job_url='https://example.com/new')
+            titles = JobPosting.objects.filter(title__in=['primary', 'replica']).values_list('title', flat=True)
+            return HttpResponse(','.join(titles))
+
+        middleware = ReplicaPinningMiddleware(view)
+        request = RequestFactory().get(path)
+        request.resolver_match = resolve(path)
+        request.COOKIES.update(cookies or {})
+        return middleware(request)
+
+    def test_listed_view_reads_from_replica(self):
+        self.assertEqual(self._get().content, b'replica')
+
+    def test_unlisted_view_reads_from_primary(self):
+        self.assertEqual(self._get('/interview-prep/').content, b'primary')
+
+    def test_recent_write_pins_to_primary(self):
+        self.assertEqual(self._get(cookies={'hs_last_write': str(time.time() - 1)}).content, b'primary')
+        self.assertEqual(self._get(cookies={'hs_last_write': str(time.time() - 60)}).content, b'replica')
+
+    def test_write_pins_rest_of_request_and_sets_cookie(self):
+        response = self._get(write=True)
+        self.assertEqual(response.content, b'primary')
+        self.assertIn('hs_last_write', response.cookies)
+        self.assertEqual(JobPosting.objects.using('replica1').filter(title='new').count(), 0)
+
+    def test_signed_in_job_list_only_pins_when_it_resets_the_badge(self):
+        user = User.objects.create_user('reader')
+        User.objects.using('replica1').bulk_create([User(pk=user.pk, username='reader')]) # "Replicated", no signals
+        job_list = JobListSearchView.as_view()
+        self.addCleanup(events.get_tracker().buffer.drain) # The page's impressions
+
+        def view(request):
+            middleware.process_view(request, job_list, (), {})
+            return job_list(request) # Left unrendered: only the routing matters here
+
+        middleware = ReplicaPinningMiddleware(view)
+
+        def get():
+            request = RequestFactory().get('/jobs/')
+            request.resolver_match = resolve('/jobs/')
+            request.user = user
+            return middleware(request)
+
+        self.assertNotIn('hs_last_write', get().cookies) # Nothing to reset: no write, no pinning
+
+        for alias in ('default', 'replica1'):
+            DashboardSummary.objects.using(alias).update_or_create(user_id=user.pk, defaults={'new_matching_jobs': 3})
+        self.assertIn('hs_last_write', get().cookies)
+        self.assertEqual(DashboardSummary.objects.get(user=user).new_matching_jobs, 0)
+
+
+class FakeConnection:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def test_reuses_returned_connections(self):
+        pool = ConnectionPool(FakeConnection, max_size=2)
+        first = pool.getconn()
+        second = pool.getconn()
+        self.assertEqual(pool.metrics()['in_use'], 2)
+        pool.putconn(first)
+        self.assertIs(pool.getconn(), first)
+        pool.putconn(first)
+        pool.putconn(second)
+        metrics = pool.metrics()
+        self.assertEqual((metrics['size'], metrics['in_use'], metrics['idle'], metrics['created']), (2, 0, 2, 2))
+
+    def test_waits_for_a_free_connection_then_times_out(self):
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=5)
+        conn = pool.getconn()
+        threading.Timer(0.05, pool.putconn, [conn]).start()
+        self.assertIs(pool.getconn(), conn) # Blocked until the timer returned it
+        with self.assertRaises(PoolTimeout):
+            pool.getconn(timeout=0.01)
+        metrics = pool.metrics()
+        self.assertEqual((metrics['waits'], metrics['timeouts']), (2, 1))
+        self.assertGreaterEqual(metrics['wait_ms_max'], 40)
+
+    def test_broken_connections_are_replaced(self):
+        resets = []
+        pool = ConnectionPool(FakeConnection, max_size=1, reset=resets.append)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        self.assertEqual(resets, [conn])
+        conn.closed = True # e.g. the server restarted while it sat idle
+        replacement = pool.getconn()
+        self.assertIsNot(replacement, conn)
+        self.assertEqual(pool.metrics()['size'], 1)
+
+
+class PooledBackendTests(SimpleTestCase):
+
+    def test_builds_pool_from_options(self):
+        from django.db import connections
+        from core.backends.postgresql_pool.base import DatabaseWrapper
+        settings_dict = connections.configure_settings({
+            'default': connections['default'].settings_dict,
+            'pooled': {
+                'ENGINE': 'core.backends.postgresql_pool', 'NAME': 'hire_synapse', 'CONN_MAX_AGE': 0,
+                'OPTIONS': {'pool': {'max_size': 4}},
+            },
+        })['pooled']
+        wrapper = DatabaseWrapper(settings_dict, alias='pooled')
+        try:
+            self.assertIsInstance(wrapper.pool, ConnectionPool)
+            self.assertEqual(wrapper.pool.max_size, 4)
+            self.assertNotIn('pool', wrapper.get_connection_params())
+        finally:
+            wrapper._connection_pools.pop('pooled', None)
+
+
+class GeoTests(SimpleTestCase):
+
+    def test_resolve(self):
+        self.assertEqual(geo.resolve('Bangalore, Karnataka')[:2], ('Bengaluru', 'IN'))
+        self.assertEqual(geo.resolve('Cambridge, UK')[:2], ('Cambridge', 'GB'))
+        self.assertEqual(geo.resolve('Remote - India'), geo.Place('', 'IN', None, None, True))
+        self.assertIsNone(geo.resolve('Somewhere nice'))
+
+    def test_geohash(self):
+        self.assertEqual(geo.encode(57.64911, 10.40744, 11), 'u4pruydqqvj') # Reference value
+        south, west, north, east = geo.cell_bounds('u4pruydqqvj')
+        self.assertTrue(south <= 57.64911 <= north and west <= 10.40744 <= east)
+
+    def test_cover_contains_every_point_in_the_radius(self):
+        rng = random.Random(7)
+        for lat, lon, km in ((28.61, 77.21, 50), (51.5, -0.12, 5), (64.1, -21.9, 200), (-33.9, 151.2, 25), (0.1, 179.9, 100)):
+            cells = geo.cover(lat, lon, km)
+            self.assertLessEqual(len(cells), geo.MAX_COVER_CELLS)
+            for _ in range(200):
+                # A random point inside the circle
+                d, bearing = km * rng.random() ** 0.5, rng.uniform(0, 2 * math.pi)
+                p_lat = lat + d / 111.32 * math.cos(bearing)
+                p_lon = lon + d / (111.32 * math.cos(math.radians(lat))) * math.sin(bearing)
+                p_lon = (p_lon + 180) % 360 - 180
+                if geo.haversine_km(lat, lon, p_lat, p_lon) > km:
+                    continue
+                point = geo.encode(p_lat, p_lon)
+                self.assertTrue(any(point.startswith(cell) for cell in cells), (lat, lon, km, p_lat, p_lon))
+
+
+class SMTPStandInTests(SimpleTestCase):
+
+    def test_messages_are_saved_as_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            server = SMTPStandIn(('127.0.0.1', 0), directory)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            try:
+                backend = EmailBackend(host='127.0.0.1', port=server.server_address[1], use_tls=False)
+                messages = [EmailMessage(f'Digest {i}', 'Body\n.starts with a dot', 'a@example.com', ['b@example.com'])
+                            for i in range(2)]
+                self.assertEqual(backend.send_messages(messages), 2) # Both over one connection
+            finally:
+                server.shutdown()
+                server.server_close()
+            files = sorted(Path(directory).glob('*.eml'))
+            self.assertEqual(len(files), 2)
+            saved = files[0].read_text()
+            self.assertIn('Subject: Digest 0', saved)
+            self.assertIn('\n.starts with a dot', saved)
+
+
+class CountingModel(StubEmbeddingModel):
+    """ The stub model, remembering how many texts it was asked to embed. """
+
+    def __init__(self, dim=64):
+        super().__init__(dim)
+        self.embedded = 0
+
+    def embed(self, texts):
+        self.embedded += len(texts)
+        return super().embed(texts)
+
+
+class EmbeddingTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_stub_model_is_deterministic_and_lexical(self):
+        model = StubEmbeddingModel(dim=128)
+        a, b, c = model.embed(['Senior Python developer', 'Python developer, senior', 'Pastry chef'])
+        self.assertAlmostEqual(float(np.linalg.norm(a)), 1.0, places=5)
+        self.assertTrue(np.array_equal(a, model.embed(['Senior Python developer'])[0]))
+        self.assertGreater(a @ b, a @ c)
+
+    def test_store_embeds_each_text_once(self):
+        model = CountingModel()
+        store = EmbeddingStore(Path(self.directory.name) / 'store', model.dim)
+        first = embed(['python', 'rust', 'python'], model=model, store=store)
+        self.assertEqual(model.embedded, 2) # The duplicate too is embedded once
+        again = embed(['rust', 'python', 'go'], model=model, store=store)
+        self.assertEqual(model.embedded, 3)
+        self.assertTrue(np.allclose(again[1], first[0], atol=1e-3)) # float16 on disk
+        # Another process opening the same files sees everything
+        self.assertEqual(len(EmbeddingStore(store.directory, model.dim)), 3)
+
+    def test_ivf_index(self):
+        rng = np.random.default_rng(0)
+        vectors = normalize_rows(rng.standard_normal((5000, 32), dtype=np.float32))
+        index = IVFIndex(Path(self.directory.name) / 'index', 32)
+        index.build(np.arange(5000), vectors)
+        self.assertEqual(index.stats()['nlist'], 70)
+        exact = set(np.argsort(-(vectors @ vectors[7]))[:10].tolist())
+        found = index.search(vectors[7], k=10, nprobe=70)
+        self.assertEqual({pk for pk, _ in found}, exact)
+        self.assertEqual(found[0][0], 7)
+
+        # Inserts are searchable right away, a re-inserted id replaces its vector, compaction keeps both
+        index.insert(np.array([9000, 7]), np.stack([vectors[7], -vectors[7]]))
+        self.assertEqual([pk for pk, _ in index.search(vectors[7], k=2, nprobe=70)][0], 9000)
+        self.assertNotIn(7, {pk for pk, _ in index.search(vectors[7], k=10, nprobe=70)})
+        index.compact()
+        self.assertEqual(index.stats()['delta'], 0)
+        self.assertEqual(len(index), 5001)
+        reopened = IVFIndex(index.path, 32)
+        self.assertEqual(reopened.search(-vectors[7], k=1, nprobe=70)[0][0], 7)
+
+
+class EventTrackerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.written = []
+        events.register('test_event', self.written.extend)
+        self.addCleanup(events._handlers.pop, 'test_event')
+
+    def test_ring_buffer_overwrites_the_oldest(self):
+        tracker = events.EventTracker(capacity=3, flush_interval=None)
+        for i in range(5):
+            tracker.track('test_event', i)
+        self.assertEqual(tracker.flush(), 3)
+        self.assertEqual([event[2] for event in self.written], [2, 3, 4])
+        self.assertEqual((tracker.stats()['tracked'], tracker.stats()['dropped']), (5, 2))
+
+    def test_failed_batch_is_kept_for_the_next_flush(self):
+        def flaky(batch):
+            events.register('test_event', self.written.extend) # Works from the second flush on
+            raise OSError('database unavailable')
+        events.register('test_event', flaky)
+        tracker = events.EventTracker(capacity=10, flush_interval=None)
+        tracker.track('test_event', 1)
+        with self.assertLogs('core.events', 'ERROR'):
+            self.assertEqual(tracker.flush(), 0)
+        self.assertEqual(tracker.flush(), 1)
+        self.assertEqual(len(self.written), 1)
+
+    def test_batch_that_keeps_failing_is_discarded(self):
+        def broken(batch):
+            raise ValueError('bad batch')
+        events.register('test_event', broken)
+        tracker = events.EventTracker(capacity=10, flush_interval=None, max_retries=2)
+        tracker.track('test_event', 1)
+        with self.assertLogs('core.events', 'ERROR') as logs:
+            for _ in range(3):
+                tracker.flush()
+        self.assertIn('discarding them', logs.output[-1])
+        self.assertEqual((len(tracker.buffer), tracker.stats()['discarded'], tracker.failed_flushes), (0, 1, 3))
+        # The next batch of that kind gets its retries again
+        events.register('test_event', self.written.extend)
+        tracker.track('test_event', 2)
+        self.assertEqual(tracker.flush(), 1)
+
+    def test_background_flush_and_stop_lose_nothing(self):
+        tracker = events.EventTracker(capacity=100, flush_interval=0.01)
+        tracker.track('test_event', 'early')
+        deadline = time.monotonic() + 5
+        while not self.written and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.written), 1) # Flushed by the thread
+        for i in range(20):
+            tracker.track('test_event', i)
+        tracker.stop(timeout=5) # Graceful shutdown: stops the thread, then writes the rest
+        self.assertEqual(len(self.written), 21)
+        self.assertFalse(tracker.stats()['flusher_running'])
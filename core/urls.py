@@ -1,9 +1,11 @@
 from django.urls import path
-from .views import HomePageView # Import the view
+from .views import HomePageView, MetricsView # Import the views
 
 app_name = 'core' # Define app namespace <--- ADD THIS LINE
 
 urlpatterns = [
     # Map the empty path within this app to the HomePageView
     path('', HomePageView.as_view(), name='home'),
+    # Per-process instrumentation (connection pools etc.) as JSON, staff only
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
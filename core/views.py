@@ -1,7 +1,11 @@
 # core/views.py
 
 from django.shortcuts import render # Optional for TemplateView, but good practice
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import JsonResponse
+from django.views import View
 from django.views.generic import TemplateView # Import TemplateView
+from . import dashboard, metrics
 
 # Define the view for the homepage
 class HomePageView(TemplateView):
@@ -13,13 +17,23 @@ class HomePageView(TemplateView):
     # Specify the template file to be rendered when this view is accessed
     template_name = "core/home.html"
 
-    # Optional: You can add context data to pass to the template if needed
-    # def get_context_data(self, **kwargs):
-    #     # Get the default context from the parent class
-    #     context = super().get_context_data(**kwargs)
-    #     # Add custom context variables
-    #     context['page_title'] = 'Welcome!'
-    #     context['featured_content'] = SomeModel.objects.filter(featured=True)
-    #     # Return the updated context dictionary
-    #     return context
+    def get_context_data(self, **kwargs):
+        """ Adds the signed-in user's dashboard summary (a single row read). """
+        context = super().get_context_data(**kwargs)
+        if self.request.user.is_authenticated:
+            context['dashboard'] = dashboard.get_summary(self.request.user)
+        return context
 
+
+class MetricsView(UserPassesTestMixin, View):
+    """
+    Returns core.metrics.snapshot() as JSON: connection pool usage and
+    anything else registered with core.metrics. Values are for the worker
+    process that answered the request.
+    """
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(metrics.snapshot())
@@ -0,0 +1,152 @@
+# core/writequeue.py
+
+"""
+Optional write queue for SQLite deployments.
+
+SQLite allows one writer at a time. When several request threads write at
+once, all but one wait on the database lock (or fail with "database is
+locked" once busy_timeout runs out). With settings.SQLITE_WRITE_QUEUE on,
+writes submitted through run_write() are handed to a single background
+thread that owns its own connection and commits them in small batches:
+many queued writes share one transaction and one WAL sync. Reads keep using
+the request thread's normal connection and never wait on the queue.
+
+The queue is per process. Across several gunicorn worker processes, writes
+are still serialized by SQLite itself, which is why WAL and busy_timeout
+are set as well (see SQLITE_PRAGMAS in settings).
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteQueue:
+    """ Runs submitted callables one after another on a dedicated writer thread. """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, max_batch=100, max_pending=10_000):
+        self.using = using
+        self.max_batch = max_batch
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """ Queues fn(*args, **kwargs). Returns a Future with its result. """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((future, fn, args, kwargs)) # Blocks when max_pending writes are waiting
+        return future
+
+    def run(self, fn, *args, timeout=None, **kwargs):
+        """ Queues fn and waits for it to be committed. """
+        return self.submit(fn, *args, **kwargs).result(timeout)
+
+    def stop(self, timeout=None):
+        """ Commits everything already queued, then stops the writer thread. """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    return
+                batch = [item]
+                stop = False
+                # Group whatever else is already waiting into the same transaction
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                self._commit(batch)
+                if stop:
+                    return
+        finally:
+            connections[self.using].close()
+
+    def _commit(self, batch):
+        connections[self.using].close_if_unusable_or_obsolete()
+        outcomes = []
+        try:
+            with transaction.atomic(using=self.using):
+                for future, fn, args, kwargs in batch:
+                    try:
+                        # Savepoint per write: one failing write doesn't undo the rest of the batch
+                        with transaction.atomic(using=self.using):
+                            outcomes.append((future, fn(*args, **kwargs), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except Exception as e:
+            logger.error(f"Write queue batch of {len(batch)} failed to commit: {e}", exc_info=True)
+            outcomes = [(future, None, e) for future, *_ in batch]
+        # Results are only published once the batch is durable
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+_write_queue = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue():
+    """ The process-wide queue, or None when disabled or not running on SQLite. """
+    global _write_queue
+    if not getattr(settings, 'SQLITE_WRITE_QUEUE', False) or connection.vendor != 'sqlite':
+        return None
+    if _write_queue is None:
+        with _write_queue_lock:
+            if _write_queue is None:
+                _write_queue = WriteQueue()
+                atexit.register(_write_queue.stop, 10) # Flush pending writes on shutdown
+    return _write_queue
+
+
+def run_write(fn, *args, wait=True, **kwargs):
+    """
+    Runs a write through the queue when it's enabled, or inline otherwise.
+    With wait=False the caller doesn't wait for the commit (fire and forget);
+    use it only for writes nothing in the current request depends on.
+    """
+    write_queue = get_write_queue()
+    if write_queue is None:
+        return fn(*args, **kwargs)
+    future = write_queue.submit(fn, *args, **kwargs)
+    if wait:
+        return future.result()
+    future.add_done_callback(_log_failure)
+    return None
+
+
+def _log_failure(future):
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Queued write failed: {error}", exc_info=error)
@@ -1,3 +1,29 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .models import CoverLetter
+
+
+class CoverLetterOwnershipTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create(username='owner')
+        cls.other = User.objects.create(username='other')
+
+    def setUp(self):
+        self.client.force_login(self.owner)
+
+    def test_delete_loads_object_once(self):
+        letter = CoverLetter.objects.create(user=self.owner, title='Acme', body='Dear Acme')
+        # Session, user, the owner-filtered letter, DELETE, dashboard refresh. Was 7.
+        with self.assertNumQueries(5):
+            self.client.post(reverse('documents:coverletter_delete', args=[letter.pk]))
+        self.assertFalse(CoverLetter.objects.filter(pk=letter.pk).exists())
+
+    def test_other_users_letters_are_not_found(self):
+        letter = CoverLetter.objects.create(user=self.other, title='Acme', body='Dear Acme')
+        response = self.client.post(reverse('documents:coverletter_delete', args=[letter.pk]))
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(CoverLetter.objects.filter(pk=letter.pk).exists())
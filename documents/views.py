@@ -3,8 +3,9 @@
 from django.shortcuts import render # Not strictly needed for these Class-Based Views, but good practice
 from django.urls import reverse_lazy # Used for success_url redirection
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin # For access control
+from django.contrib.auth.mixins import LoginRequiredMixin # For access control
 from django.contrib import messages # To show success/error messages to the user
+from core.mixins import OwnerScopedMixin # Owner check inside the single object query
 from .models import CoverLetter # Import the model this app works with
 from .forms import CoverLetterForm # Import the form used for creating/editing
 
@@ -78,10 +79,11 @@ class CoverLetterCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 # View to handle editing an existing cover letter
-class CoverLetterUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class CoverLetterUpdateView(LoginRequiredMixin, OwnerScopedMixin, UpdateView):
     """
     Handles the display of the form pre-filled with an existing cover letter's data
     and the processing of the form submission for updates.
+    OwnerScopedMixin only finds the user's own letters (others get a 404).
     """
     model = CoverLetter
     form_class = CoverLetterForm
@@ -94,14 +96,6 @@ class CoverLetterUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView)
         context['form_title'] = 'Edit Cover Letter' # Pass title to template
         return context
 
-    def test_func(self):
-        """
-        Ensures the user trying to edit the cover letter is the owner.
-        UserPassesTestMixin runs this check before displaying the view.
-        """
-        cover_letter = self.get_object() # Get the object being updated
-        return self.request.user == cover_letter.user # Check ownership
-
     def form_valid(self, form):
         """ Called when the submitted form data is valid. """
         # Add a success message
@@ -110,21 +104,17 @@ class CoverLetterUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView)
         return super().form_valid(form)
 
 # View to handle the deletion of a cover letter
-class CoverLetterDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class CoverLetterDeleteView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
     """
     Handles the display of the confirmation page for deleting a cover letter
     and processes the actual deletion upon confirmation (POST request).
+    OwnerScopedMixin only finds the user's own letters (others get a 404).
     """
     model = CoverLetter
     template_name = 'documents/coverletter_confirm_delete.html' # Confirmation template
     success_url = reverse_lazy('documents:coverletter_list') # Redirect to list view after deletion
     context_object_name = 'coverletter' # Name for the object in the template context
 
-    def test_func(self):
-        """ Ensures the user trying to delete the cover letter is the owner. """
-        cover_letter = self.get_object()
-        return self.request.user == cover_letter.user
-
     # Override post to add the success message *after* deletion
     def post(self, request, *args, **kwargs):
         """ Handles the POST request to confirm deletion. """
@@ -0,0 +1,12 @@
+# gunicorn.conf.py
+
+"""
+Gunicorn reads this file from the working directory by default
+(`gunicorn hire_synapse.wsgi`). Command-line options still take precedence.
+"""
+
+
+def worker_exit(server, worker):
+    """ Writes the worker's buffered click/impression events before it exits (see core/events.py). """
+    from core import events
+    events.shutdown()
@@ -8,9 +8,13 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
 import os
+from pathlib import Path
+
+from dotenv import load_dotenv
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hire_synapse.settings')
+load_dotenv(Path(__file__).resolve().parent.parent / '.env') # Never overrides variables already set
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hire_synapse.settings.prod')
 
 application = get_asgi_application()
@@ -0,0 +1,2 @@
+# Settings profiles for hire_synapse. Pick one with DJANGO_SETTINGS_MODULE,
+# e.g. hire_synapse.settings.prod; see base.py for what each profile changes.
@@ -0,0 +1,16 @@
+"""
+Local development profile: DEBUG on, SQLite unless DATABASE_URL is set,
+and a fixed insecure secret key so a fresh checkout runs without any setup.
+"""
+
+from .base import * # noqa: F401,F403
+from .base import env_bool, env_list
+
+DEBUG = env_bool('DJANGO_DEBUG', True)
+
+SECRET_KEY = SECRET_KEY or 'django-insecure-nu87tsz_vi%vh1va!b8&=dru^sd&s-e)!3)ig@n+y##g&@f8h-'
+
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', ['*'])
+
+# Always serve fresh static files while developing
+WHITENOISE_MAX_AGE = 0
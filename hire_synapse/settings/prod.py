@@ -0,0 +1,47 @@
+"""
+Production profile. Required environment:
+  DJANGO_SECRET_KEY, DJANGO_ALLOWED_HOSTS (comma separated), DATABASE_URL,
+  and a shared cache: REDIS_URL or DJANGO_DATABASE_CACHE=true (see CACHES in base.py)
+Optional: DB_CONN_MAX_AGE (default 600s, ignored with DB_POOL_MAX_SIZE), DB_POOL_*,
+DJANGO_SECURE_SSL_REDIRECT, DJANGO_BEHIND_PROXY, RATELIMIT_TRUSTED_PROXIES.
+"""
+
+import os
+from django.core.exceptions import ImproperlyConfigured
+from .base import * # noqa: F401,F403
+from .base import CACHES, DATABASES, SECRET_KEY, ALLOWED_HOSTS, TEMPLATES, env_bool
+
+DEBUG = False
+
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Set DJANGO_SECRET_KEY for the production profile.')
+if not ALLOWED_HOSTS:
+    raise ImproperlyConfigured('Set DJANGO_ALLOWED_HOSTS for the production profile.')
+if CACHES['default']['BACKEND'] == 'django.core.cache.backends.locmem.LocMemCache':
+    # Each worker would keep its own cache versions and never see another process's invalidations
+    raise ImproperlyConfigured('Set REDIS_URL or DJANGO_DATABASE_CACHE=true for the production profile.')
+
+# Reuse database connections across requests; health checks drop dead ones.
+# A connection pool (DB_POOL_MAX_SIZE) replaces persistent per-thread connections.
+if 'pool' not in DATABASES['default'].get('OPTIONS', {}):
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', '600'))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Parse and compile each template once per process instead of on every render
+TEMPLATES[0]['APP_DIRS'] = False # Can't be combined with explicit loaders
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+SECURE_SSL_REDIRECT = env_bool('DJANGO_SECURE_SSL_REDIRECT', False)
+if env_bool('DJANGO_BEHIND_PROXY', False):
+    # Trust the proxy's scheme header and take client IPs for rate limiting from X-Forwarded-For,
+    # counting RATELIMIT_TRUSTED_PROXIES hops (proxies that append to it) from the right
+    SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+    RATELIMIT = {**RATELIMIT, 'IP_HEADER': 'HTTP_X_FORWARDED_FOR', # noqa: F405
+                 'TRUSTED_PROXIES': int(os.environ.get('RATELIMIT_TRUSTED_PROXIES', '1'))}
@@ -0,0 +1,51 @@
+"""
+Profile used by `manage.py test`: fast password hashing, plain static
+storage (no collectstatic needed), a private in-memory cache and quieter logs.
+"""
+
+from .base import * # noqa: F401,F403
+from .base import DATABASES, LOGGING
+
+DEBUG = False
+
+SECRET_KEY = 'test-only-not-secret'
+
+ALLOWED_HOSTS = ['testserver', 'localhost']
+
+# The default PBKDF2 hasher is deliberately slow; tests create many users
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# A second, independent SQLite database so router tests can tell which one answered.
+# Only created for tests that list it in `databases`.
+DATABASES['replica1'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': BASE_DIR / 'var' / 'replica1.sqlite3', # noqa: F405 - in-memory during tests
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'hire-synapse-tests',
+    },
+}
+
+STATIC_ROOT = None # Nothing is collected for tests; also keeps WhiteNoise from warning about a missing directory
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Queued writes run on another connection, outside the test's transaction
+SQLITE_WRITE_QUEUE = False
+
+# No flusher thread: it would write on its own connection, outside the test's
+# transaction. Tests call core.events.flush() instead.
+EVENT_TRACKING = {'BUFFER_SIZE': 10_000, 'FLUSH_INTERVAL': None}
+
+# Postings created by tests feed a scratch suggestion snapshot and embedding store, not
+# var/: the runner creates the directory for the run and removes it afterwards
+TEST_RUNNER = 'core.testrunner.ScratchFilesRunner'
+
+# Only warnings and errors in test output
+LOGGING['handlers']['console']['level'] = 'WARNING'
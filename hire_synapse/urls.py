@@ -15,6 +15,8 @@ urlpatterns = [
     path('profile/', include('profiles.urls', namespace='profiles')), # Ensure this line is correctly indented
     path('documents/', include('documents.urls', namespace='documents')), # Ensure this line is correctly indented
     path('jobs/', include('jobs.urls', namespace='jobs')), # Ensure this line is correctly indented
+    path('applications/', include('applications.urls', namespace='applications')),
+    path('interview-prep/', include('interviews.urls', namespace='interviews')),
 
     # Add include for authentication URLs if you have them
     # path('accounts/', include('django.contrib.auth.urls')), # Ensure this line is correctly indented
@@ -8,9 +8,13 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 """
 
 import os
+from pathlib import Path
+
+from dotenv import load_dotenv
 
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hire_synapse.settings')
+load_dotenv(Path(__file__).resolve().parent.parent / '.env') # Never overrides variables already set
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hire_synapse.settings.prod')
 
 application = get_wsgi_application()
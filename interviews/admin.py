@@ -1,7 +1,7 @@
 # interviews/admin.py
 
 from django.contrib import admin
-from .models import InterviewQuestion # Import the model to register
+from .models import InterviewQuestion, PracticeSession, PracticeAttempt, QuestionSchedule # Import the models to register
 
 # Register the InterviewQuestion model with the Django admin site
 @admin.register(InterviewQuestion)
@@ -13,9 +13,7 @@ class InterviewQuestionAdmin(admin.ModelAdmin):
     list_filter = ('category', 'difficulty')
     # Fields that can be searched
     search_fields = ('question_text', 'answer_tips', 'category')
-    # Optional: Define which fields appear on the edit form and their order/grouping
-    fields = ('question_text', 'category', 'difficulty', 'answer_tips')
-    Optional: Use fieldsets for better organization on the edit page
+    # Use fieldsets for better organization on the edit page (replaces a flat `fields` list)
     fieldsets = (
         (None, {
             'fields': ('question_text', 'category', 'difficulty')
@@ -25,3 +23,23 @@ class InterviewQuestionAdmin(admin.ModelAdmin):
             'classes': ('collapse',) # Make this section collapsible
         }),
     )
+
+
+class PracticeAttemptInline(admin.TabularInline):
+    model = PracticeAttempt
+    extra = 0
+    raw_id_fields = ('question',)
+
+
+@admin.register(PracticeSession)
+class PracticeSessionAdmin(admin.ModelAdmin):
+    list_display = ('user', 'started_at', 'completed_at', 'question_count')
+    list_select_related = ('user',)
+    inlines = [PracticeAttemptInline]
+
+
+@admin.register(QuestionSchedule)
+class QuestionScheduleAdmin(admin.ModelAdmin):
+    list_display = ('user', 'question', 'repetitions', 'interval', 'easiness', 'due_at')
+    list_select_related = ('user', 'question')
+    raw_id_fields = ('user', 'question')
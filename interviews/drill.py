@@ -0,0 +1,186 @@
+# interviews/drill.py
+
+"""
+Random practice drills.
+
+Instead of ORDER BY RANDOM() (which sorts the whole table on every request),
+we keep a precomputed array of (id, difficulty) pairs per filter in the
+cache and sample from it in memory. The database is only hit to load the N
+chosen questions by primary key.
+
+Each process also keeps the pool's cumulative difficulty weights, so a drill
+of N questions costs O(N log pool), not a pass over the pool: questions are
+drawn by difficulty (bisection on the cumulative weights) and each draw is
+kept with probability 1 / (1 + times practised). See sample_drill().
+
+The cached pools are invalidated by bumping a version number whenever a
+question is saved or deleted (see interviews/signals.py).
+
+A signed-in user's drill is handed to the page as a signed token (the
+question ids and when it started). Nothing is written until the ratings are
+posted back with it; the PracticeSession is created then, once per token.
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import secrets
+import threading
+import time
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+from .models import InterviewQuestion
+
+logger = logging.getLogger(__name__)
+
+POOL_VERSION_KEY = 'interviews:pool_version'
+POOL_TIMEOUT = 60 * 60
+DRAWS_PER_QUESTION = 8 # Rejected draws allowed before falling back to a pass over the pool
+MIN_BATCH = 16 # Draws per round at least, so a few rejections don't cost a practice count query each
+TOKEN_SALT = 'interviews.drill'
+TOKEN_MAX_AGE = 24 * 60 * 60 # Ratings for an older drill are refused
+
+_indexes = {} # {pool cache key: (pool, cumulative weights)} in this process
+_lock = threading.Lock()
+
+
+def _pool_version():
+    version = cache.get(POOL_VERSION_KEY)
+    if version is None:
+        # Not a counter from 1: an evicted version must not come back and revive a process's old index
+        version = time.time_ns()
+        if not cache.add(POOL_VERSION_KEY, version, None):
+            version = cache.get(POOL_VERSION_KEY, version)
+    return version
+
+
+def invalidate_pools():
+    """ Called when the question bank changes. Old pool entries simply expire. """
+    try:
+        cache.incr(POOL_VERSION_KEY)
+    except ValueError:
+        cache.set(POOL_VERSION_KEY, time.time_ns(), None)
+
+
+def question_pool(category=None, difficulty=None):
+    """ Returns [(id, difficulty), ...] for the filter, from cache when possible. """
+    key = f'interviews:pool:{_pool_version()}:{category or "*"}:{difficulty or "*"}'
+    pool = cache.get(key)
+    if pool is None:
+        queryset = InterviewQuestion.objects.order_by()
+        if category:
+            queryset = queryset.filter(category=category)
+        if difficulty:
+            queryset = queryset.filter(difficulty=difficulty)
+        pool = list(queryset.values_list('id', 'difficulty'))
+        cache.set(key, pool, POOL_TIMEOUT)
+        logger.info(f"Built interview question pool {key} with {len(pool)} questions.")
+    return pool
+
+
+def pool_index(category=None, difficulty=None):
+    """ (pool, cumulative difficulty weights) for the filter, built once per process and pool version. """
+    key = f'interviews:pool:{_pool_version()}:{category or "*"}:{difficulty or "*"}'
+    index = _indexes.get(key)
+    if index is None:
+        pool = question_pool(category, difficulty)
+        index = (pool, list(itertools.accumulate(max(d, 1) for _, d in pool)))
+        with _lock:
+            for stale in [k for k in _indexes if not k.startswith(key.rsplit(':', 2)[0] + ':')]:
+                del _indexes[stale] # An older pool version
+            _indexes[key] = index
+    return index
+
+
+def weighted_sample(pool, n, weight, rng=random):
+    """
+    Picks n items without replacement, each with probability proportional to
+    weight(item). Every item gets the key u ** (1 / w) and the n largest keys win.
+    """
+    keyed = ((rng.random() ** (1.0 / w), item) for item in pool if (w := weight(item)) > 0)
+    return [item for _, item in heapq.nlargest(n, keyed, key=lambda pair: pair[0])]
+
+
+def drill_weight(practice_counts):
+    """
+    Harder questions come up more often; questions the user has already
+    practised come up less often.
+    """
+    def weight(item):
+        question_id, difficulty = item
+        return max(difficulty, 1) / (1 + practice_counts.get(question_id, 0))
+    return weight
+
+
+def _count_lookup(practice_counts):
+    """ practice_counts as a lookup: (question ids, or None for all) -> {question_id: times practised}. """
+    if callable(practice_counts):
+        return practice_counts
+    return lambda question_ids: practice_counts
+
+
+def sample_indexed(index, n, practice_counts, rng=random):
+    """
+    weighted_sample() with drill_weight(practice_counts), in O(n log pool)
+    expected: a question drawn by difficulty is kept with probability
+    1 / (1 + times practised), so it is kept in proportion to its drill
+    weight; repeats are drawn again. When draws keep getting rejected (n
+    close to the pool size, or a pool the user has mostly practised) the
+    rest is sampled with a pass over the remaining pool.
+
+    practice_counts is a dict or a lookup callable (see _count_lookup());
+    with a callable only the drawn questions' counts are fetched, one call
+    per round of draws, so a drill doesn't cost the user's whole history.
+    """
+    pool, cumulative = index
+    lookup = _count_lookup(practice_counts)
+    if n * 2 >= len(pool):
+        return weighted_sample(pool, n, drill_weight(lookup([question_id for question_id, _ in pool])), rng)
+    counts, chosen, picked = {}, [], set()
+    draws = DRAWS_PER_QUESTION * n
+    while len(chosen) < n and draws > 0:
+        batch = rng.choices(pool, cum_weights=cumulative, k=min(max(2 * (n - len(chosen)), MIN_BATCH), draws))
+        draws -= len(batch)
+        unknown = {question_id for question_id, _ in batch} - counts.keys()
+        if unknown:
+            found = lookup(unknown)
+            counts.update((question_id, found.get(question_id, 0)) for question_id in unknown)
+        for item in batch:
+            question_id = item[0]
+            if question_id in picked or rng.random() * (1 + counts[question_id]) >= 1:
+                continue
+            picked.add(question_id)
+            chosen.append(item)
+            if len(chosen) == n:
+                break
+    if len(chosen) < n:
+        rest = [item for item in pool if item[0] not in picked]
+        chosen += weighted_sample(rest, n - len(chosen), drill_weight(lookup(None)), rng)
+    return chosen
+
+
+def sample_drill(n, category=None, difficulty=None, practice_counts=None, rng=random):
+    """ Returns up to n InterviewQuestion objects in sampled order. practice_counts as for sample_indexed(). """
+    chosen = sample_indexed(pool_index(category, difficulty), n, practice_counts or {}, rng)
+    ids = [question_id for question_id, _ in chosen]
+    questions = InterviewQuestion.objects.in_bulk(ids)
+    return [questions[i] for i in ids if i in questions]
+
+
+def drill_token(user, questions):
+    """ Signs a drill for the rating form: its questions, when it started and a key so it is saved once. """
+    return signing.dumps({
+        'user': user.pk, 'key': secrets.token_hex(16),
+        'questions': [q.pk for q in questions], 'started': timezone.now().isoformat(),
+    }, salt=TOKEN_SALT, compress=True)
+
+
+def read_drill_token(token, user):
+    """ The drill_token() payload, or None if it is forged, expired or someone else's. """
+    try:
+        drill = signing.loads(token or '', salt=TOKEN_SALT, max_age=TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    return drill if drill.get('user') == user.pk else None
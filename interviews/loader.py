@@ -0,0 +1,118 @@
+# interviews/loader.py
+
+"""
+Bulk, idempotent loader for the interview question bank.
+
+Questions are streamed from JSONL / JSON / YAML files and upserted in
+batches keyed on content_hash, so re-running a load updates category,
+difficulty and tips in place instead of creating duplicates.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from . import drill
+from .models import InterviewQuestion
+
+logger = logging.getLogger(__name__)
+
+VALID_CATEGORIES = {code for code, _ in InterviewQuestion.CATEGORY_CHOICES}
+UPDATE_FIELDS = ['question_text', 'category', 'answer_tips', 'difficulty']
+
+
+@dataclass
+class LoadStats:
+    read: int = 0
+    upserted: int = 0
+    invalid: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self):
+        return self.upserted / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (f"Read: {self.read}, Upserted: {self.upserted}, Invalid: {self.invalid}, "
+                f"{self.elapsed:.2f}s ({self.rate:.0f} questions/s)")
+
+
+def iter_file(path):
+    """
+    Yields question dicts from a file without loading it whole where the format allows:
+    .jsonl (one object per line), .yaml/.yml (one question or list per document), .json (a list).
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    with path.open(encoding='utf-8') as f:
+        if suffix == '.jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif suffix in ('.yaml', '.yml'):
+            try:
+                import yaml # Optional dependency, only needed for YAML banks
+            except ImportError as e:
+                raise ImportError('Loading YAML question banks requires PyYAML (pip install PyYAML).') from e
+            for document in yaml.safe_load_all(f):
+                if isinstance(document, list):
+                    yield from document
+                elif document:
+                    yield document
+        elif suffix == '.json':
+            yield from json.load(f)
+        else:
+            raise ValueError(f"Unsupported question file type: {path.name}")
+
+
+def build_question(record):
+    """ Validates one record and returns an unsaved InterviewQuestion, or None. """
+    text = (record.get('question_text') or '').strip()
+    category = (record.get('category') or 'GENERAL').upper()
+    if not text or category not in VALID_CATEGORIES:
+        return None
+    try:
+        difficulty = int(record.get('difficulty') or 1)
+    except (TypeError, ValueError):
+        return None
+    return InterviewQuestion(
+        question_text=text,
+        content_hash=InterviewQuestion.hash_text(text),
+        category=category,
+        answer_tips=record.get('answer_tips') or None,
+        difficulty=min(max(difficulty, 1), 5),
+    )
+
+
+def load_questions(records, batch_size=1000):
+    """ Upserts an iterable of question dicts in batches. Returns LoadStats. """
+    stats = LoadStats()
+    started = time.perf_counter()
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            break
+        stats.read += len(chunk)
+        batch = {}
+        for record in chunk:
+            question = build_question(record)
+            if question is None:
+                stats.invalid += 1
+                logger.warning(f"Skipping invalid question record: {record!r:.120}")
+                continue
+            batch[question.content_hash] = question # Last one wins within a batch
+        InterviewQuestion.objects.bulk_create(
+            list(batch.values()),
+            update_conflicts=True,
+            unique_fields=['content_hash'],
+            update_fields=UPDATE_FIELDS,
+        )
+        stats.upserted += len(batch)
+    stats.elapsed = time.perf_counter() - started
+    if stats.upserted:
+        drill.invalidate_pools() # bulk_create doesn't send post_save
+    logger.info(f"Loaded interview questions. {stats.summary()}")
+    return stats
@@ -1,11 +1,11 @@
 import logging
 from django.core.management.base import BaseCommand
-from interviews.models import InterviewQuestion # Use relative import if needed
+from interviews.loader import load_questions
 
 logger = logging.getLogger(__name__)
 
 class Command(BaseCommand):
-    help = 'Populates the database with sample interview questions.'
+    help = 'Populates the database with sample interview questions (see load_questions for full banks).'
 
     SAMPLE_QUESTIONS = [
         {'category': 'GENERAL', 'question_text': 'Tell me about yourself.', 'answer_tips': 'Focus on your relevant skills and experience. Keep it concise (1-2 minutes). Structure: Present, Past, Future.'},
@@ -23,33 +23,8 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('--- Starting interview question population ---'))
         logger.info("Starting populate_questions management command.")
-        added_count = 0
-        skipped_count = 0
-        error_count = 0
-
-        for q_data in self.SAMPLE_QUESTIONS:
-            q_text = q_data['question_text']
-            try:
-                obj, created = InterviewQuestion.objects.get_or_create(
-                    question_text=q_text, # Use question as unique identifier
-                    defaults=q_data # Provide category/tips if creating
-                )
-                if created:
-                    logger.info(f'Added question: "{q_text[:50]}..."')
-                    self.stdout.write(self.style.SUCCESS(f'+ Added: "{q_text[:50]}..."'))
-                    added_count += 1
-                else:
-                    logger.warning(f'Skipped existing question: "{q_text[:50]}..."')
-                    # Optionally update tips for existing questions:
-                    # obj.category = q_data.get('category', obj.category)
-                    # obj.answer_tips = q_data.get('answer_tips', obj.answer_tips)
-                    # obj.save()
-                    skipped_count += 1
-            except Exception as e:
-                logger.error(f"Error processing question '{q_text[:50]}...': {e}", exc_info=True)
-                self.stderr.write(self.style.ERROR(f"! Error processing question '{q_text[:50]}...': {e}"))
-                error_count += 1
-
-        summary_msg = f'Finished question population. Added: {added_count}, Skipped: {skipped_count}, Errors: {error_count}'
+        # Same bulk upsert as `load_questions`: existing questions get their tips/category refreshed
+        stats = load_questions(self.SAMPLE_QUESTIONS)
+        summary_msg = f'Finished question population. {stats.summary()}'
         logger.info(summary_msg)
-        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
@@ -0,0 +1,23 @@
+import logging
+from itertools import chain
+from django.core.management.base import BaseCommand, CommandError
+from interviews.loader import iter_file, load_questions
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Bulk-loads interview questions from JSONL/JSON/YAML files, updating existing questions in place.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Question bank files (.jsonl, .json, .yaml, .yml).')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Questions per upsert statement.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f'--- Loading questions from {len(options["paths"])} file(s) ---'))
+        records = chain.from_iterable(iter_file(path) for path in options['paths'])
+        try:
+            stats = load_questions(records, batch_size=options['batch_size'])
+        except (OSError, ValueError, ImportError) as e:
+            raise CommandError(str(e))
+        style = self.style.WARNING if stats.invalid else self.style.SUCCESS
+        self.stdout.write(style(f'--- Finished question load. {stats.summary()} ---'))
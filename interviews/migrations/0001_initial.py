@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-19 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_text', models.TextField(unique=True)),
+                ('category', models.CharField(choices=[('BEHAVIORAL', 'Behavioral'), ('TECHNICAL', 'Technical'), ('SITUATIONAL', 'Situational'), ('GENERAL', 'General')], default='GENERAL', max_length=50)),
+                ('answer_tips', models.TextField(blank=True, help_text='Tips, common answers, or things to consider.', null=True)),
+                ('difficulty', models.PositiveSmallIntegerField(default=1, help_text='Optional difficulty rating (e.g., 1-5)')),
+            ],
+            options={
+                'ordering': ['category', 'question_text'],
+                'indexes': [models.Index(fields=['category', 'difficulty', 'id'], name='interviews_cat_diff_idx')],
+            },
+        ),
+    ]
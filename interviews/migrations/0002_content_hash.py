@@ -0,0 +1,52 @@
+import hashlib
+import re
+
+from django.db import migrations, models
+
+
+def fill_content_hash(apps, schema_editor):
+    """
+    Hashes every question, then merges questions that differ only in case or
+    whitespace, which would otherwise break the unique constraint added next:
+    the oldest copy is kept and takes the tips of a later one if it has none.
+    """
+    db = schema_editor.connection.alias # The database being migrated (migrate --database); the router would send writes to default
+    InterviewQuestion = apps.get_model('interviews', 'InterviewQuestion')
+    questions = list(InterviewQuestion.objects.using(db).only('id', 'question_text', 'answer_tips').order_by('id'))
+    kept, duplicate_ids = {}, []
+    for question in questions:
+        # Same normalization as InterviewQuestion.hash_text(), frozen here for the migration
+        normalized = re.sub(r'\s+', ' ', question.question_text).strip().lower()
+        question.content_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        original = kept.setdefault(question.content_hash, question)
+        if original is not question:
+            duplicate_ids.append(question.pk)
+            original.answer_tips = original.answer_tips or question.answer_tips
+    InterviewQuestion.objects.using(db).filter(pk__in=duplicate_ids).delete()
+    InterviewQuestion.objects.using(db).bulk_update(list(kept.values()), ['content_hash', 'answer_tips'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewquestion',
+            name='content_hash',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(fill_content_hash, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='interviewquestion',
+            name='content_hash',
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='interviewquestion',
+            name='question_text',
+            field=models.TextField(),
+        ),
+    ]
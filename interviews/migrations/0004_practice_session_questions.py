@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_practice_sessions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='practicesession',
+            name='question_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-19 22:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def delete_unrated_sessions(apps, schema_editor):
+    """ The drill page used to create a session on every view; the ones never rated hold nothing. """
+    db = schema_editor.connection.alias # The database being migrated (migrate --database); the router would send writes to default
+    PracticeSession = apps.get_model('interviews', 'PracticeSession')
+    PracticeSession.objects.using(db).filter(completed_at__isnull=True, attempts__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0004_practice_session_questions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='practicesession',
+            name='drill_key',
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='practicesession',
+            name='started_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(delete_unrated_sessions, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,11 @@
 # interviews/models.py
 
+import hashlib
+import re
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 
 class InterviewQuestion(models.Model):
     """ Stores common interview questions and tips. """
@@ -12,14 +17,105 @@ class InterviewQuestion(models.Model):
         # Add more categories as needed
     ]
 
-    question_text = models.TextField(unique=True) # Ensure questions are unique
+    question_text = models.TextField()
+    # Uniqueness is enforced on a fixed-size hash of the normalized text rather
+    # than on the long TextField itself (cheaper index, usable as an upsert key)
+    content_hash = models.CharField(max_length=64, unique=True, editable=False)
     category = models.CharField(max_length=50, choices=CATEGORY_CHOICES, default='GENERAL')
     answer_tips = models.TextField(blank=True, null=True, help_text="Tips, common answers, or things to consider.")
     difficulty = models.PositiveSmallIntegerField(default=1, help_text="Optional difficulty rating (e.g., 1-5)") # Optional
 
     class Meta:
         ordering = ['category', 'question_text'] # Order questions logically
+        indexes = [
+            # Serves the category/difficulty filters on the question list and drill pools
+            models.Index(fields=['category', 'difficulty', 'id'], name='interviews_cat_diff_idx'),
+        ]
+
+    @staticmethod
+    def hash_text(text):
+        """ SHA-256 of the question text, ignoring case and whitespace differences. """
+        normalized = re.sub(r'\s+', ' ', text).strip().lower()
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def clean(self):
+        """ content_hash isn't a form field, so check duplicates here for the admin. """
+        super().clean()
+        duplicates = InterviewQuestion.objects.filter(content_hash=self.hash_text(self.question_text or ''))
+        if duplicates.exclude(pk=self.pk).exists():
+            raise ValidationError({'question_text': 'This question already exists.'})
+
+    def save(self, *args, **kwargs):
+        self.content_hash = self.hash_text(self.question_text)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         # Provide a concise string representation for admin and debugging
         return f"{self.category} - {self.question_text[:60]}..." # Shortened representation
+
+
+class PracticeSession(models.Model):
+    """
+    One drill run by a user, created with its attempts in a single batch when
+    the user submits ratings (the drill page itself writes nothing, see
+    interviews/drill.py).
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='practice_sessions')
+    drill_key = models.CharField(max_length=32, unique=True, null=True, blank=True) # From the drill token: saved once
+    started_at = models.DateTimeField(default=timezone.now)
+    completed_at = models.DateTimeField(null=True, blank=True) # Set once, when the ratings are saved
+    question_count = models.PositiveSmallIntegerField(default=0)
+    question_ids = models.JSONField(default=list, blank=True) # The drilled questions: the only ones that can be rated
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.user.username} - practice on {self.started_at:%Y-%m-%d %H:%M}"
+
+
+class PracticeAttempt(models.Model):
+    """ A user's self-rating of how well they answered one question (0 = blackout ... 5 = perfect). """
+    RATING_CHOICES = [
+        (0, 'Blank'),
+        (1, 'Wrong'),
+        (2, 'Hard'),
+        (3, 'Okay'),
+        (4, 'Good'),
+        (5, 'Easy'),
+    ]
+
+    session = models.ForeignKey(PracticeSession, on_delete=models.CASCADE, related_name='attempts')
+    question = models.ForeignKey(InterviewQuestion, on_delete=models.CASCADE, related_name='attempts')
+    rating = models.PositiveSmallIntegerField(choices=RATING_CHOICES)
+    answered_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.question_id} rated {self.rating}"
+
+
+class QuestionSchedule(models.Model):
+    """
+    Spaced-repetition state for one (user, question) pair, maintained by
+    interviews/scheduler.py. "What's due for this user?" is a range scan on
+    the (user, due_at) index, not a walk over attempt history.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='question_schedules')
+    question = models.ForeignKey(InterviewQuestion, on_delete=models.CASCADE, related_name='schedules')
+    easiness = models.FloatField(default=2.5) # SM-2 E-factor, never below 1.3
+    interval = models.PositiveIntegerField(default=0) # Days until the next review
+    repetitions = models.PositiveIntegerField(default=0) # Consecutive successful reviews
+    last_rating = models.PositiveSmallIntegerField(null=True, blank=True)
+    last_reviewed_at = models.DateTimeField(null=True, blank=True)
+    due_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'question'], name='interviews_schedule_user_question'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'due_at'], name='interviews_schedule_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}/{self.question_id} due {self.due_at:%Y-%m-%d}"
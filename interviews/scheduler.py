@@ -0,0 +1,119 @@
+# interviews/scheduler.py
+
+"""
+Spaced-repetition scheduling for interview practice (SM-2).
+
+After each attempt the user rates themselves 0-5. Ratings of 3 and above
+count as a successful recall and push the next review further out
+(1 day, 6 days, then interval * easiness); anything lower resets the
+question to be reviewed again tomorrow. Easiness drifts with the ratings
+so questions a user finds hard come back sooner.
+
+A whole session is written in a fixed number of queries regardless of how
+many questions were rated: one read of the existing schedules, then bulk
+inserts/updates for attempts and schedules.
+"""
+
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .models import PracticeAttempt, PracticeSession, QuestionSchedule
+
+logger = logging.getLogger(__name__)
+
+MIN_EASINESS = 1.3
+PASSING_RATING = 3
+SCHEDULE_FIELDS = ['easiness', 'interval', 'repetitions', 'last_rating', 'last_reviewed_at', 'due_at']
+
+
+def review(schedule, rating, now=None):
+    """ Applies one SM-2 review to a QuestionSchedule in memory (does not save). """
+    now = now or timezone.now()
+    if rating >= PASSING_RATING:
+        if schedule.repetitions == 0:
+            schedule.interval = 1
+        elif schedule.repetitions == 1:
+            schedule.interval = 6
+        else:
+            schedule.interval = round(schedule.interval * schedule.easiness)
+        schedule.repetitions += 1
+    else:
+        schedule.repetitions = 0
+        schedule.interval = 1
+    schedule.easiness = max(
+        MIN_EASINESS,
+        schedule.easiness + 0.1 - (5 - rating) * (0.08 + (5 - rating) * 0.02),
+    )
+    schedule.last_rating = rating
+    schedule.last_reviewed_at = now
+    schedule.due_at = now + timedelta(days=schedule.interval)
+    return schedule
+
+
+@transaction.atomic
+def record_session(session, ratings, now=None):
+    """
+    Stores a session's ratings ({question_id: rating}) and reschedules every rated question.
+    Returns the list of updated QuestionSchedule objects, or None if the
+    session had already been rated (a session is rated once).
+    """
+    now = now or timezone.now()
+    ratings = {int(qid): min(max(int(rating), 0), 5) for qid, rating in ratings.items()}
+    if not ratings:
+        return []
+    # Claimed with a conditional UPDATE, so a double submit can't record the session twice
+    if not PracticeSession.objects.filter(pk=session.pk, completed_at__isnull=True).update(completed_at=now):
+        return None
+    session.completed_at = now
+
+    existing = {
+        s.question_id: s
+        for s in QuestionSchedule.objects.filter(user_id=session.user_id, question_id__in=ratings)
+    }
+    new_schedules = []
+    for question_id, rating in ratings.items():
+        schedule = existing.get(question_id)
+        if schedule is None:
+            schedule = QuestionSchedule(user_id=session.user_id, question_id=question_id)
+            new_schedules.append(schedule)
+        review(schedule, rating, now)
+
+    PracticeAttempt.objects.bulk_create([
+        PracticeAttempt(session=session, question_id=qid, rating=rating, answered_at=now)
+        for qid, rating in ratings.items()
+    ])
+    QuestionSchedule.objects.bulk_create(new_schedules)
+    if existing:
+        QuestionSchedule.objects.bulk_update(list(existing.values()), SCHEDULE_FIELDS)
+
+    logger.info(f"Recorded {len(ratings)} ratings for practice session {session.pk} "
+                f"({len(new_schedules)} new schedules, {len(existing)} updated).")
+    return new_schedules + list(existing.values())
+
+
+def due_schedules(user, limit=None, now=None):
+    """ The user's questions due for review, most overdue first. Served by the (user, due_at) index. """
+    queryset = (
+        QuestionSchedule.objects
+        .filter(user=user, due_at__lte=now or timezone.now())
+        .select_related('question')
+        .order_by('due_at')
+    )
+    return queryset[:limit] if limit else queryset
+
+
+def due_count(user, now=None):
+    return QuestionSchedule.objects.filter(user=user, due_at__lte=now or timezone.now()).count()
+
+
+def practice_counts(user, question_ids=None, now=None):
+    """
+    {question_id: repetitions} for questions that are *not* due yet, used to
+    down-weight them in random drills. Due and never-seen questions keep full weight.
+    With question_ids, only those questions are looked up (a drill's candidates).
+    """
+    queryset = QuestionSchedule.objects.filter(user=user, due_at__gt=now or timezone.now())
+    if question_ids is not None:
+        queryset = queryset.filter(question_id__in=question_ids)
+    return dict(queryset.values_list('question_id', 'repetitions'))
@@ -0,0 +1,13 @@
+# interviews/signals.py
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from . import drill
+from .models import InterviewQuestion
+
+
+@receiver(post_save, sender=InterviewQuestion)
+@receiver(post_delete, sender=InterviewQuestion)
+def question_bank_changed(sender, **kwargs):
+    """ Drop the cached drill pools so new or removed questions are picked up. """
+    drill.invalidate_pools()
@@ -1,3 +1,253 @@
-from django.test import TestCase
+import itertools
+import json
+import os
+import random
+import tempfile
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from . import drill, scheduler, views
+from .loader import iter_file, load_questions
+from .models import InterviewQuestion, PracticeAttempt, PracticeSession, QuestionSchedule
+
+
+class SchedulerTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('practice', password='pw')
+        InterviewQuestion.objects.bulk_create([
+            InterviewQuestion(question_text=f'Question {i}?', content_hash=InterviewQuestion.hash_text(f'Question {i}?'))
+            for i in range(60)
+        ])
+        cls.question_ids = list(InterviewQuestion.objects.values_list('id', flat=True))
+
+    def test_sm2_intervals(self):
+        now = timezone.now()
+        schedule = QuestionSchedule(user=self.user, question_id=self.question_ids[0])
+        self.assertEqual(scheduler.review(schedule, 5, now).interval, 1)
+        self.assertEqual(scheduler.review(schedule, 5, now).interval, 6)
+        self.assertGreater(scheduler.review(schedule, 4, now).interval, 6)
+        # A failed recall starts the question over
+        scheduler.review(schedule, 1, now)
+        self.assertEqual((schedule.repetitions, schedule.interval), (0, 1))
+        self.assertEqual(schedule.due_at, now + timedelta(days=1))
+        self.assertGreaterEqual(schedule.easiness, scheduler.MIN_EASINESS)
+
+    def test_session_writes_are_batched(self):
+        small = PracticeSession.objects.create(user=self.user)
+        large = PracticeSession.objects.create(user=self.user)
+        # A fixed number of queries however many questions were rated: 6 when every schedule
+        # is new, plus one bulk UPDATE when some already exist
+        with self.assertNumQueries(6):
+            scheduler.record_session(small, {qid: 4 for qid in self.question_ids[:5]})
+        with self.assertNumQueries(7):
+            scheduler.record_session(large, {qid: 4 for qid in self.question_ids[:50]})
+        self.assertEqual(PracticeAttempt.objects.count(), 55)
+        self.assertEqual(QuestionSchedule.objects.filter(user=self.user).count(), 50)
+        self.assertEqual(QuestionSchedule.objects.get(question_id=self.question_ids[0]).repetitions, 2)
+
+    def test_due_questions(self):
+        session = PracticeSession.objects.create(user=self.user)
+        earlier = timezone.now() - timedelta(days=3)
+        scheduler.record_session(session, {self.question_ids[0]: 1, self.question_ids[1]: 5}, now=earlier)
+        due = list(scheduler.due_schedules(self.user))
+        self.assertEqual({s.question_id for s in due}, {self.question_ids[0], self.question_ids[1]})
+        self.assertEqual(scheduler.due_count(self.user, now=earlier), 0)
+
+    def _token(self, question_ids, user=None):
+        return drill.drill_token(user or self.user, InterviewQuestion.objects.filter(pk__in=question_ids).order_by('pk'))
+
+    def test_rate_view_records_session(self):
+        self.client.login(username='practice', password='pw')
+        response = self.client.post(reverse('interviews:rate_drill'), {
+            'drill': self._token(self.question_ids[:2]),
+            f'rating_{self.question_ids[0]}': '3', f'rating_{self.question_ids[1]}': '0',
+        })
+        self.assertRedirects(response, reverse('interviews:due'), fetch_redirect_response=False)
+        session = PracticeSession.objects.get()
+        self.assertEqual((session.question_ids, session.attempts.count()), (self.question_ids[:2], 2))
+        self.assertIsNotNone(session.completed_at)
+
+    def test_rate_view_refuses_forged_and_foreign_drills(self):
+        self.client.login(username='practice', password='pw')
+        other = User.objects.create_user('other', password='pw')
+        rating = {f'rating_{self.question_ids[0]}': '3'}
+        for token in (self._token(self.question_ids[:1], user=other), self._token(self.question_ids[:1]) + 'x', ''):
+            response = self.client.post(reverse('interviews:rate_drill'), {'drill': token, **rating})
+            self.assertRedirects(response, reverse('interviews:drill'), fetch_redirect_response=False)
+        self.assertFalse(PracticeSession.objects.exists())
+
+    def test_rate_view_only_takes_the_drilled_questions_with_ratings_in_range(self):
+        self.client.login(username='practice', password='pw')
+        drilled, other = self.question_ids[:2], self.question_ids[2]
+        self.client.post(reverse('interviews:rate_drill'), {
+            'drill': self._token(drilled),
+            f'rating_{drilled[0]}': '9', # Out of range: clamped to 5
+            f'rating_{other}': '1', # Not in this drill: ignored
+        })
+        session = PracticeSession.objects.get()
+        self.assertEqual(list(session.attempts.values_list('question_id', 'rating')), [(drilled[0], 5)])
+        self.assertFalse(QuestionSchedule.objects.filter(question_id=other).exists())
+
+    def test_session_is_rated_once(self):
+        self.client.login(username='practice', password='pw')
+        data = {'drill': self._token(self.question_ids[:1]), f'rating_{self.question_ids[0]}': '5'}
+        self.client.post(reverse('interviews:rate_drill'), data)
+        response = self.client.post(reverse('interviews:rate_drill'), data)
+        self.assertRedirects(response, reverse('interviews:due'), fetch_redirect_response=False)
+        session = PracticeSession.objects.get()
+        self.assertEqual(session.attempts.count(), 1)
+        self.assertEqual(QuestionSchedule.objects.get(question_id=self.question_ids[0]).repetitions, 1)
+        # The scheduler refuses too, for a submit that got past the view's check
+        self.assertIsNone(scheduler.record_session(session, {self.question_ids[0]: 5}))
+
+
+class DrillTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('practice', password='pw')
+        InterviewQuestion.objects.bulk_create([
+            InterviewQuestion(question_text=f'Question {i}?', content_hash=InterviewQuestion.hash_text(f'Question {i}?'),
+                              difficulty=1 + i % 5)
+            for i in range(200)
+        ])
+
+    def setUp(self):
+        drill.invalidate_pools()
+
+    def _get_drill(self, **params):
+        request = RequestFactory().get(reverse('interviews:drill'), params)
+        request.user = self.user
+        request.session = {}
+        with mock.patch.object(views, 'render', return_value=HttpResponse()) as render:
+            views.DrillView.as_view()(request)
+        return render.call_args.args[2]
+
+    def test_viewing_a_drill_writes_nothing(self):
+        with self.assertNumQueries(3): # Practice counts, the pool, the chosen questions
+            context = self._get_drill(n='5')
+        self.assertEqual(len(context['question_list']), 5)
+        self.assertFalse(PracticeSession.objects.exists())
+
+        # The ratings create the session, with the drilled questions
+        self.client.login(username='practice', password='pw')
+        question = context['question_list'][0]
+        self.client.post(reverse('interviews:rate_drill'), {'drill': context['drill_token'], f'rating_{question.pk}': '4'})
+        session = PracticeSession.objects.get()
+        self.assertEqual(session.question_ids, [q.pk for q in context['question_list']])
+
+    def test_drill_only_looks_up_counts_for_its_candidates(self):
+        later = timezone.now() + timedelta(days=30)
+        QuestionSchedule.objects.bulk_create([
+            QuestionSchedule(user=self.user, question_id=question_id, repetitions=1, due_at=later)
+            for question_id in InterviewQuestion.objects.values_list('id', flat=True)[:150]
+        ])
+        asked = []
+
+        def lookup(question_ids):
+            asked.append(question_ids)
+            return scheduler.practice_counts(self.user, question_ids)
+
+        sample = drill.sample_indexed(drill.pool_index(), 5, lookup, random.Random(3))
+        self.assertEqual(len(sample), 5)
+        self.assertNotIn(None, asked) # Never the whole history
+        self.assertLessEqual(sum(len(ids) for ids in asked), drill.DRAWS_PER_QUESTION * 5)
+
+    def test_anonymous_drills_remember_a_bounded_number_of_questions(self):
+        request = RequestFactory().get(reverse('interviews:drill'), {'n': '50'})
+        request.user = AnonymousUser()
+        request.session = {'drill_seen': {str(-i): 1 for i in range(views.ANONYMOUS_SEEN_LIMIT)}}
+        with mock.patch.object(views, 'render', return_value=HttpResponse()) as render:
+            views.DrillView.as_view()(request)
+        seen = request.session['drill_seen']
+        self.assertEqual(len(seen), views.ANONYMOUS_SEEN_LIMIT)
+        # The questions just drilled are kept, the oldest entries dropped
+        self.assertTrue({str(q.pk) for q in render.call_args.args[2]['question_list']} <= seen.keys())
+        self.assertNotIn('0', seen)
+
+    def test_pool_index_is_kept_per_process_until_the_bank_changes(self):
+        pool, cumulative = drill.pool_index()
+        self.assertEqual((len(pool), cumulative[-1]), (200, 600))
+        with self.assertNumQueries(0):
+            self.assertIs(drill.pool_index()[0], pool)
+        InterviewQuestion.objects.create(question_text='New?', content_hash=InterviewQuestion.hash_text('New?'))
+        self.assertEqual(len(drill.pool_index()[0]), 201)
+
+    def test_sampling_draws_o_n_and_follows_the_drill_weights(self):
+        pool = [(i, 5 if i == 0 else 1) for i in range(100)]
+        index = (pool, list(itertools.accumulate(d for _, d in pool)))
+        counts = {1: 4}
+        rng = random.Random(1)
+        with mock.patch.object(drill, 'weighted_sample', side_effect=AssertionError('full pass')):
+            picks = Counter(drill.sample_indexed(index, 1, counts, rng)[0][0] for _ in range(20_000))
+            sample = drill.sample_indexed(index, 10, counts, rng)
+        self.assertEqual(len({question_id for question_id, _ in sample}), 10)
+        # Weights: question 0 is 5, question 1 is 1 / (1 + 4), the other 98 are 1
+        self.assertAlmostEqual(picks[0] / 20_000, 5 / 103.2, delta=0.006)
+        self.assertAlmostEqual(picks[1] / 20_000, 0.2 / 103.2, delta=0.002)
+
+    def test_sampling_falls_back_when_draws_keep_being_rejected(self):
+        pool = [(i, 1) for i in range(100)]
+        index = (pool, list(range(1, 101)))
+        practised = {i: 10_000 for i in range(100)}
+        sample = drill.sample_indexed(index, 20, practised, random.Random(2))
+        self.assertEqual(len({question_id for question_id, _ in sample}), 20)
+
+
+class QuestionLoaderTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+
+    def _file(self, name, content):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_reads_jsonl_json_and_yaml(self):
+        jsonl = self._file('a.jsonl', '{"question_text": "One?"}\n\n{"question_text": "Two?"}\n')
+        json_file = self._file('b.json', json.dumps([{'question_text': 'Three?'}]))
+        yaml_file = self._file('c.yaml', '- question_text: Four?\n---\nquestion_text: Five?\n')
+        texts = [r['question_text'] for path in (jsonl, json_file, yaml_file) for r in iter_file(path)]
+        self.assertEqual(texts, ['One?', 'Two?', 'Three?', 'Four?', 'Five?'])
+        with self.assertRaises(ValueError):
+            list(iter_file(self._file('d.csv', 'question_text\n')))
+
+    def test_upserts_on_normalized_text_and_skips_invalid_records(self):
+        stats = load_questions([
+            {'question_text': 'Tell me about yourself.', 'category': 'behavioral', 'difficulty': 9},
+            {'question_text': '  tell me   ABOUT yourself. ', 'answer_tips': 'Keep it short'}, # Same question
+            {'question_text': 'What is a closure?', 'category': 'NOT_A_CATEGORY'},
+            {'question_text': ''},
+        ], batch_size=2)
+        self.assertEqual((stats.read, stats.upserted, stats.invalid), (4, 1, 2))
+        question = InterviewQuestion.objects.get()
+        # The later record wins, difficulty stays in 1-5
+        self.assertEqual((question.category, question.answer_tips), ('GENERAL', 'Keep it short'))
+
+        load_questions([{'question_text': 'Tell me about yourself.', 'category': 'BEHAVIORAL', 'difficulty': 9}])
+        question = InterviewQuestion.objects.get() # Updated in place, not duplicated
+        self.assertEqual((question.category, question.difficulty), ('BEHAVIORAL', 5))
+
+    def test_load_questions_command(self):
+        path = self._file('bank.jsonl', '{"question_text": "Why us?"}\n{"question_text": "Why now?"}\n')
+        out = StringIO()
+        call_command('load_questions', path, '--batch-size', '1', stdout=out)
+        self.assertIn('Upserted: 2, Invalid: 0', out.getvalue())
+        self.assertEqual(InterviewQuestion.objects.count(), 2)
+        with self.assertRaises(CommandError):
+            call_command('load_questions', os.path.join(self.dir, 'missing.jsonl'), stdout=StringIO())
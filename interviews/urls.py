@@ -8,4 +8,10 @@ app_name = 'interviews' # Define the namespace for this app's URLs
 urlpatterns = [
     # Map the root URL of this app ('/interview-prep/') to the InterviewQuestionListView
     path('', views.InterviewQuestionListView.as_view(), name='question_list'),
+    # Random practice drill, e.g. /interview-prep/drill/?n=10&category=BEHAVIORAL
+    path('drill/', views.DrillView.as_view(), name='drill'),
+    # Batched self-ratings for a drill, feeding the spaced-repetition schedule
+    path('drill/rate/', views.RateDrillView.as_view(), name='rate_drill'),
+    # Questions due for review for the signed-in user
+    path('due/', views.DueQuestionsView.as_view(), name='due'),
 ]
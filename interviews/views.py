@@ -1,15 +1,38 @@
 # interviews/views.py
 
 import logging
-from django.shortcuts import render # Usually needed, even if just for potential error pages
+from datetime import datetime
+from functools import partial
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import IntegrityError, transaction
+from django.shortcuts import render, redirect # Usually needed, even if just for potential error pages
+from django.views import View
 from django.views.generic import ListView # Use ListView for displaying lists of objects
-from .models import InterviewQuestion # Import the model for this app
+from .models import InterviewQuestion, PracticeAttempt, PracticeSession # Import the models for this app
+from . import drill, scheduler
 
 # Get a logger instance specific to this module
 logger = logging.getLogger(__name__)
 
+VALID_CATEGORIES = {code for code, _ in InterviewQuestion.CATEGORY_CHOICES}
+ANONYMOUS_SEEN_LIMIT = 200 # Questions remembered per anonymous session, most recently drilled
+
+
+def _filters(request):
+    """ Reads and validates the category/difficulty GET parameters. Invalid values are ignored. """
+    category = request.GET.get('category') or None
+    if category not in VALID_CATEGORIES:
+        category = None
+    try:
+        difficulty = int(request.GET.get('difficulty', '')) or None
+    except ValueError:
+        difficulty = None
+    return category, difficulty
+
+
 class InterviewQuestionListView(ListView):
-    """ Displays a list of interview questions. """
+    """ Displays a list of interview questions, optionally filtered by category and difficulty. """
     model = InterviewQuestion # The model this view will display data from
     template_name = 'interviews/question_list.html' # The template to render
     context_object_name = 'question_list' # The variable name for the list in the template
@@ -18,15 +41,17 @@ class InterviewQuestionListView(ListView):
     def get_queryset(self):
         """
         Returns the queryset of questions to display.
-        Currently fetches all questions, ordered by category and text.
+        Filters run against the (category, difficulty, id) index, which also
+        provides the ordering, so no sort step is needed.
         """
-        logger.info("Fetching interview questions.")
-        # Consider adding filtering by category later via GET params
-        # category_filter = self.request.GET.get('category')
-        # if category_filter:
-        #     logger.info(f"Filtering interview questions by category: {category_filter}")
-        #     return InterviewQuestion.objects.filter(category=category_filter).order_by('question_text')
-        return InterviewQuestion.objects.all().order_by('category', 'question_text')
+        category, difficulty = _filters(self.request)
+        logger.info(f"Fetching interview questions (category={category}, difficulty={difficulty}).")
+        queryset = InterviewQuestion.objects.all()
+        if category:
+            queryset = queryset.filter(category=category)
+        if difficulty:
+            queryset = queryset.filter(difficulty=difficulty)
+        return queryset.order_by('category', 'difficulty', 'id')
 
     # Optional: Group by category in the context if needed by the template
     def get_context_data(self, **kwargs):
@@ -40,5 +65,109 @@ class InterviewQuestionListView(ListView):
                 questions_by_category[cat] = []
             questions_by_category[cat].append(question)
         context['questions_by_category'] = questions_by_category # Add grouped data to context
+        context['category_choices'] = InterviewQuestion.CATEGORY_CHOICES
+        context['selected_category'], context['selected_difficulty'] = _filters(self.request)
         logger.debug(f"Grouped questions by category for context.")
         return context
+
+
+class DrillView(View):
+    """
+    Practice drill: N questions sampled at random, weighted towards harder
+    questions and away from ones this visitor has already drilled.
+
+    Signed-in users can rate the drill at the end (a signed token carries it
+    to RateDrillView; nothing is written here), and their spaced-repetition
+    schedule decides what counts as "already drilled".
+    With ?due=1 the drill is made of their questions due for review instead.
+    """
+    template_name = 'interviews/drill.html'
+    default_size = 10
+    max_size = 50
+
+    def get(self, request, *args, **kwargs):
+        category, difficulty = _filters(request)
+        try:
+            size = min(max(int(request.GET.get('n', self.default_size)), 1), self.max_size)
+        except ValueError:
+            size = self.default_size
+
+        token = None
+        if request.user.is_authenticated:
+            if request.GET.get('due'):
+                questions = [s.question for s in scheduler.due_schedules(request.user, limit=size)]
+            else:
+                # Counts are looked up for the drawn candidates only, not the user's whole history
+                counts = partial(scheduler.practice_counts, request.user)
+                questions = drill.sample_drill(size, category, difficulty, practice_counts=counts)
+            if questions:
+                token = drill.drill_token(request.user, questions)
+        else:
+            # Anonymous practice is tracked per session: {question id: times drilled}
+            seen = {int(k): v for k, v in request.session.get('drill_seen', {}).items()}
+            questions = drill.sample_drill(size, category, difficulty, practice_counts=seen)
+            for question in questions:
+                seen[question.pk] = seen.pop(question.pk, 0) + 1 # Re-inserted: the dict stays in drill order
+            recent = list(seen.items())[-ANONYMOUS_SEEN_LIMIT:]
+            request.session['drill_seen'] = {str(k): v for k, v in recent}
+        logger.info(f"Drill of {len(questions)} questions (category={category}, difficulty={difficulty}).")
+
+        context = {
+            'question_list': questions,
+            'category_choices': InterviewQuestion.CATEGORY_CHOICES,
+            'selected_category': category,
+            'selected_difficulty': difficulty,
+            'drill_size': size,
+            'drill_token': token,
+            'rating_choices': PracticeAttempt.RATING_CHOICES,
+        }
+        return render(request, self.template_name, context)
+
+
+class RateDrillView(LoginRequiredMixin, View):
+    """
+    Receives the self-ratings for a whole drill in one POST, saves it as a
+    PracticeSession and reschedules the questions.
+    """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        payload = drill.read_drill_token(request.POST.get('drill'), request.user)
+        if payload is None:
+            messages.warning(request, 'This drill has expired. Start a new one to save your ratings.')
+            return redirect('interviews:drill')
+        # Form fields are named rating_<question id>; unrated questions are skipped, and so are
+        # questions that weren't part of this drill
+        drilled = set(payload['questions'])
+        ratings = {}
+        for key, value in request.POST.items():
+            if key.startswith('rating_') and value.isdigit():
+                question_id = key.removeprefix('rating_')
+                if question_id.isdigit() and int(question_id) in drilled:
+                    ratings[int(question_id)] = min(int(value), 5)
+        if not ratings:
+            messages.warning(request, 'Rate at least one question to save your practice.')
+            return redirect('interviews:drill')
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    practice_session = PracticeSession.objects.create(
+                        user=request.user, drill_key=payload['key'], started_at=datetime.fromisoformat(payload['started']),
+                        question_count=len(payload['questions']), question_ids=payload['questions'],
+                    )
+            except IntegrityError: # drill_key is unique: saved by an earlier or concurrent submit
+                messages.info(request, 'This practice session has already been saved.')
+                return redirect('interviews:due')
+            scheduler.record_session(practice_session, ratings)
+        messages.success(request, f'Saved {len(ratings)} rating{"s" if len(ratings) != 1 else ""}. Your review schedule has been updated.')
+        return redirect('interviews:due')
+
+
+class DueQuestionsView(LoginRequiredMixin, ListView):
+    """ Lists the signed-in user's questions that are due for review. """
+    template_name = 'interviews/due_list.html'
+    context_object_name = 'schedule_list'
+    paginate_by = 20
+
+    def get_queryset(self):
+        return scheduler.due_schedules(self.request.user)
@@ -1,9 +1,71 @@
-from django.contrib import admin
-from .models import JobPosting
+from django.contrib import admin, messages
+from core import fragments
+from core.admin import EstimatedCountPaginator, InputFilter, iter_pk_chunks
+from .keyphrases import extract_key_phrases
+from .models import JobEventCount, JobPosting, SavedSearch, make_preview
+
+
+class LocationFilter(InputFilter):
+    """ Text match on location; listing every distinct location doesn't scale. """
+    title = 'location'
+    parameter_name = 'location'
+    lookup = 'location__icontains'
+
+
+@admin.action(description='Recompute previews and key phrases for selected postings')
+def refresh_derived_fields(modeladmin, request, queryset):
+    """ Rebuilds description_preview and key_phrases in batches of primary keys (one SELECT and one bulk UPDATE each). """
+    refreshed = 0
+    for pks in iter_pk_chunks(queryset):
+        postings = list(JobPosting.objects.filter(pk__in=pks).only('pk', 'title', 'description'))
+        for posting in postings:
+            posting.description_preview = make_preview(posting.description)
+            posting.key_phrases = extract_key_phrases(posting.title, posting.description)
+        refreshed += JobPosting.objects.bulk_update(postings, ['description_preview', 'key_phrases'])
+        fragments.invalidate(JobPosting, pks) # bulk_update sends no post_save for the cached job cards
+    modeladmin.message_user(request, f'Recomputed {refreshed} posting preview(s) and key phrases.', messages.SUCCESS)
+
 
 @admin.register(JobPosting)
 class JobPostingAdmin(admin.ModelAdmin):
     list_display = ('title', 'company_name', 'source', 'location', 'date_added_db')
     search_fields = ('title', 'company_name', 'description', 'location', 'source')
-    list_filter = ('source', 'date_added_db', 'location')
-    readonly_fields = ('date_added_db',)
\ No newline at end of file
+    list_filter = ('source', 'date_added_db', LocationFilter)
+    readonly_fields = ('date_added_db',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [refresh_derived_fields]
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # The list never shows descriptions, so don't load them for every row on the page
+        match = request.resolver_match
+        if match and match.url_name == 'jobs_jobposting_changelist':
+            queryset = queryset.defer('description')
+        return queryset
+
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'user', 'query', 'within_km', 'salary_min', 'salary_max', 'active', 'last_notified_at')
+    list_filter = ('active',)
+    search_fields = ('name', 'query', 'user__username')
+    raw_id_fields = ('user',)
+    readonly_fields = ('terms', 'center_lat', 'center_lon', 'last_notified_at')
+
+
+@admin.register(JobEventCount)
+class JobEventCountAdmin(admin.ModelAdmin):
+    """ Read-only: rows are only ever written by the event flusher (jobs/tracking.py). """
+    list_display = ('hour', 'kind', 'posting_id', 'source', 'shard', 'count')
+    list_filter = ('kind', 'hour')
+    search_fields = ('source',)
+    date_hierarchy = 'hour'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
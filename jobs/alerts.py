@@ -0,0 +1,218 @@
+# jobs/alerts.py
+
+"""
+Saved searches and job alerts.
+
+Running every saved search against the job table on a schedule costs
+searches x postings. Instead the searches are indexed and each new posting
+is matched against them (a "percolator"): the posting's keys are looked up
+in the SavedSearchKey table and only the searches found there are checked.
+The work per posting depends on the posting and the searches it actually
+matches, not on how many searches exist.
+
+Keys. Each saved search is indexed under one key:
+  * its longest keyword (every keyword must be in the posting, so any one
+    will do; the longest is usually the rarest),
+  * without keywords but with a radius, the geohash cells covering the circle
+    ("geo:<cell>", see core/geo.py), plus "remote" if remote jobs count,
+  * with only a salary range, the SALARY_BANDS it overlaps ("salary:<band
+    floor>"; an open end runs to the first or last band),
+  * otherwise "*", which every posting has.
+A posting has its words (title, company, location, description), every
+prefix of its geohash as "geo:<prefix>", "remote" when it is remote, the
+salary bands its USD range overlaps (none without a salary), and "*".
+The other conditions (remaining keywords, salary, exact distance) are checked
+in Python for the few searches a key lookup returns.
+
+Keywords match whole words, so "java" does not alert on "javascript" the way
+the job list's substring search would.
+
+Matches are stored as JobAlert rows. `manage.py send_job_alerts` sends each
+user one digest email with everything new since the last one.
+"""
+
+import bisect
+import logging
+from collections import defaultdict
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import strip_tags
+from core import geo
+from . import salary
+from .models import JobAlert, SavedSearch, SavedSearchKey
+from .suggest import normalize
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 100 # SavedSearchKey.key
+KEYS_PER_QUERY = 500 # Stays under SQLite's bound parameter limit
+POSTINGS_PER_CHUNK = 200
+# Floors of the salary bands salary-only searches are indexed under, annual USD
+SALARY_BANDS = (0, 20_000, 40_000, 60_000, 80_000, 100_000, 125_000, 150_000, 200_000, 250_000, 300_000, 400_000)
+
+
+def words(text):
+    """ Normalized words of a text, without sentence-ending dots ("python." -> "python", ".net" stays). """
+    return {w.rstrip('.') for w in normalize(text).split() if w.rstrip('.')}
+
+
+# --- Saved searches ---
+
+def salary_keys(low, high):
+    """ "salary:<floor>" of every band overlapping [low, high]; None (or 0) is an open end. """
+    first = bisect.bisect_right(SALARY_BANDS, low or 0) - 1
+    last = bisect.bisect_right(SALARY_BANDS, high) - 1 if high else len(SALARY_BANDS) - 1
+    return {f'salary:{floor}' for floor in SALARY_BANDS[first:last + 1]}
+
+
+def compile_search(search):
+    """ Fills the compiled fields of a SavedSearch from its inputs. Called by SavedSearch.save(). """
+    search.terms = sorted(words(search.query))
+    search.center_lat = search.center_lon = None
+    if search.within_km:
+        place = geo.resolve(search.near) if search.near else None
+        profile = getattr(search.user, 'profile', None)
+        if place and place.lat is not None:
+            search.center_lat, search.center_lon = place.lat, place.lon
+        elif not search.near and profile is not None and profile.location_lat is not None:
+            search.center_lat, search.center_lon = profile.location_lat, profile.location_lon
+        else:
+            logger.info(f"Saved search {search.pk}: no coordinates for {search.near or 'the user profile'!r}, radius ignored.")
+
+
+def search_keys(search):
+    """ The keys a saved search is indexed under (see the module docstring). """
+    terms = [t for t in search.terms if len(t) <= MAX_KEY_LENGTH]
+    if terms:
+        return {max(terms, key=lambda t: (len(t), t))}
+    if search.within_km and search.center_lat is not None:
+        keys = {f'geo:{cell}' for cell in geo.cover(search.center_lat, search.center_lon, search.within_km)}
+        return keys | {'remote'} if search.include_remote else keys
+    if search.salary_min or search.salary_max:
+        return salary_keys(search.salary_min, search.salary_max)
+    return {'*'}
+
+
+def index_search(search):
+    """ Replaces the index rows of one saved search. """
+    with transaction.atomic():
+        SavedSearchKey.objects.filter(search=search).delete()
+        SavedSearchKey.objects.bulk_create([SavedSearchKey(key=key, search=search) for key in search_keys(search)])
+
+
+# --- Percolating new postings ---
+
+def posting_words(posting):
+    text = ' '.join(filter(None, (posting.title, posting.company_name, posting.location, strip_tags(posting.description or ''))))
+    return words(text)
+
+
+def posting_keys(posting, terms):
+    keys = {t for t in terms if len(t) <= MAX_KEY_LENGTH} | {'*'}
+    geohash = posting.location_geohash
+    keys.update(f'geo:{geohash[:i]}' for i in range(1, len(geohash) + 1))
+    if posting.location_remote:
+        keys.add('remote')
+    if posting.salary_usd_min is not None or posting.salary_usd_max is not None:
+        keys.update(salary_keys(posting.salary_usd_min, posting.salary_usd_max))
+    return keys
+
+
+def matches(search, posting, terms):
+    """ Whether a posting satisfies every condition of a saved search. """
+    if not terms.issuperset(search.terms):
+        return False
+    if (search.salary_min or search.salary_max) and not salary.overlaps(
+            posting.salary_usd_min, posting.salary_usd_max, search.salary_min or None, search.salary_max or None):
+        return False
+    if search.within_km and search.center_lat is not None:
+        if posting.location_remote and search.include_remote:
+            return True
+        if posting.location_lat is None:
+            return False
+        distance = geo.haversine_km(search.center_lat, search.center_lon, posting.location_lat, posting.location_lon)
+        return distance <= search.within_km
+    return True
+
+
+def percolate(postings):
+    """ Records a JobAlert for every active saved search each posting matches. Returns the number of matches. """
+    matched = 0
+    for start in range(0, len(postings), POSTINGS_PER_CHUNK):
+        chunk = [p for p in postings[start:start + POSTINGS_PER_CHUNK] if p.pk is not None]
+        terms = {p.pk: posting_words(p) for p in chunk}
+        by_key = defaultdict(list)
+        for posting in chunk:
+            for key in posting_keys(posting, terms[posting.pk]):
+                by_key[key].append(posting)
+
+        # Key lookups: one query per KEYS_PER_QUERY distinct keys in the chunk, answered from the unique index
+        candidates = defaultdict(set) # search id -> postings to check against it
+        keys = list(by_key)
+        for i in range(0, len(keys), KEYS_PER_QUERY):
+            rows = SavedSearchKey.objects.filter(key__in=keys[i:i + KEYS_PER_QUERY]).values_list('key', 'search_id')
+            for key, search_id in rows:
+                candidates[search_id].update(by_key[key])
+        if not candidates:
+            continue
+
+        searches = SavedSearch.objects.filter(pk__in=candidates, active=True).in_bulk()
+        alerts = [
+            JobAlert(search=search, posting=posting)
+            for search_id, search in searches.items()
+            for posting in candidates[search_id]
+            if matches(search, posting, terms[posting.pk])
+        ]
+        JobAlert.objects.bulk_create(alerts, ignore_conflicts=True) # Re-ingesting a posting doesn't alert twice
+        matched += len(alerts)
+    if matched:
+        logger.info(f"Percolated {len(postings)} postings: {matched} saved search matches.")
+    return matched
+
+
+# --- Digests ---
+
+def send_digests(connection=None):
+    """
+    Emails each user with unsent alerts one digest, all over one SMTP
+    connection, and marks the alerts sent. Returns the number of emails sent.
+    """
+    limit = getattr(settings, 'JOB_ALERT_MAX_PER_EMAIL', 20)
+    pending = (
+        JobAlert.objects.filter(sent_at__isnull=True, search__active=True, search__user__email__gt='')
+        .select_related('search__user', 'posting').defer('posting__description')
+        .order_by('search__user_id', '-posting__date_added_db')
+    )
+    by_user = defaultdict(list)
+    for alert in pending:
+        by_user[alert.search.user].append(alert)
+    if not by_user:
+        return 0
+
+    messages, alert_ids, search_ids = [], [], set()
+    for user, alerts in by_user.items():
+        postings = list({alert.posting_id: alert.posting for alert in alerts}.values()) # One entry per posting
+        body = render_to_string('jobs/email/alert_digest.txt', {
+            'user': user, 'postings': postings[:limit], 'more': max(len(postings) - limit, 0),
+            'searches': sorted({str(alert.search) for alert in alerts}),
+        })
+        subject = f"{len(postings)} new job{'s' if len(postings) != 1 else ''} matching your saved searches"
+        messages.append(EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email]))
+        alert_ids.extend(alert.pk for alert in alerts)
+        search_ids.update(alert.search_id for alert in alerts)
+
+    try:
+        connection = connection or get_connection()
+        sent = connection.send_messages(messages) or 0
+    except OSError as e:
+        logger.error(f"Could not send job alert digests, will retry next run: {e}", exc_info=True)
+        return 0
+    now = timezone.now()
+    with transaction.atomic():
+        JobAlert.objects.filter(pk__in=alert_ids).update(sent_at=now)
+        SavedSearch.objects.filter(pk__in=search_ids).update(last_notified_at=now)
+    logger.info(f"Sent {sent} job alert digests covering {len(alert_ids)} alerts.")
+    return sent
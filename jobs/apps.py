@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        from . import receivers # noqa: F401 - connects signal handlers
+        from core import metrics
+        from core import events
+        from . import semantic, tracking
+        metrics.register('job_embeddings', semantic.index_stats)
+        for kind in tracking.KINDS:
+            events.register(kind, tracking.save_counts)
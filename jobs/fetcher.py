@@ -0,0 +1,258 @@
+# jobs/fetcher.py
+
+"""
+Concurrent job fetcher.
+
+Pulls pages from many source adapters at once with asyncio. HTTP is done by a
+shared `requests.Session` (pooled keep-alive connections via urllib3) running
+on worker threads, so we stay on the HTTP stack already in requirements.txt.
+
+    sources -> [per-host limited workers] -> bounded record queue -> sink (DB upsert)
+
+The record queue is bounded, so when the sink falls behind, workers block on
+`put()` instead of buffering pages in memory.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchStats:
+    """ Counters reported at the end of a run. """
+    pages: int = 0
+    bytes: int = 0
+    not_modified: int = 0
+    records: int = 0
+    retries: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def pages_per_sec(self):
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_sec(self):
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (
+            f"pages={self.pages} not_modified={self.not_modified} records={self.records} "
+            f"retries={self.retries} errors={self.errors} elapsed={self.elapsed:.2f}s "
+            f"({self.pages_per_sec:.1f} pages/s, {self.bytes_per_sec / 1024:.1f} KiB/s)"
+        )
+
+
+class JobFetcher:
+    """
+    Fetches every page of every source concurrently and feeds parsed records to `sink`.
+
+    `sink` is a plain (synchronous) callable taking a list of records, usually
+    jobs.ingest.upsert_postings. It always runs on one dedicated thread, so
+    database writes are serialized and use a single connection.
+
+    `validators` maps url -> {'etag': ..., 'last_modified': ...} from a previous
+    run; it is updated in place with whatever the servers send back this time.
+
+    Each page URL is fetched at most once per source and run, and a source stops
+    being followed after `max_pages` pages, so a feed whose "next" links loop
+    or never end can't keep the run going.
+    """
+    def __init__(self, sources, sink, validators=None, concurrency=32, per_host=4,
+                 max_retries=3, backoff_base=0.5, backoff_cap=30.0, timeout=20.0,
+                 queue_size=1000, batch_size=200, max_pages=1000, session=None):
+        self.sources = sources
+        self.sink = sink
+        self.validators = validators if validators is not None else {}
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.max_pages = max_pages
+        self.session = session or self._build_session()
+        self.stats = FetchStats()
+        self._host_limits = {}
+        self._seen = {} # source -> URLs queued this run
+        # Enough threads for every concurrent request to block on the network
+        self._http_pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='jobfetch-http')
+        self._sink_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jobfetch-sink')
+
+    def _build_session(self):
+        session = requests.Session()
+        # One keep-alive pool per host, sized to the per-host concurrency limit
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=self.per_host, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = 'HireSynapse-JobFetcher/1.0'
+        return session
+
+    def _host_limit(self, url, source):
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(source.max_per_host or self.per_host)
+        return self._host_limits[host]
+
+    def _conditional_headers(self, url, source):
+        headers = dict(source.headers)
+        cached = self.validators.get(url)
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def _backoff(self, attempt, retry_after=None):
+        """ Exponential backoff with full jitter; honours a server's Retry-After if given. """
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_cap)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                    return max(0.0, min(delay, self.backoff_cap))
+                except (TypeError, ValueError):
+                    pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    async def _get(self, url, headers):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._http_pool,
+            lambda: self.session.get(url, headers=headers, timeout=self.timeout),
+        )
+
+    async def _fetch_page(self, source, url):
+        """ Fetches one page with retries. Returns the response, or None on 304 / failure. """
+        headers = self._conditional_headers(url, source)
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._host_limit(url, source):
+                    response = await self._get(url, headers)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Giving up on {url} after {attempt + 1} attempts: {e}")
+                    self.stats.errors += 1
+                    return None
+                self.stats.retries += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code == 304:
+                self.stats.not_modified += 1
+                return None
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                self.stats.retries += 1
+                await asyncio.sleep(self._backoff(attempt, response.headers.get('Retry-After')))
+                continue
+            if response.status_code != 200:
+                logger.error(f"Fetching {url} failed with HTTP {response.status_code}")
+                self.stats.errors += 1
+                return None
+
+            self.stats.pages += 1
+            self.stats.bytes += len(response.content)
+            self.validators[url] = {
+                'etag': response.headers.get('ETag', ''),
+                'last_modified': response.headers.get('Last-Modified', ''),
+            }
+            return response
+        return None
+
+    def _enqueue(self, frontier, source, url):
+        """ Queues a page unless the source already queued it this run or has reached max_pages. """
+        seen = self._seen.setdefault(source, set())
+        if url in seen:
+            return
+        if len(seen) >= self.max_pages:
+            logger.warning(f"Not following {url}: {source} reached {self.max_pages} pages this run")
+            return
+        seen.add(url)
+        frontier.put_nowait((source, url))
+
+    async def _worker(self, frontier, records):
+        while True:
+            source, url = await frontier.get()
+            try:
+                response = await self._fetch_page(source, url)
+                if response is not None:
+                    result = source.parse(url, response.content)
+                    for record in result.records:
+                        await records.put(record) # Blocks when the sink is behind
+                    for next_url in result.next_urls:
+                        self._enqueue(frontier, source, next_url)
+            except Exception as e:
+                logger.error(f"Error processing {url} from {source}: {e}", exc_info=True)
+                self.stats.errors += 1
+            finally:
+                frontier.task_done()
+
+    async def _consumer(self, records):
+        loop = asyncio.get_running_loop()
+        batch = []
+        while True:
+            record = await records.get()
+            if record is not None:
+                batch.append(record)
+            if batch and (record is None or len(batch) >= self.batch_size):
+                try:
+                    await loop.run_in_executor(self._sink_pool, self.sink, batch)
+                    self.stats.records += len(batch)
+                except Exception as e:
+                    # Keep draining the queue, otherwise the workers would block forever
+                    logger.error(f"Sink failed for a batch of {len(batch)} records: {e}", exc_info=True)
+                    self.stats.errors += 1
+                batch = []
+            if record is None:
+                return
+
+    async def run(self):
+        """ Fetches everything reachable from the sources' start URLs. Returns FetchStats. """
+        started = time.perf_counter()
+        frontier = asyncio.Queue()
+        records = asyncio.Queue(maxsize=self.queue_size)
+        for source in self.sources:
+            for url in source.start_urls():
+                self._enqueue(frontier, source, url)
+
+        consumer = asyncio.create_task(self._consumer(records))
+        workers = [asyncio.create_task(self._worker(frontier, records)) for _ in range(self.concurrency)]
+        try:
+            await frontier.join()
+            await records.put(None) # Tell the consumer to flush and stop
+            await consumer
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._http_pool.shutdown(wait=False)
+            self._sink_pool.submit(_close_db_connections).result()
+            self._sink_pool.shutdown()
+
+        self.stats.elapsed = time.perf_counter() - started
+        logger.info(f"Job fetch finished: {self.stats.summary()}")
+        return self.stats
+
+
+def _close_db_connections():
+    """ The sink thread opens its own DB connection; close it before the thread goes away. """
+    from django.db import connections
+    connections.close_all()
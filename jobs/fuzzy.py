@@ -0,0 +1,123 @@
+# jobs/fuzzy.py
+
+"""
+Typo-tolerant job search using trigrams.
+
+On PostgreSQL this uses pg_trgm: GIN trigram indexes on title and company
+name (created by migration 0003) and the `%>` word-similarity operator, so
+the index does the candidate search.
+
+Other backends (SQLite) have no trigram support, so we keep our own posting
+table, JobTrigram, with one row per (trigram, posting). A fuzzy query looks
+up the query's trigrams in that table through its index and counts how many
+each posting shares, which approximates pg_trgm's word_similarity(). Trigrams
+held by more than MAX_TRIGRAM_POSTINGS postings ("  d", "er ") are too common
+to pick candidates with: only the rarer ones do, so a query never groups the
+rows of a trigram that is in most of the table.
+"""
+
+import logging
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from .models import JobPosting, JobTrigram
+from .suggest import normalize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.4 # Share of the query's trigrams a posting must contain
+DEFAULT_LIMIT = 100
+MAX_TRIGRAM_POSTINGS = 1000 # Trigrams in more postings than this don't pick candidates
+
+
+def uses_pg_trgm(using=None):
+    """ Whether database `using` (default: where trigram rows are written) searches with pg_trgm. """
+    return connections[using or router.db_for_write(JobTrigram)].vendor == 'postgresql'
+
+
+def trigrams(text):
+    """ pg_trgm-style trigrams: each word is padded with two leading spaces and one trailing. """
+    grams = set()
+    for word in normalize(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def posting_trigrams(posting):
+    return trigrams(posting.title) | trigrams(posting.company_name)
+
+
+def index_postings(postings):
+    """ (Re)builds trigram rows for the given postings. No-op on PostgreSQL. """
+    if uses_pg_trgm():
+        return
+    postings = [p for p in postings if p.pk]
+    if not postings:
+        return
+    rows = [JobTrigram(trigram=gram, posting_id=p.pk) for p in postings for gram in posting_trigrams(p)]
+    with transaction.atomic():
+        JobTrigram.objects.filter(posting_id__in=[p.pk for p in postings]).delete()
+        JobTrigram.objects.bulk_create(rows, batch_size=2000)
+
+
+def fuzzy_search(query, limit=DEFAULT_LIMIT, threshold=DEFAULT_THRESHOLD):
+    """ Returns [(posting_id, similarity)] for postings that roughly match `query`, best first. """
+    # The view may read from a replica: the backend check and the query go to the same database
+    db = router.db_for_read(JobPosting)
+    if uses_pg_trgm(db):
+        return _fuzzy_search_pg(query, limit, threshold, db)
+
+    query_grams = trigrams(query)
+    if not query_grams:
+        return []
+    min_shared = max(1, int(threshold * len(query_grams) + 0.999))
+    rows = JobTrigram.objects.using(db)
+    # An index range scan that stops after MAX_TRIGRAM_POSTINGS + 1 rows
+    common = {gram for gram in query_grams if rows.filter(trigram=gram)[MAX_TRIGRAM_POSTINGS:].exists()}
+    # A match shares at least min_shared - len(common) of the rare trigrams, so they alone pick candidates
+    need = min_shared - len(common)
+    candidates = Q(posting_id__in=(
+        rows.filter(trigram__in=query_grams - common)
+        .values('posting_id').annotate(shared=Count('id')).filter(shared__gte=max(need, 1))
+        .values('posting_id')
+    ))
+    if need < 1:
+        # Postings sharing only common trigrams can match too: the newest holders of each, in index order
+        newest = set()
+        for gram in common:
+            newest.update(
+                rows.filter(trigram=gram).order_by('-posting_id').values_list('posting_id', flat=True)[:MAX_TRIGRAM_POSTINGS]
+            )
+        candidates |= Q(posting_id__in=sorted(newest)[-MAX_TRIGRAM_POSTINGS:])
+    matches = (
+        rows.filter(candidates, trigram__in=query_grams)
+        .values('posting_id')
+        .annotate(shared=Count('id'))
+        .filter(shared__gte=min_shared)
+        .order_by('-shared', 'posting_id')[:limit]
+    )
+    return [(row['posting_id'], row['shared'] / len(query_grams)) for row in matches]
+
+
+def _fuzzy_search_pg(query, limit, threshold, db):
+    from django.contrib.postgres.lookups import TrigramWordSimilar
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    # The threshold is set on the connection the query then runs on
+    with transaction.atomic(using=db):
+        with connections[db].cursor() as cursor:
+            # Threshold used by the %> operator (and therefore by the GIN index scan). is_local=true
+            # scopes it to this transaction, so it doesn't stay set on a pooled connection
+            cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)", [str(threshold)])
+        rows = (
+            JobPosting.objects.using(db).filter(
+                TrigramWordSimilar(F('title'), query) | TrigramWordSimilar(F('company_name'), query)
+            )
+            .annotate(similarity=Greatest(
+                TrigramWordSimilarity(query, 'title'), TrigramWordSimilarity(query, 'company_name'),
+            ))
+            .order_by('-similarity', 'pk')
+            .values_list('pk', 'similarity')[:limit]
+        )
+        return list(rows)
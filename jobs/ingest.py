@@ -0,0 +1,72 @@
+# jobs/ingest.py
+
+import logging
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from core.geo import LOCATION_FIELDS
+from .models import JobPosting
+from .salary import SALARY_FIELDS
+from .signals import postings_ingested
+
+logger = logging.getLogger(__name__)
+
+# Fields a source record may carry. Anything else in the record is ignored.
+POSTING_FIELDS = (
+    'title', 'description', 'company_name', 'location',
+    'salary_range', 'job_url', 'source', 'date_posted_source',
+)
+# Fields computed from the ones above by JobPosting.populate_derived_fields()
+DERIVED_FIELDS = ('description_preview', 'key_phrases', *SALARY_FIELDS, *LOCATION_FIELDS)
+# Fields refreshed in place when a posting with the same job_url already exists.
+UPDATE_FIELDS = [f for f in POSTING_FIELDS if f != 'job_url'] + list(DERIVED_FIELDS)
+
+
+def build_posting(record):
+    """ Turns one raw source record (a dict) into an unsaved JobPosting, or None if unusable. """
+    data = {field: record.get(field) for field in POSTING_FIELDS}
+    if not data['job_url'] or not data['title']:
+        return None
+    # Sources hand us ISO strings; the model wants datetimes
+    if isinstance(data['date_posted_source'], str):
+        data['date_posted_source'] = parse_datetime(data['date_posted_source'])
+    data['description'] = data['description'] or ''
+    data['company_name'] = data['company_name'] or ''
+    data['source'] = data['source'] or ''
+    posting = JobPosting(**data)
+    posting.populate_derived_fields() # bulk_create skips save()
+    return posting
+
+
+def upsert_postings(records):
+    """
+    Inserts or updates a batch of job records in a single statement, keyed on job_url.
+    Returns a (created, updated) tuple of JobPosting lists.
+    """
+    postings = {}
+    for record in records:
+        posting = build_posting(record)
+        if posting is None:
+            logger.warning(f"Skipping job record without url/title: {record!r:.200}")
+            continue
+        postings[posting.job_url] = posting # Last record wins for duplicate URLs in a batch
+    if not postings:
+        return [], []
+
+    with transaction.atomic():
+        # One indexed lookup tells us which rows are new, so listeners can
+        # tell fresh postings from refreshed ones.
+        existing = set(
+            JobPosting.objects.filter(job_url__in=list(postings)).values_list('job_url', flat=True)
+        )
+        saved = JobPosting.objects.bulk_create(
+            list(postings.values()),
+            update_conflicts=True,
+            unique_fields=['job_url'],
+            update_fields=UPDATE_FIELDS,
+        )
+
+    created = [p for p in saved if p.job_url not in existing]
+    updated = [p for p in saved if p.job_url in existing]
+    logger.info(f"Upserted {len(saved)} job postings ({len(created)} new, {len(updated)} updated).")
+    postings_ingested.send(sender=JobPosting, created=created, updated=updated)
+    return created, updated
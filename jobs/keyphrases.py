@@ -0,0 +1,148 @@
+# jobs/keyphrases.py
+
+"""
+Key phrase extraction for the resume-versus-job keyword gap.
+
+A posting's key phrases are computed once, when it is saved or ingested
+(JobPosting.populate_derived_fields), and stored in JobPosting.key_phrases,
+so showing a gap never re-reads the description.
+
+Two kinds of phrases, in this order:
+  1. Curated skills from the canonical taxonomy (profiles/skills.py), up to
+     MAX_MENTION_WORDS words long, stored as their canonical key: a posting
+     asking for "K8s" and a resume listing "Kubernetes" meet on "kubernetes".
+  2. Other phrases ranked with RAKE (Rapid Automatic Keyword Extraction):
+     the text is cut at punctuation and stopwords into runs of content
+     words, each word scores degree / frequency (words that keep appearing
+     inside longer phrases score higher), and a phrase scores the sum of
+     its words. Phrases from the title count double.
+
+Everything is normalized the way skills are (normalize_skill), so the
+resume side (profiles/terms.py) can compare with plain set operations.
+"""
+
+import html
+import re
+from collections import Counter, defaultdict
+
+MAX_PHRASES = 20 # Per posting; the gap is meant to be read, not scrolled
+MAX_PHRASE_WORDS = 3
+TITLE_WEIGHT = 2.0
+MIN_WORD_LENGTH = 3 # Shorter single words are noise unless they are known skills ("go", "r", "c#")
+
+# English function words plus the boilerplate every posting repeats. They
+# split phrases instead of being part of them.
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either else etc ever every few for
+from further had has have having he her here hers him his how i if in into is it its itself just least
+less like may me might more most much must my no nor not now of off on once only or other our ours out
+over own per plus same shall she should so some such than that the their theirs them then there these
+they this those through to too under until up upon us very via was we well were what when where whether
+which while who whom whose why will with within without would yet you your yours
+ability able applicant applicants apply benefits candidate candidates closely company competitive
+days demonstrated desired environment equal excellent experience experienced familiarity familiar good
+great help ideal including join knowledge looking new nice opportunity plus position preferred proven
+related required requirements responsibilities responsible role skills solid strong successful team
+teams understanding using work working world year years
+""".split())
+
+# Phrase boundaries: punctuation, bullets, line breaks, and a dot that ends a
+# sentence (not the one in ".net" or "node.js")
+_boundary = re.compile(r'[,;:!?()\[\]{}|\\"“”•·*\n\r\t]+|\.(?=\s|$)|\s[-–—]+\s')
+_tag = re.compile(r'<[^>]*>') # A tag ends a phrase too: "<li>Python</li><li>Go</li>" is two
+_letter = re.compile(r'[^\W\d_]')
+
+
+def chunks(text):
+    """ Normalized word lists of the text between phrase boundaries. """
+    from profiles.skills import normalize_skill
+    for chunk in _boundary.split(html.unescape(_tag.sub('\n', text or ''))):
+        words = normalize_skill(chunk).split()
+        if words:
+            yield words
+
+
+def runs(words):
+    """ Splits a chunk at stopwords and numbers into runs of content words. """
+    run = []
+    for word in words:
+        if word in STOPWORDS or not _letter.search(word):
+            if run:
+                yield run
+            run = []
+        else:
+            run.append(word)
+    if run:
+        yield run
+
+
+def ngrams(words, max_words=MAX_PHRASE_WORDS):
+    for start in range(len(words)):
+        for length in range(1, max_words + 1):
+            if start + length > len(words):
+                break
+            yield ' '.join(words[start:start + length])
+
+
+def skill_mentions(words, skill_terms):
+    """ Canonical keys of the skills named in a chunk. """
+    from profiles.skills import MAX_MENTION_WORDS
+    return {skill_terms[gram] for gram in ngrams(words, MAX_MENTION_WORDS) if gram in skill_terms}
+
+
+def _candidates(text):
+    """ Chunks of a text and its candidate phrases (runs cut to MAX_PHRASE_WORDS words). """
+    text_chunks = list(chunks(text))
+    phrases = []
+    for words in text_chunks:
+        for run in runs(words):
+            phrases.extend(run[i:i + MAX_PHRASE_WORDS] for i in range(0, len(run), MAX_PHRASE_WORDS))
+    return text_chunks, phrases
+
+
+def extract_key_phrases(title, description, skill_terms=None, limit=MAX_PHRASES):
+    """
+    Up to `limit` key phrases of a posting: canonical skill keys first (most
+    mentioned first), then RAKE phrases, best first. skill_terms is
+    {normalized name or alias: canonical key}, by default the live taxonomy
+    (migrations pass one built from historical models).
+    """
+    if skill_terms is None:
+        from profiles.skills import mention_keys
+        skill_terms = mention_keys()
+
+    skill_counts = Counter()
+    scored = []
+    for text, weight in ((title, TITLE_WEIGHT), (description, 1.0)):
+        text_chunks, phrases = _candidates(text)
+        for words in text_chunks:
+            skill_counts.update(skill_mentions(words, skill_terms))
+        scored.append((phrases, weight))
+
+    # RAKE word scores over both texts together
+    frequency, degree = Counter(), Counter()
+    for phrases, _ in scored:
+        for phrase in phrases:
+            for word in phrase:
+                frequency[word] += 1
+                degree[word] += len(phrase)
+    phrase_scores = defaultdict(float)
+    for phrases, weight in scored:
+        for phrase in phrases:
+            if len(phrase) == 1 and len(phrase[0]) < MIN_WORD_LENGTH:
+                continue
+            key = ' '.join(phrase)
+            # max: a phrase repeated ten times is no more "key" than one said once in the title
+            phrase_scores[key] = max(phrase_scores[key], weight * sum(degree[w] / frequency[w] for w in phrase))
+
+    result = [key for key, _ in sorted(skill_counts.items(), key=lambda item: (-item[1], item[0]))][:limit]
+    seen = set(result)
+    for key, _ in sorted(phrase_scores.items(), key=lambda item: (-item[1], item[0])):
+        if len(result) >= limit:
+            break
+        key = skill_terms.get(key, key) # An alias phrase ("js") is the skill it names
+        if key not in seen:
+            seen.add(key)
+            result.append(key)
+    return result
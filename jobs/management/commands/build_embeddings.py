@@ -0,0 +1,27 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from core import embeddings
+from jobs import semantic
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = ('Embeds every job posting (texts already in the embedding store are not sent to the model again) '
+            'and rebuilds the similar-jobs index from scratch, re-clustering it. Run after switching models '
+            'or to drop deleted postings from the index.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Postings embedded per model call batch.')
+        parser.add_argument('--nlist', type=int, help='Index cells (default: about the square root of the postings).')
+
+    def handle(self, *args, **options):
+        model = embeddings.get_model()
+        self.stdout.write(self.style.SUCCESS(f'--- Building job embeddings with {model.key} ---'))
+        started = time.perf_counter()
+        count = semantic.rebuild(chunk_size=options['chunk_size'], nlist=options['nlist'])
+        stats = semantic.index_stats()
+        summary_msg = (f"Indexed {count} postings in {stats['nlist']} cells, {stats['store']} texts in the store, "
+                       f'in {time.perf_counter() - started:.2f}s')
+        logger.info(summary_msg)
+        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
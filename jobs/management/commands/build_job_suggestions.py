@@ -0,0 +1,38 @@
+import logging
+import random
+import time
+from django.core.management.base import BaseCommand
+from jobs import suggest
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Rebuilds the memory-mapped job search suggestion snapshot from the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bench', type=int, default=0, metavar='N',
+                            help='After building, time N random prefix lookups and report latency percentiles.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('--- Building job suggestion snapshot ---'))
+        started = time.perf_counter()
+        count = suggest.rebuild_from_db()
+        summary_msg = f'Wrote {count} terms to {suggest.snapshot_path()} in {time.perf_counter() - started:.2f}s'
+        logger.info(summary_msg)
+        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
+
+        if options['bench'] and count:
+            self._bench(options['bench'])
+
+    def _bench(self, n):
+        snapshot = suggest.get_snapshot()
+        terms = [snapshot.term(random.randrange(snapshot.count)).decode('utf-8') for _ in range(n)]
+        timings = []
+        for term in terms:
+            prefix = term[:random.randint(1, max(1, len(term)))]
+            started = time.perf_counter()
+            suggest.suggest(prefix)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p50, p99 = timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(f'Lookups: {n}  p50: {p50:.3f} ms  p99: {p99:.3f} ms  max: {timings[-1]:.3f} ms')
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from jobs.fetcher import JobFetcher
+from jobs.ingest import upsert_postings
+from jobs.models import FetchState
+from jobs.sources import load_sources
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Fetches job postings from all configured sources concurrently and upserts them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight across all hosts.')
+        parser.add_argument('--per-host', type=int, default=4, help='Requests in flight per host.')
+        parser.add_argument('--retries', type=int, default=3, help='Retries per page on errors / 429 / 5xx.')
+        parser.add_argument('--batch-size', type=int, default=200, help='Records per DB upsert.')
+        parser.add_argument('--queue-size', type=int, default=1000, help='Max parsed records buffered before fetching pauses.')
+        parser.add_argument('--max-pages', type=int, default=1000, help='Pages followed per source before giving up on its pagination.')
+        parser.add_argument('--no-conditional', action='store_true', help='Ignore stored ETag/Last-Modified validators.')
+
+    def handle(self, *args, **options):
+        sources = load_sources()
+        if not sources:
+            raise CommandError('No job sources configured. Add entries to settings.JOB_FETCH_SOURCES.')
+
+        self.stdout.write(self.style.SUCCESS(f'--- Fetching jobs from {len(sources)} sources ---'))
+        validators = {}
+        if not options['no_conditional']:
+            for state in FetchState.objects.all().iterator():
+                validators[state.url] = {'etag': state.etag, 'last_modified': state.last_modified}
+
+        fetcher = JobFetcher(
+            sources,
+            sink=upsert_postings,
+            validators=validators,
+            concurrency=options['concurrency'],
+            per_host=options['per_host'],
+            max_retries=options['retries'],
+            batch_size=options['batch_size'],
+            queue_size=options['queue_size'],
+            max_pages=options['max_pages'],
+        )
+        stats = asyncio.run(fetcher.run())
+
+        # Persist the validators we got back so the next run can send conditional requests
+        now = timezone.now()
+        FetchState.objects.bulk_create(
+            [FetchState(url=url, etag=v['etag'], last_modified=v['last_modified'], last_fetched=now)
+             for url, v in validators.items()],
+            update_conflicts=True,
+            unique_fields=['url'],
+            update_fields=['etag', 'last_modified', 'last_fetched'],
+        )
+
+        summary_msg = f'Finished job fetch. {stats.summary()}'
+        logger.info(summary_msg)
+        style = self.style.WARNING if stats.errors else self.style.SUCCESS
+        self.stdout.write(style(f'--- {summary_msg} ---'))
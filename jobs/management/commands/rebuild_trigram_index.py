@@ -0,0 +1,38 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from jobs import fuzzy
+from jobs.models import JobPosting
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Rebuilds the trigram posting table used for typo-tolerant job search (not needed on PostgreSQL).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Postings indexed per transaction.')
+
+    def handle(self, *args, **options):
+        if fuzzy.uses_pg_trgm():
+            self.stdout.write(self.style.WARNING('PostgreSQL uses pg_trgm GIN indexes; nothing to rebuild.'))
+            return
+
+        self.stdout.write(self.style.SUCCESS('--- Rebuilding job trigram index ---'))
+        started = time.perf_counter()
+        chunk_size = options['chunk_size']
+        indexed = 0
+        chunk = []
+        postings = JobPosting.objects.only('pk', 'title', 'company_name').order_by('pk')
+        for posting in postings.iterator(chunk_size=chunk_size):
+            chunk.append(posting)
+            if len(chunk) >= chunk_size:
+                fuzzy.index_postings(chunk)
+                indexed += len(chunk)
+                chunk = []
+        if chunk:
+            fuzzy.index_postings(chunk)
+            indexed += len(chunk)
+
+        summary_msg = f'Indexed {indexed} postings in {time.perf_counter() - started:.2f}s'
+        logger.info(summary_msg)
+        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
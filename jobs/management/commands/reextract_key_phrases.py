@@ -0,0 +1,48 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs.keyphrases import extract_key_phrases
+from jobs.models import JobPosting
+from profiles.models import ResumeTerms
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = ('Re-extracts the key phrases of every job posting (jobs/keyphrases.py), for the resume keyword gap. '
+            'Run after changing the extractor or adding skills and aliases to the taxonomy.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Postings updated per transaction.')
+        parser.add_argument('--resumes', action='store_true',
+                            help='Also drop stored resume terms; each is re-extracted the next time it is needed.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('--- Re-extracting job key phrases ---'))
+        started = time.perf_counter()
+        chunk_size = options['chunk_size']
+        changed = total = 0
+        chunk = []
+        postings = JobPosting.objects.only('pk', 'title', 'description', 'key_phrases').order_by('pk')
+        for posting in postings.iterator(chunk_size=chunk_size):
+            total += 1
+            phrases = extract_key_phrases(posting.title, posting.description)
+            if phrases != posting.key_phrases:
+                posting.key_phrases = phrases
+                chunk.append(posting)
+            if len(chunk) >= chunk_size:
+                changed += self._save(chunk)
+                chunk = []
+        if chunk:
+            changed += self._save(chunk)
+
+        summary_msg = f'Updated key phrases of {changed} of {total} postings in {time.perf_counter() - started:.2f}s'
+        if options['resumes']:
+            dropped, _ = ResumeTerms.objects.all().delete()
+            summary_msg += f', dropped {dropped} stored resume term sets'
+        logger.info(summary_msg)
+        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
+
+    def _save(self, chunk):
+        with transaction.atomic():
+            return JobPosting.objects.bulk_update(chunk, ['key_phrases'])
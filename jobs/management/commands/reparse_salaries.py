@@ -0,0 +1,48 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs import salary
+from jobs.models import JobPosting
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = ('Re-parses salary_range into the salary columns of every posting and re-converts them to annual USD. '
+            'Run after changing the parser or the rate table (jobs.salary.USD_RATES / settings.SALARY_USD_RATES).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Postings updated per transaction.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f'--- Re-parsing job salaries (rates as of {salary.RATES_AS_OF}) ---'))
+        started = time.perf_counter()
+        chunk_size = options['chunk_size']
+        rates = salary.usd_rates()
+        parsed = unparsed = 0
+        chunk = []
+        postings = JobPosting.objects.only('pk', 'salary_range', *salary.SALARY_FIELDS).order_by('pk')
+        for posting in postings.iterator(chunk_size=chunk_size):
+            fields = salary.salary_fields(posting.salary_range, rates)
+            if fields['salary_period']:
+                parsed += 1
+            else:
+                unparsed += 1
+            if any(getattr(posting, field) != value for field, value in fields.items()):
+                for field, value in fields.items():
+                    setattr(posting, field, value)
+                chunk.append(posting)
+            if len(chunk) >= chunk_size:
+                self._save(chunk)
+                chunk = []
+        if chunk:
+            self._save(chunk)
+
+        summary_msg = (f'Parsed {parsed} salaries, {unparsed} without amounts, '
+                       f'in {time.perf_counter() - started:.2f}s')
+        logger.info(summary_msg)
+        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
+
+    def _save(self, chunk):
+        with transaction.atomic():
+            JobPosting.objects.bulk_update(chunk, salary.SALARY_FIELDS)
@@ -0,0 +1,29 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from jobs import alerts
+from jobs.models import SavedSearch
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = ('Emails every user one digest of the new postings matching their saved searches. '
+            'Schedule it (e.g. hourly or daily with cron); matching itself happens when postings are ingested.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reindex', action='store_true',
+                            help='Recompile every saved search and rebuild the percolator index first.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('--- Sending job alert digests ---'))
+        started = time.perf_counter()
+        if options['reindex']:
+            reindexed = 0
+            for search in SavedSearch.objects.select_related('user__profile').iterator(chunk_size=500):
+                search.save() # Recompiles and re-indexes
+                reindexed += 1
+            self.stdout.write(f'Re-indexed {reindexed} saved searches.')
+        sent = alerts.send_digests()
+        summary_msg = f'Sent {sent} digest emails in {time.perf_counter() - started:.2f}s'
+        logger.info(summary_msg)
+        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-19 17:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_pg_trgm_indexes(apps, schema_editor):
+    """ pg_trgm GIN indexes; other backends use the JobTrigram table instead. """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute("CREATE INDEX IF NOT EXISTS jobs_posting_title_trgm ON jobs_jobposting USING gin (title gin_trgm_ops)")
+    schema_editor.execute("CREATE INDEX IF NOT EXISTS jobs_posting_company_trgm ON jobs_jobposting USING gin (company_name gin_trgm_ops)")
+
+
+def drop_pg_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS jobs_posting_title_trgm")
+    schema_editor.execute("DROP INDEX IF EXISTS jobs_posting_company_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_fetchstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='jobs.jobposting')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['trigram', 'posting'], name='jobs_trigram_lookup_idx')],
+            },
+        ),
+        migrations.RunPython(create_pg_trgm_indexes, drop_pg_trgm_indexes),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-19 17:29
+
+import re
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+PREVIEW_LENGTH = 400
+
+
+def _make_preview(description):
+    """ Frozen copy of jobs.models.make_preview() as of this migration. """
+    text = re.sub(r'\s+', ' ', strip_tags(description or '')).strip()
+    return Truncator(text).chars(PREVIEW_LENGTH)
+
+
+def fill_description_preview(apps, schema_editor):
+    db = schema_editor.connection.alias # The database being migrated (migrate --database); the router would send writes to default
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    batch = []
+    for posting in JobPosting.objects.using(db).only('id', 'description').iterator(chunk_size=2000):
+        posting.description_preview = _make_preview(posting.description)
+        batch.append(posting)
+        if len(batch) >= 2000:
+            JobPosting.objects.using(db).bulk_update(batch, ['description_preview'])
+            batch = []
+    JobPosting.objects.using(db).bulk_update(batch, ['description_preview'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_trigram_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='description_preview',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_description_preview, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-19 17:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_description_preview'),
+        ('profiles', '0003_skill_taxonomy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobPostingSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_mentions', to='jobs.jobposting')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='profiles.canonicalskill')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('skill', 'posting'), name='jobs_postingskill_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2 on 2026-10-19 17:57
+
+from django.db import migrations, models
+
+from jobs.salary import SALARY_FIELDS, salary_fields
+
+
+def fill_salary_fields(apps, schema_editor):
+    db = schema_editor.connection.alias
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    batch = []
+    postings = JobPosting.objects.using(db).exclude(salary_range__isnull=True).exclude(salary_range='')
+    for posting in postings.only('id', 'salary_range').iterator(chunk_size=2000):
+        for field, value in salary_fields(posting.salary_range).items():
+            setattr(posting, field, value)
+        batch.append(posting)
+        if len(batch) >= 2000:
+            JobPosting.objects.using(db).bulk_update(batch, SALARY_FIELDS)
+            batch = []
+    JobPosting.objects.using(db).bulk_update(batch, SALARY_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_posting_skill_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_currency',
+            field=models.CharField(blank=True, default='', editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_max',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_min',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_period',
+            field=models.CharField(blank=True, choices=[('hour', 'hour'), ('day', 'day'), ('week', 'week'), ('month', 'month'), ('year', 'year')], default='', editable=False, max_length=5),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_usd_max',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_usd_min',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['salary_usd_max', 'salary_usd_min'], name='jobs_posting_salary_usd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['salary_currency', 'salary_period', 'salary_max', 'salary_min'], name='jobs_posting_salary_idx'),
+        ),
+        migrations.RunPython(fill_salary_fields, migrations.RunPython.noop),
+    ]
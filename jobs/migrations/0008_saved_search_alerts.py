@@ -0,0 +1,64 @@
+# Generated by Django 5.2 on 2026-10-19 18:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_normalized_location'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('query', models.CharField(blank=True, help_text='Keywords; every one must appear in the posting', max_length=255)),
+                ('near', models.CharField(blank=True, help_text='Place for within_km; blank uses the profile location', max_length=150)),
+                ('within_km', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('include_remote', models.BooleanField(default=False)),
+                ('salary_min', models.PositiveIntegerField(blank=True, help_text='Annual USD', null=True)),
+                ('active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_notified_at', models.DateTimeField(blank=True, null=True)),
+                ('terms', models.JSONField(blank=True, default=list, editable=False)),
+                ('center_lat', models.FloatField(blank=True, editable=False, null=True)),
+                ('center_lon', models.FloatField(blank=True, editable=False, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'saved searches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='jobs.jobposting')),
+                ('search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='jobs.savedsearch')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('search', 'posting'), name='jobs_jobalert_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100)),
+                ('search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keys', to='jobs.savedsearch')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('key', 'search'), name='jobs_savedsearchkey_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-19 19:12
+
+from django.db import migrations, models
+
+from jobs.keyphrases import extract_key_phrases
+
+
+def fill_key_phrases(apps, schema_editor):
+    db = schema_editor.connection.alias
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    CanonicalSkill = apps.get_model('profiles', 'CanonicalSkill')
+    SkillAlias = apps.get_model('profiles', 'SkillAlias')
+    # The taxonomy as of this migration, not the live alias map (which reads the default database)
+    skill_terms = {key: key for key in CanonicalSkill.objects.using(db).values_list('key', flat=True)}
+    skill_terms.update(SkillAlias.objects.using(db).values_list('alias', 'canonical__key'))
+    batch = []
+    for posting in JobPosting.objects.using(db).only('id', 'title', 'description').iterator(chunk_size=2000):
+        posting.key_phrases = extract_key_phrases(posting.title, posting.description, skill_terms)
+        batch.append(posting)
+        if len(batch) >= 2000:
+            JobPosting.objects.using(db).bulk_update(batch, ['key_phrases'])
+            batch = []
+    JobPosting.objects.using(db).bulk_update(batch, ['key_phrases'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_saved_search_alerts'),
+        ('profiles', '0003_skill_taxonomy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='key_phrases',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(fill_key_phrases, migrations.RunPython.noop),
+    ]
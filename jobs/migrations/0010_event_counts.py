@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-19 18:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_key_phrases'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobEventCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(help_text='Start of the hour (UTC)')),
+                ('kind', models.CharField(choices=[('click', 'Outbound click'), ('view', 'List impression')], max_length=10)),
+                ('source', models.CharField(help_text="The posting's source when the events happened", max_length=100)),
+                ('shard', models.PositiveSmallIntegerField(default=0)),
+                ('count', models.PositiveBigIntegerField(default=0)),
+                ('posting', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='event_counts', to='jobs.jobposting')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour', 'source'], name='jobs_eventcount_source_idx')],
+                'constraints': [models.UniqueConstraint(fields=('posting', 'kind', 'hour', 'shard'), name='jobs_eventcount_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-19 21:05
+
+from django.db import migrations
+
+
+def reopen_salary_ranges(apps, schema_editor):
+    """ Open-ended ranges used to copy their known bound into the USD column of the open side. """
+    db = schema_editor.connection.alias # The database being migrated (migrate --database); the router would send writes to default
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    JobPosting.objects.using(db).filter(salary_min__isnull=True, salary_usd_min__isnull=False).update(salary_usd_min=None)
+    JobPosting.objects.using(db).filter(salary_max__isnull=True, salary_usd_max__isnull=False).update(salary_usd_max=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_event_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(reopen_salary_ranges, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-19 22:10
+
+import bisect
+from django.db import migrations, models
+
+# Frozen copy of jobs.alerts.SALARY_BANDS as of this migration
+SALARY_BANDS = (0, 20_000, 40_000, 60_000, 80_000, 100_000, 125_000, 150_000, 200_000, 250_000, 300_000, 400_000)
+
+
+def index_salary_searches(apps, schema_editor):
+    """ Salary-only searches used to be indexed under '*'; move them to the bands from their minimum up. """
+    db = schema_editor.connection.alias # The database being migrated (migrate --database); the router would send writes to default
+    SavedSearch = apps.get_model('jobs', 'SavedSearch')
+    SavedSearchKey = apps.get_model('jobs', 'SavedSearchKey')
+    searches = SavedSearch.objects.using(db).filter(salary_min__gt=0, keys__key='*')
+    for search in searches:
+        first = bisect.bisect_right(SALARY_BANDS, search.salary_min) - 1
+        SavedSearchKey.objects.using(db).filter(search=search).delete()
+        SavedSearchKey.objects.using(db).bulk_create(
+            [SavedSearchKey(key=f'salary:{floor}', search=search) for floor in SALARY_BANDS[first:]]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_open_salary_ranges'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='savedsearch',
+            name='salary_max',
+            field=models.PositiveIntegerField(blank=True, help_text='Annual USD', null=True),
+        ),
+        migrations.RunPython(index_salary_searches, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,22 @@
+import re
+from django.conf import settings
 from django.db import models
+from . import salary
 from django.utils import timezone
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+from core.models import NormalizedLocation
 
-class JobPosting(models.Model):
+PREVIEW_LENGTH = 400
+
+
+def make_preview(description):
+    """ Plain-text, whitespace-collapsed, truncated version of an HTML description. """
+    text = re.sub(r'\s+', ' ', strip_tags(description or '')).strip()
+    return Truncator(text).chars(PREVIEW_LENGTH)
+
+
+class JobPosting(NormalizedLocation):
     """ Represents a job posting aggregated from various sources. """
     title = models.CharField(max_length=255)
     description = models.TextField()
@@ -12,9 +27,203 @@ class JobPosting(models.Model):
     source = models.CharField(max_length=100, help_text="e.g., LinkedIn, Indeed, Company Website")
     date_posted_source = models.DateTimeField(blank=True, null=True, help_text="Original posting date if available")
     date_added_db = models.DateTimeField(default=timezone.now, help_text="Date added to our database")
+    # Plain-text start of the description for job cards, so list pages don't strip HTML on every render
+    description_preview = models.TextField(blank=True, default='', editable=False)
+    # Parsed from salary_range by jobs/salary.py; null/blank when it has no amounts ("Competitive")
+    salary_min = models.DecimalField(max_digits=14, decimal_places=2, blank=True, null=True, editable=False)
+    salary_max = models.DecimalField(max_digits=14, decimal_places=2, blank=True, null=True, editable=False)
+    salary_currency = models.CharField(max_length=3, blank=True, default='', editable=False) # ISO 4217
+    salary_period = models.CharField(max_length=5, blank=True, default='', editable=False,
+                                     choices=[(p, p) for p in salary.PERIODS])
+    # The same range per year in whole USD (offline rates), for the salary filter
+    salary_usd_min = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    salary_usd_max = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    # Skills and key phrases of the title and description (jobs/keyphrases.py), for the resume keyword gap
+    key_phrases = models.JSONField(default=list, blank=True, editable=False)
 
     class Meta:
         ordering = ['-date_added_db']
+        indexes = [
+            # Salary filter: range overlap, salary_usd_max >= low AND salary_usd_min <= high (NULL: open end)
+            models.Index(fields=['salary_usd_max', 'salary_usd_min'], name='jobs_posting_salary_usd_idx'),
+            models.Index(fields=['salary_currency', 'salary_period', 'salary_max', 'salary_min'],
+                         name='jobs_posting_salary_idx'),
+        ]
+
+    def populate_derived_fields(self):
+        """ Fills fields computed from others. Called on save() and by jobs/ingest.py for bulk upserts. """
+        from .keyphrases import extract_key_phrases # Imports the skill taxonomy, which imports this module
+        self.description_preview = make_preview(self.description)
+        self.key_phrases = extract_key_phrases(self.title, self.description)
+        self.normalize_location()
+        for field, value in salary.salary_fields(self.salary_range).items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        self.populate_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            derived = {'description_preview'} if 'description' in update_fields else set()
+            if 'title' in update_fields or 'description' in update_fields:
+                derived.add('key_phrases')
+            if 'salary_range' in update_fields:
+                derived.update(salary.SALARY_FIELDS)
+            kwargs['update_fields'] = {*update_fields, *derived}
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.title} at {self.company_name} ({self.source})"
+
+class FetchState(models.Model):
+    """
+    Remembers the HTTP validators (ETag / Last-Modified) returned for each
+    source page so the fetcher can send conditional requests next time.
+    """
+    url = models.URLField(max_length=500, unique=True)
+    etag = models.CharField(max_length=255, blank=True, default='')
+    last_modified = models.CharField(max_length=64, blank=True, default='')
+    last_fetched = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.url
+
+
+class JobTrigram(models.Model):
+    """
+    Trigram posting list used for typo-tolerant search on databases without
+    pg_trgm (see jobs/fuzzy.py). One row per distinct trigram in a posting's
+    title and company name.
+    """
+    trigram = models.CharField(max_length=3)
+    posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='trigrams')
+
+    class Meta:
+        indexes = [
+            # Covers the lookup (trigram IN ...) and the GROUP BY posting without touching the table
+            models.Index(fields=['trigram', 'posting'], name='jobs_trigram_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.trigram!r} -> {self.posting_id}"
+
+
+class JobPostingSkill(models.Model):
+    """
+    Inverted index canonical skill -> postings that mention it in the title or
+    description (see profiles/skills.py). Rebuilt per posting on save and ingest.
+    """
+    skill = models.ForeignKey('profiles.CanonicalSkill', on_delete=models.CASCADE, related_name='postings')
+    posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='skill_mentions')
+
+    class Meta:
+        constraints = [
+            # Also the lookup index: skill first, then the postings that mention it
+            models.UniqueConstraint(fields=['skill', 'posting'], name='jobs_postingskill_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.skill_id} -> {self.posting_id}"
+
+
+class SavedSearch(models.Model):
+    """
+    A job search a user asked to be alerted about. New postings are matched
+    against saved searches as they arrive (see jobs/alerts.py), not the other
+    way round. `terms` and the center are compiled from the inputs on save.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=100, blank=True)
+    query = models.CharField(max_length=255, blank=True, help_text="Keywords; every one must appear in the posting")
+    near = models.CharField(max_length=150, blank=True, help_text="Place for within_km; blank uses the profile location")
+    within_km = models.PositiveSmallIntegerField(blank=True, null=True)
+    include_remote = models.BooleanField(default=False)
+    salary_min = models.PositiveIntegerField(blank=True, null=True, help_text="Annual USD")
+    salary_max = models.PositiveIntegerField(blank=True, null=True, help_text="Annual USD")
+    active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    last_notified_at = models.DateTimeField(blank=True, null=True)
+    # Compiled by jobs/alerts.py
+    terms = models.JSONField(default=list, blank=True, editable=False)
+    center_lat = models.FloatField(blank=True, null=True, editable=False)
+    center_lon = models.FloatField(blank=True, null=True, editable=False)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'saved searches'
+
+    def save(self, *args, **kwargs):
+        from .alerts import compile_search, index_search
+        compile_search(self)
+        super().save(*args, **kwargs)
+        index_search(self) # Its keys in the percolator index
+
+    def __str__(self):
+        return self.name or self.query or 'All new jobs'
+
+
+class SavedSearchKey(models.Model):
+    """
+    The percolator index: key -> saved searches to check when a new posting
+    has that key (a term, a geohash cell, 'remote', a salary band or '*'). See jobs/alerts.py.
+    """
+    key = models.CharField(max_length=100)
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='keys')
+
+    class Meta:
+        constraints = [
+            # Also the lookup index: key IN (...) -> search ids without touching the table
+            models.UniqueConstraint(fields=['key', 'search'], name='jobs_savedsearchkey_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.key!r} -> {self.search_id}"
+
+
+class JobAlert(models.Model):
+    """ A new posting matching a saved search; sent_at is set once it went out in a digest. """
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='alerts')
+    posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='alerts')
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['search', 'posting'], name='jobs_jobalert_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.search_id} -> {self.posting_id}"
+
+
+class JobEventCount(models.Model):
+    """
+    Hourly rollup of tracked events (outbound clicks, list impressions) per
+    posting, written in batches by jobs/tracking.py. Each worker process adds
+    to its own shard row, so concurrent flushes never wait on each other's
+    row locks; totals are sums over the shards.
+    """
+    CLICK = 'click'
+    VIEW = 'view'
+    KIND_CHOICES = [(CLICK, 'Outbound click'), (VIEW, 'List impression')]
+
+    hour = models.DateTimeField(help_text="Start of the hour (UTC)")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # No foreign key constraint: a posting deleted before the flush still gets its counts, and they are
+    # kept for billing after it's gone
+    posting = models.ForeignKey(JobPosting, on_delete=models.DO_NOTHING, db_constraint=False,
+                                related_name='event_counts', db_index=False) # Covered by jobs_eventcount_unique
+    source = models.CharField(max_length=100, help_text="The posting's source when the events happened")
+    shard = models.PositiveSmallIntegerField(default=0)
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # The upsert's conflict target, and the per-posting lookup index
+            models.UniqueConstraint(fields=['posting', 'kind', 'hour', 'shard'], name='jobs_eventcount_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['hour', 'source'], name='jobs_eventcount_source_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.title} at {self.company_name} ({self.source})"
\ No newline at end of file
+        return f"{self.kind} x{self.count} on {self.posting_id} at {self.hour:%Y-%m-%d %H}:00"
@@ -0,0 +1,99 @@
+# jobs/receivers.py
+
+import logging
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from profiles import skills
+from core.embeddings import EmbeddingError
+from . import alerts, fuzzy, semantic, suggest
+from .models import JobPosting
+from .signals import postings_ingested
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(postings_ingested, sender=JobPosting)
+def update_suggestions_on_ingest(sender, created, updated, **kwargs):
+    """ Adds the terms of newly ingested postings to the suggestion snapshot. """
+    try:
+        suggest.add_postings(created)
+    except OSError as e:
+        logger.error(f"Could not update job suggestions after ingest: {e}", exc_info=True)
+
+
+@receiver(post_save, sender=JobPosting)
+def update_suggestions_on_save(sender, instance, created, raw=False, **kwargs):
+    """ Postings added one at a time (admin, populate_jobs) also feed the suggestions. """
+    if created and not raw:
+        try:
+            suggest.add_postings([instance])
+        except OSError as e:
+            logger.error(f"Could not update job suggestions for posting {instance.pk}: {e}", exc_info=True)
+
+
+@receiver(post_delete, sender=JobPosting)
+def update_suggestions_on_delete(sender, instance, **kwargs):
+    """ A deleted posting's terms lose its count, once the delete is committed. """
+    pk = instance.pk # Cleared on the instance once the delete has run
+
+    def remove():
+        try:
+            suggest.remove_postings([instance])
+        except OSError as e:
+            logger.error(f"Could not update job suggestions for deleted posting {pk}: {e}", exc_info=True)
+    transaction.on_commit(remove)
+
+
+@receiver(postings_ingested, sender=JobPosting)
+def update_trigrams_on_ingest(sender, created, updated, **kwargs):
+    """ Keeps the trigram posting table in step with bulk upserts (no-op on PostgreSQL). """
+    fuzzy.index_postings(created + updated)
+
+
+@receiver(post_save, sender=JobPosting)
+def update_trigrams_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        fuzzy.index_postings([instance])
+
+
+@receiver(postings_ingested, sender=JobPosting)
+def update_skill_index_on_ingest(sender, created, updated, **kwargs):
+    """ Keeps the canonical skill -> postings index (profiles/skills.py) in step with bulk upserts. """
+    skills.index_postings(created + updated)
+
+
+@receiver(post_save, sender=JobPosting)
+def update_skill_index_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        skills.index_postings([instance])
+
+
+@receiver(postings_ingested, sender=JobPosting)
+def percolate_on_ingest(sender, created, updated, **kwargs):
+    """ Matches new postings against the saved searches (jobs/alerts.py); updates don't alert again. """
+    alerts.percolate(created)
+
+
+@receiver(post_save, sender=JobPosting)
+def percolate_on_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        alerts.percolate([instance])
+
+
+@receiver(postings_ingested, sender=JobPosting)
+def update_embeddings_on_ingest(sender, created, updated, **kwargs):
+    """ Embeds new and changed postings for "similar jobs" (jobs/semantic.py); unchanged text is cached. """
+    try:
+        semantic.index_postings(created + updated)
+    except (EmbeddingError, OSError) as e:
+        logger.error(f"Could not embed ingested postings, run `manage.py build_embeddings` later: {e}", exc_info=True)
+
+
+@receiver(post_save, sender=JobPosting)
+def update_embeddings_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        try:
+            semantic.index_postings([instance])
+        except (EmbeddingError, OSError) as e:
+            logger.error(f"Could not embed posting {instance.pk}: {e}", exc_info=True)
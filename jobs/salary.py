@@ -0,0 +1,180 @@
+# jobs/salary.py
+
+"""
+Turns free-text salary strings into numbers at ingestion time.
+
+    "₹5,00,000 - ₹8,00,000 PA"  -> 500000-800000 INR per year
+    "$70,000 - $90,000 USD"     -> 70000-90000 USD per year
+    "5-8 LPA", "12 lakh"        -> lakh (100,000) amounts in INR per year
+    "€45k–€55k", "$40/hr"       -> k suffixes, hourly and monthly pay
+    "Competitive"               -> None (nothing to filter on)
+
+The parsed range goes into JobPosting.salary_min/max/currency/period. Each
+bound is also converted to annual USD (salary_usd_min/max) with the offline
+rate table below, so the job list can filter on salary with an indexed range
+query and no live exchange-rate lookups. Open-ended ranges ("$120K+", "up to
+30 LPA") keep NULL on the open side, which usd_range_q() and overlaps()
+treat as unbounded. Rates are approximate; update
+USD_RATES (or settings.SALARY_USD_RATES) and run `manage.py reparse_salaries`.
+"""
+
+import re
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.db.models import Q
+
+ParsedSalary = namedtuple('ParsedSalary', 'min max currency period')
+
+PERIODS = ('hour', 'day', 'week', 'month', 'year')
+# Working time per year, for annualizing
+PERIODS_PER_YEAR = {'hour': 2080, 'day': 260, 'week': 52, 'month': 12, 'year': 1}
+
+# USD per unit of currency
+RATES_AS_OF = '2026-10-01'
+USD_RATES = {
+    'USD': Decimal('1'), 'EUR': Decimal('1.08'), 'GBP': Decimal('1.27'), 'INR': Decimal('0.012'),
+    'CAD': Decimal('0.73'), 'AUD': Decimal('0.66'), 'SGD': Decimal('0.74'), 'CHF': Decimal('1.13'),
+    'JPY': Decimal('0.0067'), 'AED': Decimal('0.27'),
+}
+
+# Most specific first: "C$" before "$"
+_SYMBOLS = (('c$', 'CAD'), ('ca$', 'CAD'), ('a$', 'AUD'), ('au$', 'AUD'), ('s$', 'SGD'),
+            ('₹', 'INR'), ('$', 'USD'), ('€', 'EUR'), ('£', 'GBP'), ('¥', 'JPY'))
+_code = re.compile(r'\b(' + '|'.join(c.lower() for c in USD_RATES) + r')\b')
+_rupees = re.compile(r'\b(rs\.?|rupees?|lpa|lakhs?|lacs?|crores?|cr)\b')
+
+_MULTIPLIERS = {
+    'k': 1_000, 'thousand': 1_000,
+    'm': 1_000_000, 'mn': 1_000_000, 'million': 1_000_000,
+    'l': 100_000, 'lpa': 100_000, 'lakh': 100_000, 'lakhs': 100_000, 'lac': 100_000, 'lacs': 100_000,
+    'cr': 10_000_000, 'crore': 10_000_000, 'crores': 10_000_000,
+}
+# A number ("5,00,000", "70,000.50", "5.5") and an optional magnitude word right after it
+_amount = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(' + '|'.join(sorted(_MULTIPLIERS, key=len, reverse=True)) + r')?\b')
+
+_PERIOD_PATTERNS = (
+    ('hour', r'per hour|hourly|/\s*h(ou)?r\b|an hour|\bp/?h\b'),
+    ('day', r'per day|daily|/\s*day\b|a day'),
+    ('week', r'per week|weekly|/\s*w(ee)?k\b|a week'),
+    ('month', r'per month|monthly|/\s*mo(nth)?\b|a month|\bp\.?m\.?(?=\s|$)'),
+    ('year', r'per annum|annum|annual|yearly|per year|/\s*y(ea)?r\b|a year|\bp\.?a\.?(?=\s|$)|\blpa\b|\bctc\b'),
+)
+_periods = [(period, re.compile(pattern)) for period, pattern in _PERIOD_PATTERNS]
+_upper = re.compile(r'\b(up to|upto|max(imum)?|below|under)\b')
+_lower = re.compile(r'\b(from|min(imum)?|at least|starting)\b|\+')
+
+
+def _currency(text):
+    if match := _code.search(text):
+        return match.group(1).upper()
+    for symbol, code in _SYMBOLS:
+        if symbol in text:
+            return code
+    if _rupees.search(text):
+        return 'INR'
+    return ''
+
+
+def _period(text, amounts):
+    for period, pattern in _periods:
+        if pattern.search(text):
+            return period
+    # Unstated: small numbers are hourly rates ("$45 - $60"), anything else annual
+    return 'hour' if max(amounts) < 500 else 'year'
+
+
+def parse_salary(text):
+    """ ParsedSalary(min, max, currency, period) for a salary string, or None when it has no amounts. """
+    if not text:
+        return None
+    text = text.lower().replace('–', '-').replace('—', '-')
+    numbers = []
+    for match in _amount.finditer(text):
+        try:
+            value = Decimal(match.group(1).replace(',', ''))
+        except InvalidOperation:
+            continue
+        numbers.append((value, _MULTIPLIERS.get(match.group(2) or '')))
+        if len(numbers) == 2:
+            break
+    if not numbers:
+        return None
+    # "5-8 LPA", "$70-90k": a magnitude on one end of the range applies to the other
+    units = [unit for _, unit in numbers if unit]
+    amounts = [value * (unit or (units[-1] if units else 1)) for value, unit in numbers]
+    if any(amount <= 0 for amount in amounts):
+        return None
+
+    low, high = min(amounts), max(amounts)
+    if len(amounts) == 1:
+        if _upper.search(text):
+            low = None
+        elif _lower.search(text):
+            high = None
+    return ParsedSalary(low, high, _currency(text), _period(text, amounts))
+
+
+def parse_amount(text):
+    """ One amount as an int, for filter inputs: "80000", "80,000", "80k" -> 80000. None if there's none. """
+    match = _amount.search((text or '').lower())
+    if not match:
+        return None
+    try:
+        value = Decimal(match.group(1).replace(',', '')) * _MULTIPLIERS.get(match.group(2) or '', 1)
+    except InvalidOperation:
+        return None
+    return int(value)
+
+
+def usd_rates():
+    return {**USD_RATES, **{k: Decimal(str(v)) for k, v in getattr(settings, 'SALARY_USD_RATES', {}).items()}}
+
+
+def annual_usd(amount, currency, period, rates=None):
+    """ Whole US dollars per year for an amount, or None without an amount or a rate for its currency. """
+    rate = (rates or usd_rates()).get(currency)
+    if amount is None or rate is None or period not in PERIODS_PER_YEAR:
+        return None
+    return int((amount * PERIODS_PER_YEAR[period] * rate).to_integral_value())
+
+
+def salary_fields(text, rates=None):
+    """ The JobPosting salary columns for a salary_range string (all empty when it can't be parsed). """
+    parsed = parse_salary(text)
+    if parsed is None:
+        return {'salary_min': None, 'salary_max': None, 'salary_currency': '', 'salary_period': '',
+                'salary_usd_min': None, 'salary_usd_max': None}
+    usd_min = annual_usd(parsed.min, parsed.currency, parsed.period, rates)
+    usd_max = annual_usd(parsed.max, parsed.currency, parsed.period, rates)
+    return {
+        'salary_min': parsed.min, 'salary_max': parsed.max,
+        'salary_currency': parsed.currency, 'salary_period': parsed.period,
+        'salary_usd_min': usd_min, 'salary_usd_max': usd_max,
+    }
+
+
+SALARY_FIELDS = tuple(salary_fields(None))
+
+
+def usd_range_q(low=None, high=None):
+    """
+    Postings whose annual USD range overlaps [low, high]. A NULL bound is an
+    open end ("$120K+" has no max) and never excludes; postings with no
+    salary at all never match.
+    """
+    q = Q()
+    if low is not None:
+        q &= Q(salary_usd_max__gte=low) | Q(salary_usd_max__isnull=True, salary_usd_min__isnull=False)
+    if high is not None:
+        q &= Q(salary_usd_min__lte=high) | Q(salary_usd_min__isnull=True, salary_usd_max__isnull=False)
+    return q
+
+
+def overlaps(usd_min, usd_max, low=None, high=None):
+    """ usd_range_q() for one posting's values, in Python. """
+    if usd_min is None and usd_max is None:
+        return False
+    if low is not None and usd_max is not None and usd_max < low:
+        return False
+    return high is None or usd_min is None or usd_min <= high
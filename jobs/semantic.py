@@ -0,0 +1,117 @@
+# jobs/semantic.py
+
+"""
+"Similar jobs" and "jobs like my experience", by embedding similarity.
+
+Postings and profiles are turned into text (posting_text, profile_text) and
+embedded with the configured model (core/embeddings.py); unchanged text is
+read from the content-addressed store instead of being embedded again.
+Posting vectors go into an IVF index (core/vectorindex.py) under
+<EMBEDDINGS DIRECTORY>/<model>/jobs/, updated as postings are ingested or
+saved. Profiles are embedded on demand when their recommendations are asked
+for, so editing a resume never waits on the model.
+
+Deleted postings can stay in the index until the next full build
+(`manage.py build_embeddings`); lookups load results from the database and
+skip them.
+"""
+
+import logging
+from pathlib import Path
+import numpy as np
+from django.utils.html import strip_tags
+from core import embeddings
+from core.vectorindex import IVFIndex
+from .models import JobPosting
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTION_CHARS = 2000 # Of each description; the start says what the job is
+
+
+def posting_text(posting):
+    description = ' '.join(strip_tags(posting.description or '').split())[:DESCRIPTION_CHARS]
+    return '\n'.join(filter(None, (posting.title, posting.company_name, posting.location, description)))
+
+
+def profile_text(profile):
+    """ Summary, experience and skills of a profile (prefetch 'experience' and 'skills' for many). """
+    parts = [profile.summary, profile.bio]
+    for job in profile.experience.all():
+        parts.append(f"{job.job_title} at {job.company_name}. {job.description or ''}")
+    parts.append(', '.join(skill.name for skill in profile.skills.all()))
+    return '\n'.join(part for part in parts if part and part.strip())
+
+
+_indexes = {}
+
+
+def get_index(model=None):
+    """ The posting index for the configured model (one IVFIndex object per process and directory). """
+    model = model or embeddings.get_model()
+    path = Path(embeddings.get_config()['DIRECTORY']) / model.key / 'jobs'
+    if path not in _indexes:
+        _indexes[path] = IVFIndex(path, model.dim)
+    return _indexes[path]
+
+
+def reset():
+    """ Forgets this process's index objects and models (tests, settings changes). """
+    _indexes.clear()
+    embeddings.reset()
+
+
+def index_postings(postings):
+    """ Embeds postings (new text only) and adds them to the index; a re-indexed posting replaces itself. """
+    postings = [p for p in postings if p.pk is not None]
+    if not postings:
+        return
+    vectors = embeddings.embed([posting_text(p) for p in postings])
+    get_index().insert(np.fromiter((p.pk for p in postings), dtype=np.int64, count=len(postings)), vectors)
+
+
+def _load(results):
+    """ [(JobPosting, score)] for index results, best first, skipping postings deleted since. """
+    by_id = JobPosting.objects.defer('description').in_bulk([pk for pk, _ in results])
+    return [(by_id[pk], score) for pk, score in results if pk in by_id]
+
+
+def similar_jobs(posting, k=10):
+    """ [(JobPosting, score)] most similar to a posting, not including it. """
+    vector = embeddings.embed([posting_text(posting)])[0]
+    return _load(get_index().search(vector, k=k, exclude={posting.pk}))
+
+
+def jobs_for_profile(profile, k=10):
+    """ [(JobPosting, score)] closest to a profile's experience and skills; [] for an empty profile. """
+    text = profile_text(profile)
+    if not text:
+        return []
+    vector = embeddings.embed([text])[0]
+    return _load(get_index().search(vector, k=k))
+
+
+def rebuild(chunk_size=1000, nlist=None):
+    """ Re-embeds (from the store where possible) every posting and re-clusters the index. Returns the count. """
+    ids, parts = [], []
+    postings = JobPosting.objects.only('pk', 'title', 'company_name', 'location', 'description').order_by('pk')
+    chunk = []
+    for posting in postings.iterator(chunk_size=chunk_size):
+        chunk.append(posting)
+        if len(chunk) >= chunk_size:
+            parts.append(embeddings.embed([posting_text(p) for p in chunk]))
+            ids.extend(p.pk for p in chunk)
+            chunk = []
+    if chunk:
+        parts.append(embeddings.embed([posting_text(p) for p in chunk]))
+        ids.extend(p.pk for p in chunk)
+    model = embeddings.get_model()
+    vectors = np.concatenate(parts) if parts else np.zeros((0, model.dim), dtype=np.float32)
+    get_index(model).build(np.asarray(ids, dtype=np.int64), vectors, nlist=nlist)
+    return len(ids)
+
+
+def index_stats():
+    """ core.metrics source. """
+    model = embeddings.get_model()
+    return {'model': model.key, 'store': len(embeddings.get_store(model)), **get_index(model).stats()}
@@ -0,0 +1,9 @@
+# jobs/signals.py
+
+from django.dispatch import Signal
+
+# Sent by jobs.ingest.upsert_postings() after a batch has been written.
+# bulk_create() skips post_save, so anything that needs to react to new or
+# refreshed postings (search indexes, alerts, ...) should listen here.
+# Arguments: created (list of new JobPosting), updated (list of JobPosting)
+postings_ingested = Signal()
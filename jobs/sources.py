@@ -0,0 +1,79 @@
+# jobs/sources.py
+
+import json
+import logging
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ParseResult:
+    """ What a source adapter extracts from one fetched page. """
+    records: list = field(default_factory=list) # Dicts with JobPosting field names
+    next_urls: list = field(default_factory=list) # Further pages to fetch (pagination)
+
+
+class JobSource:
+    """
+    Base class for job source adapters.
+    A source knows which URLs to start from and how to turn a response body
+    into job records; the fetcher takes care of all the HTTP work.
+    """
+    def __init__(self, name, urls, max_per_host=None, headers=None, **options):
+        self.name = name
+        self.urls = list(urls)
+        self.max_per_host = max_per_host # Overrides the fetcher's per-host limit for this source
+        self.headers = headers or {}
+        self.options = options
+
+    def start_urls(self):
+        return list(self.urls)
+
+    def parse(self, url, body):
+        """ Returns a ParseResult for the page at `url`. `body` is bytes. """
+        raise NotImplementedError
+
+    def __str__(self):
+        return self.name
+
+
+class JSONFeedSource(JobSource):
+    """
+    Adapter for JSON job feeds. Accepts either a bare list of jobs or an
+    object like {"jobs": [...], "next": "<url>"}. Field names can be remapped
+    with the `field_map` option, e.g. {"company": "company_name"}.
+    """
+    def parse(self, url, body):
+        payload = json.loads(body)
+        if isinstance(payload, dict):
+            items = payload.get(self.options.get('items_key', 'jobs'), [])
+            next_url = payload.get(self.options.get('next_key', 'next'))
+        else:
+            items, next_url = payload, None
+
+        field_map = self.options.get('field_map', {})
+        records = []
+        for item in items:
+            record = {field_map.get(key, key): value for key, value in item.items()}
+            record.setdefault('source', self.name)
+            records.append(record)
+        return ParseResult(records=records, next_urls=[next_url] if next_url else [])
+
+
+def load_sources(config=None):
+    """
+    Builds source adapters from settings.JOB_FETCH_SOURCES, a list of dicts like
+    {'adapter': 'jobs.sources.JSONFeedSource', 'name': 'Example Board', 'urls': [...]}.
+    """
+    if config is None:
+        config = getattr(settings, 'JOB_FETCH_SOURCES', [])
+    sources = []
+    for entry in config:
+        entry = dict(entry)
+        adapter_cls = import_string(entry.pop('adapter', 'jobs.sources.JSONFeedSource'))
+        sources.append(adapter_cls(**entry))
+    logger.info(f"Loaded {len(sources)} job sources.")
+    return sources
@@ -0,0 +1,437 @@
+# jobs/suggest.py
+
+"""
+Search-as-you-type suggestions for the job search box.
+
+Suggestions come from a sorted array of normalized job titles, company names
+and locations, weighted by how many postings use them. The array lives in a
+snapshot file that every worker memory-maps, so gunicorn workers share one
+copy through the page cache instead of each holding its own.
+
+Snapshot layout (little-endian):
+
+    header         b'HSSUGG02', count, blob_len, prefix_count, topk_len, prefix_blob_len
+                                                  (8 + 5 * uint32)
+    offsets        (count + 1) * uint32         start of each term in blob
+    weights        count * uint32               number of postings using the term
+    prefix_offsets (prefix_count + 1) * uint32  start of each short prefix in prefix_blob
+    topk_offsets   (prefix_count + 1) * uint32  start of each prefix's entries in topk
+    topk           topk_len * uint32            best entry indexes per prefix, best first
+    kinds          count * uint8                index into KINDS
+    blob           utf-8 terms, sorted by their bytes
+    prefix_blob    utf-8 short prefixes, sorted by their bytes
+
+Lookups binary-search the sorted terms for the prefix range. Short prefixes
+match huge ranges, so their best entries are precomputed in `topk`, which is
+binary-searched in place like the terms: nothing is parsed into a worker's
+own memory, every array is read straight from the shared mapping.
+
+New postings don't rewrite the snapshot. Their terms are appended to a
+delta log next to it (`<snapshot>.delta`), whose first line names the
+snapshot it applies to; readers keep the log's weights in memory (it is
+small) and merge them into each lookup. Deleted postings append negative
+counts, so their terms stop being suggested without a rebuild. Once the log
+passes DELTA_COMPACT_BYTES, the writer folds it into a new snapshot and
+deletes it. A delta naming another snapshot (the one before a compaction or
+a rebuild) is ignored, so nothing is ever counted twice.
+"""
+
+import contextlib
+
+import heapq
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from django.conf import settings
+
+try:
+    import fcntl # Used to serialize snapshot writers; not available on Windows
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('title', 'company', 'location')
+MAGIC = b'HSSUGG02'
+HEADER = struct.Struct('<8sIIIII')
+TOPK_PREFIX_LEN = 3 # Prefixes up to this many characters are precomputed
+TOPK_SIZE = 10
+SCAN_LIMIT = 5000 # Max entries ranked for longer prefixes
+DELTA_COMPACT_BYTES = 256 * 1024 # Delta log size at which it is merged into a new snapshot
+
+_non_word = re.compile(r"[^\w+#.\s]+")
+_spaces = re.compile(r"\s+")
+
+
+def normalize(text):
+    """ Lowercases, strips accents and punctuation (keeping e.g. 'c++', 'c#', '.net'). """
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = _non_word.sub(' ', text.lower())
+    return _spaces.sub(' ', text).strip()
+
+
+def posting_terms(title, company_name, location):
+    """ Yields (term, kind) pairs contributed by one posting. """
+    for value, kind in ((title, 'title'), (company_name, 'company'), (location, 'location')):
+        term = normalize(value)
+        if term:
+            yield term, kind
+
+
+def snapshot_path():
+    return getattr(settings, 'JOB_SUGGEST_SNAPSHOT', os.path.join(settings.BASE_DIR, 'var', 'job_suggestions.bin'))
+
+
+def delta_path(path=None):
+    return f"{path or snapshot_path()}.delta"
+
+
+def _file_id(stat):
+    return [stat.st_ino, stat.st_mtime_ns]
+
+
+def write_snapshot(weights, path=None):
+    """
+    Writes a snapshot from a {(term, kind): weight} mapping.
+    The file is replaced atomically, so readers never see a partial write.
+    """
+    path = path or snapshot_path()
+    entries = sorted(
+        ((term.encode('utf-8'), KINDS.index(kind), weight) for (term, kind), weight in weights.items() if weight > 0),
+        key=lambda e: (e[0], e[1]),
+    )
+    offsets, blob = [0], bytearray()
+    for term, _, _ in entries:
+        blob += term
+        offsets.append(len(blob))
+
+    # Best entries for every short prefix
+    buckets = defaultdict(list)
+    for index, (term, _, weight) in enumerate(entries):
+        text = term.decode('utf-8')
+        for size in range(1, min(TOPK_PREFIX_LEN, len(text)) + 1):
+            buckets[text[:size]].append((weight, -index))
+    prefix_offsets, topk_offsets, topk, prefix_blob = [0], [0], [], bytearray()
+    for prefix in sorted(buckets, key=lambda text: text.encode('utf-8')):
+        prefix_blob += prefix.encode('utf-8')
+        prefix_offsets.append(len(prefix_blob))
+        topk.extend(-i for _, i in heapq.nlargest(TOPK_SIZE, buckets[prefix]))
+        topk_offsets.append(len(topk))
+
+    count, prefix_count = len(entries), len(buckets)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        # Every uint32 array comes before the byte arrays, so they all stay 4-byte aligned
+        f.write(HEADER.pack(MAGIC, count, len(blob), prefix_count, len(topk), len(prefix_blob)))
+        f.write(struct.pack(f'<{count + 1}I', *offsets))
+        f.write(struct.pack(f'<{count}I', *(e[2] for e in entries)))
+        f.write(struct.pack(f'<{prefix_count + 1}I', *prefix_offsets))
+        f.write(struct.pack(f'<{prefix_count + 1}I', *topk_offsets))
+        f.write(struct.pack(f'<{len(topk)}I', *topk))
+        f.write(bytes(e[1] for e in entries))
+        f.write(blob)
+        f.write(prefix_blob)
+    os.replace(tmp_path, path)
+    logger.info(f"Wrote job suggestion snapshot with {count} terms to {path}")
+    return count
+
+
+class Snapshot:
+    """ Read-only view over a memory-mapped snapshot file. """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, blob_len, self.prefix_count, topk_len, prefix_blob_len = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a job suggestion snapshot (run `manage.py build_job_suggestions`)")
+        view = memoryview(self._mmap)
+        pos = HEADER.size
+
+        def take(length, fmt=None):
+            nonlocal pos
+            size = length * (4 if fmt else 1)
+            part = view[pos:pos + size]
+            pos += size
+            return part.cast(fmt) if fmt else part
+
+        self.offsets = take(self.count + 1, 'I')
+        self.weights = take(self.count, 'I')
+        self.prefix_offsets = take(self.prefix_count + 1, 'I')
+        self.topk_offsets = take(self.prefix_count + 1, 'I')
+        self.topk = take(topk_len, 'I')
+        self.kinds = take(self.count)
+        self.blob = take(blob_len)
+        self.prefix_blob = take(prefix_blob_len)
+
+    def term(self, index):
+        return bytes(self.blob[self.offsets[index]:self.offsets[index + 1]])
+
+    def _prefix(self, index):
+        return bytes(self.prefix_blob[self.prefix_offsets[index]:self.prefix_offsets[index + 1]])
+
+    def _bisect(self, key, term=None, count=None):
+        term, count = term or self.term, self.count if count is None else count
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def top_entries(self, prefix):
+        """ Precomputed best entry indexes for a short prefix, or None if it has none. """
+        key = prefix.encode('utf-8')
+        index = self._bisect(key, self._prefix, self.prefix_count)
+        if index == self.prefix_count or self._prefix(index) != key:
+            return None
+        return self.topk[self.topk_offsets[index]:self.topk_offsets[index + 1]]
+
+    def entry(self, index):
+        return {
+            'text': self.term(index).decode('utf-8'),
+            'kind': KINDS[self.kinds[index]],
+            'weight': self.weights[index],
+        }
+
+    def lookup(self, prefix, limit=TOPK_SIZE):
+        if len(prefix) <= TOPK_PREFIX_LEN:
+            top = self.top_entries(prefix) # Every short prefix that exists is in topk
+            return [self.entry(i) for i in top[:limit]] if top is not None else []
+        key = prefix.encode('utf-8')
+        lo = self._bisect(key)
+        hi = min(self._bisect(key + b'\xff'), lo + SCAN_LIMIT) # 0xff never occurs in utf-8
+        best = heapq.nlargest(limit, range(lo, hi), key=self.weights.__getitem__)
+        return [self.entry(i) for i in best]
+
+    def weight(self, term, kind):
+        """ Weight of one (term, kind) entry, 0 when the snapshot doesn't have it. """
+        key = term.encode('utf-8')
+        index = self._bisect(key)
+        while index < self.count and self.term(index) == key:
+            if KINDS[self.kinds[index]] == kind:
+                return self.weights[index]
+            index += 1
+        return 0
+
+    def items(self):
+        """ Yields ((term, kind), weight) for every entry, for merging. """
+        for index in range(self.count):
+            yield (self.term(index).decode('utf-8'), KINDS[self.kinds[index]]), self.weights[index]
+
+
+class Delta:
+    """
+    This process's copy of the delta log: {(term, kind): weight}, the offset
+    of the first line not parsed yet and the file size when it was read.
+    """
+
+    def __init__(self, stat=None, snapshot_id=None, weights=None, offset=0):
+        self.inode = stat.st_ino if stat else None
+        self.size = stat.st_size if stat else 0 # Compared with the file's size: grown means appended to
+        self.snapshot_id = snapshot_id
+        self.weights = weights or {}
+        self.offset = offset
+
+    @classmethod
+    def read(cls, path, previous=None):
+        """ Reads what was appended since `previous` (everything if the log was replaced). """
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if previous is None or previous.inode != stat.st_ino or stat.st_size < previous.offset:
+                previous = cls(stat)
+            f.seek(previous.offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1 # Only whole lines; a writer may be mid-append
+        lines = data[:end].splitlines()
+        snapshot_id, weights = previous.snapshot_id, dict(previous.weights)
+        if previous.offset == 0 and lines:
+            snapshot_id = json.loads(lines.pop(0))['snapshot']
+        for line in lines:
+            term, kind, n = json.loads(line)
+            weights[(term, kind)] = weights.get((term, kind), 0) + n
+        return cls(stat, snapshot_id, weights, previous.offset + end)
+
+
+_lock = threading.Lock()
+_snapshot = None
+_delta = None
+
+
+def get_snapshot():
+    """
+    Returns the current Snapshot, remapping it when another process has replaced
+    the file. Returns None when no snapshot has been built yet.
+    """
+    global _snapshot
+    path = snapshot_path()
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    current = _snapshot
+    if current is None or current.path != path or _file_id(current.stat) != _file_id(stat):
+        with _lock:
+            if _snapshot is current: # Another thread may have remapped already
+                try:
+                    _snapshot = Snapshot(path)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Could not load job suggestion snapshot {path}: {e}")
+                    return current
+        current = _snapshot
+    return current
+
+
+def get_delta(snapshot):
+    """ {(term, kind): weight} added since `snapshot` was written; reads only what was appended since last time. """
+    global _delta
+    path = delta_path()
+    current = _delta
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    # Against the size seen at the last read, not the parsed offset: a writer's unfinished last
+    # line is behind the offset until it is complete, and must not make every request re-read
+    if current is None or current.inode != stat.st_ino or current.size != stat.st_size:
+        with _lock:
+            if _delta is current:
+                try:
+                    _delta = Delta.read(path, current)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Could not read job suggestion delta {path}: {e}")
+                    return {}
+            current = _delta
+    return current.weights if current.snapshot_id == _file_id(snapshot.stat) else {}
+
+
+def merged_lookup(snapshot, delta, prefix, limit=TOPK_SIZE):
+    """ Snapshot.lookup() with the delta's weights added in. """
+    extra = {key: n for key, n in delta.items() if key[0].startswith(prefix)}
+    if not extra:
+        return snapshot.lookup(prefix, limit)
+    # Enough snapshot entries that the best ones the delta doesn't touch are among them
+    weights = {(e['text'], e['kind']): e['weight'] for e in snapshot.lookup(prefix, limit + len(extra))}
+    for (term, kind), n in extra.items():
+        base = weights[(term, kind)] if (term, kind) in weights else snapshot.weight(term, kind)
+        weights[(term, kind)] = base + n
+    live = ((key, weight) for key, weight in weights.items() if weight > 0) # Every posting using it was deleted
+    best = heapq.nsmallest(limit, live, key=lambda item: (-item[1], item[0]))
+    return [{'text': term, 'kind': kind, 'weight': weight} for (term, kind), weight in best]
+
+
+def suggest(query, limit=TOPK_SIZE):
+    """ Returns up to `limit` suggestions for a partially typed query. """
+    prefix = normalize(query)
+    if not prefix:
+        return []
+    snapshot = get_snapshot()
+    if snapshot is None:
+        logger.warning("No job suggestion snapshot found; run `manage.py build_job_suggestions`.")
+        return []
+    return merged_lookup(snapshot, get_delta(snapshot), prefix, limit)
+
+
+@contextlib.contextmanager
+def _writer_lock(path):
+    """ One snapshot/delta writer at a time across workers. """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.lock", 'w') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def rebuild_from_db():
+    """ Full rebuild: counts terms with GROUP BY queries instead of loading every posting. """
+    from django.db.models import Count
+    from .models import JobPosting
+
+    weights = Counter()
+    for field, kind in (('title', 'title'), ('company_name', 'company'), ('location', 'location')):
+        rows = JobPosting.objects.order_by().values_list(field).annotate(n=Count('id'))
+        for value, n in rows.iterator():
+            term = normalize(value)
+            if term:
+                weights[(term, kind)] += n
+    path = snapshot_path()
+    with _writer_lock(path):
+        count = write_snapshot(weights, path)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(delta_path(path)) # Already counted by the rebuild
+    return count
+
+
+def add_postings(postings):
+    """
+    Incremental update for newly ingested postings: appends their terms to the
+    delta log (a few bytes per posting), without going back to the database or
+    rewriting the snapshot until the log is due for compaction.
+    """
+    _append_terms(postings, 1)
+
+
+def remove_postings(postings):
+    """ add_postings() for deleted postings: appends negative counts for their terms. """
+    _append_terms(postings, -1)
+
+
+def _append_terms(postings, sign):
+    changed = Counter()
+    for posting in postings:
+        changed.update(posting_terms(posting.title, posting.company_name, posting.location))
+    if not changed:
+        return
+
+    path = snapshot_path()
+    with _writer_lock(path):
+        snapshot = get_snapshot()
+        if snapshot is None:
+            if os.path.exists(path): # Unreadable (e.g. an older format): only a rebuild can count everything
+                logger.warning(f"Job suggestion snapshot {path} can't be read; run `manage.py build_job_suggestions`.")
+            elif sign > 0:
+                write_snapshot(changed, path) # First postings ever: nothing to append to
+            return
+        lines = b''.join(
+            json.dumps([term, kind, sign * n], separators=(',', ':')).encode('utf-8') + b'\n'
+            for (term, kind), n in changed.items()
+        )
+        log = delta_path(path)
+        try:
+            with open(log, 'rb') as f:
+                stale = json.loads(f.readline())['snapshot'] != _file_id(snapshot.stat) # Left from before a rebuild
+        except (FileNotFoundError, ValueError, KeyError):
+            stale = True
+        if stale:
+            header = json.dumps({'snapshot': _file_id(snapshot.stat)}).encode('utf-8') + b'\n'
+            tmp_path = f"{log}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(header + lines)
+            os.replace(tmp_path, log)
+        else:
+            with open(log, 'ab') as f:
+                f.write(lines)
+        if os.path.getsize(log) >= DELTA_COMPACT_BYTES:
+            _compact(snapshot, path)
+
+
+def _compact(snapshot, path):
+    """ Folds the delta log into a new snapshot (caller holds the writer lock). """
+    weights = Counter(dict(snapshot.items()))
+    weights.update(get_delta(snapshot))
+    write_snapshot(weights, path)
+    os.remove(delta_path(path)) # Readers already ignore it: it names the old snapshot
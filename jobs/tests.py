@@ -1,3 +1,667 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.template import engines
+from decimal import Decimal
+
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core import embeddings, events
+from core.fragments import object_version
+from profiles import skills
+
+from . import fuzzy, salary, semantic, suggest, tracking
+from .alerts import index_search, percolate, send_digests
+from .fetcher import JobFetcher
+from .fuzzy import fuzzy_search
+from .ingest import upsert_postings
+from .keyphrases import extract_key_phrases
+from .models import JobAlert, JobEventCount, JobPosting, SavedSearch
+from .salary import parse_salary
+from .sources import JSONFeedSource
+from .views import JobListSearchView
+
+
+class StandInJobBoard(BaseHTTPRequestHandler):
+    """ Local stand-in for a paginated JSON job board with ETag support. """
+    pages = 3
+    per_page = 5
+    failures_left = {} # path -> number of 503s to return before succeeding
+
+    def do_GET(self):
+        path = self.path
+        if self.failures_left.get(path):
+            self.failures_left[path] -= 1
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+
+        etag = f'"{path}-v1"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        page = int(path.rsplit('=', 1)[-1])
+        jobs = [
+            {'title': f'Job {page}-{i}', 'company': 'Stand-in Co', 'description': 'Python',
+             'job_url': f'https://standin.example/job/{page}/{i}'}
+            for i in range(self.per_page)
+        ]
+        body = {'jobs': jobs}
+        if page < self.pages:
+            body['next'] = f'http://{self.headers["Host"]}/jobs?page={page + 1}'
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class JobFetcherTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInJobBoard)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def _fetch(self, validators=None, source_cls=JSONFeedSource, **options):
+        received = []
+        source = source_cls('Stand-in', [f'{self.base_url}/jobs?page=1'],
+                            field_map={'company': 'company_name'})
+        fetcher = JobFetcher([source], sink=received.extend, validators=validators,
+                             concurrency=4, per_host=2, backoff_base=0.01, batch_size=4, **options)
+        stats = asyncio.run(fetcher.run())
+        return stats, received, fetcher.validators
+
+    def test_follows_pagination_and_batches_records(self):
+        stats, received, _ = self._fetch()
+        self.assertEqual(stats.pages, 3)
+        self.assertEqual(stats.records, 15)
+        self.assertEqual(len(received), 15)
+        self.assertEqual(received[0]['company_name'], 'Stand-in Co')
+        self.assertEqual(received[0]['source'], 'Stand-in')
+        self.assertGreater(stats.bytes_per_sec, 0)
+
+    def test_conditional_requests_skip_unchanged_pages(self):
+        _, _, validators = self._fetch()
+        stats, received, _ = self._fetch(validators=validators)
+        self.assertEqual(stats.not_modified, 1) # Page 1 unchanged, so pagination stops there
+        self.assertEqual(received, [])
+
+    def test_retries_transient_errors(self):
+        StandInJobBoard.failures_left['/jobs?page=2'] = 2
+        stats, received, _ = self._fetch()
+        self.assertEqual(stats.retries, 2)
+        self.assertEqual(stats.errors, 0)
+        self.assertEqual(len(received), 15)
+
+    def test_pagination_loops_and_runaway_feeds_are_bounded(self):
+        class LoopingSource(JSONFeedSource):
+            def parse(self, url, body):
+                result = super().parse(url, body)
+                result.next_urls.append(self.urls[0]) # Every page links back to the first
+                return result
+
+        stats, _, _ = self._fetch(source_cls=LoopingSource)
+        self.assertEqual(stats.pages, 3)
+        stats, received, _ = self._fetch(max_pages=2)
+        self.assertEqual((stats.pages, len(received)), (2, 10))
+
+
+class UpsertPostingsTests(TestCase):
+
+    def test_upsert_is_keyed_on_job_url(self):
+        record = {'title': 'Dev', 'company_name': 'A', 'description': 'x',
+                  'job_url': 'https://example.com/1', 'source': 'Test'}
+        created, updated = upsert_postings([record])
+        self.assertEqual((len(created), len(updated)), (1, 0))
+
+        created, updated = upsert_postings([dict(record, title='Senior Dev')])
+        self.assertEqual((len(created), len(updated)), (0, 1))
+        self.assertEqual(JobPosting.objects.get().title, 'Senior Dev')
+
+    def test_description_preview_follows_description(self):
+        record = {'title': 'Dev', 'description': '<p>Build <b>APIs</b>\n\n all day</p>',
+                  'job_url': 'https://example.com/2'}
+        upsert_postings([record])
+        self.assertEqual(JobPosting.objects.get().description_preview, 'Build APIs all day')
+        upsert_postings([dict(record, description='<ul><li>Python</li></ul>')])
+        self.assertEqual(JobPosting.objects.get().description_preview, 'Python')
+
+
+class JobCardCacheTests(TestCase):
+
+    def test_card_is_rerendered_after_update(self):
+        cache.clear()
+        job, other = [JobPosting.objects.create(title=title, company_name='Acme', description='x', source='Test',
+                                                job_url=f'https://example.com/{title}') for title in ('Dev', 'QA')]
+        template = engines['django'].from_string(
+            '{% load cache fragments %}{% fragment_versions jobs %}'
+            '{% for job in jobs %}{% cache 60 job_card job.pk job.fragment_version %}{{ job.title }};{% endcache %}{% endfor %}'
+        )
+        render = lambda: template.render({'jobs': list(JobPosting.objects.order_by('pk'))})
+        self.assertEqual(render(), 'Dev;QA;')
+        other_version = object_version(other)
+        job.title = 'Senior Dev'
+        job.save()
+        self.assertEqual(render(), 'Senior Dev;QA;')
+        # Only the edited posting's fragment was invalidated
+        self.assertEqual(object_version(other), other_version)
+
+    def test_evicted_version_does_not_revive_old_fragments(self):
+        cache.clear()
+        job = JobPosting.objects.create(title='Dev', job_url='https://example.com/dev')
+        first = object_version(job)
+        cache.delete(f'fragments:version:jobs.jobposting:{job.pk}') # Evicted
+        self.assertNotEqual(object_version(job), first)
+
+
+class SuggestTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'job_suggestions.bin')
+        override = override_settings(JOB_SUGGEST_SNAPSHOT=self.path)
+        override.enable()
+        self.addCleanup(override.disable)
+        suggest.write_snapshot({('python developer', 'title'): 5, ('python', 'title'): 2, ('pytorch labs', 'company'): 1})
+
+    def _texts(self, query):
+        return [(s['text'], s['weight']) for s in suggest.suggest(query)]
+
+    def _add(self, *titles):
+        suggest.add_postings([SimpleNamespace(title=t, company_name='', location='') for t in titles])
+
+    def test_prefix_lookups(self):
+        self.assertEqual(self._texts('Py'), [('python developer', 5), ('python', 2), ('pytorch labs', 1)])
+        self.assertEqual(self._texts('python d'), [('python developer', 5)]) # Past the precomputed prefixes
+        self.assertEqual(self._texts('rust'), [])
+
+    def test_new_postings_are_appended_not_rewritten(self):
+        before = os.stat(self.path)
+        self.assertEqual(self._texts('py'), [('python developer', 5), ('python', 2), ('pytorch labs', 1)])
+        self._add('Python', 'Python', 'Python', 'Pyramid Engineer')
+        after = os.stat(self.path)
+        self.assertEqual((after.st_ino, after.st_mtime_ns), (before.st_ino, before.st_mtime_ns))
+        self.assertEqual(
+            self._texts('py'), [('python', 5), ('python developer', 5), ('pyramid engineer', 1), ('pytorch labs', 1)],
+        )
+        self.assertEqual(self._texts('pyra'), [('pyramid engineer', 1)])
+
+    def test_large_delta_is_compacted_into_the_snapshot(self):
+        self._add('Python')
+        with mock.patch.object(suggest, 'DELTA_COMPACT_BYTES', 1):
+            self._add('Python', 'Pyramid Engineer')
+        self.assertFalse(os.path.exists(suggest.delta_path(self.path)))
+        self.assertEqual(suggest.get_snapshot().weight('python', 'title'), 4)
+        self.assertEqual(self._texts('pyr'), [('pyramid engineer', 1)])
+
+    def test_short_prefixes_are_read_from_the_mapping(self):
+        snapshot = suggest.get_snapshot()
+        self.assertIsInstance(snapshot.topk, memoryview) # Not parsed into this process's heap
+        self.assertEqual([snapshot.entry(i)['text'] for i in snapshot.top_entries('pyt')], ['python developer', 'python', 'pytorch labs'])
+        self.assertIsNone(snapshot.top_entries('pz'))
+
+    def test_unfinished_delta_line_is_not_reread_on_every_request(self):
+        self._add('Python')
+        snapshot = suggest.get_snapshot()
+        with open(suggest.delta_path(self.path), 'ab') as f:
+            f.write(b'["pyramid engineer","title"') # A writer mid-append
+        self.assertEqual(suggest.get_delta(snapshot)[('python', 'title')], 1)
+        with mock.patch.object(suggest.Delta, 'read', side_effect=AssertionError('re-read')):
+            suggest.get_delta(snapshot)
+        with open(suggest.delta_path(self.path), 'ab') as f:
+            f.write(b',1]\n')
+        self.assertEqual(suggest.get_delta(snapshot)[('pyramid engineer', 'title')], 1)
+
+    def test_deleted_postings_are_no_longer_suggested(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            postings = [JobPosting.objects.create(title='Rust Developer', job_url=f'https://example.com/rust{n}')
+                        for n in range(2)]
+        self.assertEqual(self._texts('rust'), [('rust developer', 2)])
+        with self.captureOnCommitCallbacks(execute=True):
+            postings[0].delete()
+        self.assertEqual(self._texts('rust'), [('rust developer', 1)])
+        with self.captureOnCommitCallbacks(execute=True):
+            postings[1].delete()
+        self.assertEqual(self._texts('rust'), [])
+
+    def test_rebuild_replaces_snapshot_and_delta(self):
+        for n in range(2):
+            JobPosting.objects.create(title='Data Engineer', description='', company_name='Acme', source='test',
+                                      job_url=f'https://example.com/{n}') # Each one appended to the delta
+        suggest.rebuild_from_db()
+        self.assertFalse(os.path.exists(suggest.delta_path(self.path)))
+        self.assertEqual(self._texts('data'), [('data engineer', 2)])
+        self.assertEqual(self._texts('py'), [])
+
+
+class FuzzySearchTests(TestCase):
+
+    def test_misspelled_query_finds_posting(self):
+        upsert_postings([
+            {'title': 'Junior Python Developer', 'company_name': 'Tech Solutions Inc.',
+             'description': 'Django', 'job_url': 'https://example.com/py', 'source': 'Test'},
+            {'title': 'Frontend Developer (React)', 'company_name': 'Creative Designs Ltd.',
+             'description': 'JS', 'job_url': 'https://example.com/react', 'source': 'Test'},
+        ])
+        python_job = JobPosting.objects.get(job_url='https://example.com/py')
+        matches = fuzzy_search('pyhton developer')
+        self.assertEqual(matches[0][0], python_job.pk)
+
+    def test_common_trigrams_do_not_pick_candidates(self):
+        upsert_postings([
+            {'title': f'{name} Developer', 'company_name': 'Acme', 'description': 'x',
+             'job_url': f'https://example.com/{n}', 'source': 'Test'}
+            for n, name in enumerate(['Python', 'Golang', 'Ruby', 'Rust'])
+        ])
+        python_job = JobPosting.objects.get(job_url='https://example.com/0')
+        with mock.patch.object(fuzzy, 'MAX_TRIGRAM_POSTINGS', 2): # "developer" and "acme" are in every posting
+            self.assertEqual(fuzzy_search('pyhton developer')[0][0], python_job.pk)
+            self.assertEqual(len(fuzzy_search('developer')), 2) # Only the newest postings of each common trigram
+
+
+class JobPostingAdminTests(TestCase):
+    url = '/admin/jobs/jobposting/'
+
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth.models import User
+        cls.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def _add(self, n, start=0):
+        JobPosting.objects.bulk_create([
+            JobPosting(title=f'Engineer {i}', company_name='Acme', description='<p>Build things</p>' * 50,
+                       location='Berlin' if i % 2 else 'Remote', source='Feed', job_url=f'https://example.com/{i}')
+            for i in range(start, start + n)
+        ])
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        # Session, user, stats lookup, count, page of rows, distinct sources for the sidebar
+        self._add(3)
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+        self._add(30, start=3)
+        with self.assertNumQueries(6):
+            response = self.client.get(self.url)
+        self.assertIn('description', response.context['cl'].result_list[0].get_deferred_fields())
+
+    def test_location_filter(self):
+        self._add(6)
+        response = self.client.get(self.url, {'location': 'berl'})
+        self.assertEqual(response.context['cl'].result_count, 3)
+
+    def test_refresh_previews_action(self):
+        self._add(3)
+        JobPosting.objects.update(description_preview='')
+        self.client.post(self.url, {'action': 'refresh_derived_fields', 'select_across': '1', 'index': '0',
+                                    '_selected_action': JobPosting.objects.values_list('pk', flat=True)})
+        self.assertFalse(JobPosting.objects.filter(description_preview='').exists())
+
+
+class SalaryParserTests(SimpleTestCase):
+
+    def test_formats(self):
+        cases = {
+            '₹5,00,000 - ₹8,00,000 PA': (500000, 800000, 'INR', 'year'),
+            '$70,000 - $90,000 USD': (70000, 90000, 'USD', 'year'),
+            '5-8 LPA': (500000, 800000, 'INR', 'year'),
+            '1.2 crore CTC': (12000000, 12000000, 'INR', 'year'),
+            '€45k–€55k': (45000, 55000, 'EUR', 'year'),
+            'Rs. 25,000 per month': (25000, 25000, 'INR', 'month'),
+            '$40/hr': (40, 40, 'USD', 'hour'),
+            'Up to £90k': (None, 90000, 'GBP', 'year'),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(tuple(parse_salary(text)), expected)
+
+    def test_text_without_amounts(self):
+        for text in ('Competitive', 'Stipend Provided', '', None):
+            self.assertIsNone(parse_salary(text))
+
+
+class SalaryFilterTests(TestCase):
+
+    def setUp(self):
+        upsert_postings([
+            {'title': 'India', 'salary_range': '₹50,00,000 - ₹80,00,000 PA', 'job_url': 'https://example.com/in'}, # $60k-96k
+            {'title': 'US', 'salary_range': '$120,000 - $150,000 USD', 'job_url': 'https://example.com/us'},
+            {'title': 'Hourly', 'salary_range': '$40/hr', 'job_url': 'https://example.com/hr'}, # $83,200
+            {'title': 'Unknown', 'salary_range': 'Competitive', 'job_url': 'https://example.com/x'},
+        ])
+
+    def _titles(self, **params):
+        view = JobListSearchView()
+        view.setup(RequestFactory().get('/jobs/', params))
+        return sorted(view.get_queryset().values_list('title', flat=True))
+
+    def test_salary_columns_are_filled_at_ingest(self):
+        posting = JobPosting.objects.get(title='India')
+        self.assertEqual((posting.salary_min, posting.salary_currency, posting.salary_usd_min), (Decimal('5000000'), 'INR', 60000))
+        self.assertIsNone(JobPosting.objects.get(title='Unknown').salary_usd_min)
+
+    def test_range_overlap(self):
+        self.assertEqual(self._titles(salary_min='90k'), ['India', 'US'])
+        self.assertEqual(self._titles(salary_min='70000', salary_max='85,000'), ['Hourly', 'India'])
+        self.assertEqual(self._titles(), ['Hourly', 'India', 'US', 'Unknown'])
+
+    def test_open_ended_ranges_are_unbounded_on_the_open_side(self):
+        upsert_postings([
+            {'title': 'Senior', 'salary_range': '$120K+', 'job_url': 'https://example.com/senior'},
+            {'title': 'Capped', 'salary_range': 'Up to 30 LPA', 'job_url': 'https://example.com/capped'}, # <= $36k
+        ])
+        senior, capped = JobPosting.objects.get(title='Senior'), JobPosting.objects.get(title='Capped')
+        self.assertEqual((senior.salary_usd_min, senior.salary_usd_max), (120000, None))
+        self.assertEqual((capped.salary_usd_min, capped.salary_usd_max), (None, 36000))
+        self.assertEqual(self._titles(salary_min='200k'), ['Senior'])
+        self.assertEqual(self._titles(salary_max='20k'), ['Capped'])
+        self.assertEqual(self._titles(salary_min='30k', salary_max='50k'), ['Capped'])
+        self.assertTrue(salary.overlaps(120000, None, low=200000))
+        self.assertFalse(salary.overlaps(None, 36000, low=40000))
+        self.assertFalse(salary.overlaps(None, None, low=1))
+
+    def test_editing_salary_range_reparses(self):
+        posting = JobPosting.objects.get(title='Unknown')
+        posting.salary_range = '$100k - $110k'
+        posting.save(update_fields=['salary_range'])
+        posting.refresh_from_db()
+        self.assertEqual((posting.salary_usd_min, posting.salary_usd_max), (100000, 110000))
+
+
+class RadiusSearchTests(TestCase):
+
+    def setUp(self):
+        upsert_postings([
+            {'title': 'Delhi', 'location': 'New Delhi, India', 'job_url': 'https://example.com/del'},
+            {'title': 'Gurgaon', 'location': 'Gurgaon, Haryana', 'job_url': 'https://example.com/ggn'}, # ~25 km
+            {'title': 'Mumbai', 'location': 'Mumbai, India', 'job_url': 'https://example.com/bom'},
+            {'title': 'Remote', 'location': 'Remote - India', 'job_url': 'https://example.com/rem'},
+        ])
+
+    def _titles(self, user=None, **params):
+        request = RequestFactory().get('/jobs/', params)
+        request.user = user or AnonymousUser()
+        view = JobListSearchView()
+        view.setup(request)
+        return sorted(view.get_queryset().values_list('title', flat=True))
+
+    def test_locations_are_normalized_at_ingest(self):
+        posting = JobPosting.objects.get(title='Gurgaon')
+        self.assertEqual((posting.location_city, posting.location_country), ('Gurugram', 'IN'))
+        self.assertTrue(posting.location_geohash.startswith('ttn'))
+        self.assertTrue(JobPosting.objects.get(title='Remote').location_remote)
+
+    def test_within_radius(self):
+        self.assertEqual(self._titles(near='Delhi', within='50'), ['Delhi', 'Gurgaon'])
+        self.assertEqual(self._titles(near='Delhi', within='10'), ['Delhi'])
+        self.assertEqual(self._titles(near='Delhi', within='50', remote='1'), ['Delhi', 'Gurgaon', 'Remote'])
+        self.assertEqual(len(self._titles(near='Atlantis', within='50')), 4) # Unknown place: no filter
+
+    def test_defaults_to_the_users_location(self):
+        user = User.objects.create_user('dev')
+        user.profile.location = 'Navi Mumbai'
+        user.profile.save()
+        self.assertEqual(self._titles(user=user, within='25'), ['Mumbai'])
+
+
+class JobAlertTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('seeker', email='seeker@example.com')
+
+    def _ingest(self, *records):
+        return upsert_postings([{'description': '', 'job_url': f'https://example.com/{r["title"]}', **r} for r in records])[0]
+
+    def test_new_postings_match_saved_searches(self):
+        python = SavedSearch.objects.create(user=self.user, query='Python developer')
+        nearby = SavedSearch.objects.create(user=self.user, near='Delhi', within_km=50, include_remote=True)
+        paid = SavedSearch.objects.create(user=self.user, query='engineer', salary_min=100_000)
+        self.assertEqual(list(python.keys.values_list('key', flat=True)), ['developer'])
+        self.assertTrue(all(k.startswith('geo:') or k == 'remote' for k in nearby.keys.values_list('key', flat=True)))
+
+        self._ingest(
+            {'title': 'Senior Python Developer', 'location': 'Gurgaon, Haryana'},
+            {'title': 'Java Developer', 'location': 'Mumbai, India'},
+            {'title': 'Engineer', 'location': 'Remote', 'salary_range': '$120,000 - $150,000'},
+            {'title': 'Junior Engineer', 'salary_range': '$40,000'},
+        )
+        matched = set(JobAlert.objects.values_list('search__pk', 'posting__title'))
+        self.assertEqual(matched, {
+            (python.pk, 'Senior Python Developer'),
+            (nearby.pk, 'Senior Python Developer'), (nearby.pk, 'Engineer'),
+            (paid.pk, 'Engineer'),
+        })
+
+        # Updating an existing posting doesn't alert again
+        self._ingest({'title': 'Senior Python Developer', 'location': 'Gurgaon, Haryana', 'description': 'Updated'})
+        self.assertEqual(JobAlert.objects.count(), 4)
+
+    def test_salary_only_searches_are_indexed_by_band(self):
+        mid = SavedSearch.objects.create(user=self.user, salary_min=90_000, salary_max=130_000)
+        high = SavedSearch.objects.create(user=self.user, salary_min=300_000)
+        everything = SavedSearch.objects.create(user=self.user)
+        self.assertEqual(set(mid.keys.values_list('key', flat=True)), {'salary:80000', 'salary:100000', 'salary:125000'})
+        self.assertEqual(set(high.keys.values_list('key', flat=True)), {'salary:300000', 'salary:400000'})
+        self.assertEqual(list(everything.keys.values_list('key', flat=True)), ['*'])
+
+        self._ingest(
+            {'title': 'Engineer', 'salary_range': '$100,000 - $120,000'},
+            {'title': 'Manager', 'salary_range': '$140,000 - $160,000'},
+            {'title': 'Director', 'salary_range': '$350,000+'},
+            {'title': 'Intern'},
+        )
+        matched = set(JobAlert.objects.exclude(search=everything).values_list('search__pk', 'posting__title'))
+        self.assertEqual(matched, {(mid.pk, 'Engineer'), (high.pk, 'Director')})
+        self.assertEqual(JobAlert.objects.filter(search=everything).count(), 4)
+
+    def test_percolating_does_not_scale_with_searches(self):
+        posting = JobPosting.objects.create(title='Rust Engineer', company_name='Ferris', job_url='https://example.com/rust',
+                                            description='<p>Systems work.</p>', source='test')
+
+        def queries():
+            with CaptureQueriesContext(connection) as captured:
+                percolate([posting])
+            return len(captured)
+
+        SavedSearch.objects.create(user=self.user, query='rust')
+        few = queries()
+        SavedSearch.objects.bulk_create([SavedSearch(user=self.user, query=f'skill{i}') for i in range(200)])
+        for search in SavedSearch.objects.filter(query__startswith='skill'):
+            index_search(search)
+        self.assertEqual(queries(), few)
+
+    def test_digest_is_sent_once(self):
+        search = SavedSearch.objects.create(user=self.user, query='python')
+        other = User.objects.create_user('other', email='other@example.com')
+        SavedSearch.objects.create(user=other, query='python developer')
+        self._ingest({'title': 'Python Developer'}, {'title': 'Python Engineer'})
+
+        self.assertEqual(send_digests(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        mine = next(m for m in mail.outbox if m.to == ['seeker@example.com'])
+        self.assertEqual(mine.subject, '2 new jobs matching your saved searches')
+        self.assertIn('Python Engineer at', mine.body)
+        self.assertFalse(JobAlert.objects.filter(sent_at__isnull=True).exists())
+        search.refresh_from_db()
+        self.assertIsNotNone(search.last_notified_at)
+        self.assertEqual(send_digests(), 0)
+
+    def test_save_search_from_the_job_list(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('jobs:save_search'), {'q': 'data', 'within': '25', 'near': 'Pune',
+                                                                  'salary_min': '60k', 'salary_max': '90k'})
+        self.assertRedirects(response, reverse('jobs:saved_search_list'), fetch_redirect_response=False)
+        search = self.user.saved_searches.get()
+        self.assertEqual((search.terms, search.within_km, search.salary_min, search.salary_max), (['data'], 25, 60_000, 90_000))
+        self.assertIsNotNone(search.center_lat)
+
+
+class SemanticSearchTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(EMBEDDINGS={'BACKEND': 'core.embeddings.StubEmbeddingModel',
+                                                          'OPTIONS': {'dim': 256}, 'DIRECTORY': directory.name})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        semantic.reset()
+        self.addCleanup(semantic.reset)
+        upsert_postings([
+            {'title': 'Python Django Backend Developer', 'description': '<p>Build REST APIs in Django and PostgreSQL.</p>',
+             'job_url': 'https://example.com/py'},
+            {'title': 'Django REST Engineer', 'description': 'REST APIs, Python, Django, PostgreSQL.',
+             'job_url': 'https://example.com/rest'},
+            {'title': 'Pastry Chef', 'description': 'Croissants and laminated dough.', 'job_url': 'https://example.com/chef'},
+        ])
+
+    def test_postings_are_indexed_at_ingest(self):
+        self.assertEqual(len(semantic.get_index()), 3)
+        python = JobPosting.objects.get(job_url='https://example.com/py')
+        results = semantic.similar_jobs(python)
+        self.assertEqual([job.title for job, _ in results][0], 'Django REST Engineer')
+        self.assertNotIn(python, [job for job, _ in results])
+
+    def test_unchanged_text_is_not_embedded_again(self):
+        store = embeddings.get_store()
+        before = len(store)
+        upsert_postings([{'title': 'Pastry Chef', 'description': 'Croissants and laminated dough.',
+                          'job_url': 'https://example.com/chef'}])
+        self.assertEqual(len(store), before)
+
+    def test_jobs_like_my_experience(self):
+        user = User.objects.create_user('backend')
+        user.profile.summary = 'Backend developer building REST APIs.'
+        user.profile.save()
+        user.profile.skills.create(name='Django')
+        titles = [job.title for job, _ in semantic.jobs_for_profile(user.profile, k=2)]
+        self.assertNotIn('Pastry Chef', titles)
+        self.assertEqual(semantic.jobs_for_profile(User.objects.create_user('empty').profile), [])
+
+    def test_similar_jobs_view(self):
+        chef = JobPosting.objects.get(job_url='https://example.com/chef')
+        response = self.client.get(reverse('jobs:similar_jobs', args=[chef.pk]), {'limit': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(self.client.get(reverse('jobs:similar_jobs', args=[999])).status_code, 404)
+
+
+class KeyPhraseTests(TestCase):
+    """ Skill aliases come from the seed in profiles migration 0003 (k8s, postgres, ...). """
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        skills.reset_alias_map()
+
+    def test_skills_then_ranked_phrases(self):
+        terms = {'python': 'python', 'k8s': 'kubernetes', 'kubernetes': 'kubernetes', '.net': '.net', 'go': 'go'}
+        phrases = extract_key_phrases(
+            'Backend Engineer (Python)',
+            '<ul><li>5+ years of experience with Python</li><li>Operate distributed systems on K8s</li>'
+            '<li>.NET is a plus.</li><li>Go</li></ul>',
+            terms,
+        )
+        self.assertEqual(phrases[:4], ['python', '.net', 'go', 'kubernetes'])
+        self.assertIn('operate distributed systems', phrases)
+        self.assertIn('backend engineer', phrases)
+        self.assertNotIn('experience', ' '.join(phrases)) # Boilerplate splits phrases
+        self.assertNotIn('k8sgo', ' '.join(phrases)) # Adjacent list items stay apart
+
+    def test_extracted_at_ingestion_and_on_save(self):
+        upsert_postings([{'title': 'Platform Engineer', 'description': 'Run Postgres clusters on K8s.',
+                          'job_url': 'https://example.com/1'}])
+        posting = JobPosting.objects.get()
+        self.assertEqual(posting.key_phrases[:2], ['kubernetes', 'postgresql'])
+        posting.title = 'Terraform Engineer'
+        posting.save(update_fields=['title'])
+        posting.refresh_from_db()
+        self.assertIn('terraform engineer', posting.key_phrases)
+
+
+class EventTrackingTests(TestCase):
+
+    def setUp(self):
+        events.get_tracker().buffer.drain() # Events other tests left behind
+        self.postings = [
+            JobPosting.objects.create(title=f'Dev {i}', description='', company_name='Acme', source=source,
+                                      job_url=f'https://example.com/{i}')
+            for i, source in enumerate(['LinkedIn', 'LinkedIn', 'Indeed'])
+        ]
+
+    def test_click_redirects_and_is_counted_at_flush(self):
+        posting = self.postings[0]
+        with self.assertNumQueries(1): # The posting's url; nothing is written on the request path
+            response = self.client.get(reverse('jobs:job_click', args=[posting.pk]))
+        self.assertRedirects(response, posting.job_url, fetch_redirect_response=False)
+        self.assertFalse(JobEventCount.objects.exists())
+        events.flush()
+        self.assertEqual(tracking.posting_counts([posting.pk])[posting.pk], {'click': 1, 'view': 0})
+        self.assertEqual(self.client.get(reverse('jobs:job_click', args=[9999])).status_code, 404)
+
+    def test_list_impressions(self):
+        request = RequestFactory().get(reverse('jobs:job_list_search'))
+        request.user = AnonymousUser()
+        view = JobListSearchView()
+        view.setup(request)
+        view.object_list = view.get_queryset()
+        view.get_context_data()
+        events.flush()
+        counts = tracking.posting_counts([p.pk for p in self.postings])
+        self.assertEqual({c['view'] for c in counts.values()}, {1})
+
+    def test_posting_whose_source_changed_is_one_row_per_flush(self):
+        posting = self.postings[0]
+        tracking.track_click(posting)
+        posting.source = 'Indeed'
+        tracking.track_click(posting) # Two sources, one conflict key: PostgreSQL rejects duplicates in one upsert
+        events.flush()
+        row = JobEventCount.objects.get()
+        self.assertEqual((row.count, row.source), (2, 'Indeed'))
+
+    def test_flushes_add_up_per_hour_and_source(self):
+        for _ in range(3):
+            for posting in self.postings:
+                tracking.track_click(posting)
+            events.flush() # Same hour and shard each time: the upsert adds to one row
+        self.assertEqual(JobEventCount.objects.count(), 3)
+        hour_ago = timezone.now() - timedelta(hours=1)
+        self.assertEqual(tracking.source_counts(hour_ago), [
+            {'source': 'LinkedIn', 'clicks': 6, 'views': 0},
+            {'source': 'Indeed', 'clicks': 3, 'views': 0},
+        ])
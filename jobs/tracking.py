@@ -0,0 +1,109 @@
+# jobs/tracking.py
+
+"""
+Clickthrough and impression counts per posting and source, for ranking and
+billing.
+
+Views call track_click() / track_views(), which only append to the
+in-process event buffer (core/events.py). The buffer's flusher hands the
+events to save_counts(), which adds them up per (hour, kind, posting), the
+upsert's conflict key minus the shard (one value per flush), and writes the
+whole batch with one upsert per chunk of rows:
+
+    INSERT INTO jobs_jobeventcount (...) VALUES (...), (...)
+    ON CONFLICT (posting_id, kind, hour, shard) DO UPDATE SET count = count + excluded.count
+
+(SQLite 3.24+ and PostgreSQL). The shard is the worker's pid modulo
+SHARDS: workers flushing at the same moment update different rows. A
+statement must not hold two rows with the same key (PostgreSQL refuses to
+"affect row a second time"), so `source` is not part of the grouping: a new
+row takes the posting's latest source and an existing one keeps its own.
+"""
+
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+from django.db import connection, transaction
+from django.db.models import Q, Sum
+from core import events
+from .models import JobEventCount
+
+logger = logging.getLogger(__name__)
+
+CLICK_EVENT = 'job_click'
+VIEW_EVENT = 'job_view'
+KINDS = {CLICK_EVENT: JobEventCount.CLICK, VIEW_EVENT: JobEventCount.VIEW}
+SHARDS = 16
+UPSERT_CHUNK = 500 # Rows per statement: 6 parameters each, well under SQLite's variable limit
+
+
+def track_click(posting):
+    events.track(CLICK_EVENT, posting.pk, posting.source or '')
+
+
+def track_views(postings):
+    """ One impression per posting shown (e.g. a page of search results). """
+    for posting in postings:
+        events.track(VIEW_EVENT, posting.pk, posting.source or '')
+
+
+def _hour(timestamp):
+    return datetime.fromtimestamp(timestamp - timestamp % 3600, tz=dt_timezone.utc)
+
+
+def save_counts(batch):
+    """ core.events handler: [(kind, timestamp, posting_id, source)] -> hourly counter rows. """
+    counts, sources = Counter(), {}
+    for kind, timestamp, posting_id, source in batch:
+        key = (_hour(timestamp), KINDS[kind], posting_id)
+        counts[key] += 1
+        sources[key] = source # Events are in order: the last one has the latest source
+    shard = os.getpid() % SHARDS
+    opts = JobEventCount._meta
+    hour_field = opts.get_field('hour')
+    table = connection.ops.quote_name(opts.db_table)
+    columns = ', '.join(connection.ops.quote_name(opts.get_field(name).column)
+                        for name in ('hour', 'kind', 'posting', 'source', 'shard', 'count'))
+    conflict = ', '.join(connection.ops.quote_name(opts.get_field(name).column)
+                         for name in ('posting', 'kind', 'hour', 'shard'))
+    count_column = connection.ops.quote_name('count')
+    rows = [
+        (hour_field.get_db_prep_value(hour, connection), kind, posting_id,
+         sources[hour, kind, posting_id][:100], shard, count)
+        for (hour, kind, posting_id), count in counts.items()
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_CHUNK):
+            chunk = rows[start:start + UPSERT_CHUNK]
+            values = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(chunk))
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) VALUES {values} '
+                f'ON CONFLICT ({conflict}) DO UPDATE SET {count_column} = {table}.{count_column} + excluded.{count_column}',
+                [value for row in chunk for value in row],
+            )
+    logger.debug(f"Saved {len(batch)} job events as {len(rows)} counter rows (shard {shard}).")
+
+
+def posting_counts(posting_ids, since=None):
+    """ {posting_id: {'click': n, 'view': n}} summed over shards and hours. """
+    queryset = JobEventCount.objects.filter(posting_id__in=posting_ids)
+    if since is not None:
+        queryset = queryset.filter(hour__gte=since)
+    result = {pk: {JobEventCount.CLICK: 0, JobEventCount.VIEW: 0} for pk in posting_ids}
+    for row in queryset.order_by().values('posting_id', 'kind').annotate(total=Sum('count')):
+        result[row['posting_id']][row['kind']] = row['total']
+    return result
+
+
+def source_counts(since, until=None):
+    """ [{'source', 'clicks', 'views'}] per source between two times, most clicked first (for billing). """
+    queryset = JobEventCount.objects.filter(hour__gte=since)
+    if until is not None:
+        queryset = queryset.filter(hour__lt=until)
+    return list(
+        queryset.order_by().values('source').annotate(
+            clicks=Sum('count', filter=Q(kind=JobEventCount.CLICK), default=0),
+            views=Sum('count', filter=Q(kind=JobEventCount.VIEW), default=0),
+        ).order_by('-clicks', 'source')
+    )
@@ -5,4 +5,11 @@ app_name = 'jobs'
 
 urlpatterns = [
     path('', views.JobListSearchView.as_view(), name='job_list_search'),
-]
\ No newline at end of file
+    path('suggest/', views.JobSuggestView.as_view(), name='job_suggest'),
+    path('<int:pk>/go/', views.JobClickView.as_view(), name='job_click'),
+    path('<int:pk>/similar/', views.SimilarJobsView.as_view(), name='similar_jobs'),
+    path('for-me/', views.RecommendedJobsView.as_view(), name='recommended_jobs'),
+    path('alerts/', views.SavedSearchListView.as_view(), name='saved_search_list'),
+    path('alerts/save/', views.SaveSearchView.as_view(), name='save_search'),
+    path('alerts/<int:pk>/delete/', views.SavedSearchDeleteView.as_view(), name='saved_search_delete'),
+]
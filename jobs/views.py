@@ -1,8 +1,19 @@
 import logging # Import the logging library
-from django.shortcuts import render
-from django.views.generic import ListView
-from .models import JobPosting
-from django.db.models import Q
+from django.shortcuts import get_object_or_404, render, redirect
+from django.http import HttpResponseRedirect, JsonResponse
+from django.urls import reverse_lazy
+from django.views import View
+from django.views.generic import ListView, DeleteView
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.utils.cache import patch_cache_control
+from .models import JobPosting, SavedSearch
+from . import fuzzy, salary, semantic, suggest, tracking
+from core import dashboard, geo
+from core.embeddings import EmbeddingError
+from core.mixins import OwnerScopedMixin
+from core.writequeue import run_write
+from django.db.models import Q, Case, Count, When, Value, FloatField
 from django.core.paginator import Paginator # Import Paginator if handling errors manually
 
 # Get an instance of a logger for this module
@@ -14,23 +25,38 @@ class JobListSearchView(ListView):
     template_name = 'jobs/job_list.html'
     context_object_name = 'job_list'
     paginate_by = 15
+    max_radius_km = 500
+    radius_choices = (10, 25, 50, 100, 250)
 
     def get_queryset(self):
         """ Filter jobs based on search query parameter 'q'. """
         logger.info("Fetching job queryset...") # Log entry point
-        queryset = super().get_queryset()
+        # Cards render description_preview; the full description can be large, so don't load it
+        queryset = super().get_queryset().defer('description')
         query = self.request.GET.get('q')
 
         if query:
             logger.info(f"Search query received: '{query}'")
             try:
-                queryset = queryset.filter(
+                exact = (
                     Q(title__icontains=query) |
                     Q(description__icontains=query) |
                     Q(company_name__icontains=query) |
                     Q(location__icontains=query)
-                ).distinct()
-                logger.info(f"Found {queryset.count()} jobs matching query.")
+                )
+                # Typo-tolerant candidates from the trigram index, best first
+                fuzzy_matches = fuzzy.fuzzy_search(query)
+                # Exact matches rank above every fuzzy match; fuzzy ones by similarity
+                rank = Case(
+                    When(exact, then=Value(2.0)),
+                    *[When(pk=pk, then=Value(float(score))) for pk, score in fuzzy_matches],
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                )
+                queryset = queryset.filter(
+                    exact | Q(pk__in=[pk for pk, _ in fuzzy_matches])
+                ).annotate(match_rank=rank).order_by('-match_rank', '-date_added_db')
+                logger.info(f"Search query matched {len(fuzzy_matches)} fuzzy candidates.") # No COUNT(*) just to log
             except Exception as e:
                 # Log unexpected errors during filtering
                 logger.error(f"Error filtering job queryset for query '{query}': {e}", exc_info=True)
@@ -39,22 +65,198 @@ class JobListSearchView(ListView):
         else:
              logger.info("No search query provided, returning all jobs.")
 
+        # Salary filter (annual USD): postings whose range overlaps [low, high], answered
+        # from jobs_posting_salary_usd_idx. Open-ended ranges match on their open side;
+        # postings without a parsable salary drop out.
+        low, high = self.salary_filter()
+        if low is not None or high is not None:
+            queryset = queryset.filter(salary.usd_range_q(low, high))
+
+        # "Within N km": one geohash index range per cell around the point, no per-row distances
+        near = self.location_filter()
+        if near:
+            lat, lon, km, include_remote = near
+            area = geo.within_km(lat, lon, km)
+            queryset = queryset.filter(area | Q(location_remote=True) if include_remote else area)
         return queryset
 
+    def location_filter(self):
+        """
+        (lat, lon, km, include_remote) from the within/near/remote GET parameters,
+        or None. Without `near`, a logged-in user's own profile location is used.
+        """
+        if hasattr(self, '_location_filter'):
+            return self._location_filter
+        self._location_filter = None
+        try:
+            km = float(self.request.GET.get('within') or 0)
+        except ValueError:
+            km = 0
+        if 0 < km <= self.max_radius_km:
+            near = self.request.GET.get('near', '').strip()
+            place = geo.resolve(near) if near else None
+            profile = getattr(self.request.user, 'profile', None) # Anonymous users have none
+            if place and place.lat is not None:
+                center = (place.lat, place.lon)
+            elif not near and profile is not None and profile.location_lat is not None:
+                center = (profile.location_lat, profile.location_lon)
+            else:
+                center = None
+                logger.info(f"Location filter ignored: no coordinates for {near or 'the user profile'!r}.")
+            if center:
+                self._location_filter = (*center, km, self.request.GET.get('remote') == '1')
+        return self._location_filter
+
+    def salary_filter(self):
+        """ (low, high) annual USD from the salary_min/salary_max GET parameters; None where not given. """
+        if not hasattr(self, '_salary_filter'):
+            self._salary_filter = (
+                salary.parse_amount(self.request.GET.get('salary_min')),
+                salary.parse_amount(self.request.GET.get('salary_max')),
+            )
+        return self._salary_filter
+
     def get_context_data(self, **kwargs):
         """ Add the search query back to the context. """
         context = super().get_context_data(**kwargs)
         context['search_query'] = self.request.GET.get('q', '')
+        context['salary_min'], context['salary_max'] = self.salary_filter()
+        context['near'] = self.request.GET.get('near', '')
+        context['within'] = self.request.GET.get('within', '')
+        context['radius_choices'] = [str(km) for km in self.radius_choices]
+        context['include_remote'] = self.request.GET.get('remote') == '1'
+        context['location_filtered'] = self.location_filter() is not None
+        # Current filters for the pagination links
+        query = self.request.GET.copy()
+        query.pop('page', None)
+        context['filter_query'] = query.urlencode()
+        tracking.track_views(context['job_list']) # Buffered; written in batches by core/events.py
         # Log basic context info
         logger.debug(f"Context prepared for job list view. Page: {context.get('page_obj').number if context.get('page_obj') else 'N/A'}")
         return context
 
     # Optional: More granular error handling for pagination (Django handles most common cases)
     def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated and dashboard.has_unseen_jobs(request.user.pk):
+            # Reset the home page's "new matching jobs" badge; the page doesn't need to wait for it
+            run_write(dashboard.mark_jobs_seen, request.user.pk, wait=False)
         try:
             return super().get(request, *args, **kwargs)
         except Exception as e: # Catch broader errors if needed
             logger.error(f"Unhandled error in JobListSearchView GET request: {e}", exc_info=True)
             # Render an error template or return an HttpResponseServerError
             # return render(request, '500.html', status=500)
-            raise # Re-raise for Django's default error handling
\ No newline at end of file
+            raise # Re-raise for Django's default error handling
+
+
+class JobClickView(View):
+    """ "View Original Post": counts the clickthrough, then redirects to the posting's own URL. """
+
+    def get(self, request, pk, *args, **kwargs):
+        # Only ever redirects to a stored job_url, so the endpoint can't be used as an open redirect
+        posting = get_object_or_404(JobPosting.objects.only('pk', 'job_url', 'source'), pk=pk)
+        tracking.track_click(posting)
+        return HttpResponseRedirect(posting.job_url)
+
+
+class JobSuggestView(View):
+    """ Returns search-as-you-type suggestions for the job search box as JSON. """
+    max_limit = 20
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('q', '')
+        try:
+            limit = min(int(request.GET.get('limit', suggest.TOPK_SIZE)), self.max_limit)
+        except ValueError:
+            limit = suggest.TOPK_SIZE
+        suggestions = suggest.suggest(query, limit=limit)
+        response = JsonResponse({'query': query, 'suggestions': suggestions})
+        # Same prefix -> same answer until the next ingest; let browsers reuse it briefly
+        patch_cache_control(response, public=True, max_age=60)
+        return response
+
+
+class SimilarJobsView(View):
+    """ JSON list of the postings most similar to one posting (embedding similarity, jobs/semantic.py). """
+    max_limit = 20
+
+    def get(self, request, pk, *args, **kwargs):
+        posting = get_object_or_404(JobPosting, pk=pk)
+        try:
+            limit = min(int(request.GET.get('limit', 10)), self.max_limit)
+        except ValueError:
+            limit = 10
+        try:
+            results = semantic.similar_jobs(posting, k=limit)
+        except EmbeddingError as e:
+            logger.error(f"Similar jobs for posting {pk} failed: {e}")
+            return JsonResponse({'error': 'Similar jobs are unavailable right now.'}, status=503)
+        return JsonResponse({'posting': posting.pk, 'results': [
+            {'id': job.pk, 'title': job.title, 'company_name': job.company_name, 'location': job.location,
+             'job_url': job.job_url, 'score': round(score, 4)}
+            for job, score in results
+        ]})
+
+
+class RecommendedJobsView(LoginRequiredMixin, ListView):
+    """ "Jobs like my experience": postings closest to the user's summary, work experience and skills. """
+    template_name = 'jobs/recommended_jobs.html'
+    context_object_name = 'job_list'
+    limit = 20
+
+    def get_queryset(self):
+        profile = getattr(self.request.user, 'profile', None)
+        if profile is None:
+            return []
+        try:
+            return [job for job, _ in semantic.jobs_for_profile(profile, k=self.limit)]
+        except EmbeddingError as e:
+            logger.error(f"Job recommendations for user {self.request.user.username} failed: {e}")
+            return []
+
+
+class SaveSearchView(LoginRequiredMixin, View):
+    """ Saves the job list's current search (posted as hidden fields) for email alerts. """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        data = request.POST
+        try:
+            within = int(data.get('within') or 0)
+        except ValueError:
+            within = 0
+        search = SavedSearch.objects.create(
+            user=request.user,
+            name=data.get('name', '').strip()[:100],
+            query=data.get('q', '').strip()[:255],
+            near=data.get('near', '').strip()[:150],
+            within_km=within if 0 < within <= JobListSearchView.max_radius_km else None,
+            include_remote=data.get('remote') == '1',
+            salary_min=salary.parse_amount(data.get('salary_min')),
+            salary_max=salary.parse_amount(data.get('salary_max')),
+        )
+        logger.info(f"User {request.user.username} saved job search {search.pk}: {search.terms}")
+        messages.success(request, "Search saved. New matching jobs will be emailed to you.")
+        return redirect('jobs:saved_search_list')
+
+
+class SavedSearchListView(LoginRequiredMixin, ListView):
+    """ The user's saved searches, with how many alerts each has produced. """
+    model = SavedSearch
+    template_name = 'jobs/saved_search_list.html'
+    context_object_name = 'saved_searches'
+
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user).annotate(alert_count=Count('alerts'))
+
+
+class SavedSearchDeleteView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
+    """ Deletes one of the user's saved searches (others are a 404); its index keys and alerts go with it. """
+    model = SavedSearch
+    template_name = 'jobs/saved_search_confirm_delete.html'
+    success_url = reverse_lazy('jobs:saved_search_list')
+    context_object_name = 'saved_search'
+
+    def post(self, request, *args, **kwargs):
+        messages.success(self.request, 'Saved search deleted.')
+        return super().post(request, *args, **kwargs)
@@ -2,11 +2,20 @@
 """Django's command-line utility for administrative tasks."""
 import os
 import sys
+from pathlib import Path
 
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hire_synapse.settings')
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv(Path(__file__).resolve().parent / '.env') # Never overrides variables already set
+    # `manage.py test` runs against the test profile unless told otherwise
+    profile = 'test' if sys.argv[1:2] == ['test'] else 'dev'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', f'hire_synapse.settings.{profile}')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
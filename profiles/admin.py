@@ -1,38 +1,45 @@
 # profiles/admin.py
 
 from django.contrib import admin
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils.html import format_html_join
+from core.admin import BoundedInlineFormSet, EstimatedCountPaginator
 # --- Import ALL models used in this file ---
 from .models import (
     UserProfile, Education, WorkExperience, Skill,
-    Project, Award, Certification # <-- Added Project, Award, Certification here
+    Project, Award, Certification, # <-- Added Project, Award, Certification here
+    CanonicalSkill, SkillAlias
 )
 
 # --- Inline classes for related models ---
+# Each inline edits at most BoundedInlineFormSet.max_shown rows; the
+# "Resume sections" field on the profile links to the full lists.
 
-class EducationInline(admin.TabularInline): # Or StackedInline
-    model = Education
+class BoundedInline(admin.TabularInline):
+    formset = BoundedInlineFormSet
     extra = 0 # Show 0 empty forms by default for existing profiles
+    show_change_link = True
+
+class EducationInline(BoundedInline): # Or StackedInline
+    model = Education
 
-class WorkExperienceInline(admin.TabularInline):
+class WorkExperienceInline(BoundedInline):
     model = WorkExperience
-    extra = 0
 
-class SkillInline(admin.TabularInline):
+class SkillInline(BoundedInline):
     model = Skill
-    extra = 0
     readonly_fields = ('created_at',) # Good practice for auto-added fields
 
-class ProjectInline(admin.TabularInline):
+class ProjectInline(BoundedInline):
     model = Project # Now 'Project' is defined because it was imported
-    extra = 0
 
-class AwardInline(admin.TabularInline):
+class AwardInline(BoundedInline):
     model = Award # Now 'Award' is defined
-    extra = 0
 
-class CertificationInline(admin.TabularInline):
+class CertificationInline(BoundedInline):
     model = Certification # Now 'Certification' is defined
-    extra = 0
 
 # --- Main Admin class for UserProfile ---
 
@@ -40,9 +47,13 @@ class CertificationInline(admin.TabularInline):
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'location', 'website', 'updated_at')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email', 'location')
     list_filter = ('created_at', 'updated_at')
-    readonly_fields = ('created_at', 'updated_at') # Good practice
+    readonly_fields = ('created_at', 'updated_at', 'resume_sections') # Good practice
+    raw_id_fields = ('user',) # A select box would list every user on the site
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = [ # List all inlines here
         EducationInline,
         WorkExperienceInline,
@@ -52,11 +63,31 @@ class UserProfileAdmin(admin.ModelAdmin):
         CertificationInline
     ]
 
+    @admin.display(description='Resume sections')
+    def resume_sections(self, obj):
+        """ Row counts per section (one query), each linking to that section's full changelist. """
+        if obj.pk is None:
+            return '-'
+        models = [inline.model for inline in self.inlines]
+        counts = UserProfile.objects.filter(pk=obj.pk).values(**{
+            f'{model._meta.model_name}_count': Coalesce(Subquery(
+                model.objects.filter(profile=OuterRef('pk')).order_by()
+                .values('profile').annotate(n=Count('pk')).values('n')
+            ), 0)
+            for model in models
+        }).get()
+        return format_html_join(', ', '<a href="{}?profile__id__exact={}">{}: {}</a>', (
+            (reverse(f'admin:profiles_{model._meta.model_name}_changelist'), obj.pk,
+             model._meta.verbose_name_plural.capitalize(), counts[f'{model._meta.model_name}_count'])
+            for model in models
+        ))
+
 # --- Admin classes for other models (Optional but good for direct management) ---
 
 @admin.register(Education)
 class EducationAdmin(admin.ModelAdmin):
     list_display = ('profile', 'institution_name', 'degree', 'start_date', 'end_date')
+    list_select_related = ('profile__user',)
     search_fields = ('profile__user__username', 'institution_name', 'degree', 'field_of_study')
     list_filter = ('start_date', 'end_date')
     autocomplete_fields = ['profile'] # Makes selecting the profile easier
@@ -64,21 +95,37 @@ class EducationAdmin(admin.ModelAdmin):
 @admin.register(WorkExperience)
 class WorkExperienceAdmin(admin.ModelAdmin):
     list_display = ('profile', 'job_title', 'company_name', 'start_date', 'end_date')
+    list_select_related = ('profile__user',)
     search_fields = ('profile__user__username', 'job_title', 'company_name')
     list_filter = ('start_date', 'end_date')
     autocomplete_fields = ['profile']
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
-    list_display = ('profile', 'name', 'created_at')
+    list_display = ('profile', 'name', 'canonical', 'created_at')
+    list_select_related = ('profile__user', 'canonical')
     search_fields = ('profile__user__username', 'name')
     list_filter = ('created_at',)
-    readonly_fields = ('created_at',)
+    readonly_fields = ('canonical', 'created_at')
     autocomplete_fields = ['profile']
 
+# Skill taxonomy: saving here bumps the alias map version (profiles/signals.py)
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+@admin.register(CanonicalSkill)
+class CanonicalSkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'key', 'curated')
+    list_editable = ('curated',)
+    list_filter = ('curated',)
+    search_fields = ('name', 'key', 'aliases__alias')
+    inlines = [SkillAliasInline]
+
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     list_display = ('profile', 'name', 'start_date', 'end_date')
+    list_select_related = ('profile__user',)
     search_fields = ('profile__user__username', 'name', 'description')
     list_filter = ('start_date', 'end_date')
     autocomplete_fields = ['profile']
@@ -86,6 +133,7 @@ class ProjectAdmin(admin.ModelAdmin):
 @admin.register(Award)
 class AwardAdmin(admin.ModelAdmin):
     list_display = ('profile', 'title', 'issuer', 'date_received')
+    list_select_related = ('profile__user',)
     search_fields = ('profile__user__username', 'title', 'issuer')
     list_filter = ('date_received',)
     autocomplete_fields = ['profile']
@@ -93,6 +141,7 @@ class AwardAdmin(admin.ModelAdmin):
 @admin.register(Certification)
 class CertificationAdmin(admin.ModelAdmin):
     list_display = ('profile', 'name', 'issuing_organization', 'issue_date', 'expiration_date')
+    list_select_related = ('profile__user',)
     search_fields = ('profile__user__username', 'name', 'issuing_organization')
     list_filter = ('issue_date', 'expiration_date')
     autocomplete_fields = ['profile']
@@ -4,4 +4,10 @@ from django.apps import AppConfig
 # Make sure the class name is sensible, e.g., ProfilesConfig
 class ProfilesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'profiles' # <--- CORRECTED LINE
\ No newline at end of file
+    name = 'profiles' # <--- CORRECTED LINE
+
+    def ready(self):
+        from . import signals # noqa: F401 - connects resume score signal handlers
+        from core import metrics
+        from . import candidates
+        metrics.register('candidate_index', candidates.index_stats)
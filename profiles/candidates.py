@@ -0,0 +1,316 @@
+# profiles/candidates.py
+
+"""
+Candidate search for employers: profiles by skill, location and degree.
+
+Every criterion value has a bitmap over profile ids (bit n set = profile n
+has it), held in memory by each process:
+
+  skills     canonical skill id (profiles/skills.py)      -> bitmap
+  locations  normalized location, each comma part and the -> bitmap
+             gazetteer city/country (core/geo.py): "Bangalore, India"
+             is under "bangalore, india", "bangalore", "india", "bengaluru"
+  degrees    normalized Education.degree                  -> bitmap
+
+A query is bitmap AND (across criteria, and across skills unless match_any)
+and OR (within locations, within degrees). Only the requested page of the
+result is loaded from the database; the total is a popcount.
+
+Bitmaps are Python ints: & | and bit_count() run in C over 64-bit words, so
+one operation over 1M profiles touches 125 KB. Values held by few profiles
+are kept as sorted id arrays instead, which keeps a large taxonomy of rare
+skills small in memory. A query intersects such arrays directly (or probes
+them against the bitmap so far), so its result can itself be an id array.
+
+Edits to profiles, skills and education bump a version in the cache. A
+process seeing a new version rebuilds its index in a background thread (at
+most every REBUILD_INTERVAL seconds) and keeps answering from the old one
+meanwhile, so results can lag edits by that long.
+"""
+
+import logging
+import threading
+import time
+from array import array
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Max
+from core import geo
+from jobs.suggest import normalize
+from .models import Education, Skill, UserProfile
+from .skills import normalize_skill, resolve
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION_KEY = 'profiles:candidate_index_version'
+REBUILD_INTERVAL = getattr(settings, 'CANDIDATE_INDEX_REBUILD_INTERVAL', 30) # Seconds
+SPARSE_RATIO = 512 # Values held by fewer than size / SPARSE_RATIO profiles are stored as id arrays
+WINDOW = 1 << 12 # Bits iter_ids cuts out of a bitmap at a time
+
+
+def location_keys(location, city='', country=''):
+    """ "Berlin, Germany" -> {"berlin, germany", "berlin", "germany"}, plus the resolved city and country names. """
+    full = normalize(location)
+    if not full:
+        return set()
+    keys = {full} | {part for part in (normalize(p) for p in location.split(',')) if part}
+    return keys | {key for key in (normalize(city), normalize(geo.country_name(country))) if key}
+
+
+def query_location_keys(location):
+    """ Index keys to OR for one searched location: its text, or the city it resolves to ("Bengaluru" for "Bangalore"). """
+    place = geo.resolve(location)
+    return {key for key in (normalize(location), normalize(place.city) if place else '') if key}
+
+
+def _bitmap(ids, size):
+    """ Int bitmap with the given bit positions set. """
+    buf = bytearray((size >> 3) + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def count_ids(result):
+    """ Number of profiles in a search result (bitmap or sorted id array). """
+    return len(result) if isinstance(result, array) else result.bit_count()
+
+
+def iter_ids(result, newest_first=True):
+    """
+    Profile ids in a search result (bitmap or sorted id array), highest (newest
+    profile) first by default. A bitmap is walked down from its top bit a window
+    at a time, so taking the first page never touches the rest of it.
+    """
+    if isinstance(result, array):
+        yield from reversed(result) if newest_first else result
+    elif newest_first:
+        high, width = result.bit_length(), WINDOW
+        while high > 0:
+            low = max(high - width, 0)
+            window = (result >> low) & ((1 << (high - low)) - 1)
+            # Empty windows double, so a sparse bitmap is crossed in few shifts
+            width = WINDOW if window else min(width * 2, WINDOW << 6)
+            while window:
+                top = window.bit_length() - 1
+                yield low + top
+                window ^= 1 << top
+            high = low
+    else:
+        while result:
+            low = result & -result
+            yield low.bit_length() - 1
+            result ^= low
+
+
+def _probe(ids, bitmap):
+    """ The ids (sorted array) whose bit is set in bitmap, without building a bitmap from them. """
+    bits = bitmap.to_bytes((bitmap.bit_length() + 7) >> 3, 'little')
+    end = len(bits) << 3
+    return array('q', (i for i in ids if i < end and bits[i >> 3] >> (i & 7) & 1))
+
+
+def _intersect(a, b):
+    """ a AND b for any mix of bitmaps and sorted id arrays; None stands for every profile. """
+    if a is None:
+        return b
+    if isinstance(a, int) and isinstance(b, int):
+        return a & b
+    if isinstance(a, array) and isinstance(b, array):
+        small, large = (a, b) if len(a) <= len(b) else (b, a)
+        large = set(large)
+        return array('q', (i for i in small if i in large))
+    return _probe(a, b) if isinstance(a, array) else _probe(b, a)
+
+
+class CandidateIndex:
+    """ Bitmaps for one snapshot of the profiles; immutable once built. """
+
+    def __init__(self, size):
+        self.size = size # Highest profile id + 1
+        self.all = 0
+        self.skills, self.locations, self.degrees = {}, {}, {}
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def build(cls):
+        started = time.perf_counter()
+        size = (UserProfile.objects.aggregate(top=Max('id'))['top'] or 0) + 1
+        index = cls(size)
+
+        profile_ids, locations = array('q'), {}
+        rows = UserProfile.objects.values_list('id', 'location', 'location_city', 'location_country')
+        for pk, location, city, country in rows.iterator(chunk_size=10_000):
+            profile_ids.append(pk)
+            for key in location_keys(location, city, country):
+                locations.setdefault(key, array('q')).append(pk)
+        index.all = _bitmap(profile_ids, size)
+
+        skills = {}
+        rows = Skill.objects.filter(canonical__isnull=False).values_list('canonical_id', 'profile_id')
+        for skill_id, pk in rows.iterator(chunk_size=10_000):
+            skills.setdefault(skill_id, array('q')).append(pk)
+
+        degrees = {}
+        rows = Education.objects.exclude(degree__isnull=True).exclude(degree='').values_list('degree', 'profile_id')
+        for degree, pk in rows.iterator(chunk_size=10_000):
+            if key := normalize(degree):
+                degrees.setdefault(key, array('q')).append(pk)
+
+        for source, target in ((skills, index.skills), (locations, index.locations), (degrees, index.degrees)):
+            for key, ids in source.items():
+                target[key] = index._container(ids)
+        logger.info(
+            f"Built candidate index: {len(profile_ids)} profiles, {len(index.skills)} skills, "
+            f"{len(index.locations)} locations, {len(index.degrees)} degrees in {time.perf_counter() - started:.2f}s"
+        )
+        return index
+
+    def _container(self, ids):
+        if len(ids) * SPARSE_RATIO < self.size:
+            return array('q', sorted(set(ids)))
+        return _bitmap(ids, self.size)
+
+    def _any(self, mapping, keys):
+        """ OR of the values' containers: an id array while they are all sparse. """
+        dense, sparse = 0, set()
+        for key in keys:
+            container = mapping.get(key, 0)
+            if isinstance(container, array):
+                sparse.update(container)
+            else:
+                dense |= container
+        if not dense:
+            return array('q', sorted(sparse))
+        return dense | _bitmap(sparse, self.size) if sparse else dense
+
+    def search(self, skill_ids=(), locations=(), degrees=(), match_any=False):
+        """
+        Profiles matching every given criterion: a bitmap, or a sorted id array
+        when a sparse value narrowed them down. Unknown skills are passed as None.
+        """
+        result = None # Every profile; replaced by the first criterion rather than ANDed with self.all
+        if skill_ids:
+            if match_any:
+                result = _intersect(result, self._any(self.skills, [s for s in skill_ids if s is not None]))
+            else:
+                # Rarest skill first: the intersection shrinks fastest
+                for skill_id in sorted(skill_ids, key=self._cardinality):
+                    result = _intersect(result, self.skills.get(skill_id, 0))
+                    if not result:
+                        break
+        if locations and (result is None or result):
+            keys = {key for loc in locations for key in query_location_keys(loc)}
+            result = _intersect(result, self._any(self.locations, keys))
+        if degrees and (result is None or result):
+            result = _intersect(result, self._any(self.degrees, [normalize(d) for d in degrees]))
+        return self.all if result is None else result
+
+    def _cardinality(self, skill_id):
+        return count_ids(self.skills.get(skill_id, 0))
+
+    def stats(self):
+        sparse = sum(isinstance(c, array) for m in (self.skills, self.locations, self.degrees) for c in m.values())
+        return {
+            'profiles': self.all.bit_count(), 'size': self.size,
+            'skills': len(self.skills), 'locations': len(self.locations), 'degrees': len(self.degrees),
+            'sparse_values': sparse, 'age_s': round(time.monotonic() - self.built_at, 1),
+        }
+
+
+# --- The process's current index ---
+
+_index = None
+_index_version = None
+_rebuilding = False
+_lock = threading.Lock()
+_first_build_lock = threading.Lock()
+
+
+def _version():
+    version = cache.get(INDEX_VERSION_KEY)
+    if version is None:
+        cache.add(INDEX_VERSION_KEY, time.time_ns(), None) # Not 1, so an evicted key still means "changed"
+        version = cache.get(INDEX_VERSION_KEY)
+    return version
+
+
+def invalidate():
+    try:
+        cache.incr(INDEX_VERSION_KEY)
+    except ValueError:
+        cache.set(INDEX_VERSION_KEY, time.time_ns(), None)
+
+
+def _rebuild(version):
+    global _index, _index_version, _rebuilding
+    try:
+        index = CandidateIndex.build()
+        with _lock:
+            _index, _index_version = index, version
+    except Exception as e:
+        logger.error(f"Error rebuilding candidate index: {e}", exc_info=True)
+    finally:
+        _rebuilding = False
+
+
+def get_index():
+    """ The current index; built in the foreground the first time, in the background after that. """
+    global _index, _index_version, _rebuilding
+    version = _version()
+    if _index is None:
+        with _first_build_lock:
+            if _index is None:
+                index = CandidateIndex.build()
+                with _lock:
+                    _index, _index_version = index, version
+        return _index
+    if version != _index_version and not _rebuilding and time.monotonic() - _index.built_at >= REBUILD_INTERVAL:
+        with _lock:
+            if _rebuilding:
+                return _index
+            _rebuilding = True
+        threading.Thread(target=_background_rebuild, args=(version,), name='candidate-index', daemon=True).start()
+    return _index
+
+
+def _background_rebuild(version):
+    try:
+        _rebuild(version)
+    finally:
+        connections.close_all() # This thread's connections
+
+
+def reset():
+    """ Drops this process's index; the next search rebuilds it (tests, management commands). """
+    global _index, _index_version
+    with _lock:
+        _index, _index_version = None, None
+
+
+def index_stats():
+    """ core.metrics source. """
+    return _index.stats() if _index is not None else {'built': False}
+
+
+def search_candidates(skills=(), locations=(), degrees=(), match_any=False, page=1, per_page=20):
+    """
+    (total, [UserProfile]) for one page of matching candidates, newest profiles
+    first. Skills are names as typed ("JS", "k8s"); only the page is loaded.
+    """
+    skill_ids = [resolve(name, create=False) for name in skills if normalize_skill(name)]
+    if skill_ids and not match_any and None in skill_ids:
+        return 0, [] # Nobody has a skill that isn't in the taxonomy
+    result = get_index().search(skill_ids, locations, degrees, match_any=match_any)
+    total = count_ids(result)
+    start = (max(page, 1) - 1) * per_page
+    ids = []
+    for position, pk in enumerate(iter_ids(result)):
+        if position >= start + per_page:
+            break
+        if position >= start:
+            ids.append(pk)
+    profiles = UserProfile.objects.filter(pk__in=ids).select_related('user').prefetch_related('skills')
+    by_id = {profile.pk: profile for profile in profiles}
+    return total, [by_id[pk] for pk in ids if pk in by_id] # Deleted since the index was built: skipped
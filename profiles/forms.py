@@ -148,3 +148,26 @@ class CertificationForm(forms.ModelForm):
             'issue_date': 'Issue Date',
             'expiration_date': 'Expiration Date (Optional)',
         }
+
+# Form for the employer candidate search (profiles/candidates.py)
+class CandidateSearchForm(forms.Form):
+    """ GET form; comma separated values within a field. """
+    MATCH_CHOICES = [('all', 'All of these skills'), ('any', 'Any of these skills')]
+
+    skills = forms.CharField(required=False, max_length=500, label='Skills', widget=forms.TextInput(attrs={'placeholder': 'e.g., Python, Django, PostgreSQL', 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}))
+    match = forms.ChoiceField(required=False, choices=MATCH_CHOICES, initial='all', widget=forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}))
+    location = forms.CharField(required=False, max_length=200, label='Locations', widget=forms.TextInput(attrs={'placeholder': 'e.g., Berlin, Remote', 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}))
+    degree = forms.CharField(required=False, max_length=200, label='Degrees', widget=forms.TextInput(attrs={'placeholder': 'e.g., Bachelor of Science', 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm dark:bg-gray-700 dark:border-gray-600 dark:text-white'}))
+
+    @staticmethod
+    def _split(value):
+        return [part.strip() for part in (value or '').split(',') if part.strip()]
+
+    def criteria(self):
+        """ Keyword arguments for candidates.search_candidates(). Call after is_valid(). """
+        return {
+            'skills': self._split(self.cleaned_data.get('skills')),
+            'locations': self._split(self.cleaned_data.get('location')),
+            'degrees': self._split(self.cleaned_data.get('degree')),
+            'match_any': self.cleaned_data.get('match') == 'any',
+        }
@@ -0,0 +1,63 @@
+import itertools
+import random
+import statistics
+import time
+from array import array
+from django.core.management.base import BaseCommand
+from profiles.candidates import CandidateIndex, _bitmap, count_ids, iter_ids
+
+LOCATIONS = ['berlin', 'london', 'paris', 'remote', 'new york', 'bangalore', 'toronto', 'madrid']
+DEGREES = ['bachelor of science', 'master of science', 'bachelor of arts', 'phd', 'mba']
+
+class Command(BaseCommand):
+    help = ('Measures candidate search queries/sec on a synthetic in-memory index '
+            '(no database): bitmap AND/OR plus picking the first page of ids. It leaves out loading that '
+            'page of profiles from the database, which search_candidates adds to every query.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=1_000_000, help='Synthetic profiles.')
+        parser.add_argument('--skills', type=int, default=5000, help='Distinct skills (popularity is Zipf-like).')
+        parser.add_argument('--skills-per-profile', type=int, default=8)
+        parser.add_argument('--queries', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        n, n_skills = options['profiles'], options['skills']
+        self.stdout.write(self.style.SUCCESS(f'--- Building synthetic candidate index: {n} profiles, {n_skills} skills ---'))
+        started = time.perf_counter()
+
+        # Skill k is picked with weight 1/k, so a few skills are common and most are rare
+        weights = list(itertools.accumulate(1 / k for k in range(1, n_skills + 1)))
+        skills, locations, degrees = {}, {}, {}
+        for pk in range(1, n + 1):
+            for skill_id in set(rng.choices(range(n_skills), cum_weights=weights, k=options['skills_per_profile'])):
+                skills.setdefault(skill_id, array('q')).append(pk)
+            locations.setdefault(rng.choice(LOCATIONS), array('q')).append(pk)
+            degrees.setdefault(rng.choice(DEGREES), array('q')).append(pk)
+        index = CandidateIndex(n + 1)
+        index.all = _bitmap(range(1, n + 1), n + 1)
+        for source, target in ((skills, index.skills), (locations, index.locations), (degrees, index.degrees)):
+            for key, ids in source.items():
+                target[key] = index._container(ids)
+        stats = index.stats()
+        self.stdout.write(f'Built in {time.perf_counter() - started:.1f}s: {stats["skills"]} skills, '
+                          f'{stats["sparse_values"]} values stored sparse')
+
+        latencies, hits = [], 0
+        for _ in range(options['queries']):
+            skill_ids = rng.choices(range(n_skills), cum_weights=weights, k=rng.randint(1, 3))
+            query_locations = rng.sample(LOCATIONS, rng.randint(0, 2))
+            query_degrees = rng.sample(DEGREES, rng.randint(0, 1))
+            t = time.perf_counter()
+            result = index.search(skill_ids, query_locations, query_degrees, match_any=rng.random() < 0.2)
+            total = count_ids(result)
+            page = [pk for pk, _ in zip(iter_ids(result), range(20))]
+            latencies.append((time.perf_counter() - t) * 1000)
+            hits += bool(total and page)
+
+        elapsed = sum(latencies) / 1000
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        summary_msg = (f'{len(latencies)} queries: {len(latencies) / elapsed:.0f} queries/s, '
+                       f'p50={statistics.median(latencies):.2f}ms p95={p95:.2f}ms, {hits} with results')
+        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
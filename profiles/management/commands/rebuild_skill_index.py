@@ -0,0 +1,61 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs.models import JobPosting
+from profiles import skills
+from profiles.models import Skill
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = ('Re-resolves every profile skill against the skill taxonomy and rebuilds the '
+            'canonical skill -> job postings index. Run after merging skills, adding aliases or curating skills.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows handled per transaction.')
+        parser.add_argument('--skip-postings', action='store_true', help='Only re-resolve profile skills.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('--- Rebuilding skill index ---'))
+        started = time.perf_counter()
+        chunk_size = options['chunk_size']
+        skills.invalidate_aliases() # Start from the current taxonomy, not this process's copy
+
+        # Profile skills: only rows whose canonical skill changed are written
+        changed = 0
+        chunk = []
+        for skill in Skill.objects.only('pk', 'name', 'canonical').order_by('pk').iterator(chunk_size=chunk_size):
+            canonical_id = skills.resolve(skill.name)
+            if canonical_id != skill.canonical_id:
+                skill.canonical_id = canonical_id
+                chunk.append(skill)
+            if len(chunk) >= chunk_size:
+                changed += self._update_skills(chunk)
+                chunk = []
+        if chunk:
+            changed += self._update_skills(chunk)
+
+        indexed = 0
+        if not options['skip_postings']:
+            chunk = []
+            postings = JobPosting.objects.only('pk', 'title', 'description').order_by('pk')
+            for posting in postings.iterator(chunk_size=chunk_size):
+                chunk.append(posting)
+                if len(chunk) >= chunk_size:
+                    skills.index_postings(chunk)
+                    indexed += len(chunk)
+                    chunk = []
+            if chunk:
+                skills.index_postings(chunk)
+                indexed += len(chunk)
+
+        summary_msg = (f'Re-resolved {changed} profile skills, indexed {indexed} postings '
+                       f'in {time.perf_counter() - started:.2f}s')
+        logger.info(summary_msg)
+        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
+
+    def _update_skills(self, chunk):
+        with transaction.atomic():
+            Skill.objects.bulk_update(chunk, ['canonical'])
+        return len(chunk)
@@ -0,0 +1,63 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Max, Min
+from profiles.models import UserProfile
+from profiles.scoring import recompute_chunk, recompute_stale
+
+logger = logging.getLogger(__name__)
+
+def _run_chunk(min_id, max_id):
+    """ Worker thread entry point: score one id range, then release the thread's DB connection. """
+    try:
+        return recompute_chunk(min_id, max_id)
+    finally:
+        connections.close_all()
+
+class Command(BaseCommand):
+    help = 'Recomputes resume strength scores for all users in parallel chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Chunks processed concurrently.')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Profiles per chunk (by id range).')
+        parser.add_argument('--stale', action='store_true',
+                            help='Only rescore profiles whose certification points have lapsed (daily from cron).')
+
+    def handle(self, *args, **options):
+        if options['stale']:
+            scored = recompute_stale(options['chunk_size'])
+            logger.info(f"Rescored {scored} stale resume scores.")
+            self.stdout.write(self.style.SUCCESS(f'--- Rescored {scored} stale resume scores ---'))
+            return
+
+        bounds = UserProfile.objects.aggregate(lo=Min('id'), hi=Max('id'))
+        if bounds['lo'] is None:
+            self.stdout.write(self.style.WARNING('No profiles to score.'))
+            return
+
+        chunk_size = options['chunk_size']
+        chunks = [(lo, lo + chunk_size) for lo in range(bounds['lo'], bounds['hi'] + 1, chunk_size)]
+        self.stdout.write(self.style.SUCCESS(
+            f'--- Scoring profiles in {len(chunks)} chunks with {options["workers"]} workers ---'
+        ))
+        started = time.perf_counter()
+        scored = error_count = 0
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {pool.submit(_run_chunk, lo, hi): (lo, hi) for lo, hi in chunks}
+            for future in as_completed(futures):
+                lo, hi = futures[future]
+                try:
+                    scored += future.result()
+                except Exception as e:
+                    logger.error(f"Error scoring profiles {lo}..{hi - 1}: {e}", exc_info=True)
+                    self.stderr.write(self.style.ERROR(f'! Error scoring profiles {lo}..{hi - 1}: {e}'))
+                    error_count += 1
+
+        elapsed = time.perf_counter() - started
+        summary_msg = (f'Finished resume scoring. Scored: {scored}, Failed chunks: {error_count}, '
+                       f'{elapsed:.2f}s ({scored / elapsed if elapsed else 0:.0f} profiles/s)')
+        logger.info(summary_msg)
+        self.stdout.write(self.style.SUCCESS(f'--- {summary_msg} ---'))
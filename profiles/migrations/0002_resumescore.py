@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 17:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section_scores', models.JSONField(default=dict, help_text='Points per resume section.')),
+                ('total', models.PositiveSmallIntegerField(db_index=True, default=0, help_text='Sum of section scores, out of 100.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='resume_score', to='profiles.userprofile')),
+            ],
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2 on 2026-10-19 17:50
+
+import re
+import unicodedata
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Aliases seeded with the taxonomy: alias -> canonical display name
+SEED_ALIASES = {
+    'js': 'JavaScript', 'ecmascript': 'JavaScript',
+    'ts': 'TypeScript',
+    'py': 'Python', 'python3': 'Python',
+    'postgres': 'PostgreSQL', 'psql': 'PostgreSQL',
+    'k8s': 'Kubernetes',
+    'golang': 'Go',
+    'reactjs': 'React', 'react.js': 'React',
+    'node': 'Node.js', 'nodejs': 'Node.js',
+    'vuejs': 'Vue.js', 'vue': 'Vue.js',
+    'ml': 'Machine Learning',
+    'aws': 'Amazon Web Services',
+    'gcp': 'Google Cloud Platform',
+}
+
+
+def _normalize_skill(name):
+    """ Frozen copy of profiles.skills.normalize_skill() as of this migration. """
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"\s+", ' ', re.sub(r"[^\w+#.\s]+", ' ', text.lower())).strip()
+    return ' '.join(word.rstrip('.') or word for word in text.split())
+
+
+def build_taxonomy(apps, schema_editor):
+    """ One CanonicalSkill per distinct normalized skill name, plus the seed aliases. """
+    db = schema_editor.connection.alias # The database being migrated (migrate --database); the router would send writes to default
+    CanonicalSkill = apps.get_model('profiles', 'CanonicalSkill')
+    SkillAlias = apps.get_model('profiles', 'SkillAlias')
+    Skill = apps.get_model('profiles', 'Skill')
+
+    canonical_ids = {}
+    for name in sorted(set(SEED_ALIASES.values())):
+        key = _normalize_skill(name)
+        canonical_ids[key] = CanonicalSkill.objects.using(db).create(name=name, key=key).pk
+    for alias, name in SEED_ALIASES.items():
+        SkillAlias.objects.using(db).create(alias=alias, canonical_id=canonical_ids[_normalize_skill(name)])
+    aliases = {alias: canonical_ids[_normalize_skill(name)] for alias, name in SEED_ALIASES.items()}
+
+    skills_by_key = {}
+    for pk, name in Skill.objects.using(db).values_list('pk', 'name').iterator():
+        key = _normalize_skill(name)
+        if key:
+            skills_by_key.setdefault(key, (name.strip()[:100], []))[1].append(pk)
+    for key, (name, pks) in skills_by_key.items():
+        canonical_id = canonical_ids.get(key) or aliases.get(key)
+        if canonical_id is None:
+            canonical_id = canonical_ids[key] = CanonicalSkill.objects.using(db).create(name=name, key=key).pk
+        Skill.objects.using(db).filter(pk__in=pks).update(canonical_id=canonical_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_resumescore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('key', models.CharField(blank=True, max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'skill aliases',
+            },
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='canonical',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='profile_skills', to='profiles.canonicalskill'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['canonical', 'profile'], name='profiles_skill_canonical_idx'),
+        ),
+        migrations.AddField(
+            model_name='skillalias',
+            name='canonical',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='profiles.canonicalskill'),
+        ),
+        migrations.RunPython(build_taxonomy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 19:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_normalized_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeTerms',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section_terms', models.JSONField(default=dict, help_text='Terms per resume section.')),
+                ('terms', models.JSONField(default=list, help_text='Union of the section terms.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='resume_terms', to='profiles.userprofile')),
+            ],
+        ),
+    ]
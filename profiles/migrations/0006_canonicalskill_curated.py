@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 20:40
+
+from django.db import migrations, models
+
+# The taxonomy seeded by 0003_skill_taxonomy (keys), curated from the start
+SEEDED_KEYS = [
+    'javascript', 'typescript', 'python', 'postgresql', 'kubernetes', 'go', 'react',
+    'node.js', 'vue.js', 'machine learning', 'amazon web services', 'google cloud platform',
+]
+
+
+def curate_seeded_skills(apps, schema_editor):
+    db = schema_editor.connection.alias # The database being migrated (migrate --database); the router would send writes to default
+    CanonicalSkill = apps.get_model('profiles', 'CanonicalSkill')
+    CanonicalSkill.objects.using(db).filter(key__in=SEEDED_KEYS).update(curated=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0005_resumeterms'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='canonicalskill',
+            name='curated',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(curate_seeded_skills, migrations.RunPython.noop),
+    ]
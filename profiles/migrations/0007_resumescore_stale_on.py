@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-19 22:30
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_expiring_scores_stale(apps, schema_editor):
+    """ Scores stored before stale_on don't know when their certifications lapse: rescore them on next use. """
+    db = schema_editor.connection.alias # The database being migrated (migrate --database); the router would send writes to default
+    ResumeScore = apps.get_model('profiles', 'ResumeScore')
+    Certification = apps.get_model('profiles', 'Certification')
+    expiring = Certification.objects.using(db).filter(expiration_date__isnull=False).values('profile_id')
+    ResumeScore.objects.using(db).filter(profile_id__in=expiring).update(stale_on=timezone.localdate())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0006_canonicalskill_curated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumescore',
+            name='stale_on',
+            field=models.DateField(blank=True, db_index=True, help_text='First day a counted certification has expired; rescored from then on.', null=True),
+        ),
+        migrations.RunPython(mark_expiring_scores_stale, migrations.RunPython.noop),
+    ]
@@ -4,9 +4,10 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from core.models import NormalizedLocation
 
 # User Profile Model: Extends the default Django User model
-class UserProfile(models.Model):
+class UserProfile(NormalizedLocation):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     bio = models.TextField(blank=True, null=True, help_text="A short biography or summary.")
     # --- NEW FIELD for Sprint 3 ---
@@ -58,7 +59,7 @@ class Education(models.Model):
 
 
 # Work Experience Model
-class WorkExperience(models.Model):
+class WorkExperience(NormalizedLocation):
     """
     Stores details about a user's work experience.
     Linked to the UserProfile.
@@ -81,13 +82,56 @@ class WorkExperience(models.Model):
         return f"{self.job_title} at {self.company_name} ({self.profile.user.username})"
 
 
+# Canonical skill taxonomy (see profiles/skills.py)
+class CanonicalSkill(models.Model):
+    """
+    One real-world skill ("JavaScript"), whatever users call it. Profile skills
+    and job postings point here, so "JS", "Javascript" and "javascript" are the same skill.
+    """
+    name = models.CharField(max_length=100) # Display name
+    key = models.CharField(max_length=100, unique=True, blank=True) # Normalized name (profiles.skills.normalize_skill)
+    # Looked for in posting and resume text. Skills users type in are only resolved until an admin curates them.
+    curated = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['name']
+
+    def save(self, *args, **kwargs):
+        from .skills import normalize_skill
+        self.key = normalize_skill(self.key or self.name) # Left blank in the admin: derived from the name
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+class SkillAlias(models.Model):
+    """ Another normalized spelling that resolves to a canonical skill, e.g. "js" -> JavaScript. """
+    alias = models.CharField(max_length=100, unique=True)
+    canonical = models.ForeignKey(CanonicalSkill, on_delete=models.CASCADE, related_name='aliases')
+
+    class Meta:
+        verbose_name_plural = 'skill aliases'
+
+    def save(self, *args, **kwargs):
+        from .skills import normalize_skill
+        self.alias = normalize_skill(self.alias)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.alias} -> {self.canonical_id}"
+
 # Skill Model
 class Skill(models.Model):
     """
     Stores skills associated with a user's profile.
+    `name` is what the user typed; `canonical` is resolved from it on save.
     """
     profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='skills')
     name = models.CharField(max_length=100)
+    canonical = models.ForeignKey(
+        CanonicalSkill, on_delete=models.SET_NULL, null=True, blank=True, editable=False,
+        related_name='profile_skills', db_index=False, # Covered by profiles_skill_canonical_idx
+    )
     # Optional: Add proficiency level if needed later
     # PROFICIENCY_CHOICES = [('Beginner', 'Beginner'), ('Intermediate', 'Intermediate'), ('Advanced', 'Advanced'), ('Expert', 'Expert')]
     # proficiency = models.CharField(max_length=20, choices=PROFICIENCY_CHOICES, blank=True, null=True)
@@ -95,6 +139,18 @@ class Skill(models.Model):
 
     class Meta:
         ordering = ['name'] # Order skills alphabetically
+        indexes = [
+            # Inverted index canonical skill -> profiles; "has X and Y" queries read only this index
+            models.Index(fields=['canonical', 'profile'], name='profiles_skill_canonical_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        from .skills import resolve # An in-memory alias lookup; only unknown skills cost a query
+        self.canonical_id = resolve(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'canonical'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.name} ({self.profile.user.username})"
@@ -150,3 +206,34 @@ class Certification(models.Model):
     def __str__(self):
         return f"{self.name} - {self.issuing_organization} ({self.profile.user.username})"
 
+
+class ResumeScore(models.Model):
+    """
+    Resume strength score for a profile, stored per section so a change to one
+    section only recomputes that section (see profiles/scoring.py).
+    """
+    profile = models.OneToOneField(UserProfile, on_delete=models.CASCADE, related_name='resume_score')
+    section_scores = models.JSONField(default=dict, help_text="Points per resume section.")
+    total = models.PositiveSmallIntegerField(default=0, db_index=True, help_text="Sum of section scores, out of 100.")
+    stale_on = models.DateField(blank=True, null=True, db_index=True,
+                                help_text="First day a counted certification has expired; rescored from then on.")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.total}/100 ({self.profile.user.username})"
+
+
+class ResumeTerms(models.Model):
+    """
+    Normalized words, phrases and canonical skills found in a profile's
+    resume, stored per section like ResumeScore so editing one section only
+    re-extracts that section (see profiles/terms.py). The job keyword gap is
+    a set difference against `terms`.
+    """
+    profile = models.OneToOneField(UserProfile, on_delete=models.CASCADE, related_name='resume_terms')
+    section_terms = models.JSONField(default=dict, help_text="Terms per resume section.")
+    terms = models.JSONField(default=list, help_text="Union of the section terms.")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{len(self.terms)} terms ({self.profile.user.username})"
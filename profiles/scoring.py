@@ -0,0 +1,206 @@
+# profiles/scoring.py
+
+"""
+Resume strength scoring.
+
+The score (out of 100) is the sum of independent section scores. Each
+section is computed with one aggregate query over its own table, and the
+result is stored in ResumeScore.section_scores. When a resume item is saved
+or deleted, only its section is recomputed (see profiles/signals.py).
+
+The same aggregates run grouped by profile for batch recomputes, so scoring
+a chunk of profiles costs one query per section, not one per profile.
+
+Some points lapse without an edit: a certification stops counting the day
+after it expires. ResumeScore.stale_on records the first such day; get_score()
+recomputes a score read on or after it, and `recompute_resume_scores --stale`
+(daily from cron) does the same for scores nobody reads, so rankings by
+total stay current.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+from .models import (
+    UserProfile, Education, WorkExperience, Skill,
+    Project, Award, Certification, ResumeScore
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _score_summary(length):
+    if length >= 300:
+        return 15
+    if length >= 100:
+        return 10
+    return 5 if length else 0
+
+
+def _score_experience(agg):
+    if not agg['entries']:
+        return 0
+    # Up to 10 points for having entries, up to 15 for describing them
+    return round(min(agg['entries'], 3) / 3 * 10 + agg['described'] / agg['entries'] * 15)
+
+
+@dataclass
+class Section:
+    model: type
+    aggregates: callable # () -> dict of aggregate expressions (callable so dates are current)
+    score: callable # (aggregate dict) -> points
+    max_points: int
+    stale_on: callable = None # (aggregate dict) -> first day the points change without an edit, or None
+
+
+def _active_certifications():
+    today = timezone.localdate()
+    return {
+        # Expired certifications don't count
+        'active': Count('id', filter=Q(expiration_date__isnull=True) | Q(expiration_date__gte=today)),
+        'next_expiry': Min('expiration_date', filter=Q(expiration_date__gte=today)),
+    }
+
+
+def _certifications_lapse(agg):
+    return agg['next_expiry'] + timedelta(days=1) if agg['next_expiry'] else None
+
+
+SECTIONS = {
+    'education': Section(
+        Education, lambda: {'entries': Count('id')},
+        lambda agg: 15 if agg['entries'] else 0, 15,
+    ),
+    'experience': Section(
+        WorkExperience,
+        lambda: {'entries': Count('id'), 'described': Count('id', filter=Q(description__gt=''))},
+        _score_experience, 25,
+    ),
+    'skills': Section(
+        Skill, lambda: {'entries': Count('id')},
+        lambda agg: min(agg['entries'], 10) * 2, 20,
+    ),
+    'projects': Section(
+        Project, lambda: {'entries': Count('id')},
+        lambda agg: min(agg['entries'], 2) * 5, 10,
+    ),
+    'awards': Section(
+        Award, lambda: {'entries': Count('id')},
+        lambda agg: 5 if agg['entries'] else 0, 5,
+    ),
+    'certifications': Section(
+        Certification, _active_certifications,
+        lambda agg: min(agg['active'], 2) * 5, 10, _certifications_lapse,
+    ),
+}
+# The summary is scored from the UserProfile row itself, no extra query
+SUMMARY_MAX_POINTS = 15
+
+# Model class -> section name, used by the signal handlers
+SECTION_FOR_MODEL = {section.model: name for name, section in SECTIONS.items()}
+
+
+def _stale_on(dates):
+    return min(filter(None, dates), default=None)
+
+
+def score_section(profile, name):
+    """ (points, first day they lapse or None) for one section of one profile. """
+    if name == 'summary':
+        return _score_summary(len(profile.summary or '')), None
+    section = SECTIONS[name]
+    agg = section.model.objects.filter(profile=profile).aggregate(**section.aggregates())
+    return section.score(agg), section.stale_on(agg) if section.stale_on else None
+
+
+def score_profiles(profiles):
+    """ Scores for many profiles at once: {profile_id: ({section: points}, stale_on)}. """
+    ids = [p.pk for p in profiles]
+    scores = {p.pk: {'summary': _score_summary(len(p.summary or ''))} for p in profiles}
+    lapses = {pk: [] for pk in ids}
+    for name, section in SECTIONS.items():
+        aggregates = section.aggregates()
+        empty = {key: 0 for key in aggregates}
+        rows = {
+            row.pop('profile_id'): row
+            for row in section.model.objects.filter(profile_id__in=ids)
+            .order_by().values('profile_id').annotate(**aggregates)
+        }
+        for pk in ids:
+            agg = rows.get(pk, empty)
+            scores[pk][name] = section.score(agg)
+            if section.stale_on:
+                lapses[pk].append(section.stale_on(agg))
+    return {pk: (scores[pk], _stale_on(lapses[pk])) for pk in ids}
+
+
+def get_score(profile):
+    """
+    Returns the profile's ResumeScore, computing every section if it doesn't
+    exist yet and the sections whose points have lapsed if it is stale.
+    """
+    try:
+        score = profile.resume_score
+    except ResumeScore.DoesNotExist:
+        sections, stale_on = score_profiles([profile])[profile.pk]
+        score, _ = ResumeScore.objects.update_or_create(
+            profile=profile, defaults={'section_scores': sections, 'total': sum(sections.values()), 'stale_on': stale_on},
+        )
+        return score
+    if score.stale_on is not None and score.stale_on <= timezone.localdate():
+        for name, section in SECTIONS.items():
+            if section.stale_on:
+                refresh_section(score, profile, name)
+    return score
+
+
+def update_section(profile, name):
+    """ Recomputes a single section and the total. Profiles never scored are left for get_score(). """
+    score = ResumeScore.objects.filter(profile=profile).first()
+    if score is not None:
+        refresh_section(score, profile, name)
+
+
+def refresh_section(score, profile, name):
+    """ update_section() for an already loaded ResumeScore. """
+    points, stale_on = score_section(profile, name)
+    if name == 'summary' or not SECTIONS[name].stale_on:
+        stale_on = score.stale_on # Only sections that can lapse move the date
+    if score.section_scores.get(name) == points and score.stale_on == stale_on:
+        return
+    score.section_scores[name] = points
+    score.total = sum(score.section_scores.values())
+    score.stale_on = stale_on
+    score.save(update_fields=['section_scores', 'total', 'stale_on', 'updated_at'])
+    logger.debug(f"Resume score for profile {profile.pk}: {name}={points}, total={score.total}")
+
+
+def save_scores(profiles):
+    """ Rescores and stores a list of profiles (loaded with at least id and summary). Returns the number scored. """
+    if not profiles:
+        return 0
+    scores = score_profiles(profiles)
+    ResumeScore.objects.bulk_create(
+        [ResumeScore(profile_id=pk, section_scores=sections, total=sum(sections.values()), stale_on=stale_on)
+         for pk, (sections, stale_on) in scores.items()],
+        update_conflicts=True,
+        unique_fields=['profile'],
+        update_fields=['section_scores', 'total', 'stale_on', 'updated_at'],
+    )
+    return len(profiles)
+
+
+def recompute_chunk(min_id, max_id):
+    """ Rescores every profile with min_id <= id < max_id. Returns the number scored. """
+    return save_scores(list(UserProfile.objects.filter(pk__gte=min_id, pk__lt=max_id).only('id', 'summary')))
+
+
+def recompute_stale(chunk_size=500):
+    """ Rescores every profile whose score has lapsed (stale_on is today or earlier). Returns the number scored. """
+    ids = list(ResumeScore.objects.filter(stale_on__lte=timezone.localdate()).values_list('profile_id', flat=True))
+    scored = 0
+    for start in range(0, len(ids), chunk_size):
+        scored += save_scores(list(UserProfile.objects.filter(pk__in=ids[start:start + chunk_size]).only('id', 'summary')))
+    return scored
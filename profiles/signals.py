@@ -0,0 +1,83 @@
+# profiles/signals.py
+
+"""
+Keeps ResumeScore and ResumeTerms current: when a resume item is saved or
+deleted, only the section it belongs to is rescored and re-extracted. Also invalidates the skill alias map
+(profiles/skills.py) when the taxonomy is edited, and the candidate search
+index (profiles/candidates.py) when what it indexes changes. Connected in
+ProfilesConfig.ready().
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from . import candidates, scoring, skills, terms
+from .models import CanonicalSkill, Education, ResumeScore, ResumeTerms, Skill, SkillAlias, UserProfile
+
+
+def update_section(profile, name):
+    """
+    Rescores and re-extracts one section. Profiles with neither stored yet are
+    left for first use; one query finds out which of the two exist.
+    """
+    stored = (
+        UserProfile.objects.filter(pk=profile.pk)
+        .select_related('resume_score', 'resume_terms').only('id', 'resume_score', 'resume_terms').first()
+    )
+    if stored is None:
+        return
+    try:
+        scoring.refresh_section(stored.resume_score, profile, name)
+    except ResumeScore.DoesNotExist:
+        pass
+    try:
+        terms.refresh_section(stored.resume_terms, profile, name)
+    except ResumeTerms.DoesNotExist:
+        pass
+
+
+@receiver(post_save, sender=UserProfile)
+def profile_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_section(instance, 'summary')
+
+
+def resume_item_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        profile = instance.profile
+    except UserProfile.DoesNotExist:
+        return # Cascade delete of the whole profile
+    update_section(profile, scoring.SECTION_FOR_MODEL[sender])
+
+
+for model in scoring.SECTION_FOR_MODEL:
+    post_save.connect(resume_item_changed, sender=model, dispatch_uid=f'resume_score_{model.__name__}_saved')
+    post_delete.connect(resume_item_changed, sender=model, dispatch_uid=f'resume_score_{model.__name__}_deleted')
+
+
+@receiver(post_save, sender=CanonicalSkill)
+@receiver(post_delete, sender=CanonicalSkill)
+@receiver(post_save, sender=SkillAlias)
+@receiver(post_delete, sender=SkillAlias)
+def skill_taxonomy_changed(sender, instance, raw=False, created=False, **kwargs):
+    """
+    Other processes rebuild their alias map. Not for an uncurated skill a user
+    just typed (skills.resolve()): it isn't matched in text, and the others
+    look it up on first use rather than every process reloading the map.
+    """
+    if raw or (sender is CanonicalSkill and created and not instance.curated):
+        return
+    transaction.on_commit(skills.invalidate_aliases)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+def candidate_data_changed(sender, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(candidates.invalidate)
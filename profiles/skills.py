@@ -0,0 +1,242 @@
+# profiles/skills.py
+
+"""
+Canonical skill taxonomy and the skill inverted indexes.
+
+What a user types as a skill ("JS", "Javascript ", "javascript") is
+normalized and resolved to one CanonicalSkill through an in-memory alias map
+{normalized name or alias: canonical id}. Resolution happens once, when the
+Skill row is saved, so reads never compare free text.
+
+Two inverted indexes hang off CanonicalSkill:
+  Skill(canonical, profile)        profiles_skill_canonical_idx
+  JobPostingSkill(skill, posting)  jobs_postingskill_unique
+"Profiles with X and Y" is a GROUP BY over the index entries for X and Y
+(HAVING all of them present): an index-only intersection, no text scan.
+
+The alias map is built lazily per process and rebuilt when the version
+counter in the cache moves. Every committed change to CanonicalSkill or
+SkillAlias bumps it (see profiles/signals.py), except a new skill created by
+resolve() for a name nobody has used before: other processes find that one
+in the database on their first miss instead of all reloading the map.
+
+Free text (posting titles and descriptions, resume prose) is only matched
+against curated skills (CanonicalSkill.curated: the seeded taxonomy plus
+whatever admins mark), and never on a single everyday word from
+AMBIGUOUS_MENTIONS: "go" and "node" mean Go and Node.js as profile skills,
+but not in "ready to go" or "a node in the graph". Their unambiguous
+spellings ("golang", "node.js") still match.
+"""
+
+import logging
+import threading
+import time
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.utils.html import strip_tags
+from jobs.suggest import normalize
+from .models import CanonicalSkill, Skill, SkillAlias
+
+logger = logging.getLogger(__name__)
+
+ALIAS_VERSION_KEY = 'profiles:skill_alias_version'
+MAX_MENTION_WORDS = 3 # Longest multi-word skill looked for in posting text ("google cloud platform")
+AMBIGUOUS_MENTIONS = frozenset({'go', 'node', 'r', 'c', 'rust', 'swift', 'spring', 'express', 'dart'})
+
+_alias_map = {}
+_alias_map_version = None
+_canonical = {} # {canonical id: (key, display name)}, loaded with the alias map
+_mention_ids = {} # {normalized name or alias: canonical id} matched in free text, ditto
+_mention_keys = {} # The same names -> canonical key
+_lock = threading.Lock()
+
+
+def normalize_skill(name):
+    """ normalize() from job search, minus sentence punctuation: "Python." -> "python", ".NET" -> ".net". """
+    return ' '.join(word.rstrip('.') or word for word in normalize(name).split())
+
+
+def _alias_version():
+    version = cache.get(ALIAS_VERSION_KEY)
+    if version is None:
+        # Not 1: if the key is evicted, restarting from a fresh value still forces a rebuild
+        cache.add(ALIAS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(ALIAS_VERSION_KEY)
+    return version
+
+
+def invalidate_aliases():
+    try:
+        cache.incr(ALIAS_VERSION_KEY)
+    except ValueError:
+        cache.set(ALIAS_VERSION_KEY, time.time_ns(), None) # Evicted: a fresh value, never one a process already saw
+
+
+def alias_map():
+    """ {normalized name or alias: canonical id}, rebuilt when the taxonomy changed. """
+    global _alias_map, _alias_map_version, _canonical, _mention_ids, _mention_keys
+    version = _alias_version()
+    if version != _alias_map_version:
+        with _lock:
+            if version != _alias_map_version:
+                rows = list(CanonicalSkill.objects.values_list('key', 'id', 'name', 'curated'))
+                canonical = {pk: (key, name) for key, pk, name, _ in rows}
+                curated = {pk for _, pk, _, is_curated in rows if is_curated}
+                mapping = {key: pk for pk, (key, _) in canonical.items()}
+                mapping.update(SkillAlias.objects.values_list('alias', 'canonical_id'))
+                _mention_ids = {
+                    alias: pk for alias, pk in mapping.items() if pk in curated and alias not in AMBIGUOUS_MENTIONS
+                }
+                _mention_keys = {alias: canonical[pk][0] for alias, pk in _mention_ids.items()}
+                _alias_map, _alias_map_version, _canonical = mapping, version, canonical
+                logger.info(f"Loaded skill alias map: {len(mapping)} names (version {version}).")
+    return _alias_map
+
+
+def reset_alias_map():
+    """ Drops this process's map; the next lookup reloads it. """
+    global _alias_map, _alias_map_version, _canonical, _mention_ids, _mention_keys
+    with _lock:
+        _alias_map, _alias_map_version, _canonical, _mention_ids, _mention_keys = {}, None, {}, {}, {}
+
+
+def mention_keys():
+    """ {normalized name or alias: canonical key} of the skills looked for in free text, e.g. "k8s" -> "kubernetes". """
+    alias_map()
+    return _mention_keys
+
+
+def display_name(key):
+    """ The canonical skill's name for a canonical key ("javascript" -> "JavaScript"), else the key itself. """
+    alias_map()
+    pk = _alias_map.get(key)
+    return _canonical[pk][1] if pk in _canonical and _canonical[pk][0] == key else key
+
+
+def _remember(key, canonical_id, name):
+    """ Adds an uncurated skill to this process's map (it is never matched in free text). """
+    global _alias_map, _canonical
+    with _lock:
+        # Copy-on-write; readers never see a half-updated dict
+        _alias_map = {**_alias_map, key: canonical_id}
+        _canonical = {**_canonical, canonical_id: (key, name)}
+
+
+def resolve(name, create=True):
+    """
+    Canonical skill id for a typed skill name. Unknown names become a new
+    CanonicalSkill when create is True, else resolve to None.
+    """
+    key = normalize_skill(name)
+    if not key:
+        return None
+    canonical_id = alias_map().get(key)
+    if canonical_id is not None:
+        return canonical_id
+    if not create:
+        # Perhaps created by another process since this map was loaded (that doesn't invalidate it)
+        row = CanonicalSkill.objects.filter(key=key).values_list('id', 'name').first()
+        if row is not None:
+            _remember(key, *row)
+        return row[0] if row is not None else None
+    try:
+        with transaction.atomic():
+            canonical, _ = CanonicalSkill.objects.get_or_create(key=key, defaults={'name': name.strip()[:100]})
+    except IntegrityError: # Another request created it first
+        canonical = CanonicalSkill.objects.get(key=key)
+    # Only once committed: a rolled back row must not stay in the map
+    transaction.on_commit(lambda: _remember(key, canonical.pk, canonical.name))
+    return canonical.pk
+
+
+def resolve_many(names, create=False):
+    """ Canonical ids for several names; unknown names are dropped unless create is True. """
+    ids = {resolve(name, create=create) for name in names}
+    ids.discard(None)
+    return ids
+
+
+def mentioned_skills(text):
+    """ Canonical ids of every curated skill (or alias) named in text, up to MAX_MENTION_WORDS words long. """
+    alias_map()
+    mapping = _mention_ids
+    words = normalize_skill(strip_tags(text or '')).split()
+    found = set()
+    for start in range(len(words)):
+        for length in range(1, MAX_MENTION_WORDS + 1):
+            if start + length > len(words):
+                break
+            canonical_id = mapping.get(' '.join(words[start:start + length]))
+            if canonical_id is not None:
+                found.add(canonical_id)
+    return found
+
+
+def posting_skills(posting):
+    return mentioned_skills(posting.title) | mentioned_skills(posting.description)
+
+
+def index_postings(postings):
+    """ (Re)builds the JobPostingSkill rows for the given postings. """
+    from jobs.models import JobPostingSkill
+    postings = [p for p in postings if p.pk]
+    if not postings:
+        return
+    rows = [JobPostingSkill(skill_id=skill_id, posting_id=p.pk) for p in postings for skill_id in posting_skills(p)]
+    with transaction.atomic():
+        JobPostingSkill.objects.filter(posting_id__in=[p.pk for p in postings]).delete()
+        JobPostingSkill.objects.bulk_create(rows, batch_size=2000)
+
+
+def _skill_ids(names, match_all):
+    """ Canonical ids for names, or None when match_all and some name isn't a known skill (nothing can match). """
+    ids = [resolve(name, create=False) for name in names]
+    if match_all and None in ids:
+        return None
+    return {i for i in ids if i is not None} or None
+
+
+def _intersect(queryset, owner, skill_field, skill_ids, match_all):
+    """ Owner ids from an inverted index queryset having all (or any) of skill_ids. """
+    # order_by(): the model's default ordering would end up in the GROUP BY
+    queryset = queryset.filter(**{f'{skill_field}__in': skill_ids}).order_by().values(owner)
+    if match_all:
+        # distinct: a profile may list two spellings of the same skill
+        queryset = queryset.annotate(matched=Count(skill_field, distinct=True)).filter(matched=len(skill_ids))
+    else:
+        queryset = queryset.distinct()
+    return queryset.values_list(owner, flat=True)
+
+
+def profiles_with_skills(names, match_all=True):
+    """
+    Profile ids having all (or any) of the named skills. A lazy queryset, so it
+    can be used as a subquery: UserProfile.objects.filter(pk__in=profiles_with_skills([...])).
+    """
+    skill_ids = _skill_ids(names, match_all)
+    if skill_ids is None:
+        return Skill.objects.none().values_list('profile_id', flat=True)
+    return _intersect(Skill.objects.all(), 'profile_id', 'canonical_id', skill_ids, match_all)
+
+
+def postings_with_skills(names, match_all=True):
+    """ Job posting ids mentioning all (or any) of the named skills; same rules as profiles_with_skills(). """
+    from jobs.models import JobPostingSkill
+    skill_ids = _skill_ids(names, match_all)
+    if skill_ids is None:
+        return JobPostingSkill.objects.none().values_list('posting_id', flat=True)
+    return _intersect(JobPostingSkill.objects.all(), 'posting_id', 'skill_id', skill_ids, match_all)
+
+
+def matching_postings(profile, limit=20):
+    """ [(posting_id, shared skill count)] for postings sharing the most skills with a profile. """
+    from jobs.models import JobPostingSkill
+    skill_ids = Skill.objects.filter(profile=profile, canonical__isnull=False).values('canonical_id')
+    rows = (
+        JobPostingSkill.objects.filter(skill_id__in=skill_ids)
+        .values('posting_id').annotate(shared=Count('pk'))
+        .order_by('-shared', '-posting_id')[:limit]
+    )
+    return [(row['posting_id'], row['shared']) for row in rows]
+
@@ -0,0 +1,115 @@
+# profiles/terms.py
+
+"""
+The resume side of the job keyword gap.
+
+A profile's resume terms are every run of content words in its resume (up
+to MAX_PHRASE_WORDS words, all sub-phrases included) plus the canonical key
+of every curated skill it names, normalized like posting key phrases
+(jobs/keyphrases.py). A posting phrase the resume doesn't contain is a gap:
+    missing = posting.key_phrases - resume terms
+
+Terms are stored per section in ResumeTerms. When a resume item is saved or
+deleted only its section is re-extracted (see profiles/signals.py), with one
+query over that section's table. A first extraction runs the same queries
+grouped by profile (terms_for_profiles), one per section.
+"""
+
+import logging
+from collections import defaultdict
+from jobs.keyphrases import chunks, ngrams, runs, skill_mentions
+from . import skills
+from .models import (
+    Education, WorkExperience, Skill,
+    Project, Award, Certification, ResumeTerms
+)
+
+logger = logging.getLogger(__name__)
+
+# Section -> (model, text fields). The summary comes from the UserProfile row itself.
+SECTIONS = {
+    'experience': (WorkExperience, ('job_title', 'description')),
+    'skills': (Skill, ('name',)),
+    'projects': (Project, ('name', 'description')),
+    'education': (Education, ('degree', 'field_of_study', 'description')),
+    'certifications': (Certification, ('name',)),
+    'awards': (Award, ('title', 'description')),
+}
+SUMMARY_FIELDS = ('summary', 'bio')
+
+# Model class -> section name, used by the signal handlers
+SECTION_FOR_MODEL = {model: name for name, (model, _) in SECTIONS.items()}
+
+
+def text_terms(texts, skill_terms=None):
+    """ Sorted terms of some resume texts: their content-word phrases and the canonical skills they name. """
+    if skill_terms is None:
+        skill_terms = skills.mention_keys()
+    terms = set()
+    for text in texts:
+        for words in chunks(text):
+            terms.update(skill_mentions(words, skill_terms))
+            for run in runs(words):
+                terms.update(ngrams(run))
+    return sorted(terms)
+
+
+def _summary_terms(profile, skill_terms=None):
+    return text_terms((getattr(profile, field) for field in SUMMARY_FIELDS), skill_terms)
+
+
+def section_terms(profile, name):
+    """ Terms of one section of one profile. """
+    if name == 'summary':
+        return _summary_terms(profile)
+    model, fields = SECTIONS[name]
+    rows = model.objects.filter(profile=profile).values_list(*fields)
+    return text_terms(value for row in rows for value in row)
+
+
+def terms_for_profiles(profiles):
+    """ Section terms for many profiles at once: {profile_id: {section: [terms]}}. """
+    skill_terms = skills.mention_keys()
+    ids = [p.pk for p in profiles]
+    sections = {p.pk: {'summary': _summary_terms(p, skill_terms)} for p in profiles}
+    for name, (model, fields) in SECTIONS.items():
+        texts = defaultdict(list)
+        for profile_id, *values in model.objects.filter(profile_id__in=ids).values_list('profile_id', *fields):
+            texts[profile_id].extend(values)
+        for pk in ids:
+            sections[pk][name] = text_terms(texts[pk], skill_terms)
+    return sections
+
+
+def _union(section_terms):
+    return sorted({term for terms in section_terms.values() for term in terms})
+
+
+def get_terms(profile):
+    """ Returns the profile's ResumeTerms, extracting every section if it doesn't exist yet. """
+    try:
+        return profile.resume_terms
+    except ResumeTerms.DoesNotExist:
+        sections = terms_for_profiles([profile])[profile.pk]
+        terms, _ = ResumeTerms.objects.update_or_create(
+            profile=profile, defaults={'section_terms': sections, 'terms': _union(sections)},
+        )
+        return terms
+
+
+def update_section(profile, name):
+    """ Re-extracts a single section and the union. Profiles never extracted are left for get_terms(). """
+    stored = ResumeTerms.objects.filter(profile=profile).first()
+    if stored is not None:
+        refresh_section(stored, profile, name)
+
+
+def refresh_section(stored, profile, name):
+    """ update_section() for an already loaded ResumeTerms. """
+    terms = section_terms(profile, name)
+    if stored.section_terms.get(name) == terms:
+        return
+    stored.section_terms[name] = terms
+    stored.terms = _union(stored.section_terms)
+    stored.save(update_fields=['section_terms', 'terms', 'updated_at'])
+    logger.debug(f"Resume terms for profile {profile.pk}: {name} has {len(terms)}, {len(stored.terms)} in total")
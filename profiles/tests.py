@@ -1,3 +1,363 @@
-from django.test import TestCase
+import random
+from array import array
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.admin import BoundedInlineFormSet
+from jobs.models import JobPosting
+
+from . import candidates, scoring, skills, terms
+from .models import CanonicalSkill, Certification, Education, ResumeScore, ResumeTerms, Skill, WorkExperience
+
+
+class UserProfileAdminTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        cls.candidate = User.objects.create(username='candidate')
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+        self.url = reverse('admin:profiles_userprofile_change', args=[self.candidate.profile.pk])
+
+    def _add(self, n):
+        profile = self.candidate.profile
+        Skill.objects.bulk_create([Skill(profile=profile, name=f'Skill {i}') for i in range(n)])
+        Education.objects.bulk_create([
+            Education(profile=profile, institution_name=f'School {i}', degree='BSc', start_date=date(2020, 1, 1)) for i in range(n)
+        ])
+
+    def test_change_page_queries_do_not_grow_with_resume_items(self):
+        self._add(2)
+        self.client.get(self.url) # Warms the content type cache
+        # Session, user, profile, its user, the user widget label, section counts, one query per inline
+        with self.assertNumQueries(12):
+            self.client.get(self.url)
+        self._add(30)
+        with self.assertNumQueries(12):
+            response = self.client.get(self.url)
+        education_inline = response.context['inline_admin_formsets'][0]
+        self.assertEqual(len(education_inline.formset.forms), BoundedInlineFormSet.max_shown)
+        self.assertContains(response, 'Skills: 32</a>')
+
+
+class OwnerScopedViewTests(TestCase):
+    """ Edit/delete views load the object once, already filtered by owner. """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create(username='owner')
+        cls.other = User.objects.create(username='other')
+
+    def setUp(self):
+        self.client.force_login(self.owner)
+
+    def _education(self, user):
+        return Education.objects.create(profile=user.profile, institution_name='School', degree='BSc',
+                                        start_date=date(2020, 1, 1))
+
+    def test_delete_loads_object_once(self):
+        skill = Skill.objects.create(profile=self.owner.profile, name='Python')
+        # Session, user, skill joined with its profile, DELETE, then the signal handlers
+        # (resume score, dashboard). Was 11 with the test_func ownership check.
+        with self.assertNumQueries(6):
+            response = self.client.post(reverse('profiles:delete_skill', args=[skill.pk]))
+        self.assertRedirects(response, reverse('profiles:profile_detail'), fetch_redirect_response=False)
+        self.assertFalse(Skill.objects.filter(pk=skill.pk).exists())
+
+    def test_edit_loads_object_once(self):
+        education = self._education(self.owner)
+        data = {'institution_name': 'University', 'degree': 'BSc', 'start_date': '2020-01-01'}
+        with self.assertNumQueries(6): # Was 10
+            self.client.post(reverse('profiles:edit_education', args=[education.pk]), data)
+        education.refresh_from_db()
+        self.assertEqual(education.institution_name, 'University')
+
+    def test_other_users_objects_are_not_found(self):
+        education = self._education(self.other)
+        for name in ('profiles:edit_education', 'profiles:delete_education'):
+            with self.assertNumQueries(3):
+                response = self.client.post(reverse(name, args=[education.pk]))
+            self.assertEqual(response.status_code, 404)
+        self.assertTrue(Education.objects.filter(pk=education.pk).exists())
+
+
+class SkillTaxonomyTests(TestCase):
+    """ Aliases come from the seed in migration 0003 (js, k8s, postgres, ...). """
+
+    def setUp(self):
+        cache.clear() # Fresh alias map version, so the map is reloaded from this test's data
+        self.user = User.objects.create_user('dev', password='pw')
+        self.profile = self.user.profile
+        with self.captureOnCommitCallbacks(execute=True):
+            CanonicalSkill.objects.create(name='Django', curated=True)
+
+    def tearDown(self):
+        skills.reset_alias_map() # The map may now hold ids from this test's rolled back rows
+
+    def _posting(self, title, n=0):
+        return JobPosting.objects.create(
+            title=title, description='', company_name='Acme', source='test', job_url=f'https://example.com/{n}',
+        )
+
+    def test_spellings_resolve_to_one_canonical_skill(self):
+        self.assertEqual(skills.normalize_skill('  JavaScript. '), 'javascript')
+        ids = {skills.resolve(name) for name in ('JS', 'Javascript ', 'javascript', 'ECMAScript')}
+        self.assertEqual(len(ids), 1)
+        self.assertIsNone(skills.resolve('Fortran 77', create=False))
+
+    def test_skill_rows_store_their_canonical_skill(self):
+        skill = Skill.objects.create(profile=self.profile, name='k8s')
+        self.assertEqual(skill.canonical.name, 'Kubernetes')
+
+    def test_add_skill_view_treats_aliases_as_duplicates(self):
+        self.client.force_login(self.user)
+        self.client.post(reverse('profiles:add_skill'), {'name': 'PostgreSQL'})
+        self.client.post(reverse('profiles:add_skill'), {'name': 'postgres'})
+        self.assertEqual(list(self.profile.skills.values_list('name', flat=True)), ['PostgreSQL'])
+
+    def test_profiles_with_skills_intersects_the_index(self):
+        other = User.objects.create_user('other').profile
+        for profile, names in ((self.profile, ['Python', 'django']), (other, ['py'])):
+            for name in names:
+                Skill.objects.create(profile=profile, name=name)
+        self.assertEqual(list(skills.profiles_with_skills(['python', 'Django'])), [self.profile.pk])
+        self.assertCountEqual(skills.profiles_with_skills(['Python', 'Django'], match_all=False), [self.profile.pk, other.pk])
+        self.assertEqual(list(skills.profiles_with_skills(['Python', 'Cobol'])), [])
+
+    def test_postings_are_indexed_by_the_skills_they_mention(self):
+        match = self._posting('Senior Python / Django developer', 1)
+        other = self._posting('Django designer', 2)
+        self.assertEqual(list(skills.postings_with_skills(['py', 'django'])), [match.pk])
+
+        Skill.objects.create(profile=self.profile, name='Python')
+        Skill.objects.create(profile=self.profile, name='Django')
+        self.assertEqual(skills.matching_postings(self.profile), [(match.pk, 2), (other.pk, 1)])
+
+    def test_text_only_matches_curated_unambiguous_skills(self):
+        go, node = skills.resolve('Go'), skills.resolve('Node.js')
+        self.assertEqual(skills.mentioned_skills('Ready to go? Every node in the graph counts.'), set())
+        self.assertEqual(skills.mentioned_skills('Golang and Node.js services'), {go, node})
+        # A skill users typed in resolves, but isn't looked for in postings
+        Skill.objects.create(profile=self.profile, name='Leadership')
+        self.assertIsNotNone(skills.resolve('leadership', create=False))
+        self.assertEqual(skills.mentioned_skills('Leadership of a Django team'), {skills.resolve('django')})
+
+    def test_user_created_skills_do_not_invalidate_the_shared_map(self):
+        version = cache.get(skills.ALIAS_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = Skill.objects.create(profile=self.profile, name='Fortran 77')
+        self.assertEqual(cache.get(skills.ALIAS_VERSION_KEY), version)
+        skills.reset_alias_map() # Another process: finds it in the database on first use
+        self.assertEqual(skills.resolve('fortran 77', create=False), skill.canonical_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CanonicalSkill.objects.filter(pk=skill.canonical_id).get().save() # e.g. curated in the admin
+        self.assertNotEqual(cache.get(skills.ALIAS_VERSION_KEY), version)
+
+    def test_evicted_alias_version_is_not_restarted_at_a_fixed_value(self):
+        skills.alias_map()
+        cache.delete(skills.ALIAS_VERSION_KEY) # Evicted, then a curator edits the taxonomy
+        skills.invalidate_aliases()
+        first = cache.get(skills.ALIAS_VERSION_KEY)
+        cache.delete(skills.ALIAS_VERSION_KEY)
+        skills.invalidate_aliases()
+        self.assertNotEqual(cache.get(skills.ALIAS_VERSION_KEY), first)
+
+
+class CandidateSearchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        candidates.reset()
+        self.people = {}
+        with self.captureOnCommitCallbacks(execute=True): # New skills (Django) join the alias map on commit
+            for username, location, skill_names, degree in (
+                ('ana', 'Berlin, Germany', ['Python', 'Django'], 'Bachelor of Science'),
+                ('ben', 'Munich, Germany', ['JS', 'Python'], 'Master of Science'),
+                ('cho', 'London, UK', ['python', 'k8s'], 'Bachelor of Science'),
+            ):
+                profile = User.objects.create_user(username).profile
+                profile.location = location
+                profile.save()
+                for name in skill_names:
+                    Skill.objects.create(profile=profile, name=name)
+                Education.objects.create(profile=profile, institution_name='Uni', degree=degree, start_date=date(2015, 1, 1))
+                self.people[username] = profile
+
+    def tearDown(self):
+        candidates.reset()
+        skills.reset_alias_map()
+
+    def _names(self, **criteria):
+        total, profiles = candidates.search_candidates(**criteria)
+        self.assertEqual(total, len(profiles))
+        return [profile.user.username for profile in profiles]
+
+    def test_criteria_are_intersected(self):
+        self.assertEqual(self._names(skills=['py', 'Django']), ['ana'])
+        self.assertEqual(self._names(skills=['Python'], locations=['germany']), ['ben', 'ana']) # Newest first
+        self.assertEqual(self._names(skills=['Python'], degrees=['bachelor of science'], locations=['London, UK']), ['cho'])
+        self.assertEqual(self._names(skills=['Python', 'Haskell']), [])
+
+    def test_match_any_and_location_alternatives(self):
+        self.assertEqual(self._names(skills=['javascript', 'kubernetes'], match_any=True), ['cho', 'ben'])
+        self.assertEqual(self._names(locations=['Berlin', 'London']), ['cho', 'ana'])
+        self.assertEqual(self._names(locations=['München']), ['ben']) # Gazetteer alias of Munich
+
+    def test_only_the_requested_page_is_loaded(self):
+        total, profiles = candidates.search_candidates(skills=['Python'], page=2, per_page=2)
+        self.assertEqual((total, [p.user.username for p in profiles]), (3, ['ana']))
+        candidates.get_index() # Built already; the page itself is two queries (profiles + skills)
+        with self.assertNumQueries(2):
+            candidates.search_candidates(skills=['Python'], page=1, per_page=2)
+
+    def test_sparse_values_behave_like_bitmaps(self):
+        with mock.patch.object(candidates, 'SPARSE_RATIO', 1):
+            candidates.reset()
+            dense = self._names(skills=['Python'], locations=['Germany'])
+        with mock.patch.object(candidates, 'SPARSE_RATIO', 10**9):
+            candidates.reset()
+            self.assertEqual(self._names(skills=['Python'], locations=['Germany']), dense)
+
+    def test_ids_are_read_from_bitmaps_and_sparse_arrays_in_order(self):
+        ids = sorted(random.Random(1).sample(range(100_000), 500)) + [300_000] # Gap wider than a window
+        bitmap = candidates._bitmap(ids, 300_001)
+        self.assertEqual(list(candidates.iter_ids(bitmap)), ids[::-1])
+        self.assertEqual(list(candidates.iter_ids(bitmap, newest_first=False)), ids)
+        self.assertEqual(list(candidates._intersect(array('q', ids[::3]), bitmap)), ids[::3])
+        self.assertEqual(list(candidates._intersect(array('q', ids[::2]), array('q', ids[::3]))), ids[::6])
+        self.assertEqual(list(candidates.iter_ids(array('q', ids))), ids[::-1])
+
+    def test_search_view_is_staff_only(self):
+        self.client.force_login(self.people['ana'].user)
+        response = self.client.get(reverse('profiles:candidate_search'), {'skills': 'Python'})
+        self.assertEqual(response.status_code, 403)
+
+
+class ResumeTermsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.profile = User.objects.create_user('dev').profile
+
+    def tearDown(self):
+        skills.reset_alias_map()
+
+    def _terms(self):
+        return set(ResumeTerms.objects.get(profile=self.profile).terms)
+
+    def test_sections_update_when_they_change(self):
+        self.assertEqual(terms.get_terms(self.profile).terms, [])
+        Skill.objects.create(profile=self.profile, name='k8s')
+        self.assertIn('kubernetes', self._terms()) # Canonical key, so "Kubernetes" in a posting matches
+        job = WorkExperience.objects.create(profile=self.profile, job_title='Data Engineer', company_name='Acme',
+                                            start_date=date(2020, 1, 1), description='Built streaming pipelines.')
+        self.assertTrue({'data engineer', 'streaming pipelines', 'pipelines'} <= self._terms())
+        self.profile.summary = 'Machine learning enthusiast'
+        self.profile.save()
+        self.assertIn('machine learning', self._terms())
+
+        job.delete()
+        stored = ResumeTerms.objects.get(profile=self.profile)
+        self.assertEqual(stored.section_terms['experience'], [])
+        self.assertNotIn('streaming pipelines', stored.terms)
+        self.assertIn('kubernetes', stored.terms)
+
+
+class ResumeScoreTests(TestCase):
+
+    def setUp(self):
+        self.profile = User.objects.create_user('dev').profile
+
+    def _certify(self, name, expires=None):
+        return Certification.objects.create(profile=self.profile, name=name, issuing_organization='Cloud Inc',
+                                            issue_date=date(2020, 1, 1), expiration_date=expires)
+
+    def test_sections_are_rescored_as_they_change(self):
+        score = scoring.get_score(self.profile)
+        self.assertEqual(score.total, 0)
+        self.assertEqual(set(score.section_scores), {'summary', *scoring.SECTIONS})
+
+        Skill.objects.create(profile=self.profile, name='Python')
+        job = WorkExperience.objects.create(profile=self.profile, job_title='Engineer', company_name='Acme',
+                                            start_date=date(2020, 1, 1), description='Shipped things.')
+        self.profile.summary = 'x' * 120
+        self.profile.save()
+        score.refresh_from_db()
+        self.assertEqual(score.section_scores['skills'], 2)
+        self.assertEqual(score.section_scores['experience'], 18) # One of three entries, described
+        self.assertEqual(score.section_scores['summary'], 10)
+        self.assertEqual(score.total, 30)
+
+        job.delete()
+        score.refresh_from_db()
+        self.assertEqual((score.section_scores['experience'], score.total), (0, 12))
+
+    def test_unscored_profiles_are_left_for_first_use(self):
+        Skill.objects.create(profile=self.profile, name='Python')
+        self.assertFalse(ResumeScore.objects.exists())
+
+    def test_expired_certifications_lapse_without_an_edit(self):
+        today = timezone.localdate()
+        self._certify('Cloud Architect', expires=today)
+        self._certify('Ancient', expires=today - timedelta(days=1))
+        self._certify('Lifetime')
+        score = scoring.get_score(self.profile)
+        self.assertEqual(score.section_scores['certifications'], 10)
+        self.assertEqual(score.stale_on, today + timedelta(days=1))
+
+        # Same day: the stored score is used as is
+        profile = type(self.profile).objects.select_related('resume_score').get(pk=self.profile.pk)
+        with self.assertNumQueries(0):
+            scoring.get_score(profile)
+
+        with mock.patch.object(timezone, 'localdate', return_value=today + timedelta(days=1)):
+            profile = type(self.profile).objects.select_related('resume_score').get(pk=self.profile.pk)
+            score = scoring.get_score(profile)
+        self.assertEqual(score.section_scores['certifications'], 5)
+        self.assertIsNone(score.stale_on) # Nothing left that expires
+        score.refresh_from_db()
+        self.assertEqual(score.section_scores['certifications'], 5)
+
+    def test_recompute_stale_only_touches_lapsed_scores(self):
+        today = timezone.localdate()
+        self._certify('Cloud Architect', expires=today)
+        scoring.get_score(self.profile)
+        other = User.objects.create_user('other').profile
+        scoring.get_score(other)
+
+        with mock.patch.object(timezone, 'localdate', return_value=today + timedelta(days=1)):
+            out = StringIO()
+            call_command('recompute_resume_scores', '--stale', stdout=out)
+        self.assertIn('Rescored 1 stale resume scores', out.getvalue())
+        score = ResumeScore.objects.get(profile=self.profile)
+        self.assertEqual((score.section_scores['certifications'], score.stale_on), (0, None))
+
+
+class RecomputeResumeScoresTests(TransactionTestCase):
+    """
+    The command scores chunks on worker threads, each with its own connection:
+    needs committed rows. One worker, since the threads would lock each other
+    out of the shared in-memory SQLite database.
+    """
+
+    def test_every_profile_is_scored(self):
+        profiles = [User.objects.create_user(f'user{i}').profile for i in range(5)]
+        Skill.objects.create(profile=profiles[0], name='Python')
+        ResumeScore.objects.create(profile=profiles[1], section_scores={'skills': 20}, total=99) # Out of date
+
+        out = StringIO()
+        call_command('recompute_resume_scores', '--workers', '1', '--chunk-size', '2', stdout=out)
+        self.assertIn('Scored: 5, Failed chunks: 0', out.getvalue())
+        totals = dict(ResumeScore.objects.values_list('profile_id', 'total'))
+        self.assertEqual(totals, {p.pk: 2 if p == profiles[0] else 0 for p in profiles})
@@ -31,4 +31,7 @@ urlpatterns = [
     path('certification/<int:pk>/edit/', views.EditCertificationView.as_view(), name='edit_certification'),
     path('certification/<int:pk>/delete/', views.DeleteCertificationView.as_view(), name='delete_certification'),
     # --- End NEW URLs ---
+
+    # Employer candidate search
+    path('candidates/', views.CandidateSearchView.as_view(), name='candidate_search'),
 ]
\ No newline at end of file
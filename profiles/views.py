@@ -5,6 +5,7 @@ from django.urls import reverse_lazy, reverse
 from django.views.generic import DetailView, UpdateView, CreateView, DeleteView, View
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
+from core.mixins import OwnerScopedMixin
 
 # --- Corrected Model Imports ---
 # Import ALL models used in this file
@@ -12,12 +13,15 @@ from .models import (
     UserProfile, Education, WorkExperience, Skill,
     Project, Award, Certification # <-- Added Project, Award, Certification
 )
+from . import candidates, skills
+from .scoring import get_score
 
 # --- Corrected Form Imports ---
 # Import ALL forms used in this file
 from .forms import (
     UserProfileForm, EducationForm, WorkExperienceForm, SkillForm,
-    ProjectForm, AwardForm, CertificationForm #<-- Added ProjectForm, AwardForm, CertificationForm
+    ProjectForm, AwardForm, CertificationForm, #<-- Added ProjectForm, AwardForm, CertificationForm
+    CandidateSearchForm
 )
 
 # --- ProfileView (Updated for Sprint 3 context) ---
@@ -57,6 +61,8 @@ class ProfileView(LoginRequiredMixin, View):
             'project_list': profile.projects.all(),
             'award_list': profile.awards.all(),
             'certification_list': profile.certifications.all(),
+            # Stored per-section score; only recomputed when a section changes
+            'resume_score': get_score(profile),
         }
         return render(request, self.template_name, context)
 
@@ -93,6 +99,7 @@ class ProfileView(LoginRequiredMixin, View):
                 'project_list': profile.projects.all(),
                 'award_list': profile.awards.all(),
                 'certification_list': profile.certifications.all(),
+                'resume_score': get_score(profile),
             }
             messages.error(request, 'Please correct the errors in the profile section.')
             return render(request, self.template_name, context)
@@ -116,8 +123,9 @@ class AddEducationView(LoginRequiredMixin, CreateView):
         messages.success(self.request, 'Education added successfully!')
         return super().form_valid(form)
 
-class EditEducationView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class EditEducationView(LoginRequiredMixin, OwnerScopedMixin, UpdateView):
     model = Education
+    owner_field = 'profile__user'
     form_class = EducationForm
     template_name = 'profiles/add_edit_form.html'
     success_url = reverse_lazy('profiles:profile_detail')
@@ -127,15 +135,13 @@ class EditEducationView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         context['form_title'] = 'Edit Education'
         return context
 
-    def test_func(self):
-        return self.request.user == self.get_object().profile.user
-
     def form_valid(self, form):
         messages.success(self.request, 'Education updated successfully!')
         return super().form_valid(form)
 
-class DeleteEducationView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class DeleteEducationView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
     model = Education
+    owner_field = 'profile__user'
     template_name = 'profiles/delete_confirm.html'
     success_url = reverse_lazy('profiles:profile_detail')
 
@@ -144,9 +150,6 @@ class DeleteEducationView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         context['confirm_message'] = f"Are you sure you want to delete this education entry: {self.object.degree} at {self.object.institution_name}?"
         return context
 
-    def test_func(self):
-        return self.request.user == self.get_object().profile.user
-
     def post(self, request, *args, **kwargs):
          messages.success(self.request, 'Education deleted successfully!')
          return super().post(request, *args, **kwargs)
@@ -170,8 +173,9 @@ class AddExperienceView(LoginRequiredMixin, CreateView):
         messages.success(self.request, 'Work Experience added successfully!')
         return super().form_valid(form)
 
-class EditExperienceView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class EditExperienceView(LoginRequiredMixin, OwnerScopedMixin, UpdateView):
     model = WorkExperience
+    owner_field = 'profile__user'
     form_class = WorkExperienceForm
     template_name = 'profiles/add_edit_form.html'
     success_url = reverse_lazy('profiles:profile_detail')
@@ -181,15 +185,13 @@ class EditExperienceView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         context['form_title'] = 'Edit Work Experience'
         return context
 
-    def test_func(self):
-        return self.request.user == self.get_object().profile.user
-
     def form_valid(self, form):
         messages.success(self.request, 'Work Experience updated successfully!')
         return super().form_valid(form)
 
-class DeleteExperienceView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class DeleteExperienceView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
     model = WorkExperience
+    owner_field = 'profile__user'
     template_name = 'profiles/delete_confirm.html'
     success_url = reverse_lazy('profiles:profile_detail')
 
@@ -198,9 +200,6 @@ class DeleteExperienceView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         context['confirm_message'] = f"Are you sure you want to delete this experience: {self.object.job_title} at {self.object.company_name}?"
         return context
 
-    def test_func(self):
-        return self.request.user == self.get_object().profile.user
-
     def post(self, request, *args, **kwargs):
          messages.success(self.request, 'Work Experience deleted successfully!')
          return super().post(request, *args, **kwargs)
@@ -215,8 +214,9 @@ class AddSkillView(LoginRequiredMixin, View):
         form = SkillForm(request.POST)
         if form.is_valid():
             skill_name = form.cleaned_data['name']
-            # Avoid duplicate skills for the same profile
-            if not Skill.objects.filter(profile=profile, name__iexact=skill_name).exists():
+            # Avoid duplicate skills for the same profile ("JS" and "JavaScript" are one skill)
+            canonical_id = skills.resolve(skill_name)
+            if not Skill.objects.filter(profile=profile, canonical_id=canonical_id).exists():
                 Skill.objects.create(profile=profile, name=skill_name)
                 messages.success(request, f'Skill "{skill_name}" added successfully!')
             else:
@@ -227,15 +227,12 @@ class AddSkillView(LoginRequiredMixin, View):
 
         return redirect('profiles:profile_detail') # Always redirect back
 
-class DeleteSkillView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class DeleteSkillView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
     """ Deletes a skill entry. """
     model = Skill
+    owner_field = 'profile__user'
     success_url = reverse_lazy('profiles:profile_detail')
 
-    def test_func(self):
-        skill = self.get_object()
-        return self.request.user == skill.profile.user
-
     # Override post for flash message and to avoid needing a confirmation template
     def post(self, request, *args, **kwargs):
          skill = self.get_object()
@@ -267,8 +264,9 @@ class AddProjectView(LoginRequiredMixin, CreateView):
         messages.success(self.request, 'Project added successfully!')
         return super().form_valid(form)
 
-class EditProjectView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class EditProjectView(LoginRequiredMixin, OwnerScopedMixin, UpdateView):
     model = Project
+    owner_field = 'profile__user'
     form_class = ProjectForm
     template_name = 'profiles/add_edit_form.html'
     success_url = reverse_lazy('profiles:profile_detail')
@@ -278,15 +276,13 @@ class EditProjectView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         context['form_title'] = 'Edit Project'
         return context
 
-    def test_func(self):
-        return self.request.user == self.get_object().profile.user
-
     def form_valid(self, form):
         messages.success(self.request, 'Project updated successfully!')
         return super().form_valid(form)
 
-class DeleteProjectView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class DeleteProjectView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
     model = Project
+    owner_field = 'profile__user'
     template_name = 'profiles/delete_confirm.html'
     success_url = reverse_lazy('profiles:profile_detail')
 
@@ -295,9 +291,6 @@ class DeleteProjectView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         context['confirm_message'] = f"Are you sure you want to delete the project: {self.object.name}?"
         return context
 
-    def test_func(self):
-        return self.request.user == self.get_object().profile.user
-
     def post(self, request, *args, **kwargs):
          messages.success(self.request, 'Project deleted successfully!')
          return super().post(request, *args, **kwargs)
@@ -321,8 +314,9 @@ class AddAwardView(LoginRequiredMixin, CreateView):
         messages.success(self.request, 'Award added successfully!')
         return super().form_valid(form)
 
-class EditAwardView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class EditAwardView(LoginRequiredMixin, OwnerScopedMixin, UpdateView):
     model = Award
+    owner_field = 'profile__user'
     form_class = AwardForm
     template_name = 'profiles/add_edit_form.html'
     success_url = reverse_lazy('profiles:profile_detail')
@@ -332,15 +326,13 @@ class EditAwardView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         context['form_title'] = 'Edit Award/Honor'
         return context
 
-    def test_func(self):
-        return self.request.user == self.get_object().profile.user
-
     def form_valid(self, form):
         messages.success(self.request, 'Award updated successfully!')
         return super().form_valid(form)
 
-class DeleteAwardView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class DeleteAwardView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
     model = Award
+    owner_field = 'profile__user'
     template_name = 'profiles/delete_confirm.html'
     success_url = reverse_lazy('profiles:profile_detail')
 
@@ -349,9 +341,6 @@ class DeleteAwardView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         context['confirm_message'] = f"Are you sure you want to delete the award: {self.object.title}?"
         return context
 
-    def test_func(self):
-        return self.request.user == self.get_object().profile.user
-
     def post(self, request, *args, **kwargs):
          messages.success(self.request, 'Award deleted successfully!')
          return super().post(request, *args, **kwargs)
@@ -375,8 +364,9 @@ class AddCertificationView(LoginRequiredMixin, CreateView):
         messages.success(self.request, 'Certification added successfully!')
         return super().form_valid(form)
 
-class EditCertificationView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class EditCertificationView(LoginRequiredMixin, OwnerScopedMixin, UpdateView):
     model = Certification
+    owner_field = 'profile__user'
     form_class = CertificationForm
     template_name = 'profiles/add_edit_form.html'
     success_url = reverse_lazy('profiles:profile_detail')
@@ -386,15 +376,13 @@ class EditCertificationView(LoginRequiredMixin, UserPassesTestMixin, UpdateView)
         context['form_title'] = 'Edit Certification'
         return context
 
-    def test_func(self):
-        return self.request.user == self.get_object().profile.user
-
     def form_valid(self, form):
         messages.success(self.request, 'Certification updated successfully!')
         return super().form_valid(form)
 
-class DeleteCertificationView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class DeleteCertificationView(LoginRequiredMixin, OwnerScopedMixin, DeleteView):
     model = Certification
+    owner_field = 'profile__user'
     template_name = 'profiles/delete_confirm.html'
     success_url = reverse_lazy('profiles:profile_detail')
 
@@ -403,10 +391,39 @@ class DeleteCertificationView(LoginRequiredMixin, UserPassesTestMixin, DeleteVie
         context['confirm_message'] = f"Are you sure you want to delete the certification: {self.object.name}?"
         return context
 
-    def test_func(self):
-        return self.request.user == self.get_object().profile.user
-
     def post(self, request, *args, **kwargs):
          messages.success(self.request, 'Certification deleted successfully!')
          return super().post(request, *args, **kwargs)
 
+
+
+# --- Employer candidate search ---
+class CandidateSearchView(UserPassesTestMixin, View):
+    """
+    Searches candidate profiles by skills, locations and degrees (staff only
+    until employer accounts exist). Matching runs on the in-memory bitmaps
+    in profiles/candidates.py; only the shown page is read from the database.
+    """
+    template_name = 'profiles/candidate_search.html'
+    paginate_by = 20
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        form = CandidateSearchForm(request.GET or None)
+        context = {'form': form, 'searched': False}
+        if form.is_bound and form.is_valid():
+            criteria = form.criteria()
+            try:
+                page = max(int(request.GET.get('page', 1)), 1)
+            except ValueError:
+                page = 1
+            total, profiles = candidates.search_candidates(**criteria, page=page, per_page=self.paginate_by)
+            query = request.GET.copy()
+            query.pop('page', None)
+            context.update({
+                'searched': True, 'total': total, 'candidates': profiles, 'page': page,
+                'has_next': page * self.paginate_by < total, 'query_string': query.urlencode(),
+            })
+        return render(request, self.template_name, context)